@@ -1,94 +1,104 @@
+from __future__ import annotations
+
 import json
-import pandas
-from binance_f.constant.test import *
-from binance_f.exception.binanceapiexception import BinanceApiException
-from binance_f.model import Position
-from binance_f.model.constant import *
-from ccxt import binance
+import os
+from typing import TYPE_CHECKING
+
 from chalice import Chalice
 
-from chalicelib import orderutils
-from chalicelib.email import emails
 from chalicelib.constants import Constants
-from chalicelib.exchanges.binanceexchangeclient import BinanceExchangeClient
-from chalicelib.exchanges.dummybinanceexchangeclient import DummyBinanceExchangeClient
-from chalicelib.exchanges.exchangeclient import ExchangeClient
-from chalicelib.handlers.webhookhandler import WebhookHandler
-from chalicelib.markets.ccxtmarkets import CCXTMarkets
-from chalicelib.models.orders.slorder import StopLossOrder
-from chalicelib.requests.webhookjsonvalidator import WebhookJsonValidator
+from chalicelib.email.notificationdispatcher import flush_notifications
+from chalicelib.lazymodule import LazyModule
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.userconfig.userconfigstore import get_user_config_store
+
+if TYPE_CHECKING:
+    from binance_f.model import Position
+    from chalicelib.exchanges.exchangeclient import ExchangeClient
+
+logger = get_logger()
+
+# Heavy dependencies (boto3, ccxt, binance_f, numpy) are imported on first use so each route only pays for its own
+binanceapiexception = LazyModule("binance_f.exception.binanceapiexception")
+ccxt = LazyModule("ccxt")
+emails = LazyModule("chalicelib.email.emails")
+exchangeclientpool = LazyModule("chalicelib.exchanges.exchangeclientpool")
+tickerexecutionqueue = LazyModule("chalicelib.execution.tickerexecutionqueue")
+orderupdatehandler = LazyModule("chalicelib.handlers.orderupdatehandler")
+webhookhandler = LazyModule("chalicelib.handlers.webhookhandler")
+idempotencycache = LazyModule("chalicelib.idempotency.idempotencycache")
+ccxtmarkets = LazyModule("chalicelib.markets.ccxtmarkets")
+slorder = LazyModule("chalicelib.models.orders.slorder")
+priceservice = LazyModule("chalicelib.prices.priceservice")
+webhookjsonvalidator = LazyModule("chalicelib.requests.webhookjsonvalidator")
+
+OrderSide = Constants.OrderSide
+OrderType = Constants.OrderType
 
 USER_CONFIG_PATH_ENV_VAR = 'USER_CONFIG_PATH'
 EMAIL_ADDRESS_CONFIG_KEY = 'EMAIL_ADDRESS'
 BOT_API_KEY_CONFIG_KEY = 'BOT_API_KEY'
 
 USER_ID_QUERY_PARAM = 'userId'
-ORDER_ID_PREFIX = "bot_"
-EXIT_ORDER_ID_PREFIX = "bot_exit_"
 EXCHANGES = {"BINANCE": False, "TESTNET": True}
+# The stop which exits a position is placed at the current price, so it is priced more strictly than entries
+EXIT_PRICE_MAX_AGE_MS = 250
 
 app = Chalice(app_name='crypto-trading-bot')
 
 
-def load_user_config():
+@app.middleware('http')
+def flush_notifications_after_response(event, get_response):
+    # Emails are sent in the background while the request is handled, but Lambda freezes the container once the
+    # response is returned, so the response waits here, for up to the flush timeout, until they have gone out
+    response = get_response(event)
+    flush_notifications()
+    return response
+
+
+def get_user_id():
     query_params = app.current_request.query_params
     if query_params:
-        user_id_query_param = query_params.get(USER_ID_QUERY_PARAM)
-        if user_id_query_param:
-            user_conf_path = os.environ.get(USER_CONFIG_PATH_ENV_VAR)
-            print(user_conf_path)
-            with open(user_conf_path) as user_config_json:
-                data = json.load(user_config_json)
-                print(data)
-                return data.get(user_id_query_param)
+        return query_params.get(USER_ID_QUERY_PARAM)
+    return None
+
+
+def load_user_config():
+    user_id = get_user_id()
+    if user_id:
+        user_config_store = get_user_config_store(path=os.environ.get(USER_CONFIG_PATH_ENV_VAR))
+        return user_config_store.get(user_id=user_id)
     return None
 
 
+def get_exchange_client(user_config, is_test_platform: bool, is_dry_run: bool) -> ExchangeClient:
+    # Only the client this request needs is built, and it is reused by later warm invocations for the same user
+    return exchangeclientpool.get_exchange_client_pool().get_client(user_id=get_user_id(), user_config=user_config,
+                                                                    is_test_platform=is_test_platform,
+                                                                    is_dry_run=is_dry_run)
+
+
+def run_for_ticker(ticker: str, exchange_client: ExchangeClient, work, coalesce_key: str = None):
+    # Requests for the same user and ticker take turns, so concurrent alerts and fills do not race on the exchange
+    return tickerexecutionqueue.get_ticker_execution_queue().run(user_id=get_user_id(), ticker=ticker,
+                                                                 exchange_client=exchange_client, work=work,
+                                                                 coalesce_key=coalesce_key)
+
+
 def authenticate_user(api_key, payload):
     if not api_key:
-        print('API_KEY environment variable must be set. Exiting script...')
+        logger.warning("API_KEY environment variable must be set. Exiting script...")
         return False
     if 'auth' not in payload:
-        print('Authentication value not present in payload. Payload: {}'.format(payload))
+        logger.warning("Authentication value not present in payload. Payload: %s", payload)
         return False
     payload_auth = payload['auth']
     if payload_auth != api_key:
-        print('Authentication failed. Invalid API Key {}. Exiting script...'.format(payload_auth))
+        logger.warning("Authentication failed. Invalid API Key. Exiting script...")
         return False
     return True
 
 
-def is_bot_order_id(order_id: str):
-    return order_id.startswith(ORDER_ID_PREFIX)
-
-
-def is_bot_exit_order_id(order_id: str):
-    return order_id.startswith(EXIT_ORDER_ID_PREFIX)
-
-
-def cancel_all_open_orders(client: ExchangeClient, ticker):
-    open_orders = client.get_open_orders(ticker)
-    open_order_ids = []
-    for order in open_orders:
-        order_id = order.orderId
-        client_order_id = order.clientOrderId
-        if is_bot_order_id(client_order_id):
-            open_order_ids.append(order_id)
-    if open_order_ids:
-        print("Cancelling open orders: {}".format(open_orders))
-        client.cancel_list_orders(ticker, open_order_ids)
-        return True
-    return False
-
-
-def get_open_position(client: ExchangeClient, ticker: str):
-    open_positions = client.get_position()
-    for open_position in open_positions:
-        if open_position.symbol == ticker.upper():
-            return open_position
-    return None
-
-
 def cancel_open_position(client: ExchangeClient, ticker: str, open_position: Position, token_price: float,
                          quantity_precision: int, entry_price: float = None, price_precision: int = None):
     """
@@ -106,177 +116,23 @@ def cancel_open_position(client: ExchangeClient, ticker: str, open_position: Pos
         #                       quantity=position_amount, price=entry_price, timeInForce=TimeInForce.GTC,
         #                       newClientOrderId=utils.generate_client_order_id())
         # else:
-        print('Cancelling open position... Executing STOP_MARKET order')
-        stop_order = StopLossOrder(side=flipped_side, ticker=ticker, order_id_str="pos_exit", trigger_price=token_price)
+        logger.info("Cancelling open position... Executing STOP_MARKET order")
+        stop_order = slorder.StopLossOrder(side=flipped_side, ticker=ticker, order_id_str="pos_exit",
+                                           trigger_price=token_price)
         client.place_order(stop_order)
         return True
     return False
 
 
-def is_exit_order(order_type: OrderType):
-    return (order_type != OrderType.LIMIT) and (order_type != OrderType.MARKET)
-
-
-def cleanup_rogue_open_orders(client: ExchangeClient, ticker: str) -> bool:
-    print("Cleaning up rogue open orders on ticker: {}".format(ticker))
-    open_position = get_open_position(client=client, ticker=ticker)
-    all_open_orders = client.get_open_orders(ticker=ticker)
-    print("Total open orders on ticker: {}".format(len(all_open_orders)))
-    bot_open_orders = filter(lambda o: is_bot_order_id(o.clientOrderId), all_open_orders)
-    print("Total bot placed open orders: {}".format(len(list(bot_open_orders))))
-
-    # Do not terminate open orders if there is a potential position waiting to get filled.
-    # We only want to cancel exit type orders (SL, TP and TS).
-    open_exit_orders = filter(lambda o: is_exit_order(o.type), bot_open_orders)
-    # print("Total exit type open orders to cancel: {}".format(len(list(open_exit_orders))))
-
-    open_position_amt = float(open_position.positionAmt)
-    print(f"Position amount: {open_position_amt}")
-    if open_position_amt == 0:
-        return cancel_all_open_orders(client=client, ticker=ticker)
-    print("No open orders to cancel")
-    return False
-
-
-def is_stop_loss_order(order_type: str) -> bool:
-    return order_type == "STOP" or order_type == "STOP_MARKET"
-
-
-def move_stop_loss(client, ticker: str) -> bool:
-    print("Attempting to move stop loss")
-    open_position = get_open_position(client=client, ticker=ticker)
-    open_position_amt = float(open_position.positionAmt)
-    print(f"Open position amount: {open_position_amt}")
-    if open_position_amt != 0:
-        open_orders = client.get_open_orders(ticker=ticker)
-        print(f"All open orders count: {len(open_orders)}")
-        stop_loss_orders = filter(lambda o: is_stop_loss_order(o.type), open_orders)
-        stop_loss_order_ids = [order.orderId for order in stop_loss_orders]
-        print(f"All Stop Loss orders to cancel: {stop_loss_order_ids}")
-        if stop_loss_order_ids:
-            print("Cancelling Stop Loss orders: {}".format(stop_loss_order_ids))
-            client.cancel_list_orders(ticker, stop_loss_order_ids)
-            stop_loss_side = Constants.OrderSide.SELL if open_position_amt > 0 else Constants.OrderSide.BUY
-            sl_trigger = open_position.entryPrice
-            price_precision = client.get_price_precision(ticker=ticker)
-            sl_trigger = round(sl_trigger, price_precision)
-            print("Placing new {} Stop Loss order at: {}".format(stop_loss_side, sl_trigger))
-            stop_order = StopLossOrder(side=stop_loss_side, ticker=ticker, order_id_str="sl_mv",
-                                       trigger_price=sl_trigger)
-            client.place_order(stop_order)
-            return True
-    return False
-
-
-@app.route('/webhook', methods=['POST'])
-def webhook():
-    user_config = load_user_config()
-    if not user_config:
-        return {
-            'code': 401,
-            'message': 'Invalid user'
-        }
-
-    payload = app.current_request.json_body
-    print('Request received: {}'.format(payload))
-    is_authenticated = authenticate_user(user_config.get(BOT_API_KEY_CONFIG_KEY), payload)
-    if not is_authenticated:
-        return {
-            'code': 401,
-            'message': 'Authentication Failed!'
-        }
-
-    user_email = user_config.get(EMAIL_ADDRESS_CONFIG_KEY, None)
-
-    # Platform & dry run checks
-    is_test_platform = bool(payload.get(Constants.JsonRequestKeys.IS_TEST_PLATFORM, False))
-    is_dry_run = bool(payload.get(Constants.JsonRequestKeys.IS_DRY_RUN, False))
-    print('Is running on testnet platform: {}. Is dry run: {}'.format(is_test_platform, is_dry_run))
-
-    should_send_email = user_email is not None and not is_dry_run
-    ticker = payload.get(Constants.JsonRequestKeys.Position.TICKER, "")
-    side = payload.get(Constants.JsonRequestKeys.Position.SIDE, "")
-
-    # Validate JSON payload
-    try:
-        json_validator = WebhookJsonValidator()
-        json_validator.validate_payload(payload=payload)
-    except ValueError as e:
-        print("JSON Validation Failed.")
-        print(e)
-        if should_send_email:
-            print(f"Sending error email to user: {user_email}")
-            emails.send_error_email(email_recipient=user_email, heading="Error placing order", err_msg=str(e),
-                                    ticker=ticker, order_side=side)
-        return {"code": 400, "body": str(e)}
-
-    binance_client = BinanceExchangeClient(is_test_platform=is_test_platform, user_config=user_config)
-    dummy_binance = DummyBinanceExchangeClient(is_test_platform=is_test_platform, user_config=user_config)
-    exchange_client = dummy_binance if payload.get("isDryRun") else binance_client
-
-    constants = Constants()
-    markets = CCXTMarkets(exchange=binance())
-    handler = WebhookHandler(payload=payload, exchange_client=exchange_client, constants=constants, markets=markets)
-
-    try:
-        response = handler.handle()
-        if should_send_email:
-            print('Sending order placed email to user')
-            emails.send_trade_placed_email(email_recipient=user_email, trade_response=response)
-        return response
-
-    except Exception as e:
-        print("Error occurred when placing orders. ")
-        print(e)
-        if should_send_email:
-            print('Sending error email to user')
-            emails.send_error_email(email_recipient=user_email, heading="Error placing order", err_msg=str(e),
-                                    ticker=ticker, order_side=side)
-        return {"code": 400, "body": str(e)}
-
-
-@app.route('/exit', methods=['POST'])
-def exit_trade():
-    """
-    Exits open positions and orders based on certain criteria.
-
-    Rules:
-
-    - When a TP is not present in open orders this indicates it has already triggered. This indicates that the
-    """
-    user_config = load_user_config()
-    if not user_config:
-        return {
-            'code': 401,
-            'message': 'Invalid user'
-        }
-    payload = app.current_request.json_body
-    print('Exit trade called: {}'.format(payload))
-
-    is_authenticated = authenticate_user(user_config.get(BOT_API_KEY_CONFIG_KEY), payload)
-    if not is_authenticated:
-        return {
-            'code': 401,
-            'message': 'Authentication Failed!'
-        }
-
-    is_test_platform = bool(payload.get('isTestPlatform', False))
-    is_dry_run = bool(payload.get('isDryRun', False))
-    print('Is running on testnet platform: {}. Is dry run: {}'.format(is_test_platform, is_dry_run))
-
-    binance_client = BinanceExchangeClient(is_test_platform=is_test_platform, user_config=user_config)
-    dummy_binance = DummyBinanceExchangeClient(is_test_platform=is_test_platform, user_config=user_config)
-    exchange_client = dummy_binance if payload.get("isDryRun") else binance_client
-
-    ticker = payload.get('ticker', '').upper()
-    print('Ticker: {}'.format(ticker))
-    open_orders = exchange_client.get_open_orders(ticker=ticker)
-    open_position = get_open_position(exchange_client, ticker)
+def exit_ticker(client: ExchangeClient, ticker: str, payload: dict, user_id: str, is_test_platform: bool,
+                is_dry_run: bool):
+    open_orders = client.get_open_orders(ticker=ticker)
+    open_position = orderupdatehandler.get_open_position(client, ticker)
     open_position_amt = float(open_position.positionAmt)
     exit_alert_side = payload.get('exitSide', '').upper()
     if not exit_alert_side:
         response = 'Post body must contain exitSide BUY or SELL in JSON payload'
-        print(response)
+        logger.debug("%s", response)
         return {
             'code': 400,
             'message': response
@@ -287,14 +143,14 @@ def exit_trade():
     if (open_position_amt != 0) and (current_position_side != exit_alert_side):
         response = 'Current position side is {} and exit alert side is {}. Will not exit current position'.format(
             current_position_side, exit_alert_side)
-        print(response)
+        logger.debug("%s", response)
         return {
             'code': 200,
             'message': response
         }
 
-    quantity_precision = exchange_client.get_quantity_precision(ticker=ticker)
-    price_precision = exchange_client.get_price_precision(ticker=ticker)
+    quantity_precision = client.get_quantity_precision(ticker=ticker)
+    price_precision = client.get_price_precision(ticker=ticker)
     is_take_profit_present = False
     is_tailing_stop_present = False
 
@@ -307,7 +163,7 @@ def exit_trade():
 
     if is_open_position_present and is_tailing_stop_present and not is_take_profit_present:
         response = 'Position has hit Take Profit with Trailing Stop in place. Will not cancel position'
-        print(response)
+        logger.debug("%s", response)
         return {
             'code': 200,
             'message': response
@@ -316,25 +172,25 @@ def exit_trade():
     is_open_position_cancelled = False
     last_token_price = 0.0
     if open_orders:
-        print('Exiting open orders')
+        logger.info("Exiting open orders")
         if is_dry_run:
             is_open_orders_cancelled = True
         else:
-            is_open_orders_cancelled = cancel_all_open_orders(client=exchange_client, ticker=ticker)
+            is_open_orders_cancelled = orderupdatehandler.cancel_all_open_orders(client=client, ticker=ticker)
     if is_open_position_present:
-        print('Exiting open position')
-        markets = CCXTMarkets(binance())
-        last_token_price = markets.get_current_token_price(ticker=ticker)
+        logger.info("Exiting open position")
+        last_token_price = priceservice.get_price_service(is_test_platform).get_price(
+            ticker=ticker, max_age_ms=EXIT_PRICE_MAX_AGE_MS)
         if is_dry_run:
             is_open_position_cancelled = True
         else:
             try:
-                is_open_position_cancelled = cancel_open_position(client=exchange_client, ticker=ticker,
+                is_open_position_cancelled = cancel_open_position(client=client, ticker=ticker,
                                                                   open_position=open_position,
                                                                   token_price=last_token_price,
                                                                   quantity_precision=quantity_precision)
-            except BinanceApiException as err:
-                print("Error occurred while attempting to cancel open position: {}".format(err.args))
+            except binanceapiexception.BinanceApiException as err:
+                logger.error("Error occurred while attempting to cancel open position: %s", err.args)
                 return {
                     "code": 400,
                     "body": err.args
@@ -342,15 +198,15 @@ def exit_trade():
 
     response = 'Exited all trades. Open position cancelled: {}. Open orders cancelled: {}'.format(
         is_open_position_cancelled, is_open_orders_cancelled)
-    print(response)
+    logger.debug("%s", response)
 
     if is_dry_run:
-        print('Dry run. Not exiting orders')
+        logger.info("Dry run. Not exiting orders")
 
     return {
         'code': 200,
         "body": {
-            "userId": str(app.current_request.query_params.get(USER_ID_QUERY_PARAM)),
+            "userId": str(user_id),
             "ticker": f"{ticker}",
             "exitSide": f"{exit_alert_side}",
             "existingPositionSide": f"{current_position_side}",
@@ -369,6 +225,136 @@ def exit_trade():
     }
 
 
+@app.route('/webhook', methods=['POST'])
+def webhook():
+    user_config = load_user_config()
+    if not user_config:
+        return {
+            'code': 401,
+            'message': 'Invalid user'
+        }
+
+    payload = app.current_request.json_body
+    logger.debug("Request received: %s", payload)
+    is_authenticated = authenticate_user(user_config.get(BOT_API_KEY_CONFIG_KEY), payload)
+    if not is_authenticated:
+        return {
+            'code': 401,
+            'message': 'Authentication Failed!'
+        }
+
+    user_email = user_config.get(EMAIL_ADDRESS_CONFIG_KEY, None)
+
+    # Platform & dry run checks
+    is_test_platform = bool(payload.get(Constants.JsonRequestKeys.IS_TEST_PLATFORM, False))
+    is_dry_run = bool(payload.get(Constants.JsonRequestKeys.IS_DRY_RUN, False))
+    logger.info("Is running on testnet platform: %s. Is dry run: %s", is_test_platform, is_dry_run)
+
+    should_send_email = user_email is not None and not is_dry_run
+    # Read before validation for error emails, so a malformed position is tolerated here
+    position_json = payload.get(Constants.JsonRequestKeys.Position.POSITION)
+    position_json = position_json if isinstance(position_json, dict) else {}
+    ticker = str(position_json.get(Constants.JsonRequestKeys.Position.TICKER, ""))
+    side = position_json.get(Constants.JsonRequestKeys.Position.SIDE, "")
+
+    # Validate JSON payload
+    try:
+        json_validator = webhookjsonvalidator.WebhookJsonValidator()
+        json_validator.validate_payload(payload=payload)
+    except ValueError as e:
+        logger.error("JSON Validation Failed. %s", e)
+        if should_send_email:
+            logger.info("Sending error email to user: %s", user_email)
+            emails.send_error_email(email_recipient=user_email, heading="Error placing order", err_msg=str(e),
+                                    ticker=ticker, order_side=side)
+        return {"code": 400, "body": str(e)}
+
+    # TradingView retries webhooks and alerts can fire twice on one bar. Repeats of an alert get the first one's
+    # response rather than cancelling and placing every order again.
+    idempotency_cache = idempotencycache.get_idempotency_cache()
+    fingerprint = idempotencycache.fingerprint_webhook(user_id=get_user_id(), payload=payload)
+    with idempotency_cache.hold(fingerprint):
+        cached_response = idempotency_cache.get(fingerprint)
+        if cached_response is not None:
+            logger.info("Duplicate alert for %s %s. Returning response of the original alert", ticker, side)
+            return cached_response
+
+        exchange_client = get_exchange_client(user_config=user_config, is_test_platform=is_test_platform,
+                                              is_dry_run=bool(payload.get("isDryRun")))
+
+        constants = Constants()
+        markets = ccxtmarkets.CCXTMarkets(exchange=ccxt.binance())
+        price_service = priceservice.get_price_service(is_test_platform)
+
+        def place_orders(client: ExchangeClient):
+            handler = webhookhandler.WebhookHandler(payload=payload, exchange_client=client, constants=constants,
+                                                    markets=markets, price_service=price_service)
+            try:
+                orders_response = handler.handle()
+                if should_send_email:
+                    logger.info("Sending order placed email to user")
+                    emails.send_trade_placed_email(email_recipient=user_email, trade_response=orders_response)
+                return orders_response
+
+            except Exception as e:
+                logger.error("Error occurred when placing orders. %s", e)
+                if should_send_email:
+                    logger.info("Sending error email to user")
+                    emails.send_error_email(email_recipient=user_email, heading="Error placing order",
+                                            err_msg=str(e), ticker=ticker, order_side=side)
+                return {"code": 400, "body": str(e)}
+
+        # A newer alert for the ticker replaces one still queued, it closes whatever position that one would open
+        response = run_for_ticker(ticker=ticker, exchange_client=exchange_client, work=place_orders,
+                                  coalesce_key="webhook")
+        # Only alerts whose orders were placed are remembered, a failed alert may be retried
+        if response.get("code") == 200:
+            idempotency_cache.put(fingerprint, response)
+        return response
+
+
+@app.route('/exit', methods=['POST'])
+def exit_trade():
+    """
+    Exits open positions and orders based on certain criteria.
+
+    Rules:
+
+    - When a TP is not present in open orders this indicates it has already triggered. This indicates that the
+    """
+    user_config = load_user_config()
+    if not user_config:
+        return {
+            'code': 401,
+            'message': 'Invalid user'
+        }
+    payload = app.current_request.json_body
+    logger.debug("Exit trade called: %s", payload)
+
+    is_authenticated = authenticate_user(user_config.get(BOT_API_KEY_CONFIG_KEY), payload)
+    if not is_authenticated:
+        return {
+            'code': 401,
+            'message': 'Authentication Failed!'
+        }
+
+    is_test_platform = bool(payload.get('isTestPlatform', False))
+    is_dry_run = bool(payload.get('isDryRun', False))
+    logger.info("Is running on testnet platform: %s. Is dry run: %s", is_test_platform, is_dry_run)
+
+    exchange_client = get_exchange_client(user_config=user_config, is_test_platform=is_test_platform,
+                                          is_dry_run=bool(payload.get("isDryRun")))
+
+    ticker = payload.get('ticker', '').upper()
+    logger.info("Ticker: %s", ticker)
+    user_id = get_user_id()
+    exit_side = payload.get('exitSide', '').upper()
+    return run_for_ticker(ticker=ticker, exchange_client=exchange_client, coalesce_key=f"exit:{exit_side}",
+                          work=lambda client: exit_ticker(client=client, ticker=ticker, payload=payload,
+                                                          user_id=user_id, is_test_platform=is_test_platform,
+                                                          is_dry_run=is_dry_run))
+
+
 @app.route('/orderUpdateEvent', methods=['POST'])
 def order_update_event():
     user_config = load_user_config()
@@ -379,7 +365,7 @@ def order_update_event():
         }
 
     payload = dict(app.current_request.json_body)
-    print('Order Update Event received: {}'.format(payload))
+    logger.debug("Order Update Event received: %s", payload)
 
     is_authenticated = authenticate_user(user_config.get(BOT_API_KEY_CONFIG_KEY), payload)
     if not is_authenticated:
@@ -395,7 +381,7 @@ def order_update_event():
             'code': 400,
             'message': 'Request must include "order" property.'
         }
-    print("Order: {}".format(order))
+    logger.debug("Order: %s", order)
 
     exchange = payload.get("exchange")
     if exchange not in EXCHANGES:
@@ -405,35 +391,23 @@ def order_update_event():
         }
 
     is_test_exchange = EXCHANGES.get(exchange)
-    print("Is from test exchange: {}".format(is_test_exchange))
-    binance_client = BinanceExchangeClient(is_test_platform=is_test_exchange, user_config=user_config)
-    dummy_binance = DummyBinanceExchangeClient(is_test_platform=is_test_exchange, user_config=user_config)
-    exchange_client = dummy_binance if payload.get("isDryRun") else binance_client
-
-    is_orders_cancelled = False
-    ticker = order.get("s")
-    order_id = order.get("c", "")
-    # When flipping from one side to another we place an order with ID prefix "bot_exit_" to exit the old position.
-    # We must avoid cleaning up open orders on this order type, otherwise new DCA open orders for new side will
-    # instantly be cancelled.
-    if not is_bot_exit_order_id(order_id=order_id):
-        is_orders_cancelled = cleanup_rogue_open_orders(client=exchange_client, ticker=ticker)
-
-    order_type = str(order.get("ot"))
-    is_stop_loss_moved = False
-    if ("PROFIT" in order_type.upper()) and (not is_orders_cancelled):
-        print("Take profit order filled. Will attempt to move Stop Loss")
-        try:
-            is_stop_loss_moved = move_stop_loss(client=exchange_client, ticker=ticker)
-        except BinanceApiException as err:
-            print("Error occurred while attempting to move stop loss: {}".format(err.args))
-            return {
-                "code": 400,
-                "body": err.args
-            }
-
-    print(f"Open orders cancelled: {is_orders_cancelled}")
-    print(f"Stop Loss moved: {is_stop_loss_moved}")
+    logger.info("Is from test exchange: %s", is_test_exchange)
+    exchange_client = get_exchange_client(user_config=user_config, is_test_platform=is_test_exchange,
+                                          is_dry_run=bool(payload.get("isDryRun")))
+
+    try:
+        result = run_for_ticker(ticker=order.get("s", ""), exchange_client=exchange_client,
+                                work=lambda client: orderupdatehandler.OrderUpdateHandler(client).handle(order=order),
+                                coalesce_key=orderupdatehandler.get_coalesce_key(order))
+    except binanceapiexception.BinanceApiException as err:
+        logger.error("Error occurred while attempting to move stop loss: %s", err.args)
+        return {
+            "code": 400,
+            "body": err.args
+        }
+    is_orders_cancelled = result["is_orders_cancelled"]
+    is_stop_loss_moved = result["is_stop_loss_moved"]
+
     return {
         "code": 200,
         "body": "Successfully processed request. Open orders cancelled: {}. Stop Loss moved: {}".format(
@@ -0,0 +1,68 @@
+"""
+Compares the NumPy ATR backend against the pandas/ta backend: cold import time and peak memory in a fresh interpreter,
+then per-call latency on chalicelib/handlers/tests/sample-ohlcv.json.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_atr
+"""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+from chalicelib.indicators.atrbackends import get_atr_class, NUMPY_BACKEND, TA_BACKEND
+from chalicelib.markets.fakemarkets import FakeMarkets
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+SAMPLE_OHLCV_PATH = os.path.join(REPO_ROOT, "chalicelib", "handlers", "tests", "sample-ohlcv.json")
+BACKEND_MODULES = {NUMPY_BACKEND: "chalicelib.indicators.atr", TA_BACKEND: "chalicelib.indicators.taatr"}
+ITERATIONS = 2000
+COLD_IMPORT_RUNS = 5
+COLD_IMPORT_SCRIPT = """
+import resource, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(elapsed_ms, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure_cold_import(module: str):
+    """
+    Imports the module in fresh interpreters and returns the best import time (ms) and its peak RSS (KB).
+    """
+    samples = []
+    for _ in range(COLD_IMPORT_RUNS):
+        output = subprocess.run([sys.executable, "-c", COLD_IMPORT_SCRIPT.format(module=module)], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.split()
+        samples.append((float(output[0]), int(output[1])))
+    return min(samples)
+
+
+def measure_per_call(backend: str) -> float:
+    with open(SAMPLE_OHLCV_PATH) as sample_ohlcv:
+        markets = FakeMarkets()
+        markets.set_ohlcv_data(json.load(sample_ohlcv))
+    atr_class = get_atr_class(backend=backend)
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed = timeit.timeit(lambda: atr_class(markets=markets, ticker="CHRUSDT", interval=60), number=ITERATIONS)
+    return elapsed / ITERATIONS * 1e6
+
+
+def run():
+    results = {}
+    for backend, module in BACKEND_MODULES.items():
+        import_ms, peak_rss_kb = measure_cold_import(module)
+        results[backend] = {"coldImportMs": round(import_ms, 1), "coldImportPeakRssKb": peak_rss_kb,
+                            "usPerCall": round(measure_per_call(backend), 1)}
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run().items():
+        print(f"{name}: cold import {result['coldImportMs']} ms, peak RSS {result['coldImportPeakRssKb']} KB, "
+              f"{result['usPerCall']} us/call")
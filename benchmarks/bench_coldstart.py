@@ -0,0 +1,85 @@
+"""
+Cold-start import profile for app.py, built on `python -X importtime`.
+
+For the bare app module and for each route it imports the modules that route touches in a fresh interpreter, then
+reports the total import time and the most expensive modules so regressions show up.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_coldstart [--top N] [--json PATH]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+# Modules loaded lazily by app.py on each route's code path: the LazyModules the route touches, which
+# tests/test_bench_coldstart.py checks against app.py, then the modules those import on first use. Every route flushes
+# the notification dispatcher, and /webhook creates the SES client with boto3 when it sends its first email.
+ROUTE_MODULES = {
+    "app": [],
+    "/webhook": ["chalicelib.requests.webhookjsonvalidator", "chalicelib.idempotency.idempotencycache",
+                 "chalicelib.exchanges.exchangeclientpool", "chalicelib.exchanges.binanceexchangeclient",
+                 "chalicelib.execution.tickerexecutionqueue", "ccxt", "chalicelib.markets.ccxtmarkets",
+                 "chalicelib.prices.priceservice", "chalicelib.prices.tickerpriceservice",
+                 "chalicelib.handlers.webhookhandler", "chalicelib.email.notificationdispatcher",
+                 "chalicelib.email.emails", "boto3"],
+    "/exit": ["chalicelib.exchanges.exchangeclientpool", "chalicelib.exchanges.binanceexchangeclient",
+              "chalicelib.execution.tickerexecutionqueue", "chalicelib.prices.priceservice",
+              "chalicelib.prices.tickerpriceservice", "chalicelib.models.orders.slorder",
+              "chalicelib.handlers.orderupdatehandler", "binance_f.exception.binanceapiexception",
+              "chalicelib.email.notificationdispatcher"],
+    "/orderUpdateEvent": ["chalicelib.exchanges.exchangeclientpool",
+                          "chalicelib.exchanges.binanceexchangeclient", "chalicelib.execution.tickerexecutionqueue",
+                          "chalicelib.handlers.orderupdatehandler", "binance_f.exception.binanceapiexception",
+                          "chalicelib.email.notificationdispatcher"],
+}
+IMPORT_TIME_PREFIX = "import time:"
+DEFAULT_TOP = 15
+
+
+def profile_imports(modules: List[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Imports app plus the given modules under -X importtime and returns self and cumulative microseconds per module.
+    """
+    statements = "; ".join(["import app"] + [f"import {module}" for module in modules])
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", statements], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True).stderr
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX) or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len(IMPORT_TIME_PREFIX):].split("|")
+        costs[module.strip()] = {"selfUs": int(self_us), "cumulativeUs": int(cumulative_us)}
+    return costs
+
+
+def run(top: int = DEFAULT_TOP) -> dict:
+    results = {}
+    for route, modules in ROUTE_MODULES.items():
+        costs = profile_imports(modules)
+        total_us = sum(cost["selfUs"] for cost in costs.values())
+        slowest = sorted(costs.items(), key=lambda item: item[1]["selfUs"], reverse=True)[:top]
+        results[route] = {"totalMs": round(total_us / 1000, 1), "moduleCount": len(costs),
+                          "slowestModules": {module: cost for module, cost in slowest}}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="number of slowest modules to report")
+    parser.add_argument("--json", help="write the results to this path as JSON")
+    args = parser.parse_args()
+
+    profile = run(top=args.top)
+    for route_name, result in profile.items():
+        print(f"{route_name}: {result['totalMs']} ms across {result['moduleCount']} modules")
+        for module_name, module_cost in result["slowestModules"].items():
+            print(f"    {module_cost['selfUs'] / 1000:8.1f} ms self  {module_cost['cumulativeUs'] / 1000:8.1f} ms "
+                  f"cumulative  {module_name}")
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(profile, json_file, indent=2)
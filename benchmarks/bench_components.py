@@ -0,0 +1,198 @@
+"""
+Micro-benchmarks for the components on a webhook request's hot path, run on the sample payloads and OHLCV data in
+chalicelib/handlers/tests, with a committed baseline to compare against so regressions are caught before deploy.
+
+Timings are the best of several repeats, in microseconds per call, and only comparable on the same machine, so
+regenerate the baseline wherever the comparison runs.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_components [--json PATH]                  # run and print the results
+    python -m benchmarks.bench_components --compare [--threshold PERCENT]  # exit 1 if anything got slower
+    python -m benchmarks.bench_components --update-baseline              # store the results as the baseline
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import timeit
+from typing import Callable, Dict
+
+from benchmarks.legacyemails import format_json_to_html
+from chalicelib.account.account import Account
+from chalicelib.constants import Constants
+from chalicelib.email.htmlrenderer import render_json_html
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.factories.positionorderfactory import PositionOrderFactory
+from chalicelib.factories.slorderfactory import StopLossOrderFactory
+from chalicelib.factories.tporderfactory import TakeProfitOrderFactory
+from chalicelib.indicators.atrbackends import get_atr_class, NUMPY_BACKEND
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.markets.fakemarkets import FakeMarkets
+from chalicelib.requests.webhookjsonvalidator import WebhookJsonValidator
+from chalicelib.responses.responsebuilder import ResponseBuilder
+from chalicelib.risk.risk import Risk
+from chalicelib.token import Token
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+SAMPLES_DIR = os.path.join(REPO_ROOT, "chalicelib", "handlers", "tests")
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baselines", "components.json")
+MARKET_PAYLOAD = "sample-json-payload.json"
+DCA_PAYLOAD = "sample-json-payload-dca-atr-multipliers.json"
+TICKER = "CHRUSDT"
+INTERVAL = 60
+PORTFOLIO_VALUE = 1000
+TOKEN_PRICE = 100
+PRECISION = 4
+MAX_PORTFOLIO_RISK = 1.5
+REPEATS = 7
+# Calls are timed in batches of at least this long, so timer resolution does not matter
+MIN_BATCH_SECONDS = 0.2
+DEFAULT_THRESHOLD_PERCENT = 20.0
+
+
+def load_json(file_name: str):
+    with open(os.path.join(SAMPLES_DIR, file_name)) as sample_json:
+        return json.load(sample_json)
+
+
+class Fixture:
+    """
+    The inputs each component is called with, built the way WebhookHandler builds them for a payload.
+    """
+
+    def __init__(self, payload: dict, ohlcv: list):
+        self.payload = payload
+        exchange_client = FakeBinanceExchangeClient()
+        exchange_client.set_portfolio_value(PORTFOLIO_VALUE)
+        exchange_client.set_price_precision(PRECISION)
+        exchange_client.set_quantity_precision(PRECISION)
+        self.markets = FakeMarkets()
+        self.markets.set_ohlcv_data(ohlcv)
+        self.markets.set_current_token_price(TOKEN_PRICE)
+        self.constants = Constants()
+        self.atr = get_atr_class(backend=NUMPY_BACKEND)(markets=self.markets, ticker=TICKER, interval=INTERVAL)
+        self.token = Token(exchange_client=exchange_client, markets=self.markets, ticker=TICKER)
+        self.account = Account(exchange_client)
+
+        self.sl_factory = StopLossOrderFactory(request=payload, constants=self.constants, atr=self.atr,
+                                               token=self.token)
+        self.position_factory = PositionOrderFactory(request=payload, constants=self.constants, account=self.account,
+                                                     token=self.token, atr=self.atr)
+        self.sl_orders = self.sl_factory.create_orders()
+        self.position_orders = self.position_factory.create_orders()
+        token_qty = sum(order.token_qty for order in self.position_orders)
+        self.tp_factory = TakeProfitOrderFactory(request=payload, constants=self.constants, atr=self.atr,
+                                                 token_qty=token_qty, token=self.token)
+        self.tp_orders = self.tp_factory.create_orders()
+        average_entry_price = sum(order.entry_price * (order.token_qty / token_qty) for order in self.position_orders)
+        self.risk = Risk(token_qty=token_qty, sl_trigger_price=self.sl_orders[0].trigger_price,
+                         portfolio_value=self.account.portfolio_value, max_portfolio_risk=MAX_PORTFOLIO_RISK,
+                         token_price=average_entry_price)
+
+    def build_response(self) -> dict:
+        return ResponseBuilder(payload=self.payload, position_orders=self.position_orders, sl_orders=self.sl_orders,
+                               tp_orders=self.tp_orders, token=self.token, risk=self.risk,
+                               account=self.account).build_response()
+
+
+def build_components() -> Dict[str, Callable[[], object]]:
+    ohlcv = load_json("sample-ohlcv.json")
+    market = Fixture(payload=load_json(MARKET_PAYLOAD), ohlcv=ohlcv)
+    dca = Fixture(payload=load_json(DCA_PAYLOAD), ohlcv=ohlcv)
+    trade_response = {"code": 200, "body": dca.build_response()}
+    trade_response_json = json.dumps(trade_response, indent=4)
+    validator = WebhookJsonValidator()
+    return {
+        "WebhookJsonValidator.validate_payload": lambda: validator.validate_payload(payload=dca.payload),
+        "ATR.get_atr": lambda: market.atr.get_atr(markets=market.markets),
+        "PositionOrderFactory.create_orders.market": market.position_factory.create_orders,
+        "PositionOrderFactory.create_orders.dca": dca.position_factory.create_orders,
+        "StopLossOrderFactory.create_orders": dca.sl_factory.create_orders,
+        "TakeProfitOrderFactory.create_orders": dca.tp_factory.create_orders,
+        "ResponseBuilder.build_response": dca.build_response,
+        "format_json_to_html": lambda: format_json_to_html(trade_response_json),
+        "render_json_html": lambda: render_json_html(trade_response),
+    }
+
+
+def measure(component: Callable[[], object]) -> float:
+    """
+    Best of REPEATS batches, in microseconds per call.
+    """
+    timer = timeit.Timer(component)
+    number, elapsed = timer.autorange()
+    number = max(number, int(number * MIN_BATCH_SECONDS / elapsed))
+    return min(timer.repeat(repeat=REPEATS, number=number)) / number * 1e6
+
+
+def run() -> Dict[str, dict]:
+    logger = get_logger()
+    original_level = logger.level
+    logger.level = logging.WARNING
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return {name: {"usPerCall": round(measure(component), 3)}
+                    for name, component in build_components().items()}
+    finally:
+        logger.level = original_level
+
+
+def compare(baseline: Dict[str, dict], results: Dict[str, dict],
+            threshold_percent: float) -> Dict[str, Dict[str, float]]:
+    """
+    Percentage change from the baseline of every component in both, and the components which got more than
+    threshold_percent slower.
+    """
+    changes = {name: (result["usPerCall"] / baseline[name]["usPerCall"] - 1) * 100
+               for name, result in results.items() if name in baseline}
+    regressions = {name: change for name, change in changes.items() if change > threshold_percent}
+    return {"changes": changes, "regressions": regressions}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="write the results to this path as JSON")
+    parser.add_argument("--results", help="compare these stored results rather than running the benchmarks")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline results to compare with or update")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if any component regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PERCENT,
+                        help="percentage slowdown allowed before a component is flagged")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the baseline")
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as results_file:
+            benchmark = json.load(results_file)
+    else:
+        benchmark = run()
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(benchmark, json_file, indent=2)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(benchmark, baseline_file, indent=2)
+            baseline_file.write("\n")
+
+    if not args.compare:
+        for component_name, result in benchmark.items():
+            print(f"{result['usPerCall']:>12.3f} us  {component_name}")
+        sys.exit(0)
+
+    with open(args.baseline) as baseline_file:
+        baseline_results = json.load(baseline_file)
+    comparison = compare(baseline=baseline_results, results=benchmark, threshold_percent=args.threshold)
+    for component_name, result in benchmark.items():
+        if component_name not in baseline_results:
+            print(f"{result['usPerCall']:>12.3f} us  {'new':>8}  {component_name}")
+            continue
+        change = comparison["changes"][component_name]
+        flag = "  REGRESSION" if component_name in comparison["regressions"] else ""
+        print(f"{result['usPerCall']:>12.3f} us  {change:>+7.1f}%  {component_name}{flag}")
+    if comparison["regressions"]:
+        print(f"{len(comparison['regressions'])} component(s) more than {args.threshold}% slower than the baseline")
+        sys.exit(1)
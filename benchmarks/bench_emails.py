@@ -0,0 +1,96 @@
+"""
+Benchmark for building the trade placed and error email bodies, comparing the line by line regular expression
+formatter with the single pass renderer and checking both produce byte-identical HTML.
+
+The trade responses are produced by WebhookHandler from the sample payloads in chalicelib/handlers/tests. Run from
+the repository root:
+
+    python -m benchmarks.bench_emails
+"""
+import contextlib
+import io
+import json
+import os
+import timeit
+import tracemalloc
+
+from chalicelib.constants import Constants
+from benchmarks.legacyemails import format_json_to_html
+from chalicelib.email.emails import ERROR_TEMPLATE, TRADE_PLACED_TEMPLATE, build_error_html, build_trade_placed_html
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.handlers.webhookhandler import WebhookHandler
+from chalicelib.markets.fakemarkets import FakeMarkets
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "chalicelib", "handlers", "tests")
+SAMPLE_PAYLOADS = ["sample-json-payload.json", "sample-json-payload-dca-atr-multipliers.json"]
+ERROR_ARGS = {"heading": "Error placing order", "ticker": "BTCUSDT", "order_side": "BUY",
+              "err_msg": "Maximum risk exceeded for position. Risk: 3.2 Max Risk: 1.5"}
+ITERATIONS = 5000
+
+
+def load_json(file_name: str):
+    with open(os.path.join(SAMPLES_DIR, file_name)) as sample_json:
+        return json.load(sample_json)
+
+
+def create_trade_response(file_name: str) -> dict:
+    exchange_client = FakeBinanceExchangeClient()
+    exchange_client.set_portfolio_value(1000)
+    exchange_client.set_price_precision(4)
+    exchange_client.set_quantity_precision(4)
+    markets = FakeMarkets()
+    markets.set_ohlcv_data(load_json("sample-ohlcv.json"))
+    markets.set_current_token_price(100)
+    handler = WebhookHandler(payload=load_json(file_name), exchange_client=exchange_client, constants=Constants(),
+                             markets=markets)
+    return handler.handle()
+
+
+def build_trade_placed_html_legacy(trade_response) -> str:
+    # The email body as built before the single pass renderer, json.dumps then regular expressions per line
+    trade_response = dict(trade_response)
+    ticker = trade_response.get('body', {}).get('ticker', '')
+    side = trade_response.get('body', {}).get('position', {}).get('side', '')
+    interval = trade_response.get('body', {}).get('interval', '')
+    html_json = ''.join(format_json_to_html(json.dumps(trade_response, indent=2)))
+    return TRADE_PLACED_TEMPLATE.template.format(ticker, side, interval, html_json)
+
+
+def build_error_html_legacy(heading, err_msg, ticker, order_side) -> str:
+    return ERROR_TEMPLATE.template.format(ticker, order_side, heading, err_msg)
+
+
+def measure(build) -> dict:
+    build()
+    elapsed = timeit.timeit(build, number=ITERATIONS)
+    tracemalloc.start()
+    build()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"usPerCall": round(elapsed / ITERATIONS * 1e6, 2), "peakBytes": peak_bytes}
+
+
+def run():
+    results = {}
+    cases = []
+    for file_name in SAMPLE_PAYLOADS:
+        # The handler logs every step, discard that output
+        with contextlib.redirect_stdout(io.StringIO()):
+            trade_response = create_trade_response(file_name)
+        cases.append((f"trade placed ({file_name})", lambda response=trade_response: build_trade_placed_html_legacy(
+            response), lambda response=trade_response: build_trade_placed_html(response)))
+    cases.append(("error", lambda: build_error_html_legacy(**ERROR_ARGS), lambda: build_error_html(**ERROR_ARGS)))
+
+    for name, build_legacy, build_current in cases:
+        if build_legacy() != build_current():
+            raise AssertionError(f"HTML for {name} differs from the legacy formatter")
+        results[name] = {"legacy": measure(build_legacy), "current": measure(build_current)}
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run().items():
+        legacy, current = result["legacy"], result["current"]
+        print(f"{name}: byte-identical. legacy {legacy['usPerCall']} us/call (peak {legacy['peakBytes']} bytes), "
+              f"single pass {current['usPerCall']} us/call (peak {current['peakBytes']} bytes), "
+              f"{legacy['usPerCall'] / current['usPerCall']:.1f}x")
@@ -0,0 +1,78 @@
+"""
+Benchmark for the log output of a webhook request: bytes written and time per WebhookHandler.handle call on the fake
+exchange, at DEBUG, which logs every payload and object dump the handler used to print, and at the default INFO.
+
+Uses the sample payloads in chalicelib/handlers/tests. Run from the repository root:
+
+    python -m benchmarks.bench_logging
+"""
+import contextlib
+import io
+import json
+import logging
+import os
+import timeit
+
+from chalicelib.constants import Constants
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.handlers.webhookhandler import WebhookHandler
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.markets.fakemarkets import FakeMarkets
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "chalicelib", "handlers", "tests")
+SAMPLE_PAYLOADS = ["sample-json-payload.json", "sample-json-payload-dca-atr-multipliers.json"]
+LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO}
+ITERATIONS = 300
+
+
+def load_json(file_name: str):
+    with open(os.path.join(SAMPLES_DIR, file_name)) as sample_json:
+        return json.load(sample_json)
+
+
+def create_handler(payload: dict, ohlcv: list) -> WebhookHandler:
+    exchange_client = FakeBinanceExchangeClient()
+    exchange_client.set_portfolio_value(1000)
+    exchange_client.set_price_precision(4)
+    exchange_client.set_quantity_precision(4)
+    markets = FakeMarkets()
+    markets.set_ohlcv_data(ohlcv)
+    markets.set_current_token_price(100)
+    return WebhookHandler(payload=payload, exchange_client=exchange_client, constants=Constants(), markets=markets)
+
+
+def measure(payload: dict, ohlcv: list) -> dict:
+    handle = lambda: create_handler(payload=payload, ohlcv=ohlcv).handle()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        handle()
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed = timeit.timeit(handle, number=ITERATIONS)
+    return {"bytesPerRequest": len(output.getvalue().encode()), "linesPerRequest": len(output.getvalue().splitlines()),
+            "usPerRequest": round(elapsed / ITERATIONS * 1e6, 1)}
+
+
+def run():
+    logger = get_logger()
+    original_level = logger.level
+    ohlcv = load_json("sample-ohlcv.json")
+    results = {}
+    try:
+        for file_name in SAMPLE_PAYLOADS:
+            payload = load_json(file_name)
+            results[file_name] = {}
+            for name, level in LEVELS.items():
+                logger.level = level
+                results[file_name][name] = measure(payload=payload, ohlcv=ohlcv)
+    finally:
+        logger.level = original_level
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run().items():
+        debug, info = result["DEBUG"], result["INFO"]
+        print(f"{name}: DEBUG {debug['bytesPerRequest']} bytes in {debug['linesPerRequest']} lines, "
+              f"{debug['usPerRequest']} us/request. INFO {info['bytesPerRequest']} bytes in {info['linesPerRequest']} "
+              f"lines, {info['usPerRequest']} us/request. Saves {debug['bytesPerRequest'] - info['bytesPerRequest']} "
+              f"bytes and {debug['usPerRequest'] - info['usPerRequest']:.1f} us per request")
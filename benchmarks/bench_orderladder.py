@@ -0,0 +1,109 @@
+"""
+Benchmark for building DCA ladders of 10, 100 and 1000 rungs, comparing the per rung loop with repeated round()
+calls against the order ladder, and checking both produce the same quantities and prices. Ladders of
+MIN_VECTORISED_RUNGS or more are calculated with NumPy, shorter ones keep the per rung loop.
+
+Both build the PositionDCAOrder objects at the end, so the timings are for a ladder ready to place. Run from the
+repository root:
+
+    python -m benchmarks.bench_orderladder
+"""
+import timeit
+import tracemalloc
+
+from chalicelib import orderutils
+from chalicelib.factories import orderladder
+from chalicelib.models.orders.positiondcaorder import PositionDCAOrder
+
+RUNG_COUNTS = [10, 100, 1000]
+TOKEN_QTY = 1234.5678
+ENTRY_PRICE = 27123.45
+ATR = 123.456789
+QTY_PRECISION = 3
+PRICE_PRECISION = 2
+POS_SIDE = "BUY"
+TOTAL_CALLS = 20000
+
+
+def create_rungs(rung_count: int):
+    qty_splits = [100 / rung_count] * rung_count
+    atr_multipliers = [round(0.25 * (i + 1), 2) for i in range(rung_count)]
+    return qty_splits, atr_multipliers
+
+
+def build_orders(qtys, prices, qty_splits) -> list:
+    return [PositionDCAOrder(side=POS_SIDE, ticker="BTCUSDT", token_qty=qty, limit_price=price,
+                             curr_token_price=ENTRY_PRICE, entry_price=price, dca_percentage=split,
+                             order_id_str=f"dca{count}")
+            for count, (qty, price, split) in enumerate(zip(qtys, prices, qty_splits), start=1)]
+
+
+def build_ladder_legacy(qty_splits, atr_multipliers):
+    # The per rung calculation the factories used before the NumPy ladder
+    qty_remaining = TOKEN_QTY
+    qtys = []
+    for split in qty_splits[:-1]:
+        qty = round(TOKEN_QTY * (split / 100), QTY_PRECISION)
+        qty_remaining -= qty
+        if qty > 0:
+            qtys.append(qty)
+    qtys.append(round(qty_remaining, QTY_PRECISION))
+    prices = []
+    for atr_multiplier in atr_multipliers:
+        distance = round(orderutils.calculate_atr_exit_distance(atr=ATR, atr_multiplier=atr_multiplier),
+                         PRICE_PRECISION)
+        prices.append(orderutils.calculate_stop_loss_trigger_from_delta(
+            entry_price=ENTRY_PRICE, price_precision=PRICE_PRECISION, delta=distance, pos_order_side=POS_SIDE))
+    return qtys, prices
+
+
+def build_ladder_current(qty_splits, atr_multipliers):
+    return (orderladder.split_quantities(total_qty=TOKEN_QTY, qty_precision=QTY_PRECISION, qty_splits=qty_splits),
+            orderladder.dca_entry_prices(entry_price=ENTRY_PRICE, atr=ATR, atr_multipliers=atr_multipliers,
+                                         price_precision=PRICE_PRECISION, pos_side=POS_SIDE))
+
+
+def build_ladder_numpy(qty_splits, atr_multipliers):
+    # Always NumPy, whatever the number of rungs, to show where MIN_VECTORISED_RUNGS pays off
+    return (orderladder.split_quantities_array(total_qty=TOKEN_QTY, qty_precision=QTY_PRECISION,
+                                               qty_splits=qty_splits).tolist(),
+            orderladder.atr_offset_prices_array(entry_price=ENTRY_PRICE, atr=ATR, atr_multipliers=atr_multipliers,
+                                                price_precision=PRICE_PRECISION, is_above=False).tolist())
+
+
+def measure(build, iterations: int) -> dict:
+    build()
+    elapsed = timeit.timeit(build, number=iterations)
+    tracemalloc.start()
+    build()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"usPerLadder": round(elapsed / iterations * 1e6, 2), "peakBytes": peak_bytes}
+
+
+def run():
+    results = {}
+    for rung_count in RUNG_COUNTS:
+        qty_splits, atr_multipliers = create_rungs(rung_count)
+        legacy_ladder = build_ladder_legacy(qty_splits, atr_multipliers)
+        if legacy_ladder != build_ladder_current(qty_splits, atr_multipliers) or \
+                legacy_ladder != build_ladder_numpy(qty_splits, atr_multipliers):
+            raise AssertionError(f"Ladder of {rung_count} rungs differs from the per rung loop")
+        iterations = max(TOTAL_CALLS // rung_count, 20)
+        results[rung_count] = {}
+        for name, build_ladder in [("legacy", build_ladder_legacy), ("current", build_ladder_current),
+                                   ("numpy", build_ladder_numpy)]:
+            results[rung_count][name] = {
+                "prices": measure(lambda: build_ladder(qty_splits, atr_multipliers), iterations),
+                "orders": measure(lambda: build_orders(*build_ladder(qty_splits, atr_multipliers), qty_splits),
+                                  iterations)}
+    return results
+
+
+if __name__ == "__main__":
+    for rung_count, result in run().items():
+        timings = ", ".join(f"{name} {timing['prices']['usPerLadder']} us ({timing['orders']['usPerLadder']} us, "
+                            f"peak {timing['orders']['peakBytes']} bytes with orders)"
+                            for name, timing in result.items())
+        speedup = result["legacy"]["prices"]["usPerLadder"] / result["current"]["prices"]["usPerLadder"]
+        print(f"{rung_count} rungs: identical ladders. {timings}. Ladder {speedup:.1f}x the per rung loop")
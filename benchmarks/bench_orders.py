@@ -0,0 +1,83 @@
+"""
+Benchmark for order objects and client order IDs: memory held by a ladder of orders and the time to build one,
+comparing a __dict__ based copy of the previous PositionDCAOrder and its eight random.choice ID with the slotted
+orders and the counter based OrderIdGenerator.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_orders
+"""
+import random
+import string
+import timeit
+import tracemalloc
+
+from chalicelib.models.orders.orderidgenerator import OrderIdGenerator
+from chalicelib.models.orders.positiondcaorder import PositionDCAOrder
+
+ORDER_COUNT = 10000
+ID_ITERATIONS = 100000
+
+
+def generate_order_id_legacy(msg: str = "") -> str:
+    msg = msg if len(msg) == 0 else f"{msg}_"
+    rand_str = ''.join(random.choice(string.ascii_letters) for _ in range(8))
+    return f"bot_{msg}{rand_str}"
+
+
+class LegacyPositionDCAOrder:
+    # The attributes PositionDCAOrder and its base classes set, held in an instance __dict__ as before
+
+    def __init__(self, side, ticker, token_qty, limit_price, curr_token_price, entry_price, dca_percentage,
+                 order_id_str="dca"):
+        self.dca_percentage = dca_percentage
+        self.curr_token_price = curr_token_price
+        self.entry_price = entry_price
+        self.side = side
+        self.ticker = ticker
+        self.order_type = "LIMIT"
+        self.order_id = generate_order_id_legacy(msg=order_id_str)
+        self.token_qty = token_qty
+        self.close_position = None
+        self.trigger_price = None
+        self.limit_price = limit_price
+        self.reduce_only = None
+        self.time_in_force = "GTC"
+
+
+def build_ladder(order_class) -> list:
+    return [order_class(side="BUY", ticker="BTCUSDT", token_qty=0.001 * i, limit_price=30000.0 - i,
+                        curr_token_price=30000.0, entry_price=30000.0 - i, dca_percentage=1, order_id_str=f"dca{i}")
+            for i in range(ORDER_COUNT)]
+
+
+def measure_ladder(order_class) -> dict:
+    build_ladder(order_class)
+    elapsed = timeit.timeit(lambda: build_ladder(order_class), number=5) / 5
+    tracemalloc.start()
+    orders = build_ladder(order_class)
+    held_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return {"usPerOrder": round(elapsed / ORDER_COUNT * 1e6, 3), "bytesPerOrder": held_bytes // ORDER_COUNT}
+
+
+def run():
+    generator = OrderIdGenerator()
+    return {
+        "orderIdUs": {
+            "legacy": round(timeit.timeit(lambda: generate_order_id_legacy(msg="tp1_mkt"),
+                                          number=ID_ITERATIONS) / ID_ITERATIONS * 1e6, 3),
+            "current": round(timeit.timeit(lambda: generator.generate(msg="tp1_mkt"),
+                                           number=ID_ITERATIONS) / ID_ITERATIONS * 1e6, 3)},
+        "ladder": {"legacy": measure_ladder(LegacyPositionDCAOrder), "current": measure_ladder(PositionDCAOrder)}}
+
+
+if __name__ == "__main__":
+    results = run()
+    order_ids, ladder = results["orderIdUs"], results["ladder"]
+    print(f"order ID: legacy {order_ids['legacy']} us, counter {order_ids['current']} us "
+          f"({order_ids['legacy'] / order_ids['current']:.1f}x)")
+    print(f"{ORDER_COUNT} DCA orders: legacy {ladder['legacy']['usPerOrder']} us and "
+          f"{ladder['legacy']['bytesPerOrder']} bytes per order, slotted {ladder['current']['usPerOrder']} us and "
+          f"{ladder['current']['bytesPerOrder']} bytes per order")
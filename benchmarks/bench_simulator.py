@@ -0,0 +1,86 @@
+"""
+Throughput of the simulated exchange, in orders per second, for placing resting limit orders, cancelling a third of
+them and sweeping the price through the book until the rest fill. Half the orders are buys below the price and half
+sells above it. Building the bot's order objects is not timed.
+
+Events are only built when the client has listeners, so --listener adds an AccountBook mirroring every event to
+show the cost of a load test driving OrderUpdateHandler. Run from the repository root:
+
+    python -m benchmarks.bench_simulator [--orders COUNT] [--listener]
+"""
+import argparse
+import gc
+import logging
+import time
+
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.models.orders.positionlimitorder import PositionLimitOrder
+from chalicelib.simulator.simulatedexchangeclient import SimulatedExchangeClient
+from chalicelib.userdata.accountbook import AccountBook
+
+TICKER = "BTCUSDT"
+START_PRICE = 30000.0
+# Orders are spread one tick apart on each side of the start price
+TICK = 0.01
+SWEEP_STEPS = 1000
+DEFAULT_ORDERS = 100000
+
+
+def build_orders(order_count: int) -> list:
+    orders = []
+    for i in range(order_count):
+        side, offset = ("BUY", -TICK) if i % 2 == 0 else ("SELL", TICK)
+        limit_price = round(START_PRICE + offset * (i // 2 + 1), 2)
+        orders.append(PositionLimitOrder(side=side, ticker=TICKER, token_qty=0.001, limit_price=limit_price,
+                                         curr_token_price=START_PRICE, entry_price=limit_price))
+    return orders
+
+
+def sweep_prices(order_count: int) -> list:
+    # Down through every buy, then up through every sell
+    distance = TICK * (order_count // 2 + 1)
+    down = [START_PRICE - distance * step / SWEEP_STEPS for step in range(1, SWEEP_STEPS + 1)]
+    up = [START_PRICE + distance * step / SWEEP_STEPS for step in range(1, SWEEP_STEPS + 1)]
+    return down + up
+
+
+def timed(operation) -> float:
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def run(order_count: int, with_listener: bool) -> dict:
+    client = SimulatedExchangeClient(wallet_balance=1e9)
+    if with_listener:
+        client.add_listener(AccountBook().apply_event)
+    client.set_price(TICKER, START_PRICE)
+    orders = build_orders(order_count)
+    # The prebuilt orders are inputs, not the simulator's, so the garbage collector is kept from rescanning them
+    gc.collect()
+    gc.freeze()
+    placed = []
+
+    place_seconds = timed(lambda: placed.extend(client.place_order(order) for order in orders))
+    cancelled_ids = [order.orderId for order in placed[::3]]
+    cancel_seconds = timed(lambda: client.cancel_list_orders(TICKER, cancelled_ids))
+    fill_seconds = timed(lambda: client.replay(TICKER, sweep_prices(order_count)))
+
+    filled = order_count - len(cancelled_ids)
+    if client.get_open_orders(TICKER):
+        raise AssertionError("Orders left open after the sweep")
+    return {"place": order_count / place_seconds, "cancel": len(cancelled_ids) / cancel_seconds,
+            "fill": filled / fill_seconds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=DEFAULT_ORDERS, help="number of orders to place")
+    parser.add_argument("--listener", action="store_true", help="mirror every event into an AccountBook")
+    args = parser.parse_args()
+    get_logger().level = logging.WARNING
+
+    results = run(order_count=args.orders, with_listener=args.listener)
+    print(f"{args.orders} orders, listener: {args.listener}")
+    for operation, orders_per_second in results.items():
+        print(f"  {operation:<8}{orders_per_second:>12,.0f} orders/s")
@@ -0,0 +1,214 @@
+"""
+End-to-end benchmark for a webhook request on the fake exchange and markets: p50 and p99 latency, memory allocated and
+peak RSS for each stage the /webhook route runs, i.e. validating the payload, fingerprinting the alert, handling it and
+rendering the trade placed email, for each of the sample payloads in chalicelib/handlers/tests.
+
+The fakes can delay every call which would be a request to the exchange, so concurrency and caching changes can be
+measured offline. Each scenario runs in a fresh interpreter so its peak RSS is not inflated by the ones before it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_webhook [--iterations N] [--latency-ms MS] [--scenario NAME] [--json PATH]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from chalicelib.constants import Constants
+from chalicelib.email.emails import build_trade_placed_html
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.handlers.webhookhandler import WebhookHandler
+from chalicelib.idempotency.idempotencycache import fingerprint_webhook
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.markets.fakemarkets import FakeMarkets
+from chalicelib.requests.webhookjsonvalidator import WebhookJsonValidator
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+SAMPLES_DIR = os.path.join(REPO_ROOT, "chalicelib", "handlers", "tests")
+# Payload and the positions already open on the exchange for each scenario
+SCENARIOS = {
+    "plain": ("sample-json-payload.json", None),
+    "dca-atr": ("sample-json-payload-dca-atr-multipliers.json", None),
+    "dca-fixed": ("sample-json-payload-dca-fixed-trigger-prices.json", None),
+    "adjust-for-risk": ("sample-json-payload-adjust-for-risk.json", None),
+    "close-existing": ("sample-json-payload-close-existing-position.json", "existing-position.json"),
+}
+STAGES = ["validate", "fingerprint", "handle", "email"]
+TOTAL = "total"
+DEFAULT_ITERATIONS = 2000
+# Allocations are traced over fewer requests as tracemalloc slows everything down
+ALLOCATION_ITERATIONS = 50
+WARMUP_ITERATIONS = 20
+PORTFOLIO_VALUE = 1000
+TOKEN_PRICE = 100
+PRECISION = 4
+
+
+def load_json(file_name: str):
+    with open(os.path.join(SAMPLES_DIR, file_name)) as sample_json:
+        return json.load(sample_json)
+
+
+def percentile(sorted_samples: List[float], percent: float) -> float:
+    """
+    Nearest rank percentile of already sorted samples.
+    """
+    rank = max(0, min(len(sorted_samples) - 1, int(round(percent / 100 * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[rank]
+
+
+class Request:
+    """
+    One webhook request for a scenario on fresh fakes, run a stage at a time.
+    """
+
+    def __init__(self, payload: dict, ohlcv: list, positions: Optional[list], latency_seconds: float):
+        self.payload = payload
+        self.exchange_client = FakeBinanceExchangeClient()
+        self.exchange_client.set_portfolio_value(PORTFOLIO_VALUE)
+        self.exchange_client.set_price_precision(PRECISION)
+        self.exchange_client.set_quantity_precision(PRECISION)
+        self.exchange_client.set_latency(latency_seconds)
+        if positions:
+            self.exchange_client.set_positions(positions)
+        self.markets = FakeMarkets()
+        self.markets.set_ohlcv_data(ohlcv)
+        self.markets.set_current_token_price(TOKEN_PRICE)
+        self.markets.set_latency(latency_seconds)
+        self.response = None
+
+    def stages(self) -> Dict[str, Callable[[], object]]:
+        return {
+            "validate": lambda: WebhookJsonValidator().validate_payload(payload=self.payload),
+            "fingerprint": lambda: fingerprint_webhook(user_id="benchmark", payload=self.payload),
+            "handle": self.handle,
+            "email": lambda: build_trade_placed_html(self.response),
+        }
+
+    def handle(self):
+        handler = WebhookHandler(payload=self.payload, exchange_client=self.exchange_client, constants=Constants(),
+                                 markets=self.markets)
+        self.response = handler.handle()
+        if self.response.get("code") != 200:
+            raise RuntimeError(f"Request failed: {self.response}")
+
+
+def measure_latency(create_request: Callable[[], Request], iterations: int) -> Dict[str, dict]:
+    samples = {stage: [] for stage in STAGES + [TOTAL]}
+    for _ in range(iterations):
+        total_ns = 0
+        for stage, run_stage in create_request().stages().items():
+            start_ns = time.perf_counter_ns()
+            run_stage()
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            samples[stage].append(elapsed_ns)
+            total_ns += elapsed_ns
+        samples[TOTAL].append(total_ns)
+    results = {}
+    for stage, stage_samples in samples.items():
+        stage_samples.sort()
+        results[stage] = {"p50Us": round(percentile(stage_samples, 50) / 1000, 1),
+                          "p99Us": round(percentile(stage_samples, 99) / 1000, 1)}
+    return results
+
+
+def measure_allocations(create_request: Callable[[], Request]) -> Dict[str, dict]:
+    """
+    Bytes allocated at the peak of each stage, and bytes still held once it returns, averaged over the requests.
+    """
+    allocations = {stage: {"peakBytes": 0, "retainedBytes": 0} for stage in STAGES}
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_ITERATIONS):
+            for stage, run_stage in create_request().stages().items():
+                start_bytes = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                run_stage()
+                end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                allocations[stage]["peakBytes"] += peak_bytes - start_bytes
+                allocations[stage]["retainedBytes"] += end_bytes - start_bytes
+    finally:
+        tracemalloc.stop()
+    return {stage: {key: value // ALLOCATION_ITERATIONS for key, value in stage_allocations.items()}
+            for stage, stage_allocations in allocations.items()}
+
+
+def measure_peak_rss(create_request: Callable[[], Request]) -> Dict[str, int]:
+    """
+    The interpreter's peak RSS (KB) once each stage has run for the first time, so the growth over the stage before
+    is what the stage's imports and data added.
+    """
+    peak_rss = {}
+    for stage, run_stage in create_request().stages().items():
+        run_stage()
+        peak_rss[stage] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss
+
+
+def run_scenario(scenario: str, iterations: int, latency_ms: float) -> dict:
+    payload_file, positions_file = SCENARIOS[scenario]
+    payload = load_json(payload_file)
+    ohlcv = load_json("sample-ohlcv.json")
+    positions = load_json(positions_file) if positions_file else None
+    create_request = lambda: Request(payload=payload, ohlcv=ohlcv, positions=positions,
+                                     latency_seconds=latency_ms / 1000)
+    logger = get_logger()
+    logger.level = logging.WARNING
+    with contextlib.redirect_stdout(io.StringIO()):
+        peak_rss = measure_peak_rss(create_request)
+        measure_latency(create_request, iterations=WARMUP_ITERATIONS)
+        latency = measure_latency(create_request, iterations=iterations)
+        allocations = measure_allocations(create_request)
+    stages = {stage: {**latency[stage], **allocations[stage], "peakRssKb": peak_rss[stage]} for stage in STAGES}
+    stages[TOTAL] = {**latency[TOTAL], "peakRssKb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    return stages
+
+
+def run(iterations: int = DEFAULT_ITERATIONS, latency_ms: float = 0.0, scenarios: List[str] = None) -> dict:
+    """
+    Runs each scenario in a fresh interpreter and returns its results per stage.
+    """
+    results = {}
+    for scenario in scenarios or list(SCENARIOS):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_webhook", "--scenario", scenario,
+                                 "--iterations", str(iterations), "--latency-ms", str(latency_ms), "--in-process"],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        results[scenario] = json.loads(output)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="requests timed per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay of each fake exchange and markets call")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="scenario to run, repeatable")
+    parser.add_argument("--json", help="write the results to this path as JSON")
+    parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.in_process:
+        print(json.dumps(run_scenario(scenario=args.scenario[0], iterations=args.iterations,
+                                      latency_ms=args.latency_ms)))
+        sys.exit(0)
+
+    benchmark = run(iterations=args.iterations, latency_ms=args.latency_ms, scenarios=args.scenario)
+    print(f"{args.iterations} requests per scenario, {args.latency_ms} ms per exchange call")
+    for scenario_name, scenario_stages in benchmark.items():
+        print(f"{scenario_name}:")
+        for stage_name, result in scenario_stages.items():
+            allocated = f"{result['peakBytes']:>9} B peak  {result['retainedBytes']:>8} B held" \
+                if "peakBytes" in result else " " * 34
+            print(f"    {stage_name:<12} p50 {result['p50Us']:>9} us  p99 {result['p99Us']:>9} us  {allocated}  "
+                  f"peak RSS {result['peakRssKb']} KB")
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(benchmark, json_file, indent=2)
@@ -0,0 +1,50 @@
+"""
+Benchmark for WebhookJsonValidator against the sample payloads in chalicelib/requests/tests.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_webhookjsonvalidator
+"""
+import contextlib
+import io
+import json
+import os
+import timeit
+import tracemalloc
+
+from chalicelib.requests.webhookjsonvalidator import WebhookJsonValidator
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "chalicelib", "requests", "tests")
+SAMPLE_PAYLOADS = ["sample-json-payload.json"]
+ITERATIONS = 10000
+
+
+def load_payload(file_name: str) -> dict:
+    with open(os.path.join(SAMPLES_DIR, file_name)) as sample_payload:
+        return json.load(sample_payload)
+
+
+def validate(payload: dict):
+    # A fresh validator per call mirrors what the /webhook route does on every request
+    WebhookJsonValidator().validate_payload(payload=payload)
+
+
+def run():
+    results = {}
+    for file_name in SAMPLE_PAYLOADS:
+        payload = load_payload(file_name)
+        # Validation logs every step, discard that output so only validation itself is measured
+        with contextlib.redirect_stdout(io.StringIO()):
+            validate(payload)
+            elapsed = timeit.timeit(lambda: validate(payload), number=ITERATIONS)
+            tracemalloc.start()
+            validate(payload)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        results[file_name] = {"usPerCall": round(elapsed / ITERATIONS * 1e6, 2), "peakBytes": peak_bytes}
+    return results
+
+
+if __name__ == "__main__":
+    for name, result in run().items():
+        print(f"{name}: {result['usPerCall']} us/call, peak allocation {result['peakBytes']} bytes")
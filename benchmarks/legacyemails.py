@@ -0,0 +1,28 @@
+"""
+The email body formatter replaced by chalicelib.email.htmlrenderer, kept to benchmark against and to check the
+renderer still produces byte-identical HTML.
+"""
+import re
+
+
+def format_json_to_html(json) -> list:
+    """
+    Colours indented JSON line by line, as email bodies were built before htmlrenderer.render_json_html.
+    """
+    lines = json.splitlines()
+    formatted_lines = []
+
+    for line in lines:
+        line = re.sub(r'$', '<br>', line)
+        if line.__contains__('\"'):
+            line = re.sub(r'^', '<font color=brown>', line)
+            line = re.sub(r'\":', '\"<font color=black>:', line)
+            if line.__contains__(':'):
+                line = re.sub(r':', ':<font color=mediumblue>', line)
+                line = re.sub(r',<br>$', '<font color=black>,<br>', line)
+        else:
+            line = re.sub(r'^', '<font color=black>', line)
+        # Ensure any brackets of opening blocks are black
+        line = line.replace('[', '<font color=black>[').replace('{', '<font color=black>{')
+        formatted_lines.append(line)
+    return formatted_lines
@@ -0,0 +1,280 @@
+import json
+import logging
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chalicelib.account.account import Account
+from chalicelib.backtest.backtestresult import BacktestResult
+from chalicelib.backtest.backtesttrade import BacktestTrade
+from chalicelib.constants import Constants
+from chalicelib.exceptions.risktoohighexception import RiskTooHighException
+from chalicelib.factories.orderplanfactory import OrderPlanFactory
+from chalicelib.indicators.atr import ATR, DEFAULT_ATR_LENGTH, HIGH, LOW, CLOSE, windowed_average_true_range
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.models.orders.orderplan import OrderPlan
+from chalicelib.token import Token
+
+logger = get_logger()
+
+TIME, OPEN = 0, 1
+# Closed candles the live ATR is calculated over, CCXTMarkets fetches 140 and the last one is still open
+ATR_CANDLES = 139
+# Binance USD-M futures taker fee
+DEFAULT_FEE_RATE = 0.0004
+# Candles a position is first simulated over, doubled until it closes
+INITIAL_WINDOW = 256
+# Order fills within one candle are assumed to happen in this order, so a candle reaching both the stop loss and a
+# take profit is a loss
+ENTRY, STOP_LOSS, TAKE_PROFIT = 0, 1, 2
+QTY_TOLERANCE = 1e-9
+
+
+class PrecomputedATR(ATR):
+    """
+    ATR of an alert's candle, taken from the series calculated for every candle up front.
+    """
+
+    def __init__(self, ticker: str, interval: int, atr: float, atr_length: int = DEFAULT_ATR_LENGTH):
+        self.ticker = ticker
+        self.interval = interval
+        self.atr_length = atr_length
+        self.atr = atr
+
+
+class BacktestAccount(Account):
+
+    def __init__(self, portfolio_value: float):
+        self.portfolio_value = portfolio_value
+
+
+class BacktestEngine:
+    """
+    Replays alerts for a webhook payload over historical candles, to see how a payload config would have traded.
+
+    Each alert's orders are built by OrderPlanFactory, as for a live alert, with the alert candle's open as the token
+    price and the ATR of the candles closed before it. Fills are then found with NumPy a whole window of candles at a
+    time: running lows and highs give the first candle each entry, stop loss and take profit price is reached on, and
+    only those few candles are stepped through.
+
+    As on the exchange and in OrderUpdateHandler:
+        - take profits only reduce the open position and expire if there is none
+        - the stop loss moves to the average entry price once a take profit fills
+        - leftover orders are cancelled once the position is closed
+        - an alert for the other side closes the position at its candle's open, one for the same side is ignored
+          while a position is open
+
+    A candle is assumed to reach entries first, then the stop loss, then take profits. Stops and market take profits
+    fill at their trigger price, or the candle's open if it gapped through it, and limit entries at their price.
+    Fixed trigger prices in the payload are used as given.
+    """
+    KEYS = Constants.JsonRequestKeys
+    POSITION_KEYS = KEYS.Position
+
+    def __init__(self, ohlcv: Sequence[Sequence[float]], payload: dict, portfolio_value: float = 1000.0,
+                 price_precision: int = 4, qty_precision: int = 3, fee_rate: float = DEFAULT_FEE_RATE,
+                 atr_candles: int = ATR_CANDLES, compound: bool = False):
+        candles = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        self.times = candles[:, TIME].astype(np.int64)
+        self.payload = payload
+        self.portfolio_value = portfolio_value
+        self.price_precision = price_precision
+        self.qty_precision = qty_precision
+        self.fee_rate = fee_rate
+        self.compound = compound
+        self.constants = Constants()
+        position_json = payload.get(self.POSITION_KEYS.POSITION)
+        self.ticker = str(position_json.get(self.POSITION_KEYS.TICKER))
+        self.side = position_json.get(self.POSITION_KEYS.SIDE)
+        self.interval = payload.get(self.KEYS.INTERVAL)
+        self.atrs = windowed_average_true_range(high=candles[:, HIGH], low=candles[:, LOW], close=candles[:, CLOSE],
+                                                window=DEFAULT_ATR_LENGTH, candles=atr_candles)
+        opens, highs, lows, closes = candles[:, OPEN], candles[:, HIGH], candles[:, LOW], candles[:, CLOSE]
+        # Prices as a long position sees them: a short's are negated, so one simulation serves both sides
+        self.prices: Dict[str, Tuple[np.ndarray, ...]] = {
+            Constants.OrderSide.BUY: (opens, lows, highs, closes),
+            Constants.OrderSide.SELL: (-opens, -highs, -lows, -closes),
+        }
+        self.payloads = {self.side: payload}
+
+    def run(self, alert_times: Sequence[int], sides: Optional[Sequence[Constants.OrderSide]] = None) -> BacktestResult:
+        """
+        Backtests alerts at the given times in milliseconds, for the payload's side unless sides are given.
+        """
+        alert_times = np.asarray(alert_times, dtype=np.int64)
+        alert_order = np.argsort(alert_times, kind="stable")
+        alert_times = alert_times[alert_order]
+        sides = [self.side] * len(alert_times) if sides is None else [sides[i] for i in alert_order]
+        # The candle each alert arrived during
+        alert_bars = np.searchsorted(self.times, alert_times, side="right") - 1
+        alert_count, candle_count = len(alert_times), len(self.times)
+        trades: List[BacktestTrade] = []
+        skipped_alerts, rejected_alerts = 0, 0
+        portfolio_value = self.portfolio_value
+
+        i = 0
+        while i < alert_count:
+            bar, side = int(alert_bars[i]), sides[i]
+            plan = self.__create_plan(side=side, bar=bar, portfolio_value=portfolio_value)
+            if plan is None:
+                rejected_alerts += 1
+                i += 1
+                continue
+
+            j = i + 1
+            while True:
+                # Repeats of an alert on its candle are suppressed, as the idempotency cache does live
+                while j < alert_count and alert_bars[j] == bar:
+                    skipped_alerts += 1
+                    j += 1
+                horizon = int(alert_bars[j]) if j < alert_count else candle_count
+                is_closed_at_horizon = j == alert_count or sides[j] != side
+                trade = self.__simulate(plan=plan, side=side, alert_time=int(alert_times[i]), bar=bar,
+                                        horizon=horizon, is_closed_at_horizon=is_closed_at_horizon)
+                if trade.exit_reason is not None:
+                    break
+                if not trade.is_filled:
+                    # Nothing filled yet, so the next alert cancels these orders and places its own
+                    trade.exit_reason = BacktestTrade.REVERSED
+                    trade.exit_time = int(self.times[horizon])
+                    break
+                skipped_alerts += 1
+                j += 1
+
+            trades.append(trade)
+            if self.compound:
+                portfolio_value += trade.pnl
+            i = j
+        return BacktestResult(trades=trades, skipped_alerts=skipped_alerts, rejected_alerts=rejected_alerts,
+                              starting_portfolio_value=self.portfolio_value)
+
+    def __create_plan(self, side: Constants.OrderSide, bar: int, portfolio_value: float) -> Optional[OrderPlan]:
+        if bar < 1 or np.isnan(self.atrs[bar - 1]):
+            logger.debug("Not enough candles before %s for the ATR", bar)
+            return None
+        atr = PrecomputedATR(ticker=self.ticker, interval=self.interval, atr=round(float(self.atrs[bar - 1]), 6))
+        token = Token(exchange_client=None, markets=None, ticker=self.ticker, qty_precision=self.qty_precision,
+                      price_precision=self.price_precision,
+                      token_price=float(self.prices[Constants.OrderSide.BUY][0][bar]))
+        try:
+            return OrderPlanFactory(request=self.__get_payload(side), constants=self.constants,
+                                    account=BacktestAccount(portfolio_value), token=token, atr=atr).create_plan()
+        except (RiskTooHighException, ValueError) as err:
+            logger.debug("No orders for alert on candle %s. %s", bar, err)
+            return None
+
+    def __get_payload(self, side: Constants.OrderSide) -> dict:
+        payload = self.payloads.get(side)
+        if payload is None:
+            position_json = dict(self.payload.get(self.POSITION_KEYS.POSITION), **{self.POSITION_KEYS.SIDE: side})
+            payload = dict(self.payload, **{self.POSITION_KEYS.POSITION: position_json})
+            self.payloads[side] = payload
+        return payload
+
+    def __simulate(self, plan: OrderPlan, side: Constants.OrderSide, alert_time: int, bar: int, horizon: int,
+                   is_closed_at_horizon: bool) -> BacktestTrade:
+        """
+        Simulates the plan's orders from the alert's candle up to, but not including, the horizon candle. A position
+        still open then is closed at the horizon if is_closed_at_horizon, otherwise it is returned without an exit.
+        """
+        sign = 1.0 if side == Constants.OrderSide.BUY else -1.0
+        market_qty = sum([order.token_qty for order in plan.position_orders
+                          if order.order_type == Constants.OrderType.MARKET])
+        limit_orders = [order for order in plan.position_orders if order.order_type != Constants.OrderType.MARKET]
+        levels = {
+            ENTRY: (np.array([sign * order.limit_price for order in limit_orders], dtype=np.float64),
+                    [order.token_qty for order in limit_orders]),
+            TAKE_PROFIT: (np.array([sign * order.trigger_price for order in plan.tp_orders], dtype=np.float64),
+                          [order.token_qty for order in plan.tp_orders]),
+        }
+        sl_level = sign * plan.sl_orders[0].trigger_price
+        window = INITIAL_WINDOW
+        while True:
+            end = min(horizon, bar + window)
+            is_closed_at_end = end == horizon and is_closed_at_horizon
+            trade = self.__walk(side=side, alert_time=alert_time, bar=bar, end=end, market_qty=market_qty,
+                                levels=levels, sl_level=sl_level, is_closed_at_end=is_closed_at_end)
+            if trade.exit_reason is not None or end == horizon:
+                return trade
+            window *= 2
+
+    def __walk(self, side: Constants.OrderSide, alert_time: int, bar: int, end: int, market_qty: float,
+               levels: dict, sl_level: float, is_closed_at_end: bool) -> BacktestTrade:
+        opens, lows, highs, closes = (prices[bar:end] for prices in self.prices[side])
+        sign = 1.0 if side == Constants.OrderSide.BUY else -1.0
+        trade = BacktestTrade(side=side, alert_time=alert_time)
+        # Running lows are negated so both searches run over ascending values
+        low_reach = -np.minimum.accumulate(lows) if len(lows) else lows
+        high_reach = np.maximum.accumulate(highs) if len(highs) else highs
+        entry_levels, entry_qtys = levels[ENTRY]
+        tp_levels, tp_qtys = levels[TAKE_PROFIT]
+        events = sorted(
+            [(int(hit), ENTRY, idx) for idx, hit in enumerate(np.searchsorted(low_reach, -entry_levels))] +
+            [(int(hit), TAKE_PROFIT, idx) for idx, hit in enumerate(np.searchsorted(high_reach, tp_levels))])
+        sl_bar = int(np.searchsorted(low_reach, -sl_level))
+
+        state = {"qty": 0.0, "cost": 0.0, "entry_qty": 0.0, "entry_value": 0.0, "exit_qty": 0.0, "exit_value": 0.0}
+
+        def fill(candle: int, qty: float, price: float):
+            if qty > 0:
+                state["entry_qty"] += qty
+                state["entry_value"] += qty * price
+                state["cost"] += qty * price
+                if trade.entry_time is None:
+                    trade.entry_time = int(self.times[bar + candle])
+            else:
+                state["exit_qty"] -= qty
+                state["exit_value"] -= qty * price
+                state["cost"] += qty * state["cost"] / state["qty"]
+            state["qty"] += qty
+            trade.quantity = max(trade.quantity, state["qty"])
+            trade.fees += abs(qty * price) * self.fee_rate
+
+        def close(candle: int, price: Optional[float], exit_reason: str) -> BacktestTrade:
+            if state["qty"] > QTY_TOLERANCE:
+                fill(candle=candle, qty=-state["qty"], price=price)
+            trade.exit_reason = exit_reason if trade.is_filled else BacktestTrade.NOT_FILLED
+            trade.exit_time = int(self.times[min(bar + candle, len(self.times) - 1)])
+            if trade.is_filled:
+                trade.entry_price = sign * state["entry_value"] / state["entry_qty"]
+                trade.exit_price = sign * state["exit_value"] / state["exit_qty"]
+                trade.pnl = state["exit_value"] - state["entry_value"] - trade.fees
+            return trade
+
+        if market_qty > 0 and len(opens):
+            fill(candle=0, qty=market_qty, price=opens[0])
+        for candle, kind, idx in events:
+            if candle >= len(opens):
+                break
+            if sl_bar < candle or (sl_bar == candle and kind > STOP_LOSS):
+                return close(candle=sl_bar, price=min(sl_level, opens[sl_bar]), exit_reason=BacktestTrade.STOP_LOSS)
+            if kind == ENTRY:
+                fill(candle=candle, qty=entry_qtys[idx], price=min(entry_levels[idx], opens[candle]))
+            elif state["qty"] > QTY_TOLERANCE:
+                fill(candle=candle, qty=-min(tp_qtys[idx], state["qty"]), price=max(tp_levels[idx], opens[candle]))
+                if state["qty"] <= QTY_TOLERANCE:
+                    return close(candle=candle, price=None, exit_reason=BacktestTrade.TAKE_PROFIT)
+                # Moved to the position's entry price from the next candle on, as OrderUpdateHandler does
+                average_entry = sign * state["cost"] / state["qty"]
+                sl_level = sign * round(average_entry, self.price_precision)
+                trade.is_stop_loss_moved = True
+                sl_bar = candle + 1 + int(np.searchsorted(-np.minimum.accumulate(lows[candle + 1:]), -sl_level)) \
+                    if candle + 1 < len(lows) else len(lows)
+        if sl_bar < len(opens):
+            return close(candle=sl_bar, price=min(sl_level, opens[sl_bar]), exit_reason=BacktestTrade.STOP_LOSS)
+
+        if is_closed_at_end:
+            if bar + len(opens) < len(self.times):
+                return close(candle=len(opens), price=self.prices[side][0][bar + len(opens)],
+                             exit_reason=BacktestTrade.REVERSED)
+            return close(candle=len(opens) - 1, price=closes[-1], exit_reason=BacktestTrade.END_OF_DATA)
+        return trade
+
+
+if __name__ == '__main__':
+    # Usage: python -m chalicelib.backtest.backtestengine <OHLCV JSON path> <payload JSON path> <alert times JSON path>
+    get_logger().level = logging.WARNING
+    with open(sys.argv[1]) as ohlcv_file, open(sys.argv[2]) as payload_file, open(sys.argv[3]) as alerts_file:
+        engine = BacktestEngine(ohlcv=json.load(ohlcv_file), payload=json.load(payload_file))
+        print(json.dumps(engine.run(alert_times=json.load(alerts_file)).summary(), indent=2))
@@ -0,0 +1,37 @@
+from typing import List
+
+import numpy as np
+
+from chalicelib.backtest.backtesttrade import BacktestTrade
+
+
+class BacktestResult:
+    """
+    The trades a backtest opened, and the alerts it did not act on: skipped ones arrived while a position of the same
+    side was open or on the same candle as the previous alert, rejected ones had no position size within risk or too
+    little history for the ATR.
+    """
+
+    def __init__(self, trades: List[BacktestTrade], skipped_alerts: int, rejected_alerts: int,
+                 starting_portfolio_value: float):
+        self.trades = trades
+        self.skipped_alerts = skipped_alerts
+        self.rejected_alerts = rejected_alerts
+        self.starting_portfolio_value = starting_portfolio_value
+
+    def summary(self) -> dict:
+        filled = [trade for trade in self.trades if trade.is_filled]
+        pnls = np.array([trade.pnl for trade in filled], dtype=np.float64)
+        equity = self.starting_portfolio_value + np.cumsum(pnls)
+        peaks = np.maximum.accumulate(np.concatenate(([self.starting_portfolio_value], equity)))[1:]
+        return {
+            "trades": len(filled),
+            "unfilledTrades": len(self.trades) - len(filled),
+            "skippedAlerts": self.skipped_alerts,
+            "rejectedAlerts": self.rejected_alerts,
+            "winRate": round(float((pnls > 0).mean()) * 100, 2) if len(pnls) else 0.0,
+            "totalPnl": round(float(pnls.sum()), 2),
+            "totalFees": round(float(sum(trade.fees for trade in filled)), 2),
+            "maxDrawdown": round(float((peaks - equity).max()), 2) if len(pnls) else 0.0,
+            "endingPortfolioValue": round(float(equity[-1]) if len(pnls) else self.starting_portfolio_value, 2),
+        }
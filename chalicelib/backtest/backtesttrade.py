@@ -0,0 +1,45 @@
+from typing import Optional
+
+from chalicelib.constants import Constants
+
+
+class BacktestTrade:
+    """
+    A position opened for one alert in a backtest, from its alert to the bar it was closed on. Times are the open
+    times of the candles, in milliseconds.
+    """
+    STOP_LOSS = "STOP_LOSS"
+    TAKE_PROFIT = "TAKE_PROFIT"
+    # Another alert arrived while the position was open and closed it, or replaced its unfilled orders
+    REVERSED = "REVERSED"
+    # The stop loss was reached before any entry order filled
+    NOT_FILLED = "NOT_FILLED"
+    END_OF_DATA = "END_OF_DATA"
+
+    __slots__ = ("side", "alert_time", "entry_time", "exit_time", "exit_reason", "quantity", "entry_price",
+                 "exit_price", "pnl", "fees", "is_stop_loss_moved")
+
+    def __init__(self, side: Constants.OrderSide, alert_time: int):
+        self.side = side
+        self.alert_time = alert_time
+        self.entry_time: Optional[int] = None
+        self.exit_time: Optional[int] = None
+        self.exit_reason: Optional[str] = None
+        # Largest quantity held at once, and its average entry price
+        self.quantity = 0.0
+        self.entry_price = 0.0
+        # Average price the quantity was exited at
+        self.exit_price = 0.0
+        # Net of fees
+        self.pnl = 0.0
+        self.fees = 0.0
+        self.is_stop_loss_moved = False
+
+    @property
+    def is_filled(self) -> bool:
+        return self.quantity > 0
+
+    def __repr__(self):
+        return f"--- BACKTEST TRADE --- SIDE: {self.side}, ALERT TIME: {self.alert_time}, " \
+               f"EXIT TIME: {self.exit_time}, EXIT REASON: {self.exit_reason}, QUANTITY: {self.quantity}, " \
+               f"ENTRY PRICE: {self.entry_price}, EXIT PRICE: {self.exit_price}, PNL: {self.pnl}"
@@ -0,0 +1,110 @@
+import unittest
+
+from chalicelib.backtest.backtestengine import BacktestEngine
+from chalicelib.backtest.backtesttrade import BacktestTrade
+
+
+class BacktestEngineTest(unittest.TestCase):
+    START_TIME = 1627426800000
+    HOUR_MS = 3600000
+    HISTORY_CANDLES = 150
+    PAYLOAD = {
+        "interval": 60,
+        "position": {"ticker": "BTCUSDT", "side": "BUY", "stake": 10, "leverage": 1, "marginType": "ISOLATED"},
+        "stopLoss": {"atrMultiplier": 1},
+        "takeProfit": {"splits": [50, 50], "atrMultipliers": [1, 2]},
+    }
+
+    def build_ohlcv(self, candles: list, trailing_candles: int = 10) -> list:
+        """
+        Flat candles with an ATR of 2 around a price of 100, then the given (open, high, low, close) candles, then
+        more flat candles.
+        """
+        flat_candle = (100.0, 101.0, 99.0, 100.0)
+        prices = [flat_candle] * self.HISTORY_CANDLES + candles + [flat_candle] * trailing_candles
+        return [[self.START_TIME + i * self.HOUR_MS, *candle, 1.0] for i, candle in enumerate(prices)]
+
+    def alert_time(self, candle: int) -> int:
+        return self.START_TIME + (self.HISTORY_CANDLES + candle) * self.HOUR_MS + 1000
+
+    def test_position_closed_by_take_profits(self):
+        # given
+        ohlcv = self.build_ohlcv([(100.0, 101.0, 99.0, 100.0), (100.0, 102.5, 99.5, 102.0),
+                                  (102.0, 104.5, 100.5, 104.0)])
+        class_under_test = BacktestEngine(ohlcv=ohlcv, payload=self.PAYLOAD, fee_rate=0)
+
+        # when
+        result = class_under_test.run(alert_times=[self.alert_time(0)])
+
+        # then
+        trade = result.trades[0]
+        self.assertEqual(BacktestTrade.TAKE_PROFIT, trade.exit_reason)
+        self.assertEqual(1.0, trade.quantity)
+        self.assertEqual(100.0, trade.entry_price)
+        self.assertEqual(103.0, trade.exit_price)
+        self.assertAlmostEqual(3.0, trade.pnl)
+        self.assertTrue(trade.is_stop_loss_moved)
+
+    def test_stop_loss_moved_to_entry_after_take_profit(self):
+        # given
+        ohlcv = self.build_ohlcv([(100.0, 101.0, 99.0, 100.0), (100.0, 102.5, 99.5, 102.0),
+                                  (101.0, 101.5, 99.5, 100.0)])
+        class_under_test = BacktestEngine(ohlcv=ohlcv, payload=self.PAYLOAD, fee_rate=0)
+
+        # when
+        result = class_under_test.run(alert_times=[self.alert_time(0)])
+
+        # then
+        trade = result.trades[0]
+        self.assertEqual(BacktestTrade.STOP_LOSS, trade.exit_reason)
+        self.assertEqual(self.START_TIME + (self.HISTORY_CANDLES + 2) * self.HOUR_MS, trade.exit_time)
+        self.assertAlmostEqual(1.0, trade.pnl)
+
+    def test_short_position_stopped_out_with_fees(self):
+        # given
+        ohlcv = self.build_ohlcv([(100.0, 101.0, 99.0, 100.0), (100.0, 102.5, 99.5, 102.0)])
+        class_under_test = BacktestEngine(ohlcv=ohlcv, payload=self.PAYLOAD, fee_rate=0.001)
+
+        # when
+        result = class_under_test.run(alert_times=[self.alert_time(0)], sides=["SELL"])
+
+        # then
+        trade = result.trades[0]
+        self.assertEqual("SELL", trade.side)
+        self.assertEqual(BacktestTrade.STOP_LOSS, trade.exit_reason)
+        self.assertEqual(102.0, trade.exit_price)
+        self.assertAlmostEqual(0.202, trade.fees)
+        self.assertAlmostEqual(-2.202, trade.pnl)
+
+    def test_same_side_alerts_ignored_while_open_and_other_side_reverses(self):
+        # given
+        ohlcv = self.build_ohlcv([(100.0, 101.0, 99.0, 100.0)] * 10)
+        class_under_test = BacktestEngine(ohlcv=ohlcv, payload=self.PAYLOAD, fee_rate=0)
+
+        # when
+        result = class_under_test.run(alert_times=[self.alert_time(0), self.alert_time(0) + 1, self.alert_time(2),
+                                                   self.alert_time(5)], sides=["BUY", "BUY", "BUY", "SELL"])
+
+        # then
+        self.assertEqual([BacktestTrade.REVERSED, BacktestTrade.END_OF_DATA],
+                         [trade.exit_reason for trade in result.trades])
+        self.assertEqual(self.alert_time(5) - 1000, result.trades[0].exit_time)
+        self.assertEqual(2, result.skipped_alerts)
+        self.assertEqual({"trades": 2, "unfilledTrades": 0, "skippedAlerts": 2, "rejectedAlerts": 0, "winRate": 0.0,
+                          "totalPnl": 0.0, "totalFees": 0.0, "maxDrawdown": 0.0, "endingPortfolioValue": 1000.0},
+                         result.summary())
+
+    def test_alerts_without_enough_history_rejected(self):
+        # given
+        class_under_test = BacktestEngine(ohlcv=self.build_ohlcv([]), payload=self.PAYLOAD)
+
+        # when
+        result = class_under_test.run(alert_times=[self.START_TIME + 1000])
+
+        # then
+        self.assertEqual([], result.trades)
+        self.assertEqual(1, result.rejected_alerts)
+
+
+if __name__ == '__main__':
+    unittest.main()
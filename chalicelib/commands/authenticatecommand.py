@@ -1,4 +1,7 @@
 from chalicelib.commands.command import Command
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
 
 
 class AuthenticateCommand(Command):
@@ -13,13 +16,13 @@ class AuthenticateCommand(Command):
     def execute(self) -> bool:
         user_api_key = self._user_config.get("BOT_API_KEY")
         if not user_api_key:
-            print("BOT_API_KEY must be set in user-config file. Exiting script.")
+            logger.warning("BOT_API_KEY must be set in user-config file. Exiting script.")
             return False
         if "auth" not in self._payload:
-            print(f"Authentication value (auth) not present in payload. Payload: {self._payload}")
+            logger.warning("Authentication value (auth) not present in payload. Payload: %s", self._payload)
             return False
         payload_auth_key = self._payload['auth']
         if payload_auth_key != user_api_key:
-            print(f"Authentication failed. Invalid API Key {payload_auth_key}. Exiting script...")
+            logger.warning("Authentication failed. Invalid API Key. Exiting script...")
             return False
         return True
@@ -1,6 +1,9 @@
 from chalicelib import orderutils
 from chalicelib.commands.command import Command
 from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
 
 
 class CancelAllOpenOrdersCommand(Command):
@@ -18,5 +21,5 @@ class CancelAllOpenOrdersCommand(Command):
             if orderutils.is_bot_order_id(client_order_id):
                 open_order_ids.append(order_id)
         if open_order_ids:
-            print("Cancelling open orders: {}".format(open_orders))
+            logger.info("Cancelling open orders: %s", open_orders)
             self.exchange.cancel_list_orders(self.ticker, open_order_ids)
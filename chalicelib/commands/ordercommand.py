@@ -1,14 +1,65 @@
 from chalicelib.commands.command import Command
-from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.constants import Constants
+from chalicelib.exceptions.orderplacementexception import OrderPlacementException
+from chalicelib.exchanges.exchangeclient import ExchangeClient, MAX_BATCH_ORDERS
 from chalicelib.models.orders.order import Order
+from chalicelib.models.orders.orderresult import OrderResult
 
 
 class OrderCommand(Command):
+    """
+    Command to place a group of orders which do not depend on each other, e.g. every take profit of a position.
 
-    def __init__(self, exchange: ExchangeClient, orders: [Order]):
+    Orders are sent in batches of up to max_batch_size so a group takes one request per batch rather than one per
+    order. Binance does not guarantee the order in which orders of a batch are executed, so anything that must happen
+    in sequence belongs in separate commands. Orders which close the whole position are not accepted in a batch and
+    are sent on their own.
+
+    Market orders are sent first and on their own, as the rest of a group is built around them being filled: if one
+    is rejected nothing after it is placed, e.g. no DCA entries without the market entry.
+    """
+
+    def __init__(self, exchange: ExchangeClient, orders: [Order], max_batch_size: int = MAX_BATCH_ORDERS):
         self.exchange = exchange
         self.orders = orders
+        self.max_batch_size = max_batch_size
+        self.results = []
+
+    def execute(self) -> [OrderResult]:
+        self.results = []
+        for batch in self.create_batches():
+            if len(batch) == 1:
+                result = self.__place_order(batch[0])
+                self.results.append(result)
+                if not result.is_success and batch[0].order_type == Constants.OrderType.MARKET:
+                    break
+            else:
+                self.results.extend(self.exchange.place_batch_orders(batch))
+        failed_results = [result for result in self.results if not result.is_success]
+        if failed_results:
+            raise OrderPlacementException(failed_results=failed_results,
+                                          placed_results=[result for result in self.results if result.is_success])
+        return self.results
+
+    def __place_order(self, order: Order) -> OrderResult:
+        try:
+            return OrderResult(order=order, exchange_order=self.exchange.place_order(order))
+        except Exception as err:
+            return OrderResult(order=order, error=err)
 
-    def execute(self):
+    def create_batches(self) -> [[Order]]:
+        batches = [[order] for order in self.orders if order.order_type == Constants.OrderType.MARKET]
+        batch = []
         for order in self.orders:
-            self.exchange.place_order(order)
+            if order.order_type == Constants.OrderType.MARKET:
+                continue
+            if order.close_position:
+                batches.append([order])
+                continue
+            batch.append(order)
+            if len(batch) == self.max_batch_size:
+                batches.append(batch)
+                batch = []
+        if batch:
+            batches.append(batch)
+        return batches
@@ -0,0 +1,89 @@
+import unittest
+
+from chalicelib.commands.ordercommand import OrderCommand
+from chalicelib.exceptions.orderplacementexception import OrderPlacementException
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.models.orders.positiondcaorder import PositionDCAOrder
+from chalicelib.models.orders.positionmarketorder import PositionMarketOrder
+from chalicelib.models.orders.slorder import StopLossOrder
+from chalicelib.models.orders.tpmarketorder import TakeProfitMarketOrder
+
+
+class OrderCommandTest(unittest.TestCase):
+
+    def setUp(self):
+        self.exchange = FakeBinanceExchangeClient()
+        self.ticker = "BTCUSDT"
+
+    def create_tp_orders(self, count: int):
+        return [TakeProfitMarketOrder(side="SELL", ticker=self.ticker, token_qty=0.1, trigger_price=30000.0 + i,
+                                      exit_percentage=10) for i in range(count)]
+
+    def test_orders_are_placed_in_batches_of_five(self):
+        # given
+        tp_orders = self.create_tp_orders(count=7)
+        order_command = OrderCommand(exchange=self.exchange, orders=tp_orders)
+
+        # when
+        results = order_command.execute()
+
+        # then
+        self.assertEqual([5, 2], [len(batch) for batch in self.exchange.get_placed_batches()])
+        self.assertEqual(tp_orders, self.exchange.get_placed_orders())
+        self.assertEqual(tp_orders, [result.order for result in results])
+        self.assertTrue(all(result.is_success for result in results))
+
+    def test_single_and_close_position_orders_are_not_batched(self):
+        # given
+        position_order = PositionMarketOrder(side="BUY", ticker=self.ticker, token_qty=0.5, curr_token_price=30000.0,
+                                             entry_price=30000.0)
+        sl_order = StopLossOrder(side="SELL", ticker=self.ticker, order_id_str="sl", trigger_price=29000.0)
+
+        # when
+        OrderCommand(exchange=self.exchange, orders=[position_order]).execute()
+        OrderCommand(exchange=self.exchange, orders=[sl_order]).execute()
+
+        # then
+        self.assertEqual(0, len(self.exchange.get_placed_batches()))
+        self.assertEqual([position_order, sl_order], self.exchange.get_placed_orders())
+
+    def test_failed_orders_are_reported_after_all_are_attempted(self):
+        # given
+        tp_orders = self.create_tp_orders(count=3)
+        sl_order = StopLossOrder(side="SELL", ticker=self.ticker, order_id_str="sl", trigger_price=29000.0)
+        self.exchange.set_rejected_order_types(["STOP_MARKET"])
+        order_command = OrderCommand(exchange=self.exchange, orders=[sl_order] + tp_orders)
+
+        # when
+        with self.assertRaises(OrderPlacementException) as context:
+            order_command.execute()
+
+        # then
+        failed_results = context.exception.failed_results
+        self.assertEqual([sl_order], [result.order for result in failed_results])
+        self.assertIn(sl_order.order_id, str(context.exception))
+        self.assertEqual(tp_orders, self.exchange.get_placed_orders())
+        self.assertEqual(4, len(order_command.results))
+
+    def test_rejected_market_entry_stops_its_dca_entries(self):
+        # given
+        position_order = PositionMarketOrder(side="BUY", ticker=self.ticker, token_qty=0.5, curr_token_price=30000.0,
+                                             entry_price=30000.0)
+        dca_orders = [PositionDCAOrder(side="BUY", ticker=self.ticker, token_qty=0.5, limit_price=29500.0 - i * 500,
+                                       curr_token_price=30000.0, entry_price=30000.0, dca_percentage=25)
+                      for i in range(2)]
+        self.exchange.set_rejected_order_types(["MARKET"])
+        order_command = OrderCommand(exchange=self.exchange, orders=dca_orders + [position_order])
+
+        # when
+        with self.assertRaises(OrderPlacementException) as context:
+            order_command.execute()
+
+        # then
+        self.assertEqual([position_order], [result.order for result in context.exception.failed_results])
+        self.assertEqual([], context.exception.placed_results)
+        self.assertEqual([], self.exchange.get_placed_orders())
+
+
+if __name__ == '__main__':
+    unittest.main()
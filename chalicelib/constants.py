@@ -28,6 +28,7 @@ class Constants(metaclass=ABCMeta):
     class JsonRequestKeys:
         AUTH = "auth"
         INTERVAL = "interval"
+        BAR_TIME = "barTime"
         IS_TEST_PLATFORM = "isTestPlatform"
         IS_DRY_RUN = "isDryRun"
 
@@ -0,0 +1,139 @@
+from json.encoder import encode_basestring_ascii
+from typing import List
+
+INDENT = "  "
+BR = "<br>"
+BLACK = "<font color=black>"
+BROWN = "<font color=brown>"
+# A key's closing quote and separator after format_json_to_html has coloured them
+KEY_SEPARATOR = f"{BLACK}:<font color=mediumblue> "
+COMMA_BR = f",{BR}"
+BLACK_COMMA_BR = f"{BLACK},{BR}"
+OPENERS = {dict: ("{", "}"), list: ("[", "]")}
+# Marks list items and the top level value, None is itself a valid dict key
+NO_KEY = object()
+
+
+class HtmlTemplate:
+    """
+    A str.format style template with only positional '{}' fields, split once so rendering is a single join.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts = template.split("{}")
+
+    def render(self, *values) -> str:
+        if len(values) != len(self.parts) - 1:
+            raise ValueError(f"Template expects {len(self.parts) - 1} values. Received: {len(values)}")
+        rendered = [self.parts[0]]
+        for value, part in zip(values, self.parts[1:]):
+            rendered.append(str(value))
+            rendered.append(part)
+        return "".join(rendered)
+
+
+def _colour_string(token: str, has_colon: bool) -> str:
+    # Same replacements format_json_to_html applies to the characters of a JSON encoded string
+    if '":' in token:
+        token = token.replace('":', f'"{BLACK}:')
+    if has_colon and ":" in token:
+        token = token.replace(":", ":<font color=mediumblue>")
+    if "[" in token:
+        token = token.replace("[", f"{BLACK}[")
+    if "{" in token:
+        token = token.replace("{", f"{BLACK}{{")
+    return token
+
+
+def _encode_key(key) -> str:
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    return encode_basestring_ascii(_encode_scalar(key))
+
+
+def _encode_scalar(value) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        if value in (float("inf"), float("-inf")):
+            return "Infinity" if value > 0 else "-Infinity"
+        return float.__repr__(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonHtmlRenderer:
+    """
+    Renders a JSON compatible value as the coloured HTML emails were built with by format_json_to_html, now in
+    benchmarks/legacyemails.py, in one walk over the value instead of dumping it to indented JSON and applying regular
+    expressions to every line.
+    """
+
+    def __init__(self):
+        self.out: List[str] = []
+
+    def render(self, value) -> str:
+        self.out = []
+        self.__write_value(value=value, depth=0, key=NO_KEY, is_last=True)
+        return "".join(self.out)
+
+    def __write_value(self, value, depth: int, key, is_last: bool):
+        indent = INDENT * depth
+        container = OPENERS.get(type(value))
+        if container is None and isinstance(value, (dict, list, tuple)):
+            container = OPENERS[dict] if isinstance(value, dict) else OPENERS[list]
+        if container is not None:
+            opener, closer = container
+            if not value:
+                self.__write_line(indent=indent, key=key, token=opener + closer, is_string=False, is_last=is_last)
+                return
+            self.__write_line(indent=indent, key=key, token=opener, is_string=False, is_last=True)
+            items = value.items() if isinstance(value, dict) else ((NO_KEY, item) for item in value)
+            last_idx = len(value) - 1
+            for idx, (child_key, child) in enumerate(items):
+                self.__write_value(value=child, depth=depth + 1, key=child_key, is_last=idx == last_idx)
+            self.__write_line(indent=indent, key=NO_KEY, token=closer, is_string=False, is_last=is_last)
+        elif isinstance(value, str):
+            self.__write_line(indent=indent, key=key, token=encode_basestring_ascii(value), is_string=True,
+                              is_last=is_last)
+        else:
+            self.__write_line(indent=indent, key=key, token=_encode_scalar(value), is_string=False, is_last=is_last)
+
+    def __write_line(self, indent: str, key, token: str, is_string: bool, is_last: bool):
+        out = self.out
+        has_key = key is not NO_KEY
+        if not has_key and not is_string:
+            # No quotes on the line, only brackets are coloured
+            out.append(BLACK)
+            out.append(indent)
+            out.append(_colour_string(token, has_colon=False) if token[0] in "[{" else token)
+            out.append(BR if is_last else COMMA_BR)
+            return
+
+        encoded_key = _encode_key(key) if has_key else ""
+        has_colon = has_key or ":" in token
+        out.append(BROWN)
+        out.append(indent)
+        if has_key:
+            out.append(_colour_string(encoded_key, has_colon=True))
+            out.append(KEY_SEPARATOR)
+        if is_string or token[0] in "[{":
+            out.append(_colour_string(token, has_colon=has_colon))
+        else:
+            out.append(token)
+        if is_last:
+            out.append(BR)
+        else:
+            out.append(BLACK_COMMA_BR if has_colon else COMMA_BR)
+
+
+def render_json_html(value) -> str:
+    return JsonHtmlRenderer().render(value)
@@ -0,0 +1,200 @@
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+AWS_REGION = "eu-west-1"
+CHARSET = "UTF-8"
+EMAIL_TRANSPORT_ENV_VAR = "EMAIL_TRANSPORT"
+SES_TRANSPORT = "ses"
+LOCAL_TRANSPORT = "local"
+DEFAULT_MAX_QUEUE_SIZE = 100
+DEFAULT_FLUSH_TIMEOUT_SECONDS = 5.0
+
+_SES_CLIENT = None
+_SES_CLIENT_LOCK = threading.Lock()
+
+
+def get_ses_client():
+    """
+    Returns the process-wide SES client, creating it on first use so it is built once per container.
+    """
+    global _SES_CLIENT
+    with _SES_CLIENT_LOCK:
+        if _SES_CLIENT is None:
+            import boto3
+
+            _SES_CLIENT = boto3.client('ses', region_name=AWS_REGION)
+        return _SES_CLIENT
+
+
+class Email:
+
+    def __init__(self, email_address: str, subject: str, body: str, sender: str):
+        self.email_address = email_address
+        self.subject = subject
+        self.body = body
+        self.sender = sender
+
+    def __repr__(self):
+        return f"TO: {self.email_address}, SUBJECT: {self.subject}"
+
+
+class SesTransport:
+
+    def send(self, email: Email):
+        from botocore.exceptions import ClientError
+
+        try:
+            response = get_ses_client().send_email(
+                Destination={
+                    'ToAddresses': [
+                        email.email_address,
+                    ],
+                },
+                Message={
+                    'Body': {
+                        'Html': {
+                            'Charset': CHARSET,
+                            'Data': email.body,
+                        }
+                    },
+                    'Subject': {
+                        'Charset': CHARSET,
+                        'Data': email.subject,
+                    },
+                },
+                Source=email.sender,
+            )
+        except ClientError as e:
+            logger.error("%s", e.response['Error']['Message'])
+            raise
+        logger.info("Email sent! Message ID: %s", response['MessageId'])
+
+
+class LocalTransport:
+    """
+    Stand-in for SES which keeps every email in memory, for tests and running the bot locally.
+    """
+
+    def __init__(self):
+        self.sent: List[Email] = []
+
+    def send(self, email: Email):
+        logger.info("Email not sent, local transport in use. %s", email)
+        self.sent.append(email)
+
+
+class NotificationDispatcher:
+    """
+    Sends emails from a bounded queue on a background thread, through the transport's shared client.
+
+    Emails go out while the request carries on, but not after its response: Lambda freezes the container as soon as
+    a response is returned, so routes call flush() before returning and the response still waits, up to a timeout,
+    for any send that has not finished. What this saves is an SES client built per email and the request blocking on
+    each send in turn. Taking delivery off the response path entirely would need it handed to another function, e.g.
+    an asynchronous Lambda invocation or an SQS queue.
+
+    Emails queued while the queue is full are dropped and counted rather than blocking the request. Anything still
+    queued when a flush times out is sent when the container next runs.
+    """
+
+    def __init__(self, transport, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE):
+        self.transport = transport
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_send_ms = None
+        self.total_send_ms = 0.0
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def enqueue(self, email: Email) -> bool:
+        self.__start_worker()
+        try:
+            self.queue.put_nowait(email)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Notification queue full, dropping email. %s", email)
+            return False
+
+    def flush(self, timeout_seconds: float = DEFAULT_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """
+        Waits until every queued email has been handled or the timeout passes. Returns whether the queue drained.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Notification flush timed out with %s emails outstanding",
+                                   self.queue.unfinished_tasks)
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self) -> dict:
+        average_send_ms = self.total_send_ms / self.sent if self.sent else None
+        return {"queue_depth": self.queue.qsize(), "sent": self.sent, "failed": self.failed, "dropped": self.dropped,
+                "last_send_ms": self.last_send_ms, "average_send_ms": average_send_ms}
+
+    def __start_worker(self):
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.__run, name="notification-dispatcher", daemon=True)
+                self.worker.start()
+
+    def __run(self):
+        while True:
+            email = self.queue.get()
+            start = time.perf_counter()
+            try:
+                self.transport.send(email)
+                self.sent += 1
+                self.last_send_ms = (time.perf_counter() - start) * 1000
+                self.total_send_ms += self.last_send_ms
+            except Exception as err:
+                self.failed += 1
+                logger.error("Failed to send email. %s Error: %s", email, err)
+            finally:
+                self.queue.task_done()
+
+
+def create_transport(name: str = None):
+    name = (name or os.environ.get(EMAIL_TRANSPORT_ENV_VAR) or SES_TRANSPORT).lower()
+    if name == SES_TRANSPORT:
+        return SesTransport()
+    if name == LOCAL_TRANSPORT:
+        return LocalTransport()
+    raise ValueError(f"Unknown email transport '{name}'. Valid transports: {[SES_TRANSPORT, LOCAL_TRANSPORT]}")
+
+
+_NOTIFICATION_DISPATCHER: Optional[NotificationDispatcher] = None
+_NOTIFICATION_DISPATCHER_LOCK = threading.Lock()
+
+
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """
+    Returns the process-wide dispatcher, creating it on first use with the transport named by EMAIL_TRANSPORT.
+    """
+    global _NOTIFICATION_DISPATCHER
+    with _NOTIFICATION_DISPATCHER_LOCK:
+        if _NOTIFICATION_DISPATCHER is None:
+            _NOTIFICATION_DISPATCHER = NotificationDispatcher(transport=create_transport())
+        return _NOTIFICATION_DISPATCHER
+
+
+def flush_notifications(timeout_seconds: float = DEFAULT_FLUSH_TIMEOUT_SECONDS) -> bool:
+    """
+    Flushes the process-wide dispatcher if any email has been queued in this container, otherwise returns at once.
+    """
+    if _NOTIFICATION_DISPATCHER is None:
+        return True
+    return _NOTIFICATION_DISPATCHER.flush(timeout_seconds=timeout_seconds)
@@ -0,0 +1,66 @@
+import json
+import unittest
+
+from benchmarks.legacyemails import format_json_to_html
+from chalicelib.email.emails import ERROR_TEMPLATE, build_error_html
+from chalicelib.email.htmlrenderer import HtmlTemplate, render_json_html
+
+
+class HtmlRendererTest(unittest.TestCase):
+    TRADE_RESPONSE = {
+        "code": 200,
+        "body": {
+            "ticker": "BTCUSDT",
+            "interval": "15",
+            "position": {"side": "BUY", "orders": [{"qty": 0.125, "price": 30123.5}], "reduceOnly": False},
+            "takeProfits": [[1, 2.5], [], {}],
+            "note": "Filled at 12:30 {partial} [ok]",
+            "quoted": "say \"hi\": now",
+            "unicode": "über",
+            "missing": None,
+            1: "numeric key"
+        }
+    }
+
+    def test_render_matches_line_by_line_formatter(self):
+        # given
+        expected_html = "".join(format_json_to_html(json.dumps(self.TRADE_RESPONSE, indent=2)))
+
+        # when
+        html = render_json_html(self.TRADE_RESPONSE)
+
+        # then
+        self.assertEqual(expected_html, html)
+
+    def test_render_matches_line_by_line_formatter_for_top_level_list(self):
+        # given
+        value = ["a:b", 1, {"k": ["x", None]}, "plain"]
+        expected_html = "".join(format_json_to_html(json.dumps(value, indent=2)))
+
+        # when
+        html = render_json_html(value)
+
+        # then
+        self.assertEqual(expected_html, html)
+
+    def test_template_matches_str_format(self):
+        # given
+        args = ("BTCUSDT", "SELL", "Error placing order", "Risk {too} high")
+
+        # when
+        html = build_error_html(ticker=args[0], order_side=args[1], heading=args[2], err_msg=args[3])
+
+        # then
+        self.assertEqual(ERROR_TEMPLATE.template.format(*args), html)
+
+    def test_template_rejects_wrong_number_of_values(self):
+        # given
+        template = HtmlTemplate("<h2>{} {}</h2>")
+
+        # when / then
+        with self.assertRaises(ValueError):
+            template.render("BTCUSDT")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import unittest
+
+from chalicelib.email.notificationdispatcher import Email, LocalTransport, NotificationDispatcher
+
+
+class BlockingTransport(LocalTransport):
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def send(self, email: Email):
+        self.release.wait(timeout=5)
+        super().send(email)
+
+
+class FailingTransport:
+
+    def send(self, email: Email):
+        raise ConnectionError("SES unavailable")
+
+
+def create_email(subject: str) -> Email:
+    return Email(email_address="trader@example.com", subject=subject, body="<html></html>",
+                 sender="Trading Bot <bot@example.com>")
+
+
+class NotificationDispatcherTest(unittest.TestCase):
+
+    def test_queued_emails_are_sent_on_flush(self):
+        # given
+        transport = LocalTransport()
+        class_under_test = NotificationDispatcher(transport=transport)
+
+        # when
+        class_under_test.enqueue(create_email("Order Placed"))
+        class_under_test.enqueue(create_email("Order Failed"))
+        is_flushed = class_under_test.flush(timeout_seconds=5)
+
+        # then
+        self.assertTrue(is_flushed)
+        self.assertEqual(["Order Placed", "Order Failed"], [email.subject for email in transport.sent])
+        stats = class_under_test.stats()
+        self.assertEqual(0, stats["queue_depth"])
+        self.assertEqual(2, stats["sent"])
+        self.assertIsNotNone(stats["last_send_ms"])
+
+    def test_enqueue_does_not_wait_for_transport(self):
+        # given
+        transport = BlockingTransport()
+        class_under_test = NotificationDispatcher(transport=transport, max_queue_size=1)
+
+        # when
+        first_queued = class_under_test.enqueue(create_email("first"))
+        is_flushed = class_under_test.flush(timeout_seconds=0.05)
+        second_queued = class_under_test.enqueue(create_email("second"))
+        third_queued = class_under_test.enqueue(create_email("third"))
+        transport.release.set()
+        class_under_test.flush(timeout_seconds=5)
+
+        # then
+        self.assertTrue(first_queued)
+        self.assertFalse(is_flushed)
+        self.assertTrue(second_queued)
+        self.assertFalse(third_queued)
+        self.assertEqual(["first", "second"], [email.subject for email in transport.sent])
+        self.assertEqual(1, class_under_test.stats()["dropped"])
+
+    def test_failed_sends_are_counted(self):
+        # given
+        class_under_test = NotificationDispatcher(transport=FailingTransport())
+
+        # when
+        class_under_test.enqueue(create_email("Order Placed"))
+        is_flushed = class_under_test.flush(timeout_seconds=5)
+
+        # then
+        self.assertTrue(is_flushed)
+        self.assertEqual(1, class_under_test.stats()["failed"])
+        self.assertEqual(0, class_under_test.stats()["sent"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,14 @@
+class OrderPlacementException(Exception):
+    """
+    Raised when one or more orders were rejected by the exchange. Holds the result of every failed order, and of the
+    orders of the same group which were placed.
+    """
+
+    def __init__(self, failed_results, placed_results=None, message="Failed to place orders."):
+        self.failed_results = failed_results
+        self.placed_results = placed_results or []
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{self.message} Failed orders: {self.failed_results}"
@@ -1,31 +1,65 @@
+import re
 from math import log
-from typing import List
+from typing import Iterable, List, Optional
 
 from binance_f import RequestClient
 from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.restapiinvoker import call_sync
+from binance_f.impl.restapirequest import RestApiRequest
 from binance_f.impl.utils import JsonWrapper
+from binance_f.impl.utils.apisignature import create_signature
+from binance_f.impl.utils.timeservice import get_current_timestamp
+from binance_f.impl.utils.urlparamsbuilder import UrlParamsBuilder
 from binance_f.model import FuturesMarginType, Position, OrderRespType, ExchangeInformation
 from binance_f.model import Order as LibOrder
 from binance_f.model.exchangeinformation import Symbol
 
-from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.exchanges.exchangeclient import ExchangeClient, MAX_BATCH_ORDERS
+from chalicelib.exchanges.positionsnapshot import PositionSnapshot
+from chalicelib.exchanges.symbolinfocache import get_symbol_info_cache
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.models.orders.order import Order
+from chalicelib.models.orders.orderresult import OrderResult
+
+logger = get_logger()
 
 BINANCE_API_KEY_CONFIG_KEY = 'BINANCE_API_KEY'
 BINANCE_SECRET_KEY_CONFIG_KEY = 'BINANCE_SECRET_KEY'
 BINANCE_API_BASE_URL = "https://fapi.binance.com"
 TESTNET_BASE_URL = "https://testnet.binancefuture.com"
+BINANCE_STREAM_BASE_URL = "wss://fstream.binance.com"
+TESTNET_STREAM_BASE_URL = "wss://stream.binancefuture.com"
 TESTNET_API_KEY_CONFIG_KEY = 'TESTNET_API_KEY'
 TESTNET_SECRET_KEY_CONFIG_KEY = 'TESTNET_SECRET_KEY'
-FILTER_TYPE = "filterType"
 PRICE_FILTER = "PRICE_FILTER"
 TICK_SIZE = "tickSize"
-
-
-def get_symbol_filter(symbol: Symbol, filter_type: str):
-    return next(
-        _filter for _filter in symbol.filters if _filter[FILTER_TYPE] == filter_type
-    )
+BATCH_ORDERS_PATH = "/fapi/v1/batchOrders"
+POSITION_RISK_PATH = "/fapi/v2/positionRisk"
+RECV_WINDOW_MS = 60000
+# Precision over the maximum, filter failure, invalid quantity and invalid tick size
+FILTER_ERROR_CODES = {-1111, -1013, -4003, -4014}
+ERROR_CODE_PATTERN = re.compile(r"\[Executing\] (-?\d+):")
+
+
+def build_batch_order_params(order: Order) -> dict:
+    """
+    Order parameters as expected inside a batchOrders request, where every value is sent as a string.
+    """
+    params = {"symbol": order.ticker, "side": order.side, "type": order.order_type,
+              "timeInForce": order.time_in_force, "quantity": order.token_qty, "reduceOnly": order.reduce_only,
+              "price": order.limit_price, "newClientOrderId": order.order_id, "stopPrice": order.trigger_price,
+              "callbackRate": getattr(order, "callback_rate", None),
+              "activationPrice": getattr(order, "activation_price", None), "newOrderRespType": OrderRespType.RESULT}
+    return {key: (str(value).lower() if isinstance(value, bool) else str(value))
+            for key, value in params.items() if value is not None}
+
+
+def is_filter_error(err: BinanceApiException) -> bool:
+    """
+    Whether the exchange rejected an order on its symbol's filters, e.g. after a tick size or lot size change.
+    """
+    match = ERROR_CODE_PATTERN.match(err.error_message or "")
+    return match is not None and int(match.group(1)) in FILTER_ERROR_CODES
 
 
 class BinanceExchangeClient(ExchangeClient):
@@ -43,19 +77,59 @@ class BinanceExchangeClient(ExchangeClient):
 
         self.client = RequestClient(api_key=trading_platform_api_key, secret_key=trading_platform_api_secret,
                                     url=trading_platform_base_url)
+        # binance_f has no batch order placement so those requests are signed here
+        self.__api_key = trading_platform_api_key
+        self.__secret_key = trading_platform_api_secret
+        self.__base_url = trading_platform_base_url
+        self.__stream_base_url = TESTNET_STREAM_BASE_URL if is_test_platform else BINANCE_STREAM_BASE_URL
+        self.symbol_info_cache = get_symbol_info_cache(base_url=trading_platform_base_url)
         self.log()
 
     def place_order(self, order: Order):
-        print(f"Sending order to Binance: {order}")
-        return self.client.post_order(symbol=order.ticker, side=order.side, ordertype=order.order_type,
-                                      timeInForce=order.time_in_force, quantity=order.token_qty,
-                                      reduceOnly=order.reduce_only, price=order.limit_price,
-                                      newClientOrderId=order.order_id,stopPrice=order.trigger_price,
-                                      closePosition=order.close_position, newOrderRespType=OrderRespType.RESULT)
-
-    def get_symbol_info(self, ticker: str):
-        exchange_info = self.client.get_exchange_information()
-        return next(sym for sym in exchange_info.symbols if sym.symbol == ticker.upper())
+        logger.debug("Sending order to Binance: %s", order)
+        try:
+            return self.client.post_order(symbol=order.ticker, side=order.side, ordertype=order.order_type,
+                                          timeInForce=order.time_in_force, quantity=order.token_qty,
+                                          reduceOnly=order.reduce_only, price=order.limit_price,
+                                          newClientOrderId=order.order_id,stopPrice=order.trigger_price,
+                                          closePosition=order.close_position,
+                                          callbackRate=getattr(order, "callback_rate", None),
+                                          activationPrice=getattr(order, "activation_price", None),
+                                          newOrderRespType=OrderRespType.RESULT)
+        except BinanceApiException as err:
+            self.__invalidate_on_filter_error(ticker=order.ticker, err=err)
+            raise
+
+    def place_batch_orders(self, orders: List[Order]) -> List[OrderResult]:
+        if len(orders) > MAX_BATCH_ORDERS:
+            raise ValueError(f"At most {MAX_BATCH_ORDERS} orders can be placed per batch. Received: {len(orders)}")
+        logger.debug("Sending batch of %s orders to Binance: %s", len(orders), orders)
+        builder = UrlParamsBuilder()
+        builder.put_url("batchOrders", [build_batch_order_params(order) for order in orders])
+        items = self.__call_signed(method="POST", path=BATCH_ORDERS_PATH, builder=builder,
+                                   json_parser=lambda json_wrapper: json_wrapper.convert_2_array().get_items())
+        # Binance answers with one entry per order, in request order, holding either the order or its error
+        results = []
+        for order, item in zip(orders, items):
+            if item.contain_key("code"):
+                error = BinanceApiException(BinanceApiException.EXEC_ERROR, f"[Executing] {item.get_int('code')}: "
+                                                                            f"{item.get_string_or_default('msg', '')}")
+                self.__invalidate_on_filter_error(ticker=order.ticker, err=error)
+                results.append(OrderResult(order=order, error=error))
+            else:
+                results.append(OrderResult(order=order, exchange_order=LibOrder.json_parse(item)))
+        return results
+
+    def __invalidate_on_filter_error(self, ticker: str, err: BinanceApiException):
+        if is_filter_error(err):
+            logger.warning("Order for %s rejected on its filters. Refreshing its symbol information. %s", ticker,
+                           err.error_message)
+            self.symbol_info_cache.invalidate(ticker=ticker)
+
+    def get_symbol_info(self, ticker: str, force_refresh: bool = False) -> Symbol:
+        return self.symbol_info_cache.get_symbol(ticker=ticker,
+                                                 fetch_exchange_info=self.client.get_exchange_information,
+                                                 force_refresh=force_refresh)
 
     def get_quantity_precision(self, ticker: str) -> int:
         quantity_precision = None
@@ -66,9 +140,9 @@ class BinanceExchangeClient(ExchangeClient):
 
     def get_price_precision(self, ticker: str) -> int:
         price_precision = None
-        exchange_info: Symbol = self.get_symbol_info(ticker=ticker)
-        if exchange_info is not None:
-            price_filter = get_symbol_filter(symbol=exchange_info, filter_type=PRICE_FILTER)
+        price_filter = self.symbol_info_cache.get_filter(ticker=ticker, filter_type=PRICE_FILTER,
+                                                         fetch_exchange_info=self.client.get_exchange_information)
+        if price_filter is not None:
             tick_size = float(price_filter[TICK_SIZE])
             price_precision = int(round(-log(tick_size, 10), 0))
         return price_precision
@@ -101,11 +175,52 @@ class BinanceExchangeClient(ExchangeClient):
     def get_position(self) -> List[Position]:
         return self.client.get_position_v2()
 
+    def get_position_snapshot(self, tickers: Optional[Iterable[str]] = None) -> PositionSnapshot:
+        tickers = list(tickers) if tickers is not None else []
+        if len(tickers) != 1:
+            return PositionSnapshot(self.get_position())
+        # positionRisk filters by a single symbol, which saves fetching and parsing every futures symbol
+        builder = UrlParamsBuilder()
+        builder.put_url("symbol", tickers[0].upper())
+        return PositionSnapshot(self.__call_signed(
+            method="GET", path=POSITION_RISK_PATH, builder=builder,
+            json_parser=lambda json_wrapper: [Position.json_parse(item)
+                                              for item in json_wrapper.convert_2_array().get_items()]))
+
     def get_open_orders(self, ticker: str):
         return self.client.get_open_orders(symbol=ticker)
 
     def cancel_list_orders(self, ticker: str, order_ids: List[int]):
         return self.client.cancel_list_orders(symbol=ticker, orderIdList=order_ids)
 
+    def start_user_data_stream(self) -> str:
+        return self.client.start_user_data_stream()
+
+    def keep_user_data_stream(self):
+        return self.client.keep_user_data_stream()
+
+    def close_user_data_stream(self):
+        return self.client.close_user_data_stream()
+
+    def get_user_data_stream_url(self, listen_key: str) -> str:
+        return f"{self.__stream_base_url}/ws/{listen_key}"
+
+    def __call_signed(self, method: str, path: str, builder: UrlParamsBuilder, json_parser):
+        """
+        Signed request for endpoints binance_f has no method for, or none taking the parameters needed.
+        """
+        builder.put_url("recvWindow", RECV_WINDOW_MS)
+        builder.put_url("timestamp", str(get_current_timestamp() - 1000))
+        create_signature(self.__secret_key, builder)
+        request = RestApiRequest()
+        request.method = method
+        request.host = self.__base_url
+        request.header.update({"Content-Type": "application/json", "X-MBX-APIKEY": self.__api_key})
+        request.url = f"{path}?{builder.build_url()}"
+        request.json_parser = json_parser
+        result, limits = call_sync(request)
+        self.client.refresh_limits(limits)
+        return result
+
     def log(self):
-        print("Is Test Platform: {}".format(self.is_test_platform))
+        logger.debug("Is Test Platform: %s", self.is_test_platform)
@@ -1,11 +1,21 @@
+from typing import List
+
 from chalicelib.exchanges.binanceexchangeclient import BinanceExchangeClient
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.models.orders.order import Order
+from chalicelib.models.orders.orderresult import OrderResult
+
+logger = get_logger()
 
 
 class DummyBinanceExchangeClient(BinanceExchangeClient):
 
     def place_order(self, order: Order):
-        print(f"Dry Run! Would have sent order: {order}")
+        logger.info("Dry Run! Would have sent order: %s", order)
+
+    def place_batch_orders(self, orders: List[Order]) -> List[OrderResult]:
+        logger.info("Dry Run! Would have sent batch of orders: %s", orders)
+        return [OrderResult(order=order) for order in orders]
 
     def update_leverage(self, leverage: int, ticker: str):
         pass
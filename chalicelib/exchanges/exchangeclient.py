@@ -1,10 +1,15 @@
 from abc import ABCMeta, abstractmethod
-from typing import List
+from typing import Iterable, List, Optional
 
 from binance_f.model import Position
 from binance_f.model import Order as LibOrder
 
+from chalicelib.exchanges.positionsnapshot import PositionSnapshot
 from chalicelib.models.orders.order import Order
+from chalicelib.models.orders.orderresult import OrderResult
+
+# Binance accepts at most 5 orders per batchOrders request
+MAX_BATCH_ORDERS = 5
 
 
 class ExchangeClient(metaclass=ABCMeta):
@@ -13,6 +18,19 @@ class ExchangeClient(metaclass=ABCMeta):
     def place_order(self, order: Order):
         pass
 
+    def place_batch_orders(self, orders: List[Order]) -> List[OrderResult]:
+        """
+        Places up to MAX_BATCH_ORDERS orders and returns a result per order, in the order given. A rejected order does
+        not stop the others from being placed. Exchanges without batch support place them one at a time.
+        """
+        results = []
+        for order in orders:
+            try:
+                results.append(OrderResult(order=order, exchange_order=self.place_order(order)))
+            except Exception as err:
+                results.append(OrderResult(order=order, error=err))
+        return results
+
     @abstractmethod
     def get_quantity_precision(self, ticker: str) -> int:
         pass
@@ -37,6 +55,16 @@ class ExchangeClient(metaclass=ABCMeta):
     def get_position(self) -> List[Position]:
         pass
 
+    def get_position_snapshot(self, tickers: Optional[Iterable[str]] = None) -> PositionSnapshot:
+        """
+        Positions indexed by symbol. When tickers are given only those need to be fetched, exchanges which cannot
+        filter by symbol return every position.
+        """
+        return PositionSnapshot(self.get_position())
+
+    def get_symbol_position(self, ticker: str) -> Optional[Position]:
+        return self.get_position_snapshot(tickers=[ticker]).get(ticker=ticker)
+
     @abstractmethod
     def get_open_orders(self, ticker: str) -> List[LibOrder]:
         pass
@@ -44,3 +72,19 @@ class ExchangeClient(metaclass=ABCMeta):
     @abstractmethod
     def cancel_list_orders(self, ticker: str, orders: List[int]):
         pass
+
+    # USER DATA STREAM
+    def start_user_data_stream(self) -> str:
+        """
+        Returns a listen key for the account's user data stream, valid until it is no longer kept alive.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support user data streams")
+
+    def keep_user_data_stream(self):
+        raise NotImplementedError(f"{type(self).__name__} does not support user data streams")
+
+    def close_user_data_stream(self):
+        raise NotImplementedError(f"{type(self).__name__} does not support user data streams")
+
+    def get_user_data_stream_url(self, listen_key: str) -> str:
+        raise NotImplementedError(f"{type(self).__name__} does not support user data streams")
@@ -0,0 +1,110 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+# Enough connections for every prefetch worker to hold one to the same host at once
+HTTP_POOL_MAXSIZE = 16
+
+_HTTP_SESSION: Optional[requests.Session] = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def create_http_session(pool_maxsize: int = HTTP_POOL_MAXSIZE) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide keep-alive session and routes binance_f REST calls through it.
+
+    binance_f sends every request with the module level requests.get/post/delete/put functions, each of which opens a
+    new TLS connection. Pointing the invoker's 'requests' attribute at a Session, which exposes the same methods,
+    makes every RequestClient reuse pooled connections across warm invocations. Credentials are sent per request, so
+    one session is safely shared by all users.
+    """
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            from binance_f.impl import restapiinvoker
+
+            _HTTP_SESSION = create_http_session()
+            restapiinvoker.requests = _HTTP_SESSION
+        return _HTTP_SESSION
+
+
+def create_binance_exchange_client(is_test_platform: bool, is_dry_run: bool, user_config: dict) -> ExchangeClient:
+    get_http_session()
+    if is_dry_run:
+        from chalicelib.exchanges.dummybinanceexchangeclient import DummyBinanceExchangeClient
+        return DummyBinanceExchangeClient(is_test_platform=is_test_platform, user_config=user_config)
+    from chalicelib.exchanges.binanceexchangeclient import BinanceExchangeClient
+    return BinanceExchangeClient(is_test_platform=is_test_platform, user_config=user_config)
+
+
+class ExchangeClientPool:
+    """
+    Exchange clients reused across warm invocations, keyed by user, test or live platform and dry run.
+
+    Only the client a request actually needs is built. A pooled client is rebuilt when the user's config has changed
+    since it was created, e.g. after API keys are rotated.
+    """
+
+    def __init__(self, client_factory: Callable[[bool, bool, dict], ExchangeClient] = create_binance_exchange_client):
+        self.client_factory = client_factory
+        self.clients: Dict[Tuple[str, bool, bool], Tuple[dict, ExchangeClient]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_client(self, user_id: str, user_config: dict, is_test_platform: bool,
+                   is_dry_run: bool = False) -> ExchangeClient:
+        key = (user_id, bool(is_test_platform), bool(is_dry_run))
+        with self.lock:
+            pooled = self.clients.get(key)
+            if pooled is not None and pooled[0] == user_config:
+                self.hits += 1
+                self.log(hit=True)
+                return pooled[1]
+            self.misses += 1
+        # Built outside the lock so a slow construction for one user does not hold up the others
+        client = self.client_factory(bool(is_test_platform), bool(is_dry_run), user_config)
+        with self.lock:
+            self.clients[key] = (dict(user_config), client)
+        self.log(hit=False)
+        return client
+
+    def clear(self):
+        with self.lock:
+            self.clients.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.clients)}
+
+    def log(self, hit: bool):
+        logger.debug("Exchange client pool %s. Hits: %s Misses: %s", 'hit' if hit else 'miss', self.hits, self.misses)
+
+
+_EXCHANGE_CLIENT_POOL: Optional[ExchangeClientPool] = None
+_EXCHANGE_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def get_exchange_client_pool() -> ExchangeClientPool:
+    """
+    Returns the process-wide exchange client pool, creating it on first use.
+    """
+    global _EXCHANGE_CLIENT_POOL
+    with _EXCHANGE_CLIENT_POOL_LOCK:
+        if _EXCHANGE_CLIENT_POOL is None:
+            _EXCHANGE_CLIENT_POOL = ExchangeClientPool()
+        return _EXCHANGE_CLIENT_POOL
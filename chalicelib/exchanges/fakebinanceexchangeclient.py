@@ -1,17 +1,22 @@
+import time
 from typing import List
 
+from binance_f.exception.binanceapiexception import BinanceApiException
 from binance_f.impl.utils import JsonWrapper
 from binance_f.model import Position
 from binance_f.model import Order as LibOrder
 
-from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.exchanges.exchangeclient import ExchangeClient, MAX_BATCH_ORDERS
 from chalicelib.models.orders.order import Order as BotOrder
+from chalicelib.models.orders.orderresult import OrderResult
 
 
 class FakeBinanceExchangeClient(ExchangeClient):
 
     def __init__(self):
         self.placed_orders = []
+        self.placed_batches = []
+        self.rejected_order_types = []
         self.portfolio_value = 0.0
         self.leverage = 0
         self.price_precision = 0
@@ -20,11 +25,56 @@ class FakeBinanceExchangeClient(ExchangeClient):
         self.position = []
         self.open_orders = []
         self.cancelled_orders = []
+        self.position_reads = 0
+        self.open_order_reads = 0
+        self.user_data_stream_url = ""
+        self.listen_keys = []
+        self.user_data_stream_keepalives = 0
+        self.latency_seconds = 0.0
+
+    # LATENCY
+    def set_latency(self, latency_seconds: float):
+        """
+        Delays every call which makes a request on the real exchange client, so concurrency and caching can be
+        measured offline. Precisions are cached by the real client and answered without delay.
+        """
+        self.latency_seconds = latency_seconds
+
+    def __wait(self):
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
 
     # ORDERS
     def place_order(self, order: BotOrder):
+        self.__wait()
+        self.__accept_order(order)
+
+    def __accept_order(self, order: BotOrder):
+        if order.order_type in self.rejected_order_types:
+            raise BinanceApiException(BinanceApiException.EXEC_ERROR, f"[Executing] Rejected {order.order_type}")
         self.placed_orders.append(order)
 
+    def place_batch_orders(self, orders: List[BotOrder]) -> List[OrderResult]:
+        if len(orders) > MAX_BATCH_ORDERS:
+            raise ValueError(f"At most {MAX_BATCH_ORDERS} orders can be placed per batch. Received: {len(orders)}")
+        # One request for the whole batch, as on the exchange
+        self.__wait()
+        self.placed_batches.append(orders)
+        results = []
+        for order in orders:
+            try:
+                self.__accept_order(order)
+                results.append(OrderResult(order=order))
+            except Exception as err:
+                results.append(OrderResult(order=order, error=err))
+        return results
+
+    def get_placed_batches(self) -> [[BotOrder]]:
+        return self.placed_batches
+
+    def set_rejected_order_types(self, order_types: List[str]):
+        self.rejected_order_types = order_types
+
     def get_placed_orders(self) -> [BotOrder]:
         return self.placed_orders
 
@@ -41,6 +91,8 @@ class FakeBinanceExchangeClient(ExchangeClient):
             self.position.append(position)
 
     def get_position(self) -> List[Position]:
+        self.__wait()
+        self.position_reads += 1
         return self.position
 
     def set_open_orders(self, open_orders: List[LibOrder]):
@@ -51,9 +103,12 @@ class FakeBinanceExchangeClient(ExchangeClient):
 
     def get_open_orders(self, ticker: str) -> List[LibOrder]:
         # Binance filters results by ticker so we assume open_orders contains only for specified ticker
+        self.__wait()
+        self.open_order_reads += 1
         return self.open_orders
 
     def cancel_list_orders(self, ticker: str, order_ids: List[int]):
+        self.__wait()
         for order_id in order_ids:
             self.cancelled_orders.append((ticker, order_id))
 
@@ -75,12 +130,14 @@ class FakeBinanceExchangeClient(ExchangeClient):
 
     # LEVERAGE
     def update_leverage(self, leverage: int, ticker: str):
+        self.__wait()
         self.leverage = leverage
 
     def get_leverage(self):
         return self.leverage
 
     def update_margin_type(self, margin_type: str, ticker: str):
+        self.__wait()
         self.margin_type = margin_type
 
     def get_margin_type(self):
@@ -88,7 +145,26 @@ class FakeBinanceExchangeClient(ExchangeClient):
 
     # PORTFOLIO
     def get_portfolio_value(self):
+        self.__wait()
         return self.portfolio_value
 
     def set_portfolio_value(self, portfolio_value: float):
         self.portfolio_value = portfolio_value
+
+    # USER DATA STREAM
+    def set_user_data_stream_url(self, url: str):
+        self.user_data_stream_url = url
+
+    def start_user_data_stream(self) -> str:
+        listen_key = f"listen-key-{len(self.listen_keys) + 1}"
+        self.listen_keys.append(listen_key)
+        return listen_key
+
+    def keep_user_data_stream(self):
+        self.user_data_stream_keepalives += 1
+
+    def close_user_data_stream(self):
+        pass
+
+    def get_user_data_stream_url(self, listen_key: str) -> str:
+        return f"{self.user_data_stream_url}/ws/{listen_key}"
@@ -0,0 +1,33 @@
+from typing import Dict, Iterable, Iterator, Optional
+
+from binance_f.model import Position
+
+
+class PositionSnapshot:
+    """
+    Positions fetched once and indexed by symbol, so each lookup made while handling a request is a dict access
+    rather than another request and a scan of every futures symbol.
+
+    Where an account holds more than one position for a symbol, i.e. hedge mode, the first one returned by the
+    exchange is kept, as the linear scans this replaces did.
+    """
+
+    def __init__(self, positions: Iterable[Position]):
+        self.positions: Dict[str, Position] = {}
+        for position in positions:
+            self.positions.setdefault(position.symbol, position)
+
+    def get(self, ticker: str) -> Optional[Position]:
+        return self.positions.get(ticker.upper())
+
+    def get_open(self, ticker: str) -> Optional[Position]:
+        position = self.get(ticker=ticker)
+        if position and position.positionAmt != 0:
+            return position
+        return None
+
+    def __iter__(self) -> Iterator[Position]:
+        return iter(self.positions.values())
+
+    def __len__(self) -> int:
+        return len(self.positions)
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+from binance_f.model import ExchangeInformation
+from binance_f.model.exchangeinformation import Symbol
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+EXCHANGE_INFO_TTL_ENV_VAR = 'EXCHANGE_INFO_TTL_SECONDS'
+DEFAULT_EXCHANGE_INFO_TTL_SECONDS = 3600
+# How long a symbol missing from the exchange information is answered as missing without fetching it again
+MISSING_SYMBOL_TTL_SECONDS = 60
+FILTER_TYPE = "filterType"
+
+
+class SymbolInfoCache:
+    """
+    Symbol metadata from the exchange information endpoint, indexed by symbol and filter type.
+
+    One instance is shared per exchange base URL for the lifetime of the process, so warm Lambda invocations reuse
+    the parsed metadata instead of downloading every futures symbol again. Entries expire after the configured TTL,
+    or sooner for a symbol invalidated after the exchange rejected an order on its filters.
+    """
+
+    def __init__(self, ttl_seconds: float, missing_symbol_ttl_seconds: float = MISSING_SYMBOL_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.missing_symbol_ttl_seconds = missing_symbol_ttl_seconds
+        self.symbols: Dict[str, Symbol] = {}
+        self.filters: Dict[str, Dict[str, dict]] = {}
+        self.loaded_at = None
+        # Symbols to refresh on their next lookup, and when symbols were last found missing
+        self.stale_symbols: Set[str] = set()
+        self.missing_symbols: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def is_expired(self) -> bool:
+        return self.loaded_at is None or (time.monotonic() - self.loaded_at) >= self.ttl_seconds
+
+    def load(self, exchange_info: ExchangeInformation):
+        symbols = {}
+        filters = {}
+        for symbol in exchange_info.symbols:
+            symbols[symbol.symbol] = symbol
+            filters[symbol.symbol] = {_filter[FILTER_TYPE]: _filter for _filter in symbol.filters}
+        self.symbols = symbols
+        self.filters = filters
+        self.stale_symbols = set()
+        self.loaded_at = time.monotonic()
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """
+        Refreshes the metadata on the next lookup of ticker, or on the next lookup of any symbol without one.
+        """
+        if ticker is None:
+            self.loaded_at = None
+        else:
+            self.stale_symbols.add(ticker.upper())
+
+    def get_symbol(self, ticker: str, fetch_exchange_info: Callable[[], ExchangeInformation],
+                   force_refresh: bool = False) -> Optional[Symbol]:
+        symbol = ticker.upper()
+        force_refresh = force_refresh or symbol in self.stale_symbols
+        self.__refresh_if_required(fetch_exchange_info=fetch_exchange_info, force_refresh=force_refresh)
+        if symbol not in self.symbols and not force_refresh and not self.__is_recently_missing(symbol):
+            # Newly listed symbols will not be present until the next refresh
+            self.__refresh_if_required(fetch_exchange_info=fetch_exchange_info, force_refresh=True)
+        if symbol not in self.symbols:
+            self.missing_symbols[symbol] = time.monotonic()
+        return self.symbols.get(symbol)
+
+    def __is_recently_missing(self, symbol: str) -> bool:
+        missing_at = self.missing_symbols.get(symbol)
+        return missing_at is not None and (time.monotonic() - missing_at) < self.missing_symbol_ttl_seconds
+
+    def get_filter(self, ticker: str, filter_type: str, fetch_exchange_info: Callable[[], ExchangeInformation]) \
+            -> Optional[dict]:
+        symbol = ticker.upper()
+        if self.get_symbol(ticker=symbol, fetch_exchange_info=fetch_exchange_info) is None:
+            return None
+        symbol_filter = self.filters.get(symbol, {}).get(filter_type)
+        if symbol_filter is None:
+            # Filters may have changed since the metadata was cached, reload once before giving up
+            self.get_symbol(ticker=symbol, fetch_exchange_info=fetch_exchange_info, force_refresh=True)
+            symbol_filter = self.filters.get(symbol, {}).get(filter_type)
+        return symbol_filter
+
+    def __refresh_if_required(self, fetch_exchange_info: Callable[[], ExchangeInformation], force_refresh: bool):
+        if not force_refresh and not self.is_expired():
+            return
+        with self.lock:
+            # Another thread may have refreshed while we waited on the lock
+            if not force_refresh and not self.is_expired():
+                return
+            logger.info("Refreshing exchange information symbol cache")
+            self.load(fetch_exchange_info())
+
+
+_SYMBOL_INFO_CACHES: Dict[str, SymbolInfoCache] = {}
+_SYMBOL_INFO_CACHES_LOCK = threading.Lock()
+
+
+def get_symbol_info_cache(base_url: str) -> SymbolInfoCache:
+    """
+    Returns the process-wide cache for the given exchange base URL, creating it on first use.
+    """
+    with _SYMBOL_INFO_CACHES_LOCK:
+        cache = _SYMBOL_INFO_CACHES.get(base_url)
+        if cache is None:
+            ttl_seconds = float(os.environ.get(EXCHANGE_INFO_TTL_ENV_VAR, DEFAULT_EXCHANGE_INFO_TTL_SECONDS))
+            cache = SymbolInfoCache(ttl_seconds=ttl_seconds)
+            _SYMBOL_INFO_CACHES[base_url] = cache
+        return cache
@@ -0,0 +1,97 @@
+import json
+import unittest
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.utils import JsonWrapper
+from binance_f.model import ExchangeInformation
+
+from chalicelib.exchanges.binanceexchangeclient import BinanceExchangeClient, build_batch_order_params
+from chalicelib.exchanges.symbolinfocache import SymbolInfoCache
+from chalicelib.models.orders.slorder import StopLossOrder
+from chalicelib.models.orders.tpmarketorder import TakeProfitMarketOrder
+
+
+USER_CONFIG = {"TESTNET_API_KEY": "test-key", "TESTNET_SECRET_KEY": "test-secret"}
+
+
+class StubRequestClient:
+
+    def __init__(self, order_error: BinanceApiException):
+        with open("sample-exchange-info.json") as exchange_info:
+            self.exchange_info = ExchangeInformation.json_parse(JsonWrapper(json.load(exchange_info)))
+        self.order_error = order_error
+        self.exchange_info_fetches = 0
+
+    def get_exchange_information(self) -> ExchangeInformation:
+        self.exchange_info_fetches += 1
+        return self.exchange_info
+
+    def post_order(self, **kwargs):
+        raise self.order_error
+
+
+class BinanceExchangeClientTest(unittest.TestCase):
+
+    def create_client(self, error_message: str) -> BinanceExchangeClient:
+        client = BinanceExchangeClient(is_test_platform=True, user_config=USER_CONFIG)
+        client.client = StubRequestClient(BinanceApiException(BinanceApiException.EXEC_ERROR, error_message))
+        client.symbol_info_cache = SymbolInfoCache(ttl_seconds=60)
+        return client
+
+    def place_rejected_order(self, client: BinanceExchangeClient):
+        with self.assertRaises(BinanceApiException):
+            client.place_order(StopLossOrder(side="SELL", ticker="CHRUSDT", order_id_str="sl", trigger_price=0.5))
+
+    def test_filter_rejection_refreshes_symbol_information(self):
+        # given
+        class_under_test = self.create_client("[Executing] -4014: Price not increased by tick size.")
+        class_under_test.get_price_precision(ticker="CHRUSDT")
+
+        # when
+        self.place_rejected_order(class_under_test)
+        price_precision = class_under_test.get_price_precision(ticker="CHRUSDT")
+
+        # then
+        self.assertEqual(4, price_precision)
+        self.assertEqual(2, class_under_test.client.exchange_info_fetches)
+
+    def test_other_rejections_keep_symbol_information(self):
+        # given
+        class_under_test = self.create_client("[Executing] -2019: Margin is insufficient.")
+        class_under_test.get_price_precision(ticker="CHRUSDT")
+
+        # when
+        self.place_rejected_order(class_under_test)
+        class_under_test.get_price_precision(ticker="CHRUSDT")
+
+        # then
+        self.assertEqual(1, class_under_test.client.exchange_info_fetches)
+
+    def test_batch_order_params_are_strings_without_unset_values(self):
+        # given
+        tp_order = TakeProfitMarketOrder(side="SELL", ticker="BTCUSDT", token_qty=0.25, trigger_price=31000.5,
+                                         exit_percentage=50)
+        tp_order.reduce_only = True
+
+        # when
+        params = build_batch_order_params(tp_order)
+
+        # then
+        self.assertEqual({"symbol": "BTCUSDT", "side": "SELL", "type": "TAKE_PROFIT_MARKET", "quantity": "0.25",
+                          "reduceOnly": "true", "newClientOrderId": tp_order.order_id, "stopPrice": "31000.5",
+                          "newOrderRespType": "RESULT"}, params)
+
+    def test_batch_order_params_keep_order_id(self):
+        # given
+        sl_order = StopLossOrder(side="BUY", ticker="ETHUSDT", order_id_str="sl", trigger_price=1800.0)
+
+        # when
+        params = build_batch_order_params(sl_order)
+
+        # then
+        self.assertEqual(sl_order.order_id, params["newClientOrderId"])
+        self.assertEqual("STOP_MARKET", params["type"])
+
+
+if __name__ == '__main__':
+    unittest.main()
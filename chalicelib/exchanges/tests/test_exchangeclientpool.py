@@ -0,0 +1,81 @@
+import unittest
+
+from binance_f.impl import restapiinvoker
+
+from chalicelib.exchanges.binanceexchangeclient import BinanceExchangeClient
+from chalicelib.exchanges.dummybinanceexchangeclient import DummyBinanceExchangeClient
+from chalicelib.exchanges.exchangeclientpool import ExchangeClientPool, get_http_session
+
+USER_CONFIG = {"BINANCE_API_KEY": "live-key", "BINANCE_SECRET_KEY": "live-secret", "TESTNET_API_KEY": "test-key",
+               "TESTNET_SECRET_KEY": "test-secret"}
+
+
+class ExchangeClientPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.built = []
+
+    def client_factory(self, is_test_platform: bool, is_dry_run: bool, user_config: dict):
+        client = object()
+        self.built.append((is_test_platform, is_dry_run, client))
+        return client
+
+    def test_client_is_reused_for_same_user_and_platform(self):
+        # given
+        class_under_test = ExchangeClientPool(client_factory=self.client_factory)
+
+        # when
+        first = class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=True)
+        second = class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=True)
+
+        # then
+        self.assertIs(first, second)
+        self.assertEqual(1, len(self.built))
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1}, class_under_test.stats())
+
+    def test_only_requested_client_is_built_per_key(self):
+        # given
+        class_under_test = ExchangeClientPool(client_factory=self.client_factory)
+
+        # when
+        class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=False)
+        class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=True)
+        class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=True, is_dry_run=True)
+        class_under_test.get_client(user_id="user2", user_config=USER_CONFIG, is_test_platform=True)
+
+        # then
+        self.assertEqual([(False, False), (True, False), (True, True), (True, False)],
+                         [(is_test, is_dry_run) for is_test, is_dry_run, _ in self.built])
+        self.assertEqual({"hits": 0, "misses": 4, "size": 4}, class_under_test.stats())
+
+    def test_changed_user_config_rebuilds_client(self):
+        # given
+        class_under_test = ExchangeClientPool(client_factory=self.client_factory)
+        first = class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=False)
+
+        # when
+        rotated_config = dict(USER_CONFIG, BINANCE_API_KEY="rotated-key")
+        second = class_under_test.get_client(user_id="user1", user_config=rotated_config, is_test_platform=False)
+
+        # then
+        self.assertIsNot(first, second)
+        self.assertEqual({"hits": 0, "misses": 2, "size": 1}, class_under_test.stats())
+
+    def test_default_factory_builds_binance_clients_on_shared_session(self):
+        # given
+        class_under_test = ExchangeClientPool()
+
+        # when
+        live_client = class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=False)
+        dry_run_client = class_under_test.get_client(user_id="user1", user_config=USER_CONFIG, is_test_platform=True,
+                                                     is_dry_run=True)
+
+        # then
+        self.assertIs(BinanceExchangeClient, type(live_client))
+        self.assertIsInstance(dry_run_client, DummyBinanceExchangeClient)
+        self.assertTrue(dry_run_client.is_test_platform)
+        self.assertIs(get_http_session(), restapiinvoker.requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
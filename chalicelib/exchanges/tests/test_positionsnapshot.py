@@ -0,0 +1,55 @@
+import unittest
+
+from binance_f.model import Position
+
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.exchanges.positionsnapshot import PositionSnapshot
+
+
+def create_position(symbol: str, position_amt: float, position_side: str = "BOTH") -> Position:
+    position = Position()
+    position.symbol = symbol
+    position.positionAmt = position_amt
+    position.positionSide = position_side
+    return position
+
+
+class PositionSnapshotTest(unittest.TestCase):
+
+    def test_positions_are_looked_up_by_symbol(self):
+        # given
+        class_under_test = PositionSnapshot([create_position("BTCUSDT", 0.5), create_position("ETHUSDT", 0)])
+
+        # when / then
+        self.assertEqual(0.5, class_under_test.get("btcusdt").positionAmt)
+        self.assertEqual("ETHUSDT", class_under_test.get("ETHUSDT").symbol)
+        self.assertIsNone(class_under_test.get_open("ETHUSDT"))
+        self.assertIsNone(class_under_test.get("CHRUSDT"))
+        self.assertEqual(2, len(class_under_test))
+
+    def test_first_position_of_a_symbol_is_kept(self):
+        # given
+        class_under_test = PositionSnapshot([create_position("BTCUSDT", 0.5, "LONG"),
+                                             create_position("BTCUSDT", -0.2, "SHORT")])
+
+        # when / then
+        self.assertEqual("LONG", class_under_test.get("BTCUSDT").positionSide)
+
+    def test_exchange_client_symbol_position_reads_positions_once(self):
+        # given
+        exchange_client = FakeBinanceExchangeClient()
+        exchange_client.set_positions([{
+            "entryPrice": 100, "marginType": "isolated", "isAutoAddMargin": False, "isolatedMargin": 0,
+            "leverage": 10, "liquidationPrice": 0, "markPrice": 101, "maxNotionalValue": 20000000,
+            "positionAmt": -500, "symbol": "CHRUSDT", "unRealizedProfit": 0, "positionSide": "BOTH"}])
+
+        # when
+        position = exchange_client.get_symbol_position(ticker="chrusdt")
+
+        # then
+        self.assertEqual(-500, position.positionAmt)
+        self.assertEqual(1, exchange_client.position_reads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import unittest
+
+from binance_f.impl.utils import JsonWrapper
+from binance_f.model import ExchangeInformation
+
+from chalicelib.exchanges.symbolinfocache import SymbolInfoCache
+
+
+class SymbolInfoCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        with open("sample-exchange-info.json") as exchange_info:
+            self.exchange_info = ExchangeInformation.json_parse(JsonWrapper(json.load(exchange_info)))
+        self.fetch_count = 0
+
+    def fetch_exchange_info(self) -> ExchangeInformation:
+        self.fetch_count += 1
+        return self.exchange_info
+
+    def test_symbol_lookups_fetch_exchange_info_once(self):
+        # given
+        class_under_test = SymbolInfoCache(ttl_seconds=60)
+
+        # when
+        btc = class_under_test.get_symbol(ticker="btcusdt", fetch_exchange_info=self.fetch_exchange_info)
+        chr_symbol = class_under_test.get_symbol(ticker="CHRUSDT", fetch_exchange_info=self.fetch_exchange_info)
+        price_filter = class_under_test.get_filter(ticker="CHRUSDT", filter_type="PRICE_FILTER",
+                                                   fetch_exchange_info=self.fetch_exchange_info)
+
+        # then
+        self.assertEqual(1, self.fetch_count)
+        self.assertEqual(3, btc.quantityPrecision)
+        self.assertEqual(0, chr_symbol.quantityPrecision)
+        self.assertEqual("0.00010", price_filter["tickSize"])
+
+    def test_expired_cache_is_refreshed(self):
+        # given
+        class_under_test = SymbolInfoCache(ttl_seconds=0)
+
+        # when
+        class_under_test.get_symbol(ticker="BTCUSDT", fetch_exchange_info=self.fetch_exchange_info)
+        class_under_test.get_symbol(ticker="BTCUSDT", fetch_exchange_info=self.fetch_exchange_info)
+
+        # then
+        self.assertEqual(2, self.fetch_count)
+
+    def test_missing_filter_forces_refresh(self):
+        # given
+        class_under_test = SymbolInfoCache(ttl_seconds=60)
+
+        # when
+        price_filter = class_under_test.get_filter(ticker="BTCUSDT", filter_type="MARKET_LOT_SIZE",
+                                                   fetch_exchange_info=self.fetch_exchange_info)
+
+        # then
+        self.assertIsNone(price_filter)
+        self.assertEqual(2, self.fetch_count)
+
+    def test_unknown_symbol_forces_refresh_and_returns_none(self):
+        # given
+        class_under_test = SymbolInfoCache(ttl_seconds=60)
+
+        # when
+        symbol = class_under_test.get_symbol(ticker="DOGEUSDT", fetch_exchange_info=self.fetch_exchange_info)
+
+        # then
+        self.assertIsNone(symbol)
+        self.assertEqual(2, self.fetch_count)
+
+    def test_unknown_symbol_is_remembered_as_missing(self):
+        # given
+        class_under_test = SymbolInfoCache(ttl_seconds=60)
+
+        # when
+        class_under_test.get_symbol(ticker="DOGEUSDT", fetch_exchange_info=self.fetch_exchange_info)
+        symbol = class_under_test.get_symbol(ticker="DOGEUSDT", fetch_exchange_info=self.fetch_exchange_info)
+
+        # then
+        self.assertIsNone(symbol)
+        self.assertEqual(2, self.fetch_count)
+
+    def test_invalidated_symbol_is_refreshed_on_its_next_lookup(self):
+        # given
+        class_under_test = SymbolInfoCache(ttl_seconds=60)
+        class_under_test.get_symbol(ticker="BTCUSDT", fetch_exchange_info=self.fetch_exchange_info)
+
+        # when
+        class_under_test.invalidate(ticker="btcusdt")
+        class_under_test.get_symbol(ticker="CHRUSDT", fetch_exchange_info=self.fetch_exchange_info)
+        class_under_test.get_symbol(ticker="BTCUSDT", fetch_exchange_info=self.fetch_exchange_info)
+        class_under_test.get_symbol(ticker="BTCUSDT", fetch_exchange_info=self.fetch_exchange_info)
+
+        # then
+        self.assertEqual(2, self.fetch_count)
@@ -0,0 +1,84 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from binance_f.model import Order as LibOrder
+from binance_f.model import Position
+
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.exchanges.positionsnapshot import PositionSnapshot
+from chalicelib.models.orders.order import Order
+from chalicelib.models.orders.orderresult import OrderResult
+
+
+class ReadSharingExchangeClient(ExchangeClient):
+    """
+    Exchange client shared by work queued back to back for one ticker. Positions, open orders and the portfolio
+    value are read once and reused by later work until anything is placed, cancelled or changed on the exchange,
+    which clears them.
+
+    A read is only reused by work queued before it was taken, as the event behind work queued later may have changed
+    the exchange since. Reads are stamped with the last queued sequence number when they start, and the work being run
+    is identified by its own sequence number.
+    """
+
+    def __init__(self, exchange_client: ExchangeClient, last_sequence: Callable[[], int]):
+        self.exchange_client = exchange_client
+        self.last_sequence = last_sequence
+        self.reads: Dict[tuple, Tuple[int, object]] = {}
+        self.reader_sequence = 0
+        self.shared_reads = 0
+
+    def __read(self, key: tuple, fetch):
+        read = self.reads.get(key)
+        if read is not None and read[0] >= self.reader_sequence:
+            self.shared_reads += 1
+            return read[1]
+        sequence = self.last_sequence()
+        result = fetch()
+        self.reads[key] = (sequence, result)
+        return result
+
+    def __write(self, write):
+        # Cleared even when the write fails, as it may still have reached the exchange
+        try:
+            return write()
+        finally:
+            self.reads.clear()
+
+    # ORDERS
+    def place_order(self, order: Order):
+        return self.__write(lambda: self.exchange_client.place_order(order))
+
+    def place_batch_orders(self, orders: List[Order]) -> List[OrderResult]:
+        return self.__write(lambda: self.exchange_client.place_batch_orders(orders))
+
+    def get_position(self) -> List[Position]:
+        return self.__read(("positions",), self.exchange_client.get_position)
+
+    def get_position_snapshot(self, tickers: Optional[Iterable[str]] = None) -> PositionSnapshot:
+        tickers = tuple(sorted(ticker.upper() for ticker in tickers)) if tickers is not None else None
+        return self.__read(("position_snapshot", tickers),
+                           lambda: self.exchange_client.get_position_snapshot(tickers=tickers))
+
+    def get_open_orders(self, ticker: str) -> List[LibOrder]:
+        return self.__read(("open_orders", ticker), lambda: self.exchange_client.get_open_orders(ticker=ticker))
+
+    def cancel_list_orders(self, ticker: str, orders: List[int]):
+        return self.__write(lambda: self.exchange_client.cancel_list_orders(ticker, orders))
+
+    # PRECISION
+    def get_quantity_precision(self, ticker: str) -> int:
+        return self.exchange_client.get_quantity_precision(ticker=ticker)
+
+    def get_price_precision(self, ticker: str) -> int:
+        return self.exchange_client.get_price_precision(ticker=ticker)
+
+    # LEVERAGE
+    def update_leverage(self, leverage: int, ticker: str):
+        return self.__write(lambda: self.exchange_client.update_leverage(leverage=leverage, ticker=ticker))
+
+    def update_margin_type(self, margin_type: str, ticker: str):
+        return self.__write(lambda: self.exchange_client.update_margin_type(margin_type=margin_type, ticker=ticker))
+
+    # PORTFOLIO
+    def get_portfolio_value(self) -> float:
+        return self.__read(("portfolio_value",), self.exchange_client.get_portfolio_value)
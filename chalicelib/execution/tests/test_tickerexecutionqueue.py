@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.execution.tickerexecutionqueue import TickerExecutionQueue
+
+
+class TickerExecutionQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.class_under_test = TickerExecutionQueue()
+        self.exchange_client = FakeBinanceExchangeClient()
+        self.results = {}
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def submit(self, name: str, work, ticker: str = "BTCUSDT", coalesce_key: str = None) -> threading.Thread:
+        def run():
+            self.results[name] = self.class_under_test.run(user_id="user", ticker=ticker,
+                                                           exchange_client=self.exchange_client, work=work,
+                                                           coalesce_key=coalesce_key)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def blocking_work(self, client):
+        self.started.set()
+        self.release.wait(5)
+        return "first"
+
+    def wait_for_queued(self, count: int):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            queue = self.class_under_test.queues.get(("user", "BTCUSDT"))
+            if queue is not None and len(queue.pending) == count:
+                return
+            time.sleep(0.005)
+        self.fail(f"Expected {count} queued work items")
+
+    def test_work_for_a_ticker_runs_one_at_a_time(self):
+        # given
+        executed = []
+        first = self.submit("first", self.blocking_work)
+        self.started.wait(5)
+
+        # when
+        second = self.submit("second", lambda client: executed.append("second") or "second")
+        other_ticker = self.submit("other", lambda client: executed.append("other") or "other", ticker="ETHUSDT")
+        other_ticker.join(5)
+        self.wait_for_queued(1)
+        queued_before_release = list(executed)
+        self.release.set()
+        first.join(5)
+        second.join(5)
+
+        # then
+        self.assertEqual(["other"], queued_before_release)
+        self.assertEqual({"first": "first", "second": "second", "other": "other"}, self.results)
+        self.assertEqual({}, self.class_under_test.queues)
+
+    def test_queued_work_is_superseded_by_newer_work_with_the_same_key(self):
+        # given
+        executed = []
+        first = self.submit("first", self.blocking_work)
+        self.started.wait(5)
+        older = self.submit("older", lambda client: executed.append("older") or "older", coalesce_key="exit:BUY")
+        self.wait_for_queued(1)
+        other_side = self.submit("sell", lambda client: executed.append("sell") or "sell", coalesce_key="exit:SELL")
+        self.wait_for_queued(2)
+
+        # when
+        newer = self.submit("newer", lambda client: executed.append("newer") or "newer", coalesce_key="exit:BUY")
+        self.wait_for_queued(2)
+        self.release.set()
+        for thread in [first, older, other_side, newer]:
+            thread.join(5)
+
+        # then
+        self.assertEqual(["sell", "newer"], executed)
+        self.assertEqual("newer", self.results["older"])
+        self.assertEqual(1, self.class_under_test.coalesced)
+
+    def test_work_run_back_to_back_shares_reads_until_a_write(self):
+        # given
+        def cancel_orders(client):
+            open_orders = client.get_open_orders(ticker="BTCUSDT")
+            client.cancel_list_orders("BTCUSDT", [order.orderId for order in open_orders])
+            return client.get_open_orders(ticker="BTCUSDT")
+
+        first = self.submit("first", lambda client: self.blocking_work(client) and client.get_open_orders("BTCUSDT"))
+        self.started.wait(5)
+        second = self.submit("second", cancel_orders)
+        self.wait_for_queued(1)
+
+        # when
+        self.release.set()
+        first.join(5)
+        second.join(5)
+
+        # then
+        self.assertEqual(2, self.exchange_client.open_order_reads)
+
+    def test_reads_taken_before_work_was_queued_are_not_shared_with_it(self):
+        # given
+        def read_then_block(client):
+            client.get_position()
+            client.get_open_orders(ticker="BTCUSDT")
+            return self.blocking_work(client)
+
+        def read_position_and_orders(client):
+            client.get_position()
+            client.get_open_orders(ticker="BTCUSDT")
+            # Taken after this work was queued, so reused within it
+            return client.get_position()
+
+        first = self.submit("first", read_then_block)
+        self.started.wait(5)
+
+        # when
+        # e.g. a fill event closing the position after the first work read it
+        second = self.submit("second", read_position_and_orders)
+        self.wait_for_queued(1)
+        self.release.set()
+        first.join(5)
+        second.join(5)
+
+        # then
+        self.assertEqual(2, self.exchange_client.position_reads)
+        self.assertEqual(2, self.exchange_client.open_order_reads)
+
+
+if __name__ == '__main__':
+    unittest.main()
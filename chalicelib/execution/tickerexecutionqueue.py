@@ -0,0 +1,125 @@
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.execution.readsharingexchangeclient import ReadSharingExchangeClient
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+
+class WorkItem:
+
+    def __init__(self, work: Callable[[ExchangeClient], Any], exchange_client: ExchangeClient,
+                 coalesce_key: Optional[str], sequence: int):
+        self.work = work
+        self.exchange_client = exchange_client
+        self.coalesce_key = coalesce_key
+        # Order the item was queued in across every ticker, so it only reuses exchange reads taken after that
+        self.sequence = sequence
+        self.future = Future()
+        # Futures of queued items this one superseded, which get its result
+        self.followers: List[Future] = []
+
+    def set_result(self, result):
+        for future in [self.future] + self.followers:
+            future.set_result(result)
+
+    def set_exception(self, err: Exception):
+        for future in [self.future] + self.followers:
+            future.set_exception(err)
+
+
+class TickerQueue:
+
+    def __init__(self):
+        self.pending: Deque[WorkItem] = deque()
+        self.is_draining = False
+
+
+class TickerExecutionQueue:
+    """
+    Runs the work for one user and ticker one item at a time, so an entry, an exit and order update events arriving
+    together no longer read the same positions and orders and race each other to cancel them.
+
+    The thread submitting work to an idle ticker runs it, and then anything queued behind it, so there is no thread
+    hop when nothing else is in flight, e.g. in Lambda where a container handles one request at a time. Queued work
+    with the same coalesce key and exchange client as newer work is superseded and shares the newer work's result,
+    and work run back to back shares its exchange reads until something is written, as long as the reads were taken
+    after the work was queued.
+    """
+
+    def __init__(self):
+        self.queues: Dict[Tuple[str, str], TickerQueue] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def run(self, user_id: Optional[str], ticker: str, exchange_client: ExchangeClient,
+            work: Callable[[ExchangeClient], Any], coalesce_key: Optional[str] = None):
+        """
+        Runs work with an exchange client for the ticker once earlier work for the same user and ticker is done, and
+        returns its result. The client passed to work shares reads with the work run before it.
+        """
+        key = (str(user_id), ticker.upper())
+        with self.lock:
+            self.sequence += 1
+            item = WorkItem(work=work, exchange_client=exchange_client, coalesce_key=coalesce_key,
+                            sequence=self.sequence)
+            queue = self.queues.setdefault(key, TickerQueue())
+            if coalesce_key is not None:
+                superseded = [queued for queued in queue.pending
+                              if queued.coalesce_key == coalesce_key and queued.exchange_client is exchange_client]
+                for queued in superseded:
+                    queue.pending.remove(queued)
+                    item.followers += [queued.future] + queued.followers
+                    self.coalesced += 1 + len(queued.followers)
+                    logger.info("Queued %s work for %s superseded by a newer request", coalesce_key, key[1])
+            queue.pending.append(item)
+            is_drainer = not queue.is_draining
+            queue.is_draining = True
+        if is_drainer:
+            self.__drain(key=key, queue=queue)
+        return item.future.result()
+
+    def __drain(self, key: Tuple[str, str], queue: TickerQueue):
+        clients: Dict[int, ReadSharingExchangeClient] = {}
+        while True:
+            with self.lock:
+                if not queue.pending:
+                    queue.is_draining = False
+                    del self.queues[key]
+                    return
+                item = queue.pending.popleft()
+            client = clients.get(id(item.exchange_client))
+            if client is None:
+                client = ReadSharingExchangeClient(exchange_client=item.exchange_client,
+                                                   last_sequence=self.__last_sequence)
+                clients[id(item.exchange_client)] = client
+            client.reader_sequence = item.sequence
+            try:
+                item.set_result(item.work(client))
+            except Exception as err:
+                item.set_exception(err)
+            self.executed += 1
+
+    def __last_sequence(self) -> int:
+        return self.sequence
+
+
+_TICKER_EXECUTION_QUEUE: Optional[TickerExecutionQueue] = None
+_TICKER_EXECUTION_QUEUE_LOCK = threading.Lock()
+
+
+def get_ticker_execution_queue() -> TickerExecutionQueue:
+    """
+    Returns the process-wide ticker execution queue, creating it on first use.
+    """
+    global _TICKER_EXECUTION_QUEUE
+    with _TICKER_EXECUTION_QUEUE_LOCK:
+        if _TICKER_EXECUTION_QUEUE is None:
+            _TICKER_EXECUTION_QUEUE = TickerExecutionQueue()
+        return _TICKER_EXECUTION_QUEUE
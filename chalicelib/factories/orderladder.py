@@ -0,0 +1,98 @@
+from typing import List, Sequence
+
+import numpy as np
+
+from chalicelib.constants import Constants
+
+# Below this many rungs the NumPy call overhead outweighs the per rung round() calls it saves
+MIN_VECTORISED_RUNGS = 20
+# Scaled values this close to half a tick may sit either side of it before scaling, so round() decides those
+HALF_TICK_TOLERANCE = 1e-6
+
+
+def quantize(values, precision: int) -> np.ndarray:
+    """
+    Rounds values to precision decimal places with the same result as round() on each value. Values are snapped to
+    a whole number of ticks and only then scaled back, so every result is the float closest to its decimal tick.
+
+    Scaling can carry a value sitting just off half a tick onto it, where rint and round() may disagree, so the few
+    values that land near half a tick are rounded with round() instead.
+    """
+    values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+    scale = 10.0 ** precision
+    scaled = values * scale
+    ticks = np.rint(scaled)
+    quantized = ticks / scale
+    near_half_tick = np.abs(scaled - ticks) > 0.5 - HALF_TICK_TOLERANCE
+    if near_half_tick.any():
+        for idx in np.flatnonzero(near_half_tick):
+            quantized[idx] = round(float(values[idx]), precision)
+    return quantized
+
+
+def split_quantities(total_qty: float, qty_precision: int, qty_splits: Sequence[float]) -> List[float]:
+    """
+    Splits total_qty by percentage, each split rounded to qty_precision. The last split is whatever remains so the
+    splits always add up to the rounded total, and any other split that rounds to nothing is left out.
+    """
+    if len(qty_splits) >= MIN_VECTORISED_RUNGS:
+        return split_quantities_array(total_qty=total_qty, qty_precision=qty_precision,
+                                      qty_splits=qty_splits).tolist()
+    qty_remaining = total_qty
+    splits = []
+    for split in qty_splits[:-1]:
+        qty = round(total_qty * (split / 100), qty_precision)
+        qty_remaining -= qty
+        if qty > 0:
+            splits.append(qty)
+    splits.append(round(qty_remaining, qty_precision))
+    return splits
+
+
+def split_quantities_array(total_qty: float, qty_precision: int, qty_splits: Sequence[float]) -> np.ndarray:
+    splits = np.asarray(qty_splits, dtype=np.float64)
+    leading_qtys = quantize(total_qty * (splits[:-1] / 100), qty_precision)
+    # Subtracted one split at a time, as summing the splits first can round the remainder differently
+    qty_remaining = np.subtract.accumulate(np.concatenate(([total_qty], leading_qtys)))[-1]
+    return np.concatenate((leading_qtys[leading_qtys > 0], quantize(qty_remaining, qty_precision)))
+
+
+def atr_offset_prices(entry_price: float, atr: float, atr_multipliers: Sequence[float], price_precision: int,
+                      is_above: bool, round_distance: bool = True) -> List[float]:
+    """
+    Prices atr * multiplier above or below entry_price, rounded to price_precision. With round_distance the distance
+    itself is rounded first, as trigger prices always have been.
+    """
+    if len(atr_multipliers) >= MIN_VECTORISED_RUNGS:
+        return atr_offset_prices_array(entry_price=entry_price, atr=atr, atr_multipliers=atr_multipliers,
+                                       price_precision=price_precision, is_above=is_above,
+                                       round_distance=round_distance).tolist()
+    prices = []
+    for atr_multiplier in atr_multipliers:
+        distance = atr * atr_multiplier
+        if round_distance:
+            distance = round(distance, price_precision)
+        prices.append(round(entry_price + distance if is_above else entry_price - distance, price_precision))
+    return prices
+
+
+def atr_offset_prices_array(entry_price: float, atr: float, atr_multipliers: Sequence[float], price_precision: int,
+                            is_above: bool, round_distance: bool = True) -> np.ndarray:
+    distances = atr * np.asarray(atr_multipliers, dtype=np.float64)
+    if round_distance:
+        distances = quantize(distances, price_precision)
+    return quantize(entry_price + distances if is_above else entry_price - distances, price_precision)
+
+
+def dca_entry_prices(entry_price: float, atr: float, atr_multipliers: Sequence[float], price_precision: int,
+                     pos_side: Constants.OrderSide) -> List[float]:
+    # DCA entries sit on the losing side of the current price, where the stop loss would be
+    return atr_offset_prices(entry_price=entry_price, atr=atr, atr_multipliers=atr_multipliers,
+                             price_precision=price_precision, is_above=pos_side != Constants.OrderSide.BUY)
+
+
+def take_profit_prices(entry_price: float, atr: float, atr_multipliers: Sequence[float], price_precision: int,
+                       pos_side: Constants.OrderSide, round_distance: bool = True) -> List[float]:
+    return atr_offset_prices(entry_price=entry_price, atr=atr, atr_multipliers=atr_multipliers,
+                             price_precision=price_precision, is_above=pos_side == Constants.OrderSide.BUY,
+                             round_distance=round_distance)
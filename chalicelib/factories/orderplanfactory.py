@@ -0,0 +1,79 @@
+from chalicelib.account.account import Account
+from chalicelib.constants import Constants
+from chalicelib.exceptions.risktoohighexception import RiskTooHighException
+from chalicelib.factories.positionorderfactory import PositionOrderFactory
+from chalicelib.factories.slorderfactory import StopLossOrderFactory
+from chalicelib.factories.tporderfactory import TakeProfitOrderFactory
+from chalicelib.indicators.atr import ATR
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.models.orders.orderplan import OrderPlan
+from chalicelib.risk.positionsizer import PositionSizer
+from chalicelib.risk.risk import Risk, DEFAULT_MAX_PORTFOLIO_RISK
+from chalicelib.token import Token
+
+logger = get_logger()
+
+
+class OrderPlanFactory:
+    """
+    Builds the position, stop loss and take profit orders for a webhook payload, sizing the position down to the
+    maximum portfolio risk when the payload asks for it. Raises RiskTooHighException when no position is within risk.
+    """
+    KEYS = Constants.JsonRequestKeys
+    RISK_KEYS = KEYS.Risk
+
+    def __init__(self, request: dict, constants: Constants, account: Account, token: Token, atr: ATR):
+        self.request = request
+        self.constants = constants
+        self.account = account
+        self.token = token
+        self.atr = atr
+
+    def create_plan(self) -> OrderPlan:
+        is_auto_adjust_for_risk = self.request.get(self.RISK_KEYS.RISK, {})\
+            .get(self.RISK_KEYS.AUTO_ADJUST_FOR_RISK, False)
+        logger.info("Should auto adjust position based on risk: %s", is_auto_adjust_for_risk)
+        max_portfolio_risk = float(self.request.get(self.RISK_KEYS.RISK, {})
+                                   .get(self.RISK_KEYS.PORTFOLIO_RISK, DEFAULT_MAX_PORTFOLIO_RISK))
+
+        sl_factory = StopLossOrderFactory(request=self.request, constants=self.constants, atr=self.atr,
+                                          token=self.token)
+        sl_orders = sl_factory.create_orders()
+        sl_trigger_price = sl_orders[0].trigger_price
+
+        position_factory = PositionOrderFactory(request=self.request, constants=self.constants, account=self.account,
+                                                token=self.token, atr=self.atr)
+        if is_auto_adjust_for_risk:
+            # The largest quantity within risk is solved for up front so orders are only built once
+            position_sizer = PositionSizer(portfolio_value=self.account.portfolio_value,
+                                           max_portfolio_risk=max_portfolio_risk, sl_trigger_price=sl_trigger_price,
+                                           entry_prices=position_factory.calculate_entry_prices(),
+                                           qty_splits=position_factory.get_qty_splits(),
+                                           qty_precision=self.token.qty_precision)
+            try:
+                position_factory.position_size_override = position_sizer.calculate_token_qty(
+                    max_token_qty=position_factory.calculate_max_token_qty())
+            except RiskTooHighException as err:
+                logger.warning("%s. No position size is within maximum acceptable risk percentage. Will not place any "
+                               "orders", err)
+                raise
+        position_orders = position_factory.create_orders()
+
+        # Risk analysis
+        portfolio_value = self.account.portfolio_value
+        token_qty = sum([order.token_qty for order in position_orders])
+        average_entry_price = sum([order.entry_price * (order.token_qty / token_qty) for order in position_orders])
+        risk = Risk(token_qty=token_qty, sl_trigger_price=sl_trigger_price, portfolio_value=portfolio_value,
+                    max_portfolio_risk=max_portfolio_risk, token_price=average_entry_price)
+        try:
+            risk.perform_risk_analysis()
+            logger.info("Position size within acceptable risk percentage")
+        except RiskTooHighException as err:
+            logger.warning("%s. Position size exceeded maximum acceptable risk percentage. Will not place any orders",
+                           err)
+            raise
+
+        tp_factory = TakeProfitOrderFactory(request=self.request, constants=self.constants, atr=self.atr,
+                                            token_qty=token_qty, token=self.token)
+        tp_orders = tp_factory.create_orders()
+        return OrderPlan(position_orders=position_orders, sl_orders=sl_orders, tp_orders=tp_orders, risk=risk)
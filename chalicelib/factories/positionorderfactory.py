@@ -1,14 +1,17 @@
 from typing import List
 
-from chalicelib import orderutils
 from chalicelib.account.account import Account
 from chalicelib.constants import Constants
+from chalicelib.factories import orderladder
 from chalicelib.factories.orderfactory import OrderFactory
 from chalicelib.indicators.atr import ATR
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.models.orders.positiondcaorder import PositionDCAOrder
 from chalicelib.models.orders.positionmarketorder import PositionMarketOrder
 from chalicelib.token import Token
 
+logger = get_logger()
+
 
 class PositionOrderFactory(OrderFactory):
     KEYS = Constants.JsonRequestKeys
@@ -24,13 +27,13 @@ class PositionOrderFactory(OrderFactory):
         self.position_size_override = position_size_override
 
     def create_orders(self):
-        print(f"Building Position Order {self.request}")
+        logger.debug("Building Position Order %s", self.request)
 
         position_json = self.request.get(self.POSITION_KEYS.POSITION)
         ticker = str(position_json.get(self.POSITION_KEYS.TICKER))
         side = position_json.get(self.POSITION_KEYS.SIDE)
         stake = int(position_json.get(self.POSITION_KEYS.STAKE))
-        print(f"Position stake: {stake}")
+        logger.debug("Position stake: %s", stake)
         leverage = int(position_json.get(self.POSITION_KEYS.LEVERAGE))
 
         # DCA position values
@@ -42,13 +45,13 @@ class PositionOrderFactory(OrderFactory):
         token_price = self.token.token_price
         qty_precision = self.token.qty_precision
         position_size = self.__calculate_position_size(stake=stake, leverage=leverage, portfolio_value=portfolio_value)
-        print(f"Calculated position size: ${position_size}")
+        logger.info("Calculated position size: $%s", position_size)
 
-        print(f"Position size override: {self.position_size_override}")
+        logger.debug("Position size override: %s", self.position_size_override)
         token_qty = self.position_size_override if self.position_size_override is not None else \
             self.__calculate_token_qty(position_size=position_size, token_price=token_price,
                                        qty_precision=qty_precision)
-        print(f"Calculated token quantity: {token_qty}")
+        logger.info("Calculated token quantity: %s", token_qty)
         if token_qty <= 0:
             raise ValueError(f"Position size of ${position_size} is not enough to buy any tokens at the current price "
                              f"of ${token_price} given the required quantity precision of {qty_precision}")
@@ -73,6 +76,36 @@ class PositionOrderFactory(OrderFactory):
             # Build standard MARKET position order
             return self.__build_market_order(side=side, ticker=ticker, token_qty=token_qty, token_price=token_price)
 
+    def calculate_max_token_qty(self) -> float:
+        """
+        Token quantity the stake and leverage allow for, before any adjustment for risk.
+        """
+        position_json = self.request.get(self.POSITION_KEYS.POSITION)
+        stake = int(position_json.get(self.POSITION_KEYS.STAKE))
+        leverage = int(position_json.get(self.POSITION_KEYS.LEVERAGE))
+        position_size = self.__calculate_position_size(stake=stake, leverage=leverage,
+                                                       portfolio_value=self.account.portfolio_value)
+        return self.__calculate_token_qty(position_size=position_size, token_price=self.token.token_price,
+                                          qty_precision=self.token.qty_precision)
+
+    def calculate_entry_prices(self) -> List[float]:
+        """
+        Entry price of each position order, in the order create_orders builds them.
+        """
+        position_json = self.request.get(self.POSITION_KEYS.POSITION)
+        side = position_json.get(self.POSITION_KEYS.SIDE)
+        if not position_json.get(self.POSITION_KEYS.DCA_PERCENTAGES):
+            return [self.token.token_price]
+        dca_atr_multipliers = list(position_json.get(self.POSITION_KEYS.DCA_ATR_MULTIPLIERS, []))
+        if dca_atr_multipliers:
+            return self.__calculate_dca_atr_trigger_prices(side=side, token_price=self.token.token_price,
+                                                           dca_atr_multipliers=dca_atr_multipliers)
+        return list(position_json.get(self.POSITION_KEYS.DCA_TRIGGER_PRICES, []))
+
+    def get_qty_splits(self) -> List[int]:
+        position_json = self.request.get(self.POSITION_KEYS.POSITION)
+        return list(position_json.get(self.POSITION_KEYS.DCA_PERCENTAGES, [])) or [100]
+
     @staticmethod
     def __calculate_position_size(stake: int, leverage: int, portfolio_value: float):
         stake_as_decimal = stake / 100
@@ -95,14 +128,10 @@ class PositionOrderFactory(OrderFactory):
         Builds a collection of position limit orders based on ATR multipliers.
         Each entry's token quantity is calculated based on the dca_percentage values specified.
         """
-        atr = self.atr.atr
         qty_precision = self.token.qty_precision
-        price_precision = self.token.price_precision
         dca_qtys = self._split_quantities(total_qty=token_qty, qty_precision=qty_precision, qty_splits=dca_percentages)
-        trigger_prices = [self.__calculate_dca_atr_trigger_price(atr=atr, trigger_atr_multiplier=atr_multiplier,
-                                                                 curr_token_price=token_price,
-                                                                 price_precision=price_precision, pos_side=side)
-                          for atr_multiplier in dca_atr_multipliers]
+        trigger_prices = self.__calculate_dca_atr_trigger_prices(side=side, token_price=token_price,
+                                                                 dca_atr_multipliers=dca_atr_multipliers)
 
         counter = range(1, len(trigger_prices) + 1)
         return [self.__build_dca_order(side=side, ticker=ticker, token_qty=dca_qty, trigger_price=trigger_price,
@@ -125,13 +154,11 @@ class PositionOrderFactory(OrderFactory):
                 for (dca_qty, trigger_price, dca_percent, count) in
                 zip(dca_qtys, dca_trigger_prices, dca_percentages, counter)]
 
-    @staticmethod
-    def __calculate_dca_atr_trigger_price(atr: float, trigger_atr_multiplier: float, curr_token_price: float,
-                                          price_precision: int, pos_side: Constants.OrderSide) -> float:
-        dca_distance = round(orderutils.calculate_atr_exit_distance(atr=atr, atr_multiplier=trigger_atr_multiplier),
-                             price_precision)
-        return orderutils.calculate_stop_loss_trigger_from_delta(
-            entry_price=curr_token_price, price_precision=price_precision, delta=dca_distance, pos_order_side=pos_side)
+    def __calculate_dca_atr_trigger_prices(self, side: Constants.OrderSide, token_price: float,
+                                           dca_atr_multipliers: List[float]) -> List[float]:
+        return orderladder.dca_entry_prices(entry_price=token_price, atr=self.atr.atr,
+                                            atr_multipliers=dca_atr_multipliers,
+                                            price_precision=self.token.price_precision, pos_side=side)
 
     @staticmethod
     def __build_dca_order(side: Constants.OrderSide, ticker: str, token_qty: float, trigger_price: float,
@@ -1,11 +1,14 @@
 from chalicelib import orderutils
 from chalicelib.constants import Constants
 from chalicelib.indicators.atr import ATR
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.models.orders.order import Order
 from chalicelib.factories.orderfactory import OrderFactory
 from chalicelib.models.orders.slorder import StopLossOrder
 from chalicelib.token import Token
 
+logger = get_logger()
+
 
 class StopLossOrderFactory(OrderFactory):
     KEYS = Constants.JsonRequestKeys
@@ -19,17 +22,17 @@ class StopLossOrderFactory(OrderFactory):
         self.token = token
 
     def create_orders(self):
-        print(f"Building Stop Loss Order {self.request}")
+        logger.debug("Building Stop Loss Order %s", self.request)
         position_json = self.request.get(self.POSITION_KEYS.POSITION)
         ticker = str(position_json.get(self.POSITION_KEYS.TICKER))
         pos_side = position_json.get(self.POSITION_KEYS.SIDE)
         sl_side = orderutils.flip_order_side(pos_side)
-        print(f"Stop loss side: {sl_side}")
+        logger.debug("Stop loss side: %s", sl_side)
         sl_request = dict(self.request.get(self.SL_KEYS.STOP_LOSS))
         fixed_trigger_price = sl_request.get(self.SL_KEYS.TRIGGER_PRICE, None)
-        print(f"Stop loss fixed trigger price: {fixed_trigger_price}")
+        logger.debug("Stop loss fixed trigger price: %s", fixed_trigger_price)
         trigger_atr_multiplier = sl_request.get(self.SL_KEYS.ATR_MULTIPLIER, None)
-        print(f"Stop loss trigger ATR multiplier: {trigger_atr_multiplier}")
+        logger.debug("Stop loss trigger ATR multiplier: %s", trigger_atr_multiplier)
 
         entry_price = self.token.token_price
         price_precision = self.token.price_precision
@@ -0,0 +1,103 @@
+import random
+import unittest
+
+from chalicelib import orderutils
+from chalicelib.factories import orderladder
+
+
+def split_quantities_with_loop(total_qty: float, qty_precision: int, qty_splits: list) -> list:
+    qty_remaining = total_qty
+    splits = []
+    for split in qty_splits[:-1]:
+        qty = round(total_qty * split / 100, qty_precision)
+        qty_remaining -= qty
+        if qty > 0:
+            splits.append(qty)
+    splits.append(round(qty_remaining, qty_precision))
+    return splits
+
+
+class OrderLadderTest(unittest.TestCase):
+
+    def test_quantize_matches_round_at_half_ticks(self):
+        # given
+        values = [2.675, 0.125, 47.766865, 1.0000005, 3.5, -0.125]
+
+        # when
+        quantized = orderladder.quantize(values, 2).tolist()
+
+        # then
+        self.assertEqual([round(value, 2) for value in values], quantized)
+
+    def test_split_quantities_skips_empty_splits_and_keeps_remainder(self):
+        # given
+        qty_splits = [1, 49, 50]
+
+        # when
+        split_qtys = orderladder.split_quantities_array(total_qty=0.3, qty_precision=1, qty_splits=qty_splits)
+
+        # then
+        self.assertEqual([0.1, 0.2], split_qtys.tolist())
+        self.assertEqual([0.1, 0.2], orderladder.split_quantities(total_qty=0.3, qty_precision=1,
+                                                                  qty_splits=qty_splits))
+
+    def test_split_quantities_match_loop(self):
+        # given
+        rng = random.Random(7)
+        for _ in range(2000):
+            qty_precision = rng.randint(0, 5)
+            total_qty = rng.uniform(0, 1000)
+            qty_splits = [rng.randint(0, 30) for _ in range(rng.randint(1, 30))]
+
+            # when
+            split_qtys = orderladder.split_quantities_array(total_qty=total_qty, qty_precision=qty_precision,
+                                                            qty_splits=qty_splits).tolist()
+
+            # then
+            self.assertEqual(split_quantities_with_loop(total_qty, qty_precision, qty_splits), split_qtys)
+
+    def test_ladder_prices_match_per_rung_calculation(self):
+        # given
+        rng = random.Random(11)
+        for _ in range(2000):
+            price_precision = rng.randint(0, 6)
+            entry_price = round(rng.uniform(0.01, 60000), price_precision)
+            atr = rng.uniform(0, entry_price / 20)
+            atr_multipliers = [round(rng.uniform(0.1, 5), 2) for _ in range(rng.randint(1, 20))]
+            pos_side = rng.choice(["BUY", "SELL"])
+
+            # when
+            dca_prices = orderladder.atr_offset_prices_array(
+                entry_price=entry_price, atr=atr, atr_multipliers=atr_multipliers, price_precision=price_precision,
+                is_above=pos_side == "SELL").tolist()
+            tp_prices = orderladder.atr_offset_prices_array(
+                entry_price=entry_price, atr=atr, atr_multipliers=atr_multipliers, price_precision=price_precision,
+                is_above=pos_side == "BUY").tolist()
+
+            # then
+            distances = [round(orderutils.calculate_atr_exit_distance(atr=atr, atr_multiplier=atr_multiplier),
+                               price_precision) for atr_multiplier in atr_multipliers]
+            self.assertEqual([orderutils.calculate_stop_loss_trigger_from_delta(
+                entry_price=entry_price, price_precision=price_precision, delta=distance, pos_order_side=pos_side)
+                for distance in distances], dca_prices)
+            self.assertEqual([orderutils.calculate_profit_trigger_from_delta(
+                entry_price=entry_price, price_precision=price_precision, delta=distance, tp_order_side=pos_side)
+                for distance in distances], tp_prices)
+
+    def test_take_profit_limit_prices_round_only_the_price(self):
+        # given
+        atr_multipliers = [1, 2] * orderladder.MIN_VECTORISED_RUNGS
+
+        # when
+        short_ladder = orderladder.take_profit_prices(entry_price=100, atr=0.125, atr_multipliers=atr_multipliers[:2],
+                                                      price_precision=1, pos_side="BUY", round_distance=False)
+        long_ladder = orderladder.take_profit_prices(entry_price=100, atr=0.125, atr_multipliers=atr_multipliers,
+                                                     price_precision=1, pos_side="BUY", round_distance=False)
+
+        # then
+        self.assertEqual([100.1, 100.2], short_ladder)
+        self.assertEqual([100.1, 100.2] * orderladder.MIN_VECTORISED_RUNGS, long_ladder)
+
+
+if __name__ == '__main__':
+    unittest.main()
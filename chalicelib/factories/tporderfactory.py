@@ -1,11 +1,15 @@
 from chalicelib import orderutils
 from chalicelib.constants import Constants
+from chalicelib.factories import orderladder
 from chalicelib.factories.orderfactory import OrderFactory
 from chalicelib.indicators.atr import ATR
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.models.orders.tplimitorder import TakeProfitLimitOrder
 from chalicelib.models.orders.tpmarketorder import TakeProfitMarketOrder
 from chalicelib.token import Token
 
+logger = get_logger()
+
 
 class TakeProfitOrderFactory(OrderFactory):
     KEYS = Constants.JsonRequestKeys
@@ -20,52 +24,54 @@ class TakeProfitOrderFactory(OrderFactory):
         self.token = token
 
     def create_orders(self):
-        print(f"Building Take Profit Order {self.request}")
+        logger.debug("Building Take Profit Order %s", self.request)
 
         tp_orders = []
         position_json = self.request.get(self.POSITION_KEYS.POSITION)
         ticker = str(position_json.get(self.POSITION_KEYS.TICKER))
         pos_side = position_json.get(self.POSITION_KEYS.SIDE)
         tp_side = orderutils.flip_order_side(pos_side)
-        print(f"Take profit side: {tp_side}")
+        logger.debug("Take profit side: %s", tp_side)
         tp_request = dict(self.request.get(self.TP_KEYS.TAKE_PROFIT))
         tp_splits = list(tp_request.get(self.TP_KEYS.SPLITS))
-        print(f"Take profit splits: {tp_splits}")
+        logger.debug("Take profit splits: %s", tp_splits)
         use_limit_ord = bool(tp_request.get(self.TP_KEYS.USE_LIMIT_ORDER))
-        print(f"Take profit use limit orders: {use_limit_ord}")
+        logger.debug("Take profit use limit orders: %s", use_limit_ord)
         limit_atr_multipliers = list(tp_request.get(self.TP_KEYS.LIMIT_ORDER_ATR_MULTIPLIERS)) if use_limit_ord else []
-        print(f"Take profit limit price ATR multipliers: {limit_atr_multipliers}")
+        logger.debug("Take profit limit price ATR multipliers: %s", limit_atr_multipliers)
         trigger_atr_multiplier = list(tp_request.get(self.TP_KEYS.ATR_MULTIPLIERS, []))
-        print(f"Take profit trigger ATR multipliers: {trigger_atr_multiplier}")
+        logger.debug("Take profit trigger ATR multipliers: %s", trigger_atr_multiplier)
         fixed_trigger_prices = list(tp_request.get(self.TP_KEYS.TRIGGER_PRICES, []))
-        print(f"Take profit fixed trigger prices: {fixed_trigger_prices}")
+        logger.debug("Take profit fixed trigger prices: %s", fixed_trigger_prices)
 
         price_precision = self.token.price_precision
         qty_precision = self.token.qty_precision
         entry_price = self.token.token_price
-        print(f"Take profit entry price: {entry_price}")
+        logger.debug("Take profit entry price: %s", entry_price)
         tp_quantities = self._split_quantities(total_qty=self.token_qty, qty_precision=qty_precision,
                                                qty_splits=tp_splits)
-        print(f"Take profit quantities: {tp_quantities}")
+        logger.debug("Take profit quantities: %s", tp_quantities)
         atr = self.atr.atr
+        # Every rung's prices are calculated up front, orders are only built once they are all known
+        tp_trigger_prices = fixed_trigger_prices or orderladder.take_profit_prices(
+            entry_price=entry_price, atr=atr, atr_multipliers=trigger_atr_multiplier[:len(tp_quantities)],
+            price_precision=price_precision, pos_side=pos_side)
+        # Limit prices are not rounded to the price precision until the distance has been added to the entry price
+        tp_limit_prices = orderladder.take_profit_prices(
+            entry_price=entry_price, atr=atr, atr_multipliers=limit_atr_multipliers, price_precision=price_precision,
+            pos_side=pos_side, round_distance=False)
 
         for i, exit_qty in enumerate(tp_quantities):
             normalised_idx = i + 1
             order_id_prexif = f"tp{normalised_idx}"
             tp_split = tp_splits[i]
-            tp_trigger_price = fixed_trigger_prices[i] if fixed_trigger_prices else \
-                self.__calculate_tp_trigger_price(atr=atr,
-                                                  trigger_atr_multiplier=trigger_atr_multiplier[i],
-                                                  position_entry_price=entry_price,
-                                                  price_precision=price_precision, tp_side=pos_side)
-            print(f"TP{normalised_idx} trigger price: {tp_trigger_price}")
+            tp_trigger_price = tp_trigger_prices[i]
+            logger.debug("TP%s trigger price: %s", normalised_idx, tp_trigger_price)
 
-            if use_limit_ord and i < len(limit_atr_multipliers):
+            if use_limit_ord and i < len(tp_limit_prices):
                 # Create a limit order
                 # TODO: check token info and ensure trigger and stop prices are set >= allowed distance apart
-                tp_limit_price = self.__calculate_tp_limit_price(atr=atr, limit_atr_multiplier=limit_atr_multipliers[i],
-                                                                 position_entry_price=entry_price,
-                                                                 price_precision=price_precision, tp_side=pos_side)
+                tp_limit_price = tp_limit_prices[i]
                 order_id_prexif += "_lmt"
                 tp_orders.append(TakeProfitLimitOrder(side=tp_side, ticker=ticker, order_id_str=order_id_prexif,
                                                       token_qty=exit_qty, trigger_price=tp_trigger_price,
@@ -77,22 +83,3 @@ class TakeProfitOrderFactory(OrderFactory):
                                                        token_qty=exit_qty, trigger_price=tp_trigger_price,
                                                        exit_percentage=tp_split))
         return tp_orders
-
-    @staticmethod
-    def __calculate_tp_trigger_price(atr: float, trigger_atr_multiplier: float, position_entry_price: float,
-                                     price_precision: int, tp_side: Constants.OrderSide) -> float:
-        tp_distance = round(orderutils.calculate_atr_exit_distance(atr=atr, atr_multiplier=trigger_atr_multiplier),
-                            price_precision)
-        return orderutils.calculate_profit_trigger_from_delta(
-            entry_price=position_entry_price, price_precision=price_precision, delta=tp_distance, tp_order_side=tp_side)
-
-    @staticmethod
-    def __calculate_tp_limit_price(atr: float, limit_atr_multiplier: float, position_entry_price: float,
-                                   price_precision: int, tp_side: Constants.OrderSide) -> float:
-
-        tp_limit_distance = orderutils.calculate_atr_exit_distance(
-            atr=atr, multiplier=limit_atr_multiplier)
-
-        return orderutils.calculate_profit_trigger_from_delta(
-            entry_price=position_entry_price, price_precision=price_precision,
-            delta=tp_limit_distance, tp_order_side=tp_side)
@@ -0,0 +1,124 @@
+from typing import Optional
+
+from binance_f.model import Position
+
+from chalicelib import orderutils
+from chalicelib.constants import Constants
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.models.orders.orderidgenerator import ORDER_ID_PREFIX
+from chalicelib.models.orders.slorder import StopLossOrder
+
+logger = get_logger()
+
+EXIT_ORDER_ID_PREFIX = f"{ORDER_ID_PREFIX}exit_"
+
+
+def is_bot_exit_order_id(order_id: str) -> bool:
+    return order_id.startswith(EXIT_ORDER_ID_PREFIX)
+
+
+def is_stop_loss_order(order_type: str) -> bool:
+    return order_type == "STOP" or order_type == "STOP_MARKET"
+
+
+def cancel_all_open_orders(client: ExchangeClient, ticker: str) -> bool:
+    open_orders = client.get_open_orders(ticker)
+    open_order_ids = [order.orderId for order in open_orders if orderutils.is_bot_order_id(order.clientOrderId)]
+    if open_order_ids:
+        logger.info("Cancelling open orders: %s", open_orders)
+        client.cancel_list_orders(ticker, open_order_ids)
+        return True
+    return False
+
+
+def is_take_profit_order(order_type: str) -> bool:
+    return "PROFIT" in str(order_type).upper()
+
+
+def get_coalesce_key(order: dict) -> str:
+    """
+    Order updates handled the same way share a key. The handler acts on the current position and open orders, not
+    on the order itself, so handling the latest of them covers any queued before it.
+    """
+    return f"orderUpdate:{is_bot_exit_order_id(order.get('c', ''))}:{is_take_profit_order(order.get('ot'))}"
+
+
+def get_open_position(client: ExchangeClient, ticker: str) -> Optional[Position]:
+    return client.get_symbol_position(ticker=ticker)
+
+
+class OrderUpdateHandler:
+    """
+    Tidies up after one of the bot's orders is filled: cancels leftover bot orders once the position is closed, and
+    moves the stop loss to the entry price once a take profit is hit.
+
+    Runs for order update events posted to /orderUpdateEvent and for fills seen by the user data stream consumer,
+    whose exchange client reads positions and open orders from its in-memory book instead of the REST API.
+    """
+
+    def __init__(self, exchange_client: ExchangeClient):
+        self.exchange_client = exchange_client
+
+    def handle(self, order: dict) -> dict:
+        """
+        Handles an ORDER_TRADE_UPDATE order, the "o" object of the event.
+        """
+        ticker = order.get("s")
+        order_id = order.get("c", "")
+        is_orders_cancelled = False
+        # Cancelling orders does not change the position, so it is fetched once for the whole event
+        open_position = get_open_position(client=self.exchange_client, ticker=ticker)
+        # When flipping from one side to another we place an order with ID prefix "bot_exit_" to exit the old
+        # position. We must avoid cleaning up open orders on this order type, otherwise new DCA open orders for new
+        # side will instantly be cancelled.
+        if not is_bot_exit_order_id(order_id=order_id):
+            is_orders_cancelled = self.cleanup_rogue_open_orders(ticker=ticker, open_position=open_position)
+
+        is_stop_loss_moved = False
+        if is_take_profit_order(order.get("ot")) and (not is_orders_cancelled):
+            logger.info("Take profit order filled. Will attempt to move Stop Loss")
+            is_stop_loss_moved = self.move_stop_loss(ticker=ticker, open_position=open_position)
+
+        logger.info("Open orders cancelled: %s", is_orders_cancelled)
+        logger.info("Stop Loss moved: %s", is_stop_loss_moved)
+        return {"is_orders_cancelled": is_orders_cancelled, "is_stop_loss_moved": is_stop_loss_moved}
+
+    def cleanup_rogue_open_orders(self, ticker: str, open_position: Optional[Position] = None) -> bool:
+        logger.info("Cleaning up rogue open orders on ticker: %s", ticker)
+        open_position = open_position or get_open_position(client=self.exchange_client, ticker=ticker)
+        all_open_orders = self.exchange_client.get_open_orders(ticker=ticker)
+        logger.info("Total open orders on ticker: %s", len(all_open_orders))
+        bot_open_orders = [order for order in all_open_orders if orderutils.is_bot_order_id(order.clientOrderId)]
+        logger.info("Total bot placed open orders: %s", len(bot_open_orders))
+
+        # Do not terminate open orders if there is a potential position waiting to get filled.
+        open_position_amt = float(open_position.positionAmt)
+        logger.info("Position amount: %s", open_position_amt)
+        if open_position_amt == 0:
+            return cancel_all_open_orders(client=self.exchange_client, ticker=ticker)
+        logger.info("No open orders to cancel")
+        return False
+
+    def move_stop_loss(self, ticker: str, open_position: Optional[Position] = None) -> bool:
+        logger.info("Attempting to move stop loss")
+        open_position = open_position or get_open_position(client=self.exchange_client, ticker=ticker)
+        open_position_amt = float(open_position.positionAmt)
+        logger.info("Open position amount: %s", open_position_amt)
+        if open_position_amt != 0:
+            open_orders = self.exchange_client.get_open_orders(ticker=ticker)
+            logger.info("All open orders count: %s", len(open_orders))
+            stop_loss_order_ids = [order.orderId for order in open_orders if is_stop_loss_order(order.type)]
+            logger.info("All Stop Loss orders to cancel: %s", stop_loss_order_ids)
+            if stop_loss_order_ids:
+                logger.info("Cancelling Stop Loss orders: %s", stop_loss_order_ids)
+                self.exchange_client.cancel_list_orders(ticker, stop_loss_order_ids)
+                stop_loss_side = Constants.OrderSide.SELL if open_position_amt > 0 else Constants.OrderSide.BUY
+                price_precision = self.exchange_client.get_price_precision(ticker=ticker)
+                sl_trigger = round(open_position.entryPrice, price_precision)
+                logger.info("Placing new %s Stop Loss order at: %s", stop_loss_side, sl_trigger)
+                stop_order = StopLossOrder(side=stop_loss_side, ticker=ticker, order_id_str="sl_mv",
+                                           trigger_price=sl_trigger)
+                self.exchange_client.place_order(stop_order)
+                return True
+        return False
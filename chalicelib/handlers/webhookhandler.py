@@ -3,101 +3,77 @@ from chalicelib.commands.cancelallopenorderscommand import CancelAllOpenOrdersCo
 from chalicelib.commands.ordercommand import OrderCommand
 from chalicelib.constants import Constants
 from chalicelib.exceptions.positionofsamesidealreadyexists import PositionOfSameSideAlreadyExists
-from chalicelib.exceptions.risktoohighexception import RiskTooHighException
 from chalicelib.exchanges.exchangeclient import ExchangeClient
-from chalicelib.factories.positionorderfactory import PositionOrderFactory
-from chalicelib.factories.slorderfactory import StopLossOrderFactory
-from chalicelib.factories.tporderfactory import TakeProfitOrderFactory
-from chalicelib.indicators.atr import ATR
+from chalicelib.factories.orderplanfactory import OrderPlanFactory
+from chalicelib.indicators.atrbackends import create_atr
 from chalicelib.invokers.orderinvoker import OrderInvoker
 from chalicelib.leverage.leverage import Leverage
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.markets.markets import Markets
 from chalicelib.positionterminator import PositionTerminator
+from chalicelib.prefetch.prefetcher import Prefetcher
+from chalicelib.prices.priceservice import PriceService
 from chalicelib.responses.responsebuilder import ResponseBuilder
-from chalicelib.risk.risk import Risk
-from chalicelib.token import Token
+from chalicelib.token import Token, get_token_price
+
+logger = get_logger()
 
 
 class WebhookHandler:
-    DEFAULT_MAX_PORTFOLIO_RISK = 1.5
     NO_LEVERAGE = 1
+    PREFETCH_TIMEOUT_SECONDS = 10
     KEYS = Constants.JsonRequestKeys
-    RISK_KEYS = KEYS.Risk
     POSITION_KEYS = KEYS.Position
 
-    def __init__(self, payload: dict, exchange_client: ExchangeClient, constants: Constants, markets: Markets):
+    def __init__(self, payload: dict, exchange_client: ExchangeClient, constants: Constants, markets: Markets,
+                 price_service: PriceService = None):
         self.payload = payload
         self.exchange_client = exchange_client
         self.constants = constants
         self.markets = markets
+        # Prices come from the markets when no price service is given
+        self.price_service = price_service
 
     def handle(self):
         position_json = self.payload.get(self.POSITION_KEYS.POSITION)
         ticker = position_json.get(self.POSITION_KEYS.TICKER)
         interval = self.payload.get(self.KEYS.INTERVAL)
 
-        atr = ATR(markets=self.markets, ticker=ticker, interval=interval)
-        print(atr)
-        token = Token(exchange_client=self.exchange_client, markets=self.markets, ticker=ticker)
-        print(token)
-        account = Account(self.exchange_client)
-        print(account)
-        risk = None
-
-        position_orders = []
-        sl_orders = []
-
-        is_auto_adjust_for_risk = self.payload.get(self.RISK_KEYS.RISK, {})\
-            .get(self.RISK_KEYS.AUTO_ADJUST_FOR_RISK, False)
-        print(f"Should auto adjust position based on risk: {is_auto_adjust_for_risk}")
-        attempts = 0
-        stake_override = None
-        while attempts <= 2:
-            position_factory = PositionOrderFactory(request=self.payload, constants=self.constants, account=account,
-                                                    token=token, atr=atr, position_size_override=stake_override)
-            position_orders = position_factory.create_orders()
-
-            sl_factory = StopLossOrderFactory(request=self.payload, constants=self.constants, atr=atr, token=token)
-            sl_orders = sl_factory.create_orders()
+        # None of these reads depend on each other so they are all issued at once
+        prefetched = Prefetcher(default_timeout_seconds=self.PREFETCH_TIMEOUT_SECONDS) \
+            .add("atr", lambda: create_atr(markets=self.markets, ticker=ticker, interval=interval)) \
+            .add("qty_precision", lambda: self.exchange_client.get_quantity_precision(ticker=ticker)) \
+            .add("price_precision", lambda: self.exchange_client.get_price_precision(ticker=ticker)) \
+            .add("token_price", lambda: get_token_price(markets=self.markets, ticker=ticker,
+                                                        price_service=self.price_service)) \
+            .add("account", lambda: Account(self.exchange_client)) \
+            .add("positions", lambda: self.exchange_client.get_position_snapshot(tickers=[ticker])) \
+            .run()
 
-            # Risk analysis
-            max_portfolio_risk = float(self.payload.get(self.RISK_KEYS.RISK, {})
-                                       .get(self.RISK_KEYS.PORTFOLIO_RISK, self.DEFAULT_MAX_PORTFOLIO_RISK))
-            portfolio_value = account.portfolio_value
-            token_qty = sum([order.token_qty for order in position_orders])
-            average_entry_price = sum([order.entry_price * (order.token_qty / token_qty) for order in position_orders])
-            sl_trigger_price = sl_orders[0].trigger_price
-            risk = Risk(token_qty=token_qty, sl_trigger_price=sl_trigger_price, portfolio_value=portfolio_value,
-                        max_portfolio_risk=max_portfolio_risk, token_price=average_entry_price)
-            try:
-                risk.perform_risk_analysis()
-                print("Position size within acceptable risk percentage")
-                break
-            except RiskTooHighException as err:
-                print(err)
-                attempts += 1
-                if not is_auto_adjust_for_risk or attempts > 2:
-                    print("Position size exceeded maximum acceptable risk percentage. Will not place any orders")
-                    raise
-                stake_override = risk.calculate_acceptable_position_size()
-                print(f"Position size exceeded maximum acceptable risk percentage. "
-                      f"Will retry with reduced position of {stake_override}")
+        atr = prefetched["atr"]
+        logger.debug("%s", atr)
+        token = Token(exchange_client=self.exchange_client, markets=self.markets, ticker=ticker,
+                      qty_precision=prefetched["qty_precision"], price_precision=prefetched["price_precision"],
+                      token_price=prefetched["token_price"])
+        logger.debug("%s", token)
+        account = prefetched["account"]
+        logger.debug("%s", account)
 
-        position_qty = sum([order.token_qty for order in position_orders])
-        tp_factory = TakeProfitOrderFactory(request=self.payload, constants=self.constants, atr=atr,
-                                            token_qty=position_qty, token=token)
-        tp_orders = tp_factory.create_orders()
+        plan = OrderPlanFactory(request=self.payload, constants=self.constants, account=account, token=token,
+                                atr=atr).create_plan()
+        position_orders, sl_orders, tp_orders = plan.position_orders, plan.sl_orders, plan.tp_orders
 
         # Order to cancel existing position
-        position_terminator = PositionTerminator(exchange_client=self.exchange_client)
+        position_terminator = PositionTerminator(exchange_client=self.exchange_client,
+                                                 positions=prefetched["positions"])
         close_position_order = position_terminator.build_close_position_order(ticker=ticker)
         # If current position and new position are of same side then don't place any orders
         cleanup_position = []
         if close_position_order is not None:
-            print("Existing position order exists. Will terminate old position before placing new orders")
+            logger.info("Existing position order exists. Will terminate old position before placing new orders")
             is_same_side = close_position_order.is_same_side(position_orders[0])
             if is_same_side is not None and not is_same_side:
-                print("Position of same side already exists. Will not place any orders")
+                logger.warning("Position of same side already exists. Will not place any orders")
                 raise PositionOfSameSideAlreadyExists(position_side=position_orders[0].side)
             cleanup_position = [close_position_order]
 
@@ -106,7 +82,7 @@ class WebhookHandler:
         margin_type = str(position_json.get(self.POSITION_KEYS.MARGIN_TYPE))
         leverage = Leverage(exchange_client=self.exchange_client, leverage=leverage, margin_type=margin_type,
                             ticker=ticker)
-        print(leverage)
+        logger.debug("%s", leverage)
         leverage.update_leverage_on_exchange()
 
         commands = [
@@ -122,6 +98,6 @@ class WebhookHandler:
         invoker.execute_orders()
 
         response_builder = ResponseBuilder(payload=self.payload, position_orders=position_orders, sl_orders=sl_orders,
-                                           tp_orders=tp_orders, token=token, risk=risk, account=account)
+                                           tp_orders=tp_orders, token=token, risk=plan.risk, account=account)
         response = response_builder.build_response()
         return {"code": 200, "body": response}
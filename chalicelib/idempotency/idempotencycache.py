@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Optional, Tuple
+
+from chalicelib.constants import Constants
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+TTL_SECONDS_ENV_VAR = "IDEMPOTENCY_TTL_SECONDS"
+MAX_ENTRIES_ENV_VAR = "IDEMPOTENCY_MAX_ENTRIES"
+SQLITE_PATH_ENV_VAR = "IDEMPOTENCY_SQLITE_PATH"
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 1024
+# Duplicates of one alert wait for each other, unrelated alerts rarely share a lock
+LOCK_STRIPES = 64
+
+
+def fingerprint_webhook(user_id: Optional[str], payload: dict, now: Optional[float] = None) -> str:
+    """
+    Fingerprint of the alert a webhook payload was sent for: user, ticker, side, interval, bar time and platform.
+
+    The bar time is the payload's barTime, e.g. TradingView's {{time}} placeholder. Without one, the start of the
+    current bar of the alert's interval is used, so repeats of an alert within the same bar share a fingerprint.
+    """
+    keys = Constants.JsonRequestKeys
+    position_json = payload.get(keys.Position.POSITION) or {}
+    interval = payload.get(keys.INTERVAL)
+    bar_time = payload.get(keys.BAR_TIME)
+    if bar_time is None:
+        try:
+            bar_seconds = int(interval) * 60
+        except (TypeError, ValueError):
+            bar_seconds = 60
+        now = time.time() if now is None else now
+        bar_time = int(now // bar_seconds * bar_seconds)
+    fields = [user_id, str(position_json.get(keys.Position.TICKER, "")).upper(),
+              str(position_json.get(keys.Position.SIDE, "")).upper(), str(interval), str(bar_time),
+              bool(payload.get(keys.IS_TEST_PLATFORM, False)), bool(payload.get(keys.IS_DRY_RUN, False))]
+    return hashlib.sha256(json.dumps(fields).encode("utf-8")).hexdigest()
+
+
+class SqliteResponseStore:
+    """
+    Responses in a SQLite file, shared by every process which can reach the path, e.g. a mounted EFS volume.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+        with self.__connection() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS responses "
+                               "(fingerprint TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def __connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            self.local.connection = connection
+        return connection
+
+    def get(self, fingerprint: str, now: float) -> Optional[Tuple[dict, float]]:
+        row = self.__connection().execute("SELECT response, expires_at FROM responses "
+                                          "WHERE fingerprint = ? AND expires_at > ?", (fingerprint, now)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put(self, fingerprint: str, response: dict, expires_at: float, now: float):
+        with self.__connection() as connection:
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                               (fingerprint, json.dumps(response), expires_at))
+
+
+class IdempotencyCache:
+    """
+    Responses to recently handled webhook alerts keyed by fingerprint, so a retried or repeated alert is answered
+    without placing its orders again.
+
+    Entries live for ttl_seconds in a bounded in-memory LRU and, when a SQLite path is given, in a file which
+    outlives the container. Callers hold the fingerprint's lock while checking and handling an alert, so a duplicate
+    arriving while the first is still being handled waits for its response.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 sqlite_path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.responses: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self.store = SqliteResponseStore(path=sqlite_path) if sqlite_path else None
+        self.locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, fingerprint: str):
+        with self.locks[int(fingerprint[:8], 16) % LOCK_STRIPES]:
+            yield
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        now = self.clock()
+        with self.lock:
+            entry = self.responses.get(fingerprint)
+            if entry is not None:
+                if entry[1] > now:
+                    self.responses.move_to_end(fingerprint)
+                    return entry[0]
+                del self.responses[fingerprint]
+        if self.store is not None:
+            entry = self.store.get(fingerprint=fingerprint, now=now)
+            if entry is not None:
+                self.__remember(fingerprint, entry)
+                return entry[0]
+        return None
+
+    def put(self, fingerprint: str, response: dict):
+        now = self.clock()
+        entry = (response, now + self.ttl_seconds)
+        self.__remember(fingerprint, entry)
+        if self.store is not None:
+            self.store.put(fingerprint=fingerprint, response=response, expires_at=entry[1], now=now)
+
+    def __remember(self, fingerprint: str, entry: Tuple[dict, float]):
+        with self.lock:
+            self.responses[fingerprint] = entry
+            self.responses.move_to_end(fingerprint)
+            while len(self.responses) > self.max_entries:
+                self.responses.popitem(last=False)
+
+
+_IDEMPOTENCY_CACHE: Optional[IdempotencyCache] = None
+_IDEMPOTENCY_CACHE_LOCK = threading.Lock()
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    """
+    Returns the process-wide idempotency cache, configured by IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_ENTRIES and
+    IDEMPOTENCY_SQLITE_PATH.
+    """
+    global _IDEMPOTENCY_CACHE
+    with _IDEMPOTENCY_CACHE_LOCK:
+        if _IDEMPOTENCY_CACHE is None:
+            _IDEMPOTENCY_CACHE = IdempotencyCache(
+                ttl_seconds=float(os.environ.get(TTL_SECONDS_ENV_VAR, DEFAULT_TTL_SECONDS)),
+                max_entries=int(os.environ.get(MAX_ENTRIES_ENV_VAR, DEFAULT_MAX_ENTRIES)),
+                sqlite_path=os.environ.get(SQLITE_PATH_ENV_VAR))
+        return _IDEMPOTENCY_CACHE
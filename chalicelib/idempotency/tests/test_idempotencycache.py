@@ -0,0 +1,101 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from chalicelib.idempotency.idempotencycache import IdempotencyCache, fingerprint_webhook
+
+PAYLOAD = {"auth": "super-secure-api-key-123", "interval": 60, "isTestPlatform": False, "isDryRun": False,
+           "position": {"ticker": "CHRUSDT", "side": "BUY", "stake": 10, "marginType": "ISOLATED", "leverage": 3}}
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_repeats_within_a_bar_share_a_fingerprint(self):
+        # given
+        bar_start = 1700000000 // 3600 * 3600
+
+        # when
+        first = fingerprint_webhook(user_id="user", payload=PAYLOAD, now=bar_start + 10)
+        repeat = fingerprint_webhook(user_id="user", payload=copy.deepcopy(PAYLOAD), now=bar_start + 3000)
+        next_bar = fingerprint_webhook(user_id="user", payload=PAYLOAD, now=bar_start + 3600)
+        other_user = fingerprint_webhook(user_id="other", payload=PAYLOAD, now=bar_start + 10)
+
+        # then
+        self.assertEqual(first, repeat)
+        self.assertNotEqual(first, next_bar)
+        self.assertNotEqual(first, other_user)
+
+    def test_bar_time_in_payload_is_used_and_side_matters(self):
+        # given
+        payload = dict(PAYLOAD, barTime="2023-11-14T22:00:00Z")
+        sell_payload = dict(payload, position=dict(PAYLOAD["position"], side="SELL"))
+
+        # when / then
+        self.assertEqual(fingerprint_webhook("user", payload, now=0), fingerprint_webhook("user", payload, now=1e9))
+        self.assertNotEqual(fingerprint_webhook("user", payload), fingerprint_webhook("user", sell_payload))
+
+
+class IdempotencyCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_responses_expire_after_ttl(self):
+        # given
+        class_under_test = IdempotencyCache(ttl_seconds=60, clock=self.clock)
+        class_under_test.put("a" * 64, {"code": 200, "body": {}})
+
+        # when
+        self.clock.now += 59
+        cached = class_under_test.get("a" * 64)
+        self.clock.now += 2
+        expired = class_under_test.get("a" * 64)
+
+        # then
+        self.assertEqual({"code": 200, "body": {}}, cached)
+        self.assertIsNone(expired)
+
+    def test_least_recently_used_responses_are_evicted(self):
+        # given
+        class_under_test = IdempotencyCache(ttl_seconds=60, max_entries=2, clock=self.clock)
+        class_under_test.put("a" * 64, {"code": 200})
+        class_under_test.put("b" * 64, {"code": 200})
+        class_under_test.get("a" * 64)
+
+        # when
+        class_under_test.put("c" * 64, {"code": 200})
+
+        # then
+        self.assertIsNotNone(class_under_test.get("a" * 64))
+        self.assertIsNone(class_under_test.get("b" * 64))
+        self.assertIsNotNone(class_under_test.get("c" * 64))
+
+    def test_sqlite_store_is_shared_between_caches(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # given
+            path = os.path.join(tmp_dir, "idempotency.sqlite3")
+            IdempotencyCache(ttl_seconds=60, sqlite_path=path, clock=self.clock).put("d" * 64, {"code": 200})
+
+            # when
+            class_under_test = IdempotencyCache(ttl_seconds=60, sqlite_path=path, clock=self.clock)
+            cached = class_under_test.get("d" * 64)
+            self.clock.now += 61
+            expired = IdempotencyCache(ttl_seconds=60, sqlite_path=path, clock=self.clock).get("d" * 64)
+
+            # then
+            self.assertEqual({"code": 200}, cached)
+            self.assertIsNone(expired)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,56 @@
-import pandas as pd
 from abc import ABCMeta
-from ta.volatility import AverageTrueRange
+
+import numpy as np
 
 from chalicelib.markets.markets import Markets
 
 DEFAULT_ATR_LENGTH = 14
+HIGH, LOW, CLOSE = 2, 3, 4
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int) -> float:
+    """
+    Latest value of Wilder's Average True Range, using the same arithmetic as ta.volatility.AverageTrueRange so both
+    give identical results.
+    """
+    if len(close) < window:
+        raise ValueError(f"Not enough closed candles to calculate ATR. Required: {window} Available: {len(close)}")
+    prev_close = close[:-1]
+    true_range = high - low
+    true_range[1:] = np.maximum(true_range[1:],
+                                np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)))
+    atr = float(true_range[:window].sum() / window)
+    for tr in true_range[window:].tolist():
+        atr = (atr * (window - 1) + tr) / float(window)
+    return atr
+
+
+def windowed_average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int,
+                                candles: int) -> np.ndarray:
+    """
+    For every candle, average_true_range of that candle and the candles - 1 before it, NaN where there are fewer.
+
+    Wilder's smoothing over a fixed number of candles is a weighted sum of their true ranges, so every window is
+    calculated at once as a dot product rather than one recursion per window. Each window's first true range has no
+    previous close, as when average_true_range is given just those candles.
+    """
+    if candles < window:
+        raise ValueError(f"Not enough candles to calculate ATR. Required: {window} Available: {candles}")
+    high_low = high - low
+    true_range = high_low.copy()
+    true_range[1:] = np.maximum(high_low[1:], np.maximum(np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])))
+    decay = (window - 1) / float(window)
+    weights = np.empty(candles, dtype=np.float64)
+    weights[:window] = decay ** (candles - window) / window
+    weights[window:] = decay ** np.arange(candles - window - 1, -1, -1) / window
+
+    atrs = np.full(len(close), np.nan)
+    if len(close) < candles:
+        return atrs
+    windows = np.lib.stride_tricks.sliding_window_view(true_range, candles)
+    first_candles = np.arange(len(close) - candles + 1)
+    atrs[candles - 1:] = windows @ weights + (high_low[first_candles] - true_range[first_candles]) * weights[0]
+    return atrs
 
 
 class ATR(metaclass=ABCMeta):
@@ -17,11 +63,10 @@ class ATR(metaclass=ABCMeta):
 
     def get_atr(self, markets: Markets):
         exchange_ohlcv = markets.fetch_exchange_ohlcv(ticker=self.ticker, interval=self.interval)
-        df = pd.DataFrame(exchange_ohlcv[:-1], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        atr = AverageTrueRange(high=df['high'], low=df['low'], close=df['close'], window=self.atr_length)
-        df['atr'] = atr.average_true_range()
-        return round(float(df['atr'].iloc[-1]), 6)
+        candles = np.asarray(exchange_ohlcv[:-1], dtype=np.float64).reshape(-1, 6)
+        atr = average_true_range(high=candles[:, HIGH], low=candles[:, LOW], close=candles[:, CLOSE],
+                                 window=self.atr_length)
+        return round(atr, 6)
 
     def __repr__(self):
         return f"--- ATR ---        TICKER: {self.ticker}, INTERVAL: {self.interval}, ATR: {self.atr}, " \
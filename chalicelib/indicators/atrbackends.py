@@ -0,0 +1,33 @@
+import os
+from typing import Type
+
+from chalicelib.indicators.atr import ATR
+from chalicelib.indicators.incrementalatr import IncrementalATR
+from chalicelib.markets.markets import Markets
+
+ATR_BACKEND_ENV_VAR = 'ATR_BACKEND'
+NUMPY_BACKEND = "numpy"
+INCREMENTAL_BACKEND = "incremental"
+TA_BACKEND = "ta"
+DEFAULT_ATR_BACKEND = NUMPY_BACKEND
+
+
+def get_atr_class(backend: str = None) -> Type[ATR]:
+    """
+    Resolves the ATR implementation for a backend name, defaulting to the ATR_BACKEND environment variable. The numpy
+    and incremental backends are pandas-free; pandas and ta are only imported when the ta backend is selected.
+    """
+    backend = (backend or os.environ.get(ATR_BACKEND_ENV_VAR, DEFAULT_ATR_BACKEND)).lower()
+    if backend == NUMPY_BACKEND:
+        return ATR
+    if backend == INCREMENTAL_BACKEND:
+        return IncrementalATR
+    if backend == TA_BACKEND:
+        from chalicelib.indicators.taatr import TaATR
+        return TaATR
+    raise ValueError(f"Invalid ATR backend '{backend}'. Valid backends: "
+                     f"{[NUMPY_BACKEND, INCREMENTAL_BACKEND, TA_BACKEND]}")
+
+
+def create_atr(markets: Markets, ticker: str, interval: int, backend: str = None) -> ATR:
+    return get_atr_class(backend=backend)(markets=markets, ticker=ticker, interval=interval)
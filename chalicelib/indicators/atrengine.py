@@ -0,0 +1,140 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chalicelib.indicators.atr import average_true_range
+
+DEFAULT_ATR_LENGTH = 14
+# Matches the number of candles fetched per request, ATR length * 10
+DEFAULT_CAPACITY = 140
+# The last fetched candle is still forming, so a full fetch gives the ATR one candle fewer than it asked for
+DEFAULT_WINDOW = DEFAULT_CAPACITY - 1
+MS_PER_MINUTE = 60000
+TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class OHLCVRingBuffer:
+    """
+    Fixed-size NumPy buffer of the most recent closed candles, oldest overwritten first.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.candles = np.zeros((capacity, 6), dtype=np.float64)
+        self.size = 0
+        self.next_idx = 0
+
+    def append(self, candle: Sequence[float]):
+        self.candles[self.next_idx] = candle[:6]
+        self.next_idx = (self.next_idx + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def last(self) -> Optional[np.ndarray]:
+        if self.size == 0:
+            return None
+        return self.candles[(self.next_idx - 1) % self.capacity]
+
+    def to_array(self) -> np.ndarray:
+        """
+        Returns a copy of the buffered candles ordered oldest to newest.
+        """
+        if self.size < self.capacity:
+            return self.candles[:self.size].copy()
+        return np.concatenate((self.candles[self.next_idx:], self.candles[:self.next_idx]))
+
+    def clear(self):
+        self.size = 0
+        self.next_idx = 0
+
+
+class IncrementalATREngine:
+    """
+    Wilder's Average True Range over the latest window closed candles, kept up to date one closed candle at a time.
+
+    Wilder's smoothing never forgets a candle, so a running value drifts away from one calculated over a fixed window
+    as candles leave it. Instead the ATR is recalculated with average_true_range over the last window candles in the
+    buffer whenever new ones arrive, giving exactly the value the numpy and ta backends calculate from a full fetch.
+    Only the fetch is incremental.
+    """
+
+    def __init__(self, interval_ms: int, atr_length: int = DEFAULT_ATR_LENGTH, capacity: int = DEFAULT_CAPACITY,
+                 window: int = DEFAULT_WINDOW, clock: Callable[[], int] = now_ms):
+        if window > capacity:
+            raise ValueError(f"ATR window must fit in the candle buffer. Window: {window} Capacity: {capacity}")
+        self.interval_ms = interval_ms
+        self.atr_length = atr_length
+        self.window = window
+        self.clock = clock
+        self.buffer = OHLCVRingBuffer(capacity=capacity)
+        self.bar_count = 0
+        self.atr = None
+        self.lock = threading.Lock()
+
+    def reset(self):
+        self.buffer.clear()
+        self.bar_count = 0
+        self.atr = None
+
+    def next_since(self) -> Optional[int]:
+        """
+        Timestamp to fetch candles from, or None when the engine is empty or too far behind to catch up from a single
+        fetch of buffer capacity candles and must be rebuilt from scratch.
+        """
+        last_candle = self.buffer.last()
+        if last_candle is None:
+            return None
+        since = int(last_candle[TIMESTAMP]) + self.interval_ms
+        if self.clock() - since >= (self.buffer.capacity - 1) * self.interval_ms:
+            return None
+        return since
+
+    def update(self, closed_candles: Sequence[Sequence[float]]) -> bool:
+        """
+        Applies candles newer than the last one seen and returns whether they follow on from it. When the first new
+        candle skips past the next interval nothing is applied, as the window would be missing candles, and the engine
+        must be rebuilt from a full fetch instead.
+        """
+        last_candle = self.buffer.last()
+        if last_candle is not None:
+            last_timestamp = int(last_candle[TIMESTAMP])
+            closed_candles = [candle for candle in closed_candles if candle[TIMESTAMP] > last_timestamp]
+            if closed_candles and closed_candles[0][TIMESTAMP] != last_timestamp + self.interval_ms:
+                return False
+        if not closed_candles:
+            return True
+        for candle in closed_candles:
+            self.buffer.append(candle)
+        self.bar_count += len(closed_candles)
+        self.__recalculate()
+        return True
+
+    def __recalculate(self):
+        candles = self.buffer.to_array()[-self.window:]
+        if len(candles) < self.atr_length:
+            self.atr = None
+            return
+        self.atr = average_true_range(high=candles[:, HIGH], low=candles[:, LOW], close=candles[:, CLOSE],
+                                      window=self.atr_length)
+
+
+_ATR_ENGINES: Dict[Tuple[str, int, int], IncrementalATREngine] = {}
+_ATR_ENGINES_LOCK = threading.Lock()
+
+
+def get_atr_engine(ticker: str, interval: int, atr_length: int = DEFAULT_ATR_LENGTH) -> IncrementalATREngine:
+    """
+    Returns the process-wide engine for a (ticker, interval) pair, creating it on first use.
+    """
+    key = (ticker.upper(), int(interval), atr_length)
+    with _ATR_ENGINES_LOCK:
+        engine = _ATR_ENGINES.get(key)
+        if engine is None:
+            engine = IncrementalATREngine(interval_ms=int(interval) * MS_PER_MINUTE, atr_length=atr_length)
+            _ATR_ENGINES[key] = engine
+        return engine
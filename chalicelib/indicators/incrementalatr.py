@@ -0,0 +1,33 @@
+from chalicelib.indicators.atr import ATR, DEFAULT_ATR_LENGTH
+from chalicelib.indicators.atrengine import IncrementalATREngine, get_atr_engine
+from chalicelib.markets.markets import Markets
+
+
+class IncrementalATR(ATR):
+    """
+    ATR backed by a process-wide IncrementalATREngine per (ticker, interval), so warm invocations only fetch and apply
+    the candles that closed since the previous request.
+    """
+
+    def __init__(self, markets: Markets, ticker: str, interval: int, atr_length=DEFAULT_ATR_LENGTH,
+                 engine: IncrementalATREngine = None):
+        self.engine = engine if engine is not None else get_atr_engine(ticker=ticker, interval=interval,
+                                                                       atr_length=atr_length)
+        super().__init__(markets=markets, ticker=ticker, interval=interval, atr_length=atr_length)
+
+    def get_atr(self, markets: Markets):
+        with self.engine.lock:
+            since = self.engine.next_since()
+            if since is None:
+                self.engine.reset()
+            exchange_ohlcv = markets.fetch_exchange_ohlcv(ticker=self.ticker, interval=self.interval, since=since)
+            # The last candle is still forming so it is excluded, as with the full window calculation
+            if not self.engine.update(exchange_ohlcv[:-1]):
+                # Candles are missing since the last request, so the engine is rebuilt from the full window
+                self.engine.reset()
+                exchange_ohlcv = markets.fetch_exchange_ohlcv(ticker=self.ticker, interval=self.interval)
+                self.engine.update(exchange_ohlcv[:-1])
+            if self.engine.atr is None:
+                raise ValueError(f"Not enough closed candles to calculate ATR for {self.ticker} on interval "
+                                 f"{self.interval}. Required: {self.atr_length} Available: {self.engine.bar_count}")
+            return round(self.engine.atr, 6)
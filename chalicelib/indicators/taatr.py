@@ -0,0 +1,19 @@
+import pandas as pd
+from ta.volatility import AverageTrueRange
+
+from chalicelib.indicators.atr import ATR
+from chalicelib.markets.markets import Markets
+
+
+class TaATR(ATR):
+    """
+    ATR calculated with pandas and the ta library. Kept as a reference backend, importing this module loads pandas.
+    """
+
+    def get_atr(self, markets: Markets):
+        exchange_ohlcv = markets.fetch_exchange_ohlcv(ticker=self.ticker, interval=self.interval)
+        df = pd.DataFrame(exchange_ohlcv[:-1], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        atr = AverageTrueRange(high=df['high'], low=df['low'], close=df['close'], window=self.atr_length)
+        df['atr'] = atr.average_true_range()
+        return round(float(df['atr'].iloc[-1]), 6)
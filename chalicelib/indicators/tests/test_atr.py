@@ -0,0 +1,112 @@
+import json
+import os
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from chalicelib.indicators.atr import ATR, windowed_average_true_range
+from chalicelib.indicators.atrbackends import ATR_BACKEND_ENV_VAR, create_atr
+from chalicelib.indicators.incrementalatr import IncrementalATR
+from chalicelib.indicators.taatr import TaATR
+from chalicelib.markets.fakemarkets import FakeMarkets
+
+
+class ATRTest(unittest.TestCase):
+    TICKER = "CHRUSDT"
+    INTERVAL = 60
+
+    def setUp(self):
+        with open("sample-ohlcv.json") as sample_ohlcv:
+            self.ohlcv_data = json.load(sample_ohlcv)
+        self.markets = FakeMarkets()
+
+    @staticmethod
+    def build_random_walk_ohlcv(count: int, seed: int):
+        rand = random.Random(seed)
+        ohlcv = []
+        close = 100.0
+        for i in range(count):
+            open_price = close
+            close = max(1.0, open_price + rand.uniform(-3, 3))
+            high = max(open_price, close) + rand.uniform(0, 2)
+            low = min(open_price, close) - rand.uniform(0, 2)
+            ohlcv.append([1627426800000 + i * 3600000, open_price, high, low, close, rand.uniform(1e5, 1e6)])
+        return ohlcv
+
+    def test_numpy_atr_matches_ta_on_sample_ohlcv(self):
+        # given
+        self.markets.set_ohlcv_data(self.ohlcv_data)
+        expected_atr = TaATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL).atr
+
+        # when
+        class_under_test = ATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL)
+
+        # then
+        self.assertEqual(expected_atr, class_under_test.atr)
+
+    def test_numpy_atr_matches_ta_on_random_walks(self):
+        for seed in range(20):
+            # given
+            self.markets.set_ohlcv_data(self.build_random_walk_ohlcv(count=140, seed=seed))
+            expected_atr = TaATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL).atr
+
+            # when
+            class_under_test = ATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL)
+
+            # then
+            self.assertEqual(expected_atr, class_under_test.atr)
+
+    def test_windowed_atr_matches_numpy_atr_of_each_window(self):
+        # given
+        ohlcv = self.build_random_walk_ohlcv(count=300, seed=7)
+        candles = np.asarray(ohlcv, dtype=np.float64)
+        window_candles = 140
+
+        # when
+        atrs = windowed_average_true_range(high=candles[:, 2], low=candles[:, 3], close=candles[:, 4], window=14,
+                                           candles=window_candles - 1)
+
+        # then
+        self.assertTrue(np.isnan(atrs[:window_candles - 2]).all())
+        for last_closed in range(window_candles - 2, len(ohlcv) - 1):
+            # ATR drops the last candle it is given, as it is still open
+            self.markets.set_ohlcv_data(ohlcv[last_closed - window_candles + 2:last_closed + 2])
+            expected_atr = ATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL).atr
+            self.assertEqual(expected_atr, round(atrs[last_closed], 6))
+
+    def test_create_atr_selects_backend(self):
+        # given
+        self.markets.set_ohlcv_data(self.ohlcv_data)
+
+        # when
+        numpy_atr = create_atr(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, backend="numpy")
+        ta_atr = create_atr(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, backend="ta")
+        incremental_atr = create_atr(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                                     backend="incremental")
+
+        # then
+        self.assertEqual(ATR, type(numpy_atr))
+        self.assertEqual(TaATR, type(ta_atr))
+        self.assertEqual(IncrementalATR, type(incremental_atr))
+
+    def test_numpy_backend_is_the_default(self):
+        # given
+        self.markets.set_ohlcv_data(self.ohlcv_data)
+        environ = {key: value for key, value in os.environ.items() if key != ATR_BACKEND_ENV_VAR}
+
+        # when
+        with mock.patch.dict(os.environ, environ, clear=True):
+            atr = create_atr(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL)
+
+        # then
+        self.assertEqual(ATR, type(atr))
+
+    def test_invalid_backend_throws_error(self):
+        # when
+        with self.assertRaises(ValueError) as context:
+            create_atr(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, backend="talib")
+
+        # then
+        self.assertTrue("Invalid ATR backend 'talib'" in str(context.exception))
@@ -0,0 +1,162 @@
+import json
+import random
+import unittest
+
+from chalicelib.indicators.atrengine import IncrementalATREngine, MS_PER_MINUTE
+from chalicelib.indicators.incrementalatr import IncrementalATR
+from chalicelib.indicators.taatr import TaATR
+from chalicelib.markets.fakemarkets import FakeMarkets
+
+
+class RecordingFakeMarkets(FakeMarkets):
+
+    def __init__(self):
+        self.since_requests = []
+
+    def fetch_exchange_ohlcv(self, ticker: str, interval: int, since: int = None):
+        self.since_requests.append(since)
+        return super().fetch_exchange_ohlcv(ticker=ticker, interval=interval, since=since)
+
+
+class IncrementalATRTest(unittest.TestCase):
+    TICKER = "CHRUSDT"
+    INTERVAL = 60
+    INTERVAL_MS = INTERVAL * MS_PER_MINUTE
+
+    def setUp(self):
+        with open("sample-ohlcv.json") as sample_ohlcv:
+            self.ohlcv_data = json.load(sample_ohlcv)
+        self.markets = RecordingFakeMarkets()
+
+    def build_random_walk_ohlcv(self, count: int):
+        rand = random.Random(42)
+        ohlcv = []
+        close = 100.0
+        for i in range(count):
+            open_price = close
+            close = max(1.0, open_price + rand.uniform(-3, 3))
+            high = max(open_price, close) + rand.uniform(0, 2)
+            low = min(open_price, close) - rand.uniform(0, 2)
+            ohlcv.append([1627426800000 + i * self.INTERVAL_MS, open_price, high, low, close, rand.uniform(1e5, 1e6)])
+        return ohlcv
+
+    def build_engine(self, clock) -> IncrementalATREngine:
+        return IncrementalATREngine(interval_ms=self.INTERVAL_MS, clock=clock)
+
+    def test_matches_ta_on_sample_ohlcv(self):
+        # given
+        self.markets.set_ohlcv_data(self.ohlcv_data)
+        expected_atr = TaATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL).atr
+
+        # when
+        class_under_test = IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                                          engine=self.build_engine(clock=lambda: 0))
+
+        # then
+        self.assertEqual(expected_atr, class_under_test.atr)
+
+    def test_matches_ta_on_random_walk(self):
+        # given
+        self.markets.set_ohlcv_data(self.build_random_walk_ohlcv(140))
+        expected_atr = TaATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL).atr
+
+        # when
+        class_under_test = IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                                          engine=self.build_engine(clock=lambda: 0))
+
+        # then
+        self.assertEqual(expected_atr, class_under_test.atr)
+
+    def ta_atr_over_fetch_window(self, ohlcv: list) -> float:
+        """
+        ATR calculated by ta from the candles a full fetch returns at the end of ohlcv.
+        """
+        window_markets = FakeMarkets()
+        window_markets.set_ohlcv_data(ohlcv[-140:])
+        return TaATR(markets=window_markets, ticker=self.TICKER, interval=self.INTERVAL).atr
+
+    def test_only_new_candles_fetched_and_result_matches_ta_over_fetch_window(self):
+        # given
+        ohlcv = self.build_random_walk_ohlcv(150)
+        engine = self.build_engine(clock=lambda: int(ohlcv[-1][0]))
+        self.markets.set_ohlcv_data(ohlcv[:140])
+        IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, engine=engine)
+        self.markets.set_ohlcv_data(ohlcv)
+        expected_atr = self.ta_atr_over_fetch_window(ohlcv)
+
+        # when
+        class_under_test = IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                                          engine=engine)
+
+        # then
+        self.assertEqual(expected_atr, class_under_test.atr)
+        self.assertEqual(int(ohlcv[139][0]), self.markets.since_requests[-1])
+        self.assertEqual(149, engine.bar_count)
+
+    def test_matches_ta_over_fetch_window_after_many_incremental_updates(self):
+        # given
+        # Large prices and moves make any drift from the window's ATR show up well above the 6 decimals kept
+        ohlcv = [[candle[0]] + [price * 300 for price in candle[1:5]] + [candle[5]]
+                 for candle in self.build_random_walk_ohlcv(600)]
+        clock = {"now": int(ohlcv[139][0])}
+        engine = self.build_engine(clock=lambda: clock["now"])
+        expected_atrs = []
+        actual_atrs = []
+
+        # when
+        for candle_count in range(140, len(ohlcv) + 1):
+            clock["now"] = int(ohlcv[candle_count - 1][0])
+            self.markets.set_ohlcv_data(ohlcv[:candle_count])
+            actual_atrs.append(IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                                              engine=engine).atr)
+            expected_atrs.append(self.ta_atr_over_fetch_window(ohlcv[:candle_count]))
+
+        # then
+        self.assertEqual(expected_atrs, actual_atrs)
+        self.assertEqual([None] + [int(ohlcv[i][0]) for i in range(139, len(ohlcv) - 1)], self.markets.since_requests)
+
+    def test_stale_engine_is_rebuilt_from_full_fetch(self):
+        # given
+        ohlcv = self.build_random_walk_ohlcv(140)
+        engine = self.build_engine(clock=lambda: int(ohlcv[-1][0]) + 1000 * self.INTERVAL_MS)
+        self.markets.set_ohlcv_data(ohlcv)
+        IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, engine=engine)
+
+        # when
+        IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, engine=engine)
+
+        # then
+        self.assertEqual([None, None], self.markets.since_requests)
+        self.assertEqual(139, engine.bar_count)
+
+    def test_gap_since_last_request_rebuilds_from_full_fetch(self):
+        # given
+        ohlcv = self.build_random_walk_ohlcv(150)
+        # The first request sees 139 closed candles, fewer candles than the ATR length follow the gap after them
+        gapped_ohlcv = ohlcv[:139] + ohlcv[144:]
+        engine = self.build_engine(clock=lambda: int(ohlcv[-1][0]))
+        self.markets.set_ohlcv_data(ohlcv[:140])
+        IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL, engine=engine)
+        self.markets.set_ohlcv_data(gapped_ohlcv)
+        expected_atr = self.ta_atr_over_fetch_window(gapped_ohlcv)
+
+        # when
+        class_under_test = IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                                          engine=engine)
+
+        # then
+        self.assertEqual(expected_atr, class_under_test.atr)
+        self.assertEqual([int(ohlcv[139][0]), None], self.markets.since_requests[-2:])
+        self.assertEqual(144, engine.bar_count)
+
+    def test_not_enough_candles_throws_error(self):
+        # given
+        self.markets.set_ohlcv_data(self.ohlcv_data[:10])
+
+        # when
+        with self.assertRaises(ValueError) as context:
+            IncrementalATR(markets=self.markets, ticker=self.TICKER, interval=self.INTERVAL,
+                           engine=self.build_engine(clock=lambda: 0))
+
+        # then
+        self.assertTrue("Not enough closed candles to calculate ATR" in str(context.exception))
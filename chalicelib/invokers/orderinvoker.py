@@ -1,9 +1,16 @@
 from chalicelib.commands.command import Command
+from chalicelib.exceptions.orderplacementexception import OrderPlacementException
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
 
 
 class OrderInvoker:
-    commands = []
-    executed = []
+
+    def __init__(self):
+        # Per invoker so commands left over from a failed invocation are never run by the next warm invocation
+        self.commands = []
+        self.executed = []
 
     def set_command(self, command: Command):
         self.commands.append(command)
@@ -12,8 +19,22 @@ class OrderInvoker:
         self.commands.extend(commands)
 
     def execute_orders(self):
-        print(f"Items to process: {len(self.commands)}")
+        """
+        Executes the commands in turn, stopping at the first which fails. A group of orders which failed after some
+        of them were placed does not stop the rest, so entries which went through still get their stop loss; its
+        error is raised once every command has run.
+        """
+        logger.debug("Items to process: %s", len(self.commands))
+        partial_failure = None
         while self.commands:
             order_cmd = self.commands.pop(0)
-            order_cmd.execute()
+            try:
+                order_cmd.execute()
+            except OrderPlacementException as err:
+                if not err.placed_results:
+                    raise
+                logger.error("Some orders of a group were placed. Placing the remaining groups. %s", err)
+                partial_failure = partial_failure or err
             self.executed.append(order_cmd)
+        if partial_failure is not None:
+            raise partial_failure
@@ -0,0 +1,58 @@
+import unittest
+
+from chalicelib.commands.ordercommand import OrderCommand
+from chalicelib.exceptions.orderplacementexception import OrderPlacementException
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.invokers.orderinvoker import OrderInvoker
+from chalicelib.models.orders.positiondcaorder import PositionDCAOrder
+from chalicelib.models.orders.positionmarketorder import PositionMarketOrder
+from chalicelib.models.orders.slorder import StopLossOrder
+from chalicelib.models.orders.tpmarketorder import TakeProfitMarketOrder
+
+
+class OrderInvokerTest(unittest.TestCase):
+    TICKER = "BTCUSDT"
+
+    def setUp(self):
+        self.exchange = FakeBinanceExchangeClient()
+        self.position_order = PositionMarketOrder(side="BUY", ticker=self.TICKER, token_qty=0.5,
+                                                  curr_token_price=30000.0, entry_price=30000.0)
+        self.dca_order = PositionDCAOrder(side="BUY", ticker=self.TICKER, token_qty=0.5, limit_price=29500.0,
+                                          curr_token_price=30000.0, entry_price=30000.0, dca_percentage=50)
+        self.sl_order = StopLossOrder(side="SELL", ticker=self.TICKER, order_id_str="sl", trigger_price=29000.0)
+        self.tp_order = TakeProfitMarketOrder(side="SELL", ticker=self.TICKER, token_qty=1, trigger_price=31000.0,
+                                              exit_percentage=100)
+        self.class_under_test = OrderInvoker()
+        self.class_under_test.set_commands([
+            OrderCommand(exchange=self.exchange, orders=[self.position_order, self.dca_order]),
+            OrderCommand(exchange=self.exchange, orders=[self.sl_order]),
+            OrderCommand(exchange=self.exchange, orders=[self.tp_order]),
+        ])
+
+    def test_stop_loss_placed_when_only_some_entries_went_through(self):
+        # given
+        self.exchange.set_rejected_order_types(["LIMIT"])
+
+        # when
+        with self.assertRaises(OrderPlacementException) as context:
+            self.class_under_test.execute_orders()
+
+        # then
+        self.assertEqual([self.dca_order], [result.order for result in context.exception.failed_results])
+        self.assertEqual([self.position_order, self.sl_order, self.tp_order], self.exchange.get_placed_orders())
+
+    def test_nothing_more_placed_when_no_entry_went_through(self):
+        # given
+        self.exchange.set_rejected_order_types(["MARKET"])
+
+        # when
+        with self.assertRaises(OrderPlacementException):
+            self.class_under_test.execute_orders()
+
+        # then
+        self.assertEqual([], self.exchange.get_placed_orders())
+        self.assertEqual(2, len(self.class_under_test.commands))
+
+
+if __name__ == '__main__':
+    unittest.main()
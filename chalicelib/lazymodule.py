@@ -0,0 +1,28 @@
+import importlib
+from types import ModuleType
+
+
+class LazyModule:
+    """
+    Stands in for a module and only imports it on first attribute access.
+
+    Lets a Lambda entry point declare every dependency up front while each route pays the import cost of only the
+    modules it actually touches.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            # importlib serialises concurrent imports of the same module
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule '{self._name}' ({state})>"
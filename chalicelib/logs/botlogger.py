@@ -0,0 +1,126 @@
+import logging
+import os
+import re
+import sys
+import threading
+from typing import Optional
+
+SERVICE_NAME = "crypto-trading-bot"
+LOG_LEVEL_ENV_VAR = "LOG_LEVEL"
+DEFAULT_LOG_LEVEL = "INFO"
+REDACTED = "***"
+# Keys of payload and user config values which must never reach the logs
+SECRET_KEY_PATTERN = re.compile(r"^auth$|secret|api_?key|password|passphrase|signature", re.IGNORECASE)
+# Points powertools' location key at whoever called BotLogger rather than BotLogger itself
+CALLER_STACKLEVEL = 3
+
+
+def redact(value):
+    """
+    Copy of value with every dict entry whose key names a secret replaced, at any depth.
+    """
+    if isinstance(value, dict):
+        return {key: REDACTED if isinstance(key, str) and SECRET_KEY_PATTERN.search(key) else redact(item)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item) for item in value)
+    return value
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Redacts secrets from a record's message and arguments. Filters only run for records that are emitted, so the
+    copies are never made for messages below the log level.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, (dict, list, tuple)):
+            record.msg = redact(record.msg)
+        if isinstance(record.args, dict):
+            record.args = redact(record.args)
+        elif record.args:
+            record.args = tuple(redact(arg) for arg in record.args)
+        return True
+
+
+class StdoutStream:
+    """
+    Writes to whatever sys.stdout is at the time, so output can still be redirected as it could with print().
+    """
+
+    @staticmethod
+    def write(text: str):
+        return sys.stdout.write(text)
+
+    @staticmethod
+    def flush():
+        sys.stdout.flush()
+
+
+class BotLogger:
+    """
+    Level-gated structured logging built on the aws_lambda_powertools Logger.
+
+    Messages use %-style arguments, e.g. logger.debug("Token: %s", token), which are only formatted once a record is
+    emitted, so a disabled level costs one integer comparison and no repr() calls. Whole payloads and object dumps are
+    logged at DEBUG, so only a handful of one line messages reach CloudWatch per request at the default INFO level.
+    The powertools Logger, and its import, is only created once the first record is emitted.
+    """
+
+    def __init__(self, service: str = SERVICE_NAME, level: Optional[str] = None, stream=None):
+        self.service = service
+        self.level = logging.getLevelName((level or os.environ.get(LOG_LEVEL_ENV_VAR) or DEFAULT_LOG_LEVEL).upper())
+        if not isinstance(self.level, int):
+            raise ValueError(f"Unknown log level '{level}'")
+        self.stream = stream or StdoutStream()
+        self.logger = None
+        self.lock = threading.Lock()
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def debug(self, msg, *args, **kwargs):
+        if logging.DEBUG >= self.level:
+            self.__get_logger().debug(msg, *args, stacklevel=CALLER_STACKLEVEL, **kwargs)
+
+    def info(self, msg, *args, **kwargs):
+        if logging.INFO >= self.level:
+            self.__get_logger().info(msg, *args, stacklevel=CALLER_STACKLEVEL, **kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        if logging.WARNING >= self.level:
+            self.__get_logger().warning(msg, *args, stacklevel=CALLER_STACKLEVEL, **kwargs)
+
+    def error(self, msg, *args, **kwargs):
+        if logging.ERROR >= self.level:
+            self.__get_logger().error(msg, *args, stacklevel=CALLER_STACKLEVEL, **kwargs)
+
+    def exception(self, msg, *args, **kwargs):
+        if logging.ERROR >= self.level:
+            self.__get_logger().exception(msg, *args, stacklevel=CALLER_STACKLEVEL, **kwargs)
+
+    def __get_logger(self):
+        if self.logger is None:
+            with self.lock:
+                if self.logger is None:
+                    from aws_lambda_powertools import Logger
+
+                    logger = Logger(service=self.service, level=self.level, stream=self.stream)
+                    logger.addFilter(RedactingFilter())
+                    self.logger = logger
+        return self.logger
+
+
+_BOT_LOGGER: Optional[BotLogger] = None
+_BOT_LOGGER_LOCK = threading.Lock()
+
+
+def get_logger() -> BotLogger:
+    """
+    Returns the process-wide logger, at the level named by LOG_LEVEL.
+    """
+    global _BOT_LOGGER
+    with _BOT_LOGGER_LOCK:
+        if _BOT_LOGGER is None:
+            _BOT_LOGGER = BotLogger()
+        return _BOT_LOGGER
@@ -0,0 +1,66 @@
+import io
+import json
+import unittest
+
+from chalicelib.logs.botlogger import BotLogger, redact, REDACTED
+
+
+class ExplodingRepr:
+
+    def __repr__(self):
+        raise AssertionError("repr should not be called below the log level")
+
+
+class BotLoggerTest(unittest.TestCase):
+
+    def test_messages_below_level_are_not_formatted_or_written(self):
+        # given
+        stream = io.StringIO()
+        class_under_test = BotLogger(level="INFO", stream=stream)
+
+        # when
+        class_under_test.debug("Token: %r", ExplodingRepr())
+
+        # then
+        self.assertEqual("", stream.getvalue())
+        self.assertIsNone(class_under_test.logger)
+
+    def test_messages_are_structured_and_redacted(self):
+        # given
+        stream = io.StringIO()
+        class_under_test = BotLogger(service="test-bot", level="DEBUG", stream=stream)
+        payload = {"auth": "bot-key", "position": {"ticker": "BTCUSDT", "token_qty": 1.5}}
+
+        # when
+        class_under_test.info("Calculated token quantity: %s", 1.5)
+        class_under_test.debug("Request received: %s", payload)
+
+        # then
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(["INFO", "DEBUG"], [record["level"] for record in records])
+        self.assertEqual("Calculated token quantity: 1.5", records[0]["message"])
+        self.assertEqual("test-bot", records[0]["service"])
+        self.assertNotIn("bot-key", records[1]["message"])
+        self.assertIn("'token_qty': 1.5", records[1]["message"])
+        self.assertEqual("bot-key", payload["auth"])
+
+    def test_redact_replaces_secrets_at_any_depth(self):
+        # given
+        user_config = {"BINANCE_API_KEY": "key", "TESTNET_SECRET_KEY": "secret", "EMAIL_ADDRESS": "a@b.c",
+                       "accounts": [{"password": "pw", "token_price": 100}]}
+
+        # when
+        redacted = redact(user_config)
+
+        # then
+        self.assertEqual({"BINANCE_API_KEY": REDACTED, "TESTNET_SECRET_KEY": REDACTED, "EMAIL_ADDRESS": "a@b.c",
+                          "accounts": [{"password": REDACTED, "token_price": 100}]}, redacted)
+
+    def test_unknown_level_raises(self):
+        # when / then
+        with self.assertRaises(ValueError):
+            BotLogger(level="CHATTY")
+
+
+if __name__ == '__main__':
+    unittest.main()
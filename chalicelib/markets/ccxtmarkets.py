@@ -1,6 +1,7 @@
 from ccxt.base.exchange import Exchange
 
 from chalicelib.markets.markets import Markets
+from chalicelib.markets.marketsregistry import MarketsRegistry, get_markets_registry
 
 # ATR length * 10
 DEFAULT_LIMIT = 140
@@ -22,9 +23,11 @@ TIMEFRAME_MAPPINGS = \
 
 class CCXTMarkets(Markets):
 
-    def __init__(self, exchange: Exchange):
+    def __init__(self, exchange: Exchange, registry: MarketsRegistry = None):
         self.ccxt = exchange
-        self.ccxt.load_markets()
+        # Markets are loaded once per container and shared, rather than calling load_markets() per request
+        self.registry = registry if registry is not None else get_markets_registry(exchange_id=exchange.id)
+        self.registry.prime(self.ccxt)
         # self.log()
 
     @staticmethod
@@ -37,17 +40,17 @@ class CCXTMarkets(Markets):
             raise RuntimeError(err_msg)
         return binance_interval
 
-    def fetch_exchange_ohlcv(self, ticker: str, interval: int):
+    def fetch_exchange_ohlcv(self, ticker: str, interval: int, since: int = None):
         exchange_symbol = self.__get_exchange_ticker_symbol(ticker=ticker)
         timeframe = self.map_interval_to_timeframe(interval)
-        return self.ccxt.fetch_ohlcv(symbol=exchange_symbol, timeframe=timeframe, limit=DEFAULT_LIMIT)
+        return self.ccxt.fetch_ohlcv(symbol=exchange_symbol, timeframe=timeframe, since=since, limit=DEFAULT_LIMIT)
 
     def get_current_token_price(self, ticker: str):
         exchange_symbol = self.__get_exchange_ticker_symbol(ticker=ticker)
         return float(self.ccxt.fetch_ticker(symbol=exchange_symbol)['info']['lastPrice'])
 
     def __get_exchange_ticker_symbol(self, ticker: str):
-        return self.ccxt.markets_by_id[ticker]['symbol']
+        return self.registry.get_exchange_symbol(market_id=ticker)
 
     # def log(self):
     #     print('Trading Interval: {}'.format(self.timeframe))
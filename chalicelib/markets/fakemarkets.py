@@ -1,14 +1,21 @@
+import time
+
 from chalicelib.markets.markets import Markets
 
 
 class FakeMarkets(Markets):
     ohlcv_data = []
     token_price = 0.0
+    latency_seconds = 0.0
 
-    def fetch_exchange_ohlcv(self, ticker: str, interval: int):
-        return self.ohlcv_data
+    def fetch_exchange_ohlcv(self, ticker: str, interval: int, since: int = None):
+        self.__wait()
+        if since is None:
+            return self.ohlcv_data
+        return [candle for candle in self.ohlcv_data if candle[0] >= since]
 
     def get_current_token_price(self, ticker: str):
+        self.__wait()
         return self.token_price
 
     def set_ohlcv_data(self, ohlcv_data: list):
@@ -16,3 +23,13 @@ class FakeMarkets(Markets):
 
     def set_current_token_price(self, token_price: float):
         self.token_price = token_price
+
+    def set_latency(self, latency_seconds: float):
+        """
+        Delays every fetch from the exchange, so concurrency and caching can be measured offline.
+        """
+        self.latency_seconds = latency_seconds
+
+    def __wait(self):
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
@@ -4,7 +4,7 @@ from abc import ABCMeta, abstractmethod
 class Markets(metaclass=ABCMeta):
 
     @abstractmethod
-    def fetch_exchange_ohlcv(self, ticker: str, interval: int):
+    def fetch_exchange_ohlcv(self, ticker: str, interval: int, since: int = None):
         pass
 
     @abstractmethod
@@ -0,0 +1,170 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ccxt.base.exchange import Exchange
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+MARKETS_TTL_ENV_VAR = 'MARKETS_TTL_SECONDS'
+MARKETS_SNAPSHOT_PATH_ENV_VAR = 'MARKETS_SNAPSHOT_PATH'
+DEFAULT_MARKETS_TTL_SECONDS = 21600
+SNAPSHOT_SAVED_AT_KEY = "savedAt"
+SNAPSHOT_MARKETS_KEY = "markets"
+# Market attributes shared from the primed exchange onto each per-request exchange instance
+SHARED_MARKET_ATTRIBUTES = ["markets", "markets_by_id", "symbols", "ids", "currencies", "currencies_by_id"]
+
+
+def get_tmp_snapshot_path(exchange_id: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"{exchange_id}-markets.json.gz")
+
+
+class MarketsRegistry:
+    """
+    Loads an exchange's markets once per container and shares them with every CCXT exchange instance.
+
+    On first use the markets are seeded from the freshest available gzipped JSON snapshot (the one written to /tmp by a
+    previous invocation, then the one shipped with the deployment) and only fall back to downloading them when neither
+    exists. Once the TTL elapses the markets are reloaded on a background thread while callers keep using the current
+    ones.
+    """
+
+    def __init__(self, exchange_id: str, ttl_seconds: float, snapshot_paths: List[str], tmp_snapshot_path: str):
+        self.exchange_id = exchange_id
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_paths = snapshot_paths
+        self.tmp_snapshot_path = tmp_snapshot_path
+        self.source: Optional[Exchange] = None
+        self.symbols_by_id: Dict[str, str] = {}
+        self.updated_at = None
+        self.is_refreshing = False
+        self.lock = threading.Lock()
+
+    def is_expired(self) -> bool:
+        return self.updated_at is None or (time.time() - self.updated_at) >= self.ttl_seconds
+
+    def prime(self, exchange: Exchange):
+        """
+        Ensures the given exchange instance has markets without it calling load_markets() itself.
+        """
+        with self.lock:
+            if self.source is None:
+                self.__load_initial(exchange=exchange)
+            source = self.source
+        if exchange is not source:
+            for attribute in SHARED_MARKET_ATTRIBUTES:
+                setattr(exchange, attribute, getattr(source, attribute))
+        if self.is_expired():
+            self.refresh_in_background()
+
+    def get_exchange_symbol(self, market_id: str) -> str:
+        exchange_symbol = self.symbols_by_id.get(market_id)
+        if exchange_symbol is None:
+            raise KeyError(f"Unknown market ID '{market_id}' on exchange '{self.exchange_id}'")
+        return exchange_symbol
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.is_refreshing:
+                return
+            self.is_refreshing = True
+        thread = threading.Thread(target=self.refresh, name=f"{self.exchange_id}-markets-refresh", daemon=True)
+        thread.start()
+
+    def refresh(self):
+        try:
+            # Reload on a separate instance so callers holding the current markets are never left half-updated
+            exchange = self.source.__class__()
+            exchange.load_markets()
+            self.set_source(exchange=exchange, updated_at=time.time())
+            self.save_snapshot(path=self.tmp_snapshot_path)
+        except Exception as err:
+            logger.warning("Failed to refresh markets for exchange '%s': %s", self.exchange_id, err)
+        finally:
+            self.is_refreshing = False
+
+    def save_snapshot(self, path: str):
+        snapshot = {SNAPSHOT_SAVED_AT_KEY: self.updated_at, SNAPSHOT_MARKETS_KEY: list(self.source.markets.values())}
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as snapshot_file:
+            json.dump(snapshot, snapshot_file, separators=(",", ":"))
+        # Replace atomically so a concurrent reader never sees a partially written snapshot
+        os.replace(tmp_path, path)
+
+    def __load_initial(self, exchange: Exchange):
+        for path in [self.tmp_snapshot_path] + self.snapshot_paths:
+            snapshot = self.__read_snapshot(path=path)
+            if snapshot is not None:
+                logger.info("Seeding markets for exchange '%s' from snapshot %s", self.exchange_id, path)
+                exchange.set_markets(snapshot[SNAPSHOT_MARKETS_KEY])
+                self.set_source(exchange=exchange, updated_at=float(snapshot[SNAPSHOT_SAVED_AT_KEY]))
+                return
+        logger.info("No markets snapshot found for exchange '%s'. Loading markets from exchange", self.exchange_id)
+        exchange.load_markets()
+        self.set_source(exchange=exchange, updated_at=time.time())
+        try:
+            self.save_snapshot(path=self.tmp_snapshot_path)
+        except OSError as err:
+            logger.warning("Unable to write markets snapshot to %s: %s", self.tmp_snapshot_path, err)
+
+    def set_source(self, exchange: Exchange, updated_at: float):
+        symbols_by_id = {}
+        for market_id, markets in exchange.markets_by_id.items():
+            # Older CCXT versions map an ID to a single market, newer versions to a list with spot markets first
+            market = markets[0] if isinstance(markets, list) else markets
+            symbols_by_id[market_id] = market['symbol']
+        self.source = exchange
+        self.symbols_by_id = symbols_by_id
+        self.updated_at = updated_at
+
+    @staticmethod
+    def __read_snapshot(path: str) -> Optional[dict]:
+        if not path or not os.path.isfile(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as snapshot_file:
+                return json.load(snapshot_file)
+        except (OSError, ValueError) as err:
+            logger.warning("Ignoring unreadable markets snapshot %s: %s", path, err)
+            return None
+
+
+_MARKETS_REGISTRIES: Dict[str, MarketsRegistry] = {}
+_MARKETS_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_markets_registry(exchange_id: str) -> MarketsRegistry:
+    """
+    Returns the process-wide markets registry for the given CCXT exchange ID, creating it on first use.
+    """
+    with _MARKETS_REGISTRIES_LOCK:
+        registry = _MARKETS_REGISTRIES.get(exchange_id)
+        if registry is None:
+            ttl_seconds = float(os.environ.get(MARKETS_TTL_ENV_VAR, DEFAULT_MARKETS_TTL_SECONDS))
+            deployment_snapshot_path = os.environ.get(MARKETS_SNAPSHOT_PATH_ENV_VAR)
+            snapshot_paths = [deployment_snapshot_path] if deployment_snapshot_path else []
+            registry = MarketsRegistry(exchange_id=exchange_id, ttl_seconds=ttl_seconds, snapshot_paths=snapshot_paths,
+                                       tmp_snapshot_path=get_tmp_snapshot_path(exchange_id))
+            _MARKETS_REGISTRIES[exchange_id] = registry
+        return registry
+
+
+if __name__ == "__main__":
+    # Writes a snapshot to ship with the deployment: python -m chalicelib.markets.marketsregistry <exchange_id> <path>
+    import sys
+
+    import ccxt
+
+    snapshot_exchange_id, snapshot_path = sys.argv[1], sys.argv[2]
+    snapshot_exchange = getattr(ccxt, snapshot_exchange_id)()
+    snapshot_exchange.load_markets()
+    snapshot_registry = MarketsRegistry(exchange_id=snapshot_exchange_id, ttl_seconds=DEFAULT_MARKETS_TTL_SECONDS,
+                                        snapshot_paths=[], tmp_snapshot_path=snapshot_path)
+    snapshot_registry.set_source(exchange=snapshot_exchange, updated_at=time.time())
+    snapshot_registry.save_snapshot(path=snapshot_path)
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import time
+import unittest
+
+from chalicelib.markets.ccxtmarkets import CCXTMarkets
+from chalicelib.markets.marketsregistry import MarketsRegistry
+
+MARKETS = [
+    {"id": "BTCUSDT", "symbol": "BTC/USDT", "spot": True},
+    {"id": "BTCUSDT", "symbol": "BTC/USDT:USDT", "spot": False},
+    {"id": "CHRUSDT", "symbol": "CHR/USDT", "spot": True},
+]
+
+
+class FakeExchange:
+    """
+    Minimal stand-in for a CCXT exchange which counts how often markets are downloaded.
+    """
+    id = "fakeexchange"
+    load_count = 0
+
+    def __init__(self):
+        self.markets = None
+        self.markets_by_id = None
+        self.symbols = None
+        self.ids = None
+        self.currencies = None
+        self.currencies_by_id = None
+
+    def load_markets(self):
+        FakeExchange.load_count += 1
+        self.set_markets(MARKETS)
+        return self.markets
+
+    def set_markets(self, markets):
+        self.markets = {market["symbol"]: market for market in markets}
+        self.markets_by_id = {}
+        for market in sorted(markets, key=lambda m: not m["spot"]):
+            self.markets_by_id.setdefault(market["id"], []).append(market)
+
+
+class MarketsRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        FakeExchange.load_count = 0
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_snapshot_path = os.path.join(self.tmp_dir.name, "fakeexchange-markets.json.gz")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def build_registry(self, ttl_seconds: float = 60) -> MarketsRegistry:
+        return MarketsRegistry(exchange_id=FakeExchange.id, ttl_seconds=ttl_seconds, snapshot_paths=[],
+                               tmp_snapshot_path=self.tmp_snapshot_path)
+
+    def test_markets_loaded_once_per_registry(self):
+        # given
+        class_under_test = self.build_registry()
+
+        # when
+        CCXTMarkets(exchange=FakeExchange(), registry=class_under_test)
+        second_exchange = FakeExchange()
+        CCXTMarkets(exchange=second_exchange, registry=class_under_test)
+
+        # then
+        self.assertEqual(1, FakeExchange.load_count)
+        self.assertEqual(3, len(second_exchange.markets))
+        self.assertEqual("BTC/USDT", class_under_test.get_exchange_symbol(market_id="BTCUSDT"))
+
+    def test_registry_seeded_from_snapshot_without_loading_markets(self):
+        # given
+        self.build_registry().prime(FakeExchange())
+        FakeExchange.load_count = 0
+        class_under_test = self.build_registry()
+
+        # when
+        class_under_test.prime(FakeExchange())
+
+        # then
+        self.assertEqual(0, FakeExchange.load_count)
+        self.assertEqual("CHR/USDT", class_under_test.get_exchange_symbol(market_id="CHRUSDT"))
+
+    def test_expired_markets_refreshed_in_background(self):
+        # given
+        class_under_test = self.build_registry(ttl_seconds=0)
+        class_under_test.prime(FakeExchange())
+
+        # when
+        class_under_test.prime(FakeExchange())
+        deadline = time.time() + 5
+        while FakeExchange.load_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        # then
+        self.assertGreaterEqual(FakeExchange.load_count, 2)
+
+    def test_unknown_market_id_raises_error(self):
+        # given
+        class_under_test = self.build_registry()
+        class_under_test.prime(FakeExchange())
+
+        # when
+        with self.assertRaises(KeyError) as context:
+            class_under_test.get_exchange_symbol(market_id="DOGEUSDT")
+
+        # then
+        self.assertTrue("DOGEUSDT" in str(context.exception))
@@ -3,6 +3,7 @@ from chalicelib.models.orders.order import Order
 
 
 class ClosePositionOrder(Order):
+    __slots__ = ()
 
     def __init__(self, side: Constants.OrderSide, ticker: str, order_id_str: str, token_qty: float):
         super().__init__(side=side, ticker=ticker, order_type="MARKET", order_id_str=order_id_str, token_qty=token_qty,
@@ -1,11 +1,16 @@
-import random
-import string
 from abc import ABCMeta
 
 from chalicelib.constants import Constants
+from chalicelib.models.orders.orderidgenerator import generate_order_id
 
 
 class Order(metaclass=ABCMeta):
+    """
+    Base of every order the bot places. Orders and their subclasses declare __slots__ so large ladders and
+    simulations hold no per order __dict__.
+    """
+    __slots__ = ("side", "ticker", "order_type", "order_id", "token_qty", "close_position", "trigger_price",
+                 "limit_price", "reduce_only", "time_in_force")
 
     def __init__(self, side: Constants.OrderSide, ticker: str, order_type: str, order_id_str: str = "",
                  token_qty: float = None, close_position: bool = None, trigger_price: float = None,
@@ -14,7 +19,7 @@ class Order(metaclass=ABCMeta):
         self.side = side
         self.ticker = ticker
         self.order_type = order_type
-        self.order_id = self.__generate_order_id(msg=order_id_str)
+        self.order_id = generate_order_id(msg=order_id_str)
         self.token_qty = token_qty
         self.close_position = close_position
         self.trigger_price = trigger_price
@@ -22,15 +27,6 @@ class Order(metaclass=ABCMeta):
         self.reduce_only = reduce_only
         self.time_in_force = time_in_force
 
-    @staticmethod
-    def __generate_order_id(msg: str):
-        msg = msg if len(msg) == 0 else f"{msg}_"
-        rand_str = ''.join(random.choice(string.ascii_letters) for _ in range(8))
-        order_id = f"bot_{msg}{rand_str}"
-        if len(order_id) > 36:
-            raise ValueError("Order IDs must be less than 36 characters")
-        return order_id
-
     def is_same_side(self, other):
         return self.side == other.side
 
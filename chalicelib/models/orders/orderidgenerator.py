@@ -0,0 +1,37 @@
+import itertools
+import random
+
+ORDER_ID_PREFIX = "bot_"
+MAX_ORDER_ID_LENGTH = 36
+RANDOM_SUFFIX_BITS = 24
+
+
+class OrderIdGenerator:
+    """
+    Builds client order IDs from the bot prefix, the caller's message, a per-process counter and a short random
+    suffix, e.g. bot_tp1_mkt_1f3a9c2.
+
+    The counter keeps every ID from one process unique and the random suffix keeps IDs from separate containers
+    apart, so each ID costs one counter increment and one getrandbits call. IDs only use hex digits after the
+    message, which Binance accepts in client order IDs.
+    """
+
+    def __init__(self, rng: random.Random = None):
+        self.counter = itertools.count(1)
+        self.getrandbits = (rng or random).getrandbits
+        self.suffix_format = f"0{RANDOM_SUFFIX_BITS // 4}x"
+
+    def generate(self, msg: str = "") -> str:
+        msg = f"{msg}_" if msg else msg
+        order_id = f"{ORDER_ID_PREFIX}{msg}{next(self.counter):x}" \
+                   f"{format(self.getrandbits(RANDOM_SUFFIX_BITS), self.suffix_format)}"
+        if len(order_id) > MAX_ORDER_ID_LENGTH:
+            raise ValueError("Order IDs must be less than 36 characters")
+        return order_id
+
+
+_ORDER_ID_GENERATOR = OrderIdGenerator()
+
+
+def generate_order_id(msg: str = "") -> str:
+    return _ORDER_ID_GENERATOR.generate(msg=msg)
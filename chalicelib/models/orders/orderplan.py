@@ -0,0 +1,20 @@
+from typing import List
+
+from chalicelib.models.orders.positionorder import PositionOrder
+from chalicelib.models.orders.slorder import StopLossOrder
+from chalicelib.models.orders.tporder import TakeProfitOrder
+from chalicelib.risk.risk import Risk
+
+
+class OrderPlan:
+    """
+    The position, stop loss and take profit orders built for an alert, and the risk they were checked against.
+    """
+    __slots__ = ("position_orders", "sl_orders", "tp_orders", "risk")
+
+    def __init__(self, position_orders: List[PositionOrder], sl_orders: List[StopLossOrder],
+                 tp_orders: List[TakeProfitOrder], risk: Risk):
+        self.position_orders = position_orders
+        self.sl_orders = sl_orders
+        self.tp_orders = tp_orders
+        self.risk = risk
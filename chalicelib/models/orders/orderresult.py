@@ -0,0 +1,22 @@
+from typing import Optional
+
+from chalicelib.models.orders.order import Order
+
+
+class OrderResult:
+    """
+    Outcome of placing a single order, either the exchange's order or the error it was rejected with.
+    """
+
+    def __init__(self, order: Order, exchange_order=None, error: Optional[Exception] = None):
+        self.order = order
+        self.exchange_order = exchange_order
+        self.error = error
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        outcome = "PLACED" if self.is_success else f"FAILED: {self.error}"
+        return f"ORDER ID: {self.order.order_id}, ORDER TYPE: {self.order.order_type}, {outcome}"
@@ -3,6 +3,7 @@ from chalicelib.models.orders.positionlimitorder import PositionLimitOrder
 
 
 class PositionDCAOrder(PositionLimitOrder):
+    __slots__ = ("dca_percentage",)
 
     def __init__(self, side: Constants.OrderSide, ticker: str, token_qty: float, limit_price: float,
                  curr_token_price: float, entry_price: float, dca_percentage: float, order_id_str: str = "dca"):
@@ -3,6 +3,7 @@ from chalicelib.models.orders.positionorder import PositionOrder
 
 
 class PositionMarketOrder(PositionOrder):
+    __slots__ = ()
 
     def __init__(self, side: Constants.OrderSide, ticker: str, token_qty: float,
                  curr_token_price: float, entry_price: float, order_id_str: str = "pos_mkt"):
@@ -3,6 +3,7 @@ from chalicelib.models.orders.order import Order
 
 
 class PositionOrder(Order):
+    __slots__ = ("curr_token_price", "entry_price")
 
     def __init__(self, side: Constants.OrderSide, ticker: str, order_type: str, order_id_str: str, token_qty: float,
                  curr_token_price: float, entry_price: float, limit_price: float = None, 
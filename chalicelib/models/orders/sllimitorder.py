@@ -3,9 +3,11 @@ from chalicelib.models.orders.order import Order
 
 
 class StopLossLimitOrder(Order):
+    __slots__ = ()
 
-    def __init__(self, side: Constants.OrderSide, ticker: str, order_id: str, trigger_price: float, limit_price: float):
-        super().__init__(side=side, ticker=ticker, order_type="STOP", order_id=order_id,
+    def __init__(self, side: Constants.OrderSide, ticker: str, order_id_str: str, trigger_price: float,
+                 limit_price: float):
+        super().__init__(side=side, ticker=ticker, order_type="STOP", order_id_str=order_id_str,
                          close_position=True, trigger_price=trigger_price, limit_price=limit_price)
 
     def __repr__(self):
@@ -3,6 +3,7 @@ from chalicelib.models.orders.order import Order
 
 
 class StopLossOrder(Order):
+    __slots__ = ()
 
     def __init__(self, side: Constants.OrderSide, ticker: str, order_id_str: str, trigger_price: float):
         super().__init__(side=side, ticker=ticker, order_type="STOP_MARKET", order_id_str=order_id_str,
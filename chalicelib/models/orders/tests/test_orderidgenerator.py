@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from chalicelib import orderutils
+from chalicelib.models.orders.closepositionorder import ClosePositionOrder
+from chalicelib.models.orders.orderidgenerator import OrderIdGenerator
+from chalicelib.models.orders.positiondcaorder import PositionDCAOrder
+
+
+class OrderIdGeneratorTest(unittest.TestCase):
+
+    def test_order_ids_keep_bot_prefixes(self):
+        # given
+        class_under_test = OrderIdGenerator(rng=random.Random(1))
+
+        # when
+        order_id = class_under_test.generate(msg="tp1_mkt")
+        exit_order_id = class_under_test.generate(msg="exit")
+        bare_order_id = class_under_test.generate()
+
+        # then
+        self.assertTrue(order_id.startswith("bot_tp1_mkt_"))
+        self.assertTrue(exit_order_id.startswith("bot_exit_"))
+        self.assertTrue(orderutils.is_bot_order_id(bare_order_id))
+        self.assertNotIn("__", bare_order_id)
+
+    def test_order_ids_are_unique_even_when_random_suffixes_repeat(self):
+        # given
+        first_generator = OrderIdGenerator(rng=random.Random(1))
+        second_generator = OrderIdGenerator(rng=random.Random(1))
+
+        # when
+        order_ids = {first_generator.generate(msg="dca") for _ in range(100000)}
+
+        # then
+        self.assertEqual(100000, len(order_ids))
+        self.assertIn(second_generator.generate(msg="dca"), order_ids)
+        self.assertNotEqual(first_generator.generate(msg="dca"), second_generator.generate(msg="dca"))
+
+    def test_order_id_longer_than_36_characters_raises(self):
+        # given
+        class_under_test = OrderIdGenerator()
+
+        # when / then
+        with self.assertRaises(ValueError):
+            class_under_test.generate(msg="a_very_long_order_id_message")
+
+    def test_orders_have_no_instance_dict(self):
+        # given
+        dca_order = PositionDCAOrder(side="BUY", ticker="BTCUSDT", token_qty=0.5, limit_price=29000.0,
+                                     curr_token_price=30000.0, entry_price=29000.0, dca_percentage=50)
+        exit_order = ClosePositionOrder(side="SELL", ticker="BTCUSDT", order_id_str="exit", token_qty=0.5)
+
+        # when / then
+        self.assertFalse(hasattr(dca_order, "__dict__"))
+        self.assertEqual(50, dca_order.dca_percentage)
+        self.assertTrue(exit_order.order_id.startswith("bot_exit_"))
+        with self.assertRaises(AttributeError):
+            dca_order.unknown_attribute = True
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ from chalicelib.models.orders.tpmarketorder import TakeProfitMarketOrder
 
 
 class TakeProfitLimitOrder(TakeProfitMarketOrder):
+    __slots__ = ()
 
     def __init__(self, side: Constants.OrderSide, ticker: str, token_qty: float, trigger_price: float,
                  limit_price: float, exit_percentage: int, order_id_str: str = "tp_lmt"):
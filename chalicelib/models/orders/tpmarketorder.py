@@ -3,11 +3,14 @@ from chalicelib.models.orders.tporder import TakeProfitOrder
 
 
 class TakeProfitMarketOrder(TakeProfitOrder):
+    __slots__ = ()
 
     def __init__(self, side: Constants.OrderSide, ticker: str, token_qty: float,
-                 trigger_price: float, exit_percentage: int, order_id_str: str = "tp_mkt"):
-        super().__init__(side=side, ticker=ticker, order_type="TAKE_PROFIT_MARKET", order_id_str=order_id_str,
-                         token_qty=token_qty, trigger_price=trigger_price, exit_percentage=exit_percentage)
+                 trigger_price: float, exit_percentage: int, order_id_str: str = "tp_mkt",
+                 order_type: str = "TAKE_PROFIT_MARKET", limit_price: float = None):
+        super().__init__(side=side, ticker=ticker, order_type=order_type, order_id_str=order_id_str,
+                         token_qty=token_qty, trigger_price=trigger_price, exit_percentage=exit_percentage,
+                         limit_price=limit_price)
 
     def __repr__(self):
         return f" --- TAKE PROFIT ORDER ---         EXIT PERCENTAGE: {self.exit_percentage}, {super().__repr__()}"
\ No newline at end of file
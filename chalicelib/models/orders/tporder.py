@@ -3,6 +3,7 @@ from chalicelib.models.orders.order import Order
 
 
 class TakeProfitOrder(Order):
+    __slots__ = ("exit_percentage",)
 
     def __init__(self, side: Constants.OrderSide, ticker: str, order_type: str, order_id_str: str, token_qty: float,
                  trigger_price: float, exit_percentage: int, limit_price: float = None):
@@ -0,0 +1,21 @@
+from chalicelib.constants import Constants
+from chalicelib.models.orders.order import Order
+
+
+class TrailingStopOrder(Order):
+    """
+    Reduce only TRAILING_STOP_MARKET order. Once the price reaches the activation price, or straight away without
+    one, it triggers when the price moves callback_rate percent back from the best price seen since.
+    """
+    __slots__ = ("callback_rate", "activation_price")
+
+    def __init__(self, side: Constants.OrderSide, ticker: str, token_qty: float, callback_rate: float,
+                 activation_price: float = None, order_id_str: str = "trail"):
+        self.callback_rate = callback_rate
+        self.activation_price = activation_price
+        super().__init__(side=side, ticker=ticker, order_type="TRAILING_STOP_MARKET", order_id_str=order_id_str,
+                         token_qty=token_qty, reduce_only=True)
+
+    def __repr__(self):
+        return f" --- TRAILING STOP ORDER ---       CALLBACK RATE: {self.callback_rate}%, " \
+               f"ACTIVATION PRICE: {self.activation_price}, {super().__repr__()}"
@@ -1,16 +1,9 @@
-import random
-import string
-
 from chalicelib.constants import Constants
+from chalicelib.models.orders import orderidgenerator
 
 
 def generate_order_id(msg=""):
-    msg = msg if len(msg) == 0 else f"{msg}_"
-    rand_str = ''.join(random.choice(string.ascii_letters) for _ in range(8))
-    order_id = f"bot_{msg}{rand_str}"
-    if len(order_id) > 36:
-        raise ValueError("Order IDs must be less than 36 characters")
-    return order_id
+    return orderidgenerator.generate_order_id(msg=msg)
 
 
 def flip_order_side(order_side: Constants.OrderSide) -> Constants.OrderSide:
@@ -43,7 +36,7 @@ def calculate_gain_loss(token_qty: float, exit_price: float, entry_price: float)
 
 
 def is_bot_order_id(order_id: str):
-    return order_id.startswith("bot_")
+    return order_id.startswith(orderidgenerator.ORDER_ID_PREFIX)
 
 
 def __calculate_position_size(stake_percent: int, leverage_multiplier: int, portfolio_value: float):
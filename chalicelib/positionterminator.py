@@ -1,24 +1,30 @@
+from typing import Optional
+
 from binance_f.model import Position
 
 from chalicelib import orderutils
 from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.exchanges.positionsnapshot import PositionSnapshot
+from chalicelib.logs.botlogger import get_logger
 from chalicelib.models.orders.closepositionorder import ClosePositionOrder
 
+logger = get_logger()
+
 
 class PositionTerminator:
-    def __init__(self, exchange_client: ExchangeClient):
+    def __init__(self, exchange_client: ExchangeClient, positions: Optional[PositionSnapshot] = None):
         self.exchange_client = exchange_client
+        # Positions already fetched by the caller, otherwise the ticker's position is requested when needed
+        self.positions = positions
 
-    def get_position(self, ticker: str) -> Position:
-        open_positions = self.exchange_client.get_position()
-        for open_position in open_positions:
-            if open_position.symbol == ticker.upper():
-                return open_position
+    def get_position(self, ticker: str) -> Optional[Position]:
+        if self.positions is None:
+            self.positions = self.exchange_client.get_position_snapshot(tickers=[ticker])
+        return self.positions.get(ticker=ticker)
 
-    def get_open_position(self, ticker: str) -> Position:
-        position = self.get_position(ticker=ticker)
-        if position and position.positionAmt != 0:
-            return position
+    def get_open_position(self, ticker: str) -> Optional[Position]:
+        self.get_position(ticker=ticker)
+        return self.positions.get_open(ticker=ticker)
 
     def build_close_position_order(self, ticker: str) -> ClosePositionOrder:
         open_position = self.get_open_position(ticker=ticker)
@@ -26,6 +32,6 @@ class PositionTerminator:
             position_amt = open_position.positionAmt
             position_side = orderutils.get_position_side_from_amt(position_amt)
             amt_to_close = abs(position_amt)
-            print(f"Attempting to close open position of side {position_side} for amount {amt_to_close}")
+            logger.info("Attempting to close open position of side %s for amount %s", position_side, amt_to_close)
             flipped_side = orderutils.flip_order_side(order_side=position_side)
             return ClosePositionOrder(side=flipped_side, ticker=ticker, order_id_str="exit", token_qty=amt_to_close)
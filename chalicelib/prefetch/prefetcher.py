@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_WORKERS = 8
+
+
+class PrefetchTask:
+
+    def __init__(self, name: str, fetch: Callable[[], Any], timeout_seconds: float):
+        self.name = name
+        self.fetch = fetch
+        self.timeout_seconds = timeout_seconds
+        self.elapsed_ms = None
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            return self.fetch()
+        finally:
+            self.elapsed_ms = (time.perf_counter() - start) * 1000
+
+
+class Prefetcher:
+    """
+    Issues independent exchange reads at the same time on a thread pool, so the total wait is roughly the slowest
+    single read rather than the sum of all of them.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 default_timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS):
+        self.max_workers = max_workers
+        self.default_timeout_seconds = default_timeout_seconds
+        self.tasks: List[PrefetchTask] = []
+
+    def add(self, name: str, fetch: Callable[[], Any], timeout_seconds: float = None):
+        timeout_seconds = self.default_timeout_seconds if timeout_seconds is None else timeout_seconds
+        self.tasks.append(PrefetchTask(name=name, fetch=fetch, timeout_seconds=timeout_seconds))
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Runs every added task and returns their results keyed by name. If any task fails or exceeds its timeout the
+        first such error, in the order tasks were added, is raised once all other tasks have been waited on.
+        """
+        results = {}
+        first_error = None
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.tasks))),
+                                      thread_name_prefix="prefetch")
+        try:
+            futures = [(task, executor.submit(task.run)) for task in self.tasks]
+            for task, future in futures:
+                remaining = task.timeout_seconds - (time.perf_counter() - start)
+                try:
+                    results[task.name] = future.result(timeout=max(0.0, remaining))
+                except FutureTimeoutError:
+                    first_error = first_error or TimeoutError(
+                        f"Prefetch of '{task.name}' timed out after {task.timeout_seconds}s")
+                except Exception as err:
+                    first_error = first_error or err
+        finally:
+            # Do not block on reads that timed out, their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.log(total_ms=(time.perf_counter() - start) * 1000)
+        if first_error is not None:
+            raise first_error
+        return results
+
+    def log(self, total_ms: float):
+        timings = ", ".join(
+            f"{task.name.upper()}: {'TIMED OUT' if task.elapsed_ms is None else f'{task.elapsed_ms:.1f}ms'}"
+            for task in self.tasks)
+        logger.info("--- PREFETCH ---   %s, TOTAL: %.1fms", timings, total_ms)
@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from chalicelib.prefetch.prefetcher import Prefetcher
+
+
+class PrefetcherTest(unittest.TestCase):
+    DELAY_SECONDS = 0.2
+
+    def slow_read(self, value):
+        time.sleep(self.DELAY_SECONDS)
+        return value
+
+    def test_reads_run_concurrently(self):
+        # given
+        class_under_test = Prefetcher() \
+            .add("first", lambda: self.slow_read(1)) \
+            .add("second", lambda: self.slow_read(2)) \
+            .add("third", lambda: self.slow_read(3))
+
+        # when
+        start = time.perf_counter()
+        results = class_under_test.run()
+        elapsed = time.perf_counter() - start
+
+        # then
+        self.assertEqual({"first": 1, "second": 2, "third": 3}, results)
+        self.assertLess(elapsed, self.DELAY_SECONDS * 2)
+
+    def test_read_exceeding_timeout_raises_error(self):
+        # given
+        class_under_test = Prefetcher() \
+            .add("fast", lambda: 1) \
+            .add("slow", lambda: self.slow_read(2), timeout_seconds=0.01)
+
+        # when
+        with self.assertRaises(TimeoutError) as context:
+            class_under_test.run()
+
+        # then
+        self.assertTrue("Prefetch of 'slow' timed out" in str(context.exception))
+
+    def test_read_error_is_raised(self):
+        # given
+        def failing_read():
+            raise ValueError("Exchange unavailable")
+
+        class_under_test = Prefetcher() \
+            .add("fast", lambda: 1) \
+            .add("failing", failing_read)
+
+        # when
+        with self.assertRaises(ValueError) as context:
+            class_under_test.run()
+
+        # then
+        self.assertEqual("Exchange unavailable", str(context.exception))
@@ -0,0 +1,61 @@
+import os
+import threading
+from abc import ABCMeta, abstractmethod
+from typing import Dict, Optional
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+LAST_PRICE = "LAST"
+MARK_PRICE = "MARK"
+# Oldest price accepted when a caller does not say otherwise
+DEFAULT_MAX_AGE_MS = 1000
+PRICE_STREAM_ENV_VAR = "PRICE_STREAM_ENABLED"
+
+
+class PriceService(metaclass=ABCMeta):
+
+    @abstractmethod
+    def get_price(self, ticker: str, max_age_ms: int = DEFAULT_MAX_AGE_MS, price_type: str = LAST_PRICE) -> float:
+        """
+        Last traded or mark price of the ticker, no older than max_age_ms. A max_age_ms of 0 always asks the exchange.
+        """
+        pass
+
+
+_PRICE_SERVICES: Dict[bool, PriceService] = {}
+_PRICE_SERVICES_LOCK = threading.Lock()
+
+
+def is_price_stream_enabled() -> bool:
+    return os.environ.get(PRICE_STREAM_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def get_price_service(is_test_platform: bool, stream_enabled: Optional[bool] = None) -> PriceService:
+    """
+    Returns the process-wide price service for the live or test platform, creating it on first use.
+
+    Lambda containers use the ticker price endpoint behind a short cache. Long running processes, e.g. 'chalice local'
+    or a container, set PRICE_STREAM_ENABLED to keep prices current from the exchange's websocket streams instead, and
+    fall back to the endpoint for symbols the stream has not priced recently enough.
+    """
+    with _PRICE_SERVICES_LOCK:
+        price_service = _PRICE_SERVICES.get(is_test_platform)
+        if price_service is None:
+            from chalicelib.exchanges.binanceexchangeclient import BINANCE_API_BASE_URL, BINANCE_STREAM_BASE_URL, \
+                TESTNET_BASE_URL, TESTNET_STREAM_BASE_URL
+            from chalicelib.exchanges.exchangeclientpool import get_http_session
+            from chalicelib.prices.tickerpriceservice import TickerPriceService
+
+            base_url = TESTNET_BASE_URL if is_test_platform else BINANCE_API_BASE_URL
+            price_service = TickerPriceService(base_url=base_url, session=get_http_session())
+            if is_price_stream_enabled() if stream_enabled is None else stream_enabled:
+                from chalicelib.prices.streamingpriceservice import StreamingPriceService
+
+                stream_base_url = TESTNET_STREAM_BASE_URL if is_test_platform else BINANCE_STREAM_BASE_URL
+                price_service = StreamingPriceService(stream_base_url=stream_base_url, fallback=price_service)
+                price_service.start()
+            logger.info("Created %s for test platform: %s", type(price_service).__name__, is_test_platform)
+            _PRICE_SERVICES[is_test_platform] = price_service
+        return price_service
@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.prices.priceservice import PriceService, DEFAULT_MAX_AGE_MS, LAST_PRICE, MARK_PRICE
+
+logger = get_logger()
+
+# Mark prices of every symbol each second, and last prices of every symbol that traded in the last second
+PRICE_STREAMS = "!markPrice@arr@1s/!miniTicker@arr"
+MARK_PRICE_EVENT = "markPriceUpdate"
+MINI_TICKER_EVENT = "24hrMiniTicker"
+MIN_RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 60.0
+
+
+def connect_websocket(url: str):
+    from websockets.sync.client import connect
+
+    return connect(url, max_size=None)
+
+
+class StreamingPriceService(PriceService):
+    """
+    Last and mark prices for every symbol, kept current from the exchange's all market websocket streams by a
+    background thread. Prices older than a caller accepts, e.g. while reconnecting or for a symbol which has not
+    traded recently, come from the fallback service instead.
+    """
+
+    def __init__(self, stream_base_url: str, fallback: PriceService,
+                 connect: Callable[[str], object] = connect_websocket, clock: Callable[[], float] = time.monotonic,
+                 min_reconnect_delay: float = MIN_RECONNECT_DELAY_SECONDS,
+                 max_reconnect_delay: float = MAX_RECONNECT_DELAY_SECONDS):
+        self.stream_url = f"{stream_base_url}/stream?streams={PRICE_STREAMS}"
+        self.fallback = fallback
+        self.connect = connect
+        self.clock = clock
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.prices: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def get_price(self, ticker: str, max_age_ms: int = DEFAULT_MAX_AGE_MS, price_type: str = LAST_PRICE) -> float:
+        cached = self.prices.get((ticker.upper(), price_type))
+        if cached is not None and (self.clock() - cached[1]) * 1000 < max_age_ms:
+            self.hits += 1
+            return cached[0]
+        self.misses += 1
+        return self.fallback.get_price(ticker=ticker, max_age_ms=max_age_ms, price_type=price_type)
+
+    def apply_message(self, message: dict):
+        """
+        Stores the prices in a combined stream message.
+        """
+        received_at = self.clock()
+        for update in message.get("data", []):
+            event_type = update.get("e")
+            if event_type == MARK_PRICE_EVENT:
+                self.prices[(update["s"], MARK_PRICE)] = (float(update["p"]), received_at)
+            elif event_type == MINI_TICKER_EVENT:
+                self.prices[(update["s"], LAST_PRICE)] = (float(update["c"]), received_at)
+
+    def start(self) -> threading.Thread:
+        self.thread = threading.Thread(target=self.run, name="price-stream", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self.stopped.set()
+        connection = self.connection
+        if connection is not None:
+            connection.close()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self):
+        reconnect_delay = self.min_reconnect_delay
+        while not self.stopped.is_set():
+            try:
+                with self.connect(self.stream_url) as connection:
+                    self.connection = connection
+                    logger.info("Connected to price stream")
+                    reconnect_delay = self.min_reconnect_delay
+                    for message in connection:
+                        self.apply_message(json.loads(message))
+            except Exception as err:
+                if self.stopped.is_set():
+                    break
+                logger.warning("Price stream disconnected: %s. Reconnecting in %s seconds", err, reconnect_delay)
+            self.stopped.wait(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, self.max_reconnect_delay)
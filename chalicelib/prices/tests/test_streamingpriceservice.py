@@ -0,0 +1,49 @@
+import unittest
+
+from chalicelib.prices.priceservice import MARK_PRICE
+from chalicelib.prices.streamingpriceservice import StreamingPriceService
+from chalicelib.prices.tests.test_tickerpriceservice import FakeClock
+from chalicelib.prices.tickerpriceservice import TickerPriceService
+
+
+class StreamingPriceServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.fallback = TickerPriceService(base_url="https://fapi.example.com", fetch_price=lambda ticker, _: 50.0,
+                                           clock=self.clock)
+        self.class_under_test = StreamingPriceService(stream_base_url="wss://fstream.example.com",
+                                                      fallback=self.fallback, clock=self.clock)
+        self.class_under_test.apply_message({"stream": "!miniTicker@arr", "data": [
+            {"e": "24hrMiniTicker", "E": 1, "s": "BTCUSDT", "c": "30000.5", "o": "29000", "h": "31000", "l": "28000",
+             "v": "10", "q": "300000"}]})
+        self.class_under_test.apply_message({"stream": "!markPrice@arr@1s", "data": [
+            {"e": "markPriceUpdate", "E": 1, "s": "BTCUSDT", "p": "30001.25", "i": "30000", "r": "0.0001",
+             "T": 2}]})
+
+    def test_streamed_prices_are_served_without_requests(self):
+        # when / then
+        self.assertEqual(30000.5, self.class_under_test.get_price("btcusdt"))
+        self.assertEqual(30001.25, self.class_under_test.get_price("BTCUSDT", price_type=MARK_PRICE))
+        self.assertEqual(0, self.fallback.misses)
+        self.assertEqual("wss://fstream.example.com/stream?streams=!markPrice@arr@1s/!miniTicker@arr",
+                         self.class_under_test.stream_url)
+
+    def test_stale_or_missing_prices_fall_back(self):
+        # given
+        self.clock.now += 0.5
+
+        # when
+        stale_price = self.class_under_test.get_price("BTCUSDT", max_age_ms=250)
+        recent_price = self.class_under_test.get_price("BTCUSDT", max_age_ms=1000)
+        missing_price = self.class_under_test.get_price("ETHUSDT")
+
+        # then
+        self.assertEqual(50.0, stale_price)
+        self.assertEqual(30000.5, recent_price)
+        self.assertEqual(50.0, missing_price)
+        self.assertEqual(2, self.class_under_test.misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from chalicelib.prices.priceservice import MARK_PRICE
+from chalicelib.prices.tickerpriceservice import TickerPriceService
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TickerPriceServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fetched = []
+        self.clock = FakeClock()
+        self.class_under_test = TickerPriceService(base_url="https://fapi.example.com", fetch_price=self.fetch_price,
+                                                   clock=self.clock)
+
+    def fetch_price(self, ticker: str, price_type: str) -> float:
+        self.fetched.append((ticker, price_type))
+        return 100.0 + len(self.fetched)
+
+    def test_prices_within_max_age_are_served_from_cache(self):
+        # when
+        first = self.class_under_test.get_price("btcusdt", max_age_ms=500)
+        self.clock.now += 0.4
+        second = self.class_under_test.get_price("BTCUSDT", max_age_ms=500)
+
+        # then
+        self.assertEqual(101.0, first)
+        self.assertEqual(101.0, second)
+        self.assertEqual([("BTCUSDT", "LAST")], self.fetched)
+        self.assertEqual(1, self.class_under_test.hits)
+
+    def test_callers_asking_for_fresher_prices_refetch(self):
+        # given
+        self.class_under_test.get_price("BTCUSDT", max_age_ms=1000)
+        self.clock.now += 0.3
+
+        # when
+        price = self.class_under_test.get_price("BTCUSDT", max_age_ms=250)
+        uncached_price = self.class_under_test.get_price("BTCUSDT", max_age_ms=0)
+
+        # then
+        self.assertEqual(102.0, price)
+        self.assertEqual(103.0, uncached_price)
+        self.assertEqual(3, len(self.fetched))
+
+    def test_last_and_mark_prices_are_cached_separately(self):
+        # when
+        self.class_under_test.get_price("BTCUSDT")
+        self.class_under_test.get_price("BTCUSDT", price_type=MARK_PRICE)
+
+        # then
+        self.assertEqual([("BTCUSDT", "LAST"), ("BTCUSDT", "MARK")], self.fetched)
+
+
+if __name__ == '__main__':
+    unittest.main()
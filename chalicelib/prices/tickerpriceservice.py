@@ -0,0 +1,50 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from chalicelib.prices.priceservice import PriceService, DEFAULT_MAX_AGE_MS, LAST_PRICE, MARK_PRICE
+
+TICKER_PRICE_PATH = "/fapi/v1/ticker/price"
+PREMIUM_INDEX_PATH = "/fapi/v1/premiumIndex"
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+
+class TickerPriceService(PriceService):
+    """
+    Prices from the single symbol ticker price and premium index endpoints, rather than the 24 hour statistics
+    fetch_ticker requests, cached per symbol so requests within max_age_ms of each other share one call.
+    """
+
+    def __init__(self, base_url: str, session: Optional[requests.Session] = None,
+                 fetch_price: Optional[Callable[[str, str], float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.base_url = base_url
+        self.session = session or requests.Session()
+        self.fetch_price = fetch_price or self.__fetch_price
+        self.clock = clock
+        self.prices: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_price(self, ticker: str, max_age_ms: int = DEFAULT_MAX_AGE_MS, price_type: str = LAST_PRICE) -> float:
+        key = (ticker.upper(), price_type)
+        cached = self.prices.get(key)
+        if cached is not None and (self.clock() - cached[1]) * 1000 < max_age_ms:
+            self.hits += 1
+            return cached[0]
+        self.misses += 1
+        price = self.fetch_price(key[0], price_type)
+        with self.lock:
+            self.prices[key] = (price, self.clock())
+        return price
+
+    def __fetch_price(self, ticker: str, price_type: str) -> float:
+        path = PREMIUM_INDEX_PATH if price_type == MARK_PRICE else TICKER_PRICE_PATH
+        response = self.session.get(f"{self.base_url}{path}", params={"symbol": ticker},
+                                    timeout=REQUEST_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        body = response.json()
+        return float(body["markPrice"] if price_type == MARK_PRICE else body["price"])
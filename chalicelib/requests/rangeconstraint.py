@@ -0,0 +1,21 @@
+class RangeConstraint:
+    """
+    Numeric allow-list expressed as the interval (lower, upper], e.g. a positive leverage of at most 125.
+
+    Membership costs a couple of comparisons instead of allocating and scanning every allowed value.
+    """
+    __slots__ = ("lower", "upper")
+
+    def __init__(self, lower: float, upper: float):
+        if upper <= lower:
+            raise ValueError(f"Range upper bound must be above its lower bound. Lower: {lower} Upper: {upper}")
+        self.lower = lower
+        self.upper = upper
+
+    def __contains__(self, value) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return self.lower < value <= self.upper
+
+    def __repr__(self):
+        return f"RangeConstraint(lower={self.lower}, upper={self.upper})"
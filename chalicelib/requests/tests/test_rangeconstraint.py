@@ -0,0 +1,51 @@
+import unittest
+
+from chalicelib.requests.rangeconstraint import RangeConstraint
+
+
+class RangeConstraintTest(unittest.TestCase):
+
+    def test_upper_bound_is_inclusive(self):
+        # given
+        class_under_test = RangeConstraint(0, 125)
+
+        # then
+        self.assertTrue(125 in class_under_test)
+        self.assertTrue(124.5 in class_under_test)
+        self.assertFalse(125.01 in class_under_test)
+
+    def test_lower_bound_is_exclusive(self):
+        # given
+        class_under_test = RangeConstraint(0, 100)
+
+        # then
+        self.assertTrue(0.05 in class_under_test)
+        self.assertFalse(0 in class_under_test)
+        self.assertFalse(-1 in class_under_test)
+
+    def test_values_between_bounds_need_not_land_on_a_step(self):
+        # given
+        class_under_test = RangeConstraint(0, 1000000)
+
+        # then
+        self.assertTrue(0.75 in class_under_test)
+        self.assertTrue(1.25 in class_under_test)
+
+    def test_non_numeric_values_are_rejected(self):
+        # given
+        class_under_test = RangeConstraint(0, 100)
+
+        # then
+        self.assertFalse("10" in class_under_test)
+        self.assertFalse(None in class_under_test)
+        self.assertFalse(True in class_under_test)
+        self.assertFalse(float("nan") in class_under_test)
+
+    def test_empty_range_throws_error(self):
+        # when
+        with self.assertRaises(ValueError):
+            RangeConstraint(10, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
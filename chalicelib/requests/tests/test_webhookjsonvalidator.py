@@ -703,6 +703,134 @@ class WebhookJsonValidatorTest(unittest.TestCase):
         # then
         self.assertTrue(err_msg in str(context.exception))
 
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # ---------------------------------------------- RANGE CONSTRAINT TESTS ------------------------------------------ #
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    def assert_invalid_value(self, payload: dict, field: str, field_id: str, value):
+        err_msg = f"Invalid value for '{field}' in '{field_id}' JSON payload. Value: {value} "
+        validator = WebhookJsonValidator()
+
+        # when
+        with self.assertRaises(ValueError) as context:
+            validator.validate_payload(payload=payload)
+
+        # then
+        self.assertTrue(err_msg in str(context.exception))
+
+    def test_values_at_the_upper_bounds_are_valid(self):
+        """
+        Binance's maximum leverage of 125 and a stake of the full 100% are both allowed.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.LEVERAGE] = 125
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.STAKE] = 100
+        validator = WebhookJsonValidator()
+
+        # when
+        result = validator.validate_payload(payload=self.json_payload)
+
+        # then
+        self.assertTrue(result)
+
+    def test_values_between_tenths_are_valid(self):
+        """
+        ATR multipliers and portfolio risk are not restricted to multiples of 0.1.
+        """
+        # given
+        self.json_payload[self.RISK_KEYS.RISK][self.RISK_KEYS.PORTFOLIO_RISK] = 0.25
+        self.json_payload[self.TP_KEYS.TAKE_PROFIT].update({self.TP_KEYS.ATR_MULTIPLIERS: [0.75, 1.5, 3],
+                                                           self.TP_KEYS.SPLITS: [30, 30, 40]})
+        self.json_payload[self.SL_KEYS.STOP_LOSS][self.SL_KEYS.ATR_MULTIPLIER] = 1.25
+        validator = WebhookJsonValidator()
+
+        # when
+        result = validator.validate_payload(payload=self.json_payload)
+
+        # then
+        self.assertTrue(result)
+
+    def test_numeric_string_values_are_valid(self):
+        """
+        Numeric strings within range are accepted as the order factories convert them.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.STAKE] = "5"
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.LEVERAGE] = "2"
+        self.json_payload[self.RISK_KEYS.RISK][self.RISK_KEYS.PORTFOLIO_RISK] = "1.5"
+        validator = WebhookJsonValidator()
+
+        # when
+        result = validator.validate_payload(payload=self.json_payload)
+
+        # then
+        self.assertTrue(result)
+
+    def test_leverage_above_range_throws_error(self):
+        """
+        'leverage' must be at most 125.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.LEVERAGE] = 126
+
+        self.assert_invalid_value(self.json_payload, self.POSITION_KEYS.LEVERAGE, self.POSITION_KEYS.POSITION, 126)
+
+    def test_stake_above_range_throws_error(self):
+        """
+        'stake' must be at most 100.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.STAKE] = 101
+
+        self.assert_invalid_value(self.json_payload, self.POSITION_KEYS.STAKE, self.POSITION_KEYS.POSITION, 101)
+
+    def test_stake_not_positive_throws_error(self):
+        """
+        'stake' must be positive.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.STAKE] = 0
+
+        self.assert_invalid_value(self.json_payload, self.POSITION_KEYS.STAKE, self.POSITION_KEYS.POSITION, 0)
+
+    def test_non_numeric_stake_throws_error(self):
+        """
+        'stake' must be a number.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION][self.POSITION_KEYS.STAKE] = "ten"
+
+        self.assert_invalid_value(self.json_payload, self.POSITION_KEYS.STAKE, self.POSITION_KEYS.POSITION, "ten")
+
+    def test_portfolio_risk_not_positive_throws_error(self):
+        """
+        'portfolioRisk' must be positive.
+        """
+        # given
+        self.json_payload[self.RISK_KEYS.RISK][self.RISK_KEYS.PORTFOLIO_RISK] = -1
+
+        self.assert_invalid_value(self.json_payload, self.RISK_KEYS.PORTFOLIO_RISK, self.RISK_KEYS.RISK, -1)
+
+    def test_dca_atr_multiplier_not_positive_throws_error(self):
+        """
+        Every value in 'dcaAtrMultipliers' must be positive.
+        """
+        # given
+        self.json_payload[self.POSITION_KEYS.POSITION].update({self.POSITION_KEYS.DCA_ATR_MULTIPLIERS: [0, 1],
+                                                               self.POSITION_KEYS.DCA_PERCENTAGES: [50, 50]})
+
+        self.assert_invalid_value(self.json_payload, self.POSITION_KEYS.DCA_ATR_MULTIPLIERS,
+                                  self.POSITION_KEYS.POSITION, 0)
+
+    def test_sl_atr_multiplier_not_positive_throws_error(self):
+        """
+        Stop loss 'atrMultiplier' must be positive.
+        """
+        # given
+        self.json_payload[self.SL_KEYS.STOP_LOSS][self.SL_KEYS.ATR_MULTIPLIER] = 0
+
+        self.assert_invalid_value(self.json_payload, self.SL_KEYS.ATR_MULTIPLIER, self.SL_KEYS.STOP_LOSS, 0)
+
     # ---------------------------------------------------------------------------------------------------------------- #
     # ----------------------------------------------- STOP LOSS TESTS ------------------------------------------------ #
     # ---------------------------------------------------------------------------------------------------------------- #
@@ -1,8 +1,10 @@
 from typing import List
 
-import numpy as np
-
 from chalicelib.constants import Constants
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.requests.rangeconstraint import RangeConstraint
+
+logger = get_logger()
 
 
 class WebhookJsonValidator:
@@ -12,59 +14,63 @@ class WebhookJsonValidator:
     TP_KEYS = KEYS.TakeProfit
     SL_KEYS = KEYS.StopLoss
 
-    def __init__(self):
-        self.required_fields = [self.KEYS.AUTH,
-                                self.KEYS.INTERVAL,
-                                self.POSITION_KEYS.POSITION,
-                                self.RISK_KEYS.RISK,
-                                self.KEYS.IS_DRY_RUN,
-                                self.TP_KEYS.TAKE_PROFIT,
-                                self.SL_KEYS.STOP_LOSS]
-        self.pos_required_fields = [self.POSITION_KEYS.TICKER, self.POSITION_KEYS.SIDE, self.POSITION_KEYS.STAKE]
-        self.pos_dca_trigger_fields = [self.POSITION_KEYS.DCA_ATR_MULTIPLIERS, self.POSITION_KEYS.DCA_TRIGGER_PRICES]
-        self.risk_required_fields = [self.RISK_KEYS.PORTFOLIO_RISK]
-        self.tp_required_fields = [self.TP_KEYS.SPLITS]
-        self.tp_trigger_fields = [self.TP_KEYS.ATR_MULTIPLIERS, self.TP_KEYS.TRIGGER_PRICES]
-        self.sl_trigger_fields = [self.SL_KEYS.ATR_MULTIPLIER, self.SL_KEYS.TRIGGER_PRICE]
-        self.allowed_intervals = [1, 3, 5, 15, 30, 60, 120, 240, 360, 480, 720]
-        self.allowed_actions = ["BUY", "SELL"]
-        self.allowed_margin_type = ["ISOLATED", "CROSS"]
-        self.allowed_leverage = range(1, 125)
-        self.allowed_stake = range(1, 100)
-        self.allowed_portfolio_risk = np.arange(0.1, 100.0, 0.1)
-        self.allowed_atr_multiplier = np.arange(0.1, 1000000, 0.1)
+    # Rules are built once at import time and shared by every validator instance across warm invocations
+    required_fields = [KEYS.AUTH, KEYS.INTERVAL, POSITION_KEYS.POSITION, RISK_KEYS.RISK, KEYS.IS_DRY_RUN,
+                       TP_KEYS.TAKE_PROFIT, SL_KEYS.STOP_LOSS]
+    pos_required_fields = [POSITION_KEYS.TICKER, POSITION_KEYS.SIDE, POSITION_KEYS.STAKE]
+    pos_dca_trigger_fields = [POSITION_KEYS.DCA_ATR_MULTIPLIERS, POSITION_KEYS.DCA_TRIGGER_PRICES]
+    risk_required_fields = [RISK_KEYS.PORTFOLIO_RISK]
+    tp_required_fields = [TP_KEYS.SPLITS]
+    tp_trigger_fields = [TP_KEYS.ATR_MULTIPLIERS, TP_KEYS.TRIGGER_PRICES]
+    sl_trigger_fields = [SL_KEYS.ATR_MULTIPLIER, SL_KEYS.TRIGGER_PRICE]
+    allowed_intervals = frozenset([1, 3, 5, 15, 30, 60, 120, 240, 360, 480, 720])
+    allowed_actions = frozenset(["BUY", "SELL"])
+    allowed_margin_type = frozenset(["ISOLATED", "CROSS"])
+    allowed_leverage = RangeConstraint(0, 125)
+    allowed_stake = RangeConstraint(0, 100)
+    allowed_portfolio_risk = RangeConstraint(0, 100)
+    allowed_atr_multiplier = RangeConstraint(0, 1000000)
+    # (block, field, constraint) for every numeric field, a list field has each of its values checked. The bounds are
+    # unpacked here so the common case of a number in range is two comparisons without any attribute lookups
+    range_rules = tuple((block, field, allowed, allowed.lower, allowed.upper) for block, field, allowed in (
+        (POSITION_KEYS.POSITION, POSITION_KEYS.STAKE, allowed_stake),
+        (POSITION_KEYS.POSITION, POSITION_KEYS.LEVERAGE, allowed_leverage),
+        (POSITION_KEYS.POSITION, POSITION_KEYS.DCA_ATR_MULTIPLIERS, allowed_atr_multiplier),
+        (RISK_KEYS.RISK, RISK_KEYS.PORTFOLIO_RISK, allowed_portfolio_risk),
+        (TP_KEYS.TAKE_PROFIT, TP_KEYS.ATR_MULTIPLIERS, allowed_atr_multiplier),
+        (SL_KEYS.STOP_LOSS, SL_KEYS.ATR_MULTIPLIER, allowed_atr_multiplier)))
 
     def validate_payload(self, payload: dict) -> bool:
-        print("Starting validation of JSON payload")
+        logger.debug("Starting validation of JSON payload")
         is_required_fields = self.__check_required_fields(payload=payload, required_fields=self.required_fields)
-        print(f"Required fields present: {is_required_fields}")
+        logger.debug("Required fields present: %s", is_required_fields)
+        pos_json = payload.get(self.POSITION_KEYS.POSITION)
+        tp_json = payload.get(self.TP_KEYS.TAKE_PROFIT)
 
-        is_pos_required_fields = self.__check_required_fields(payload=payload.get(self.POSITION_KEYS.POSITION),
+        is_pos_required_fields = self.__check_required_fields(payload=pos_json,
                                                               required_fields=self.pos_required_fields,
                                                               field_type=self.POSITION_KEYS.POSITION)
-        print(f"Required position fields present: {is_pos_required_fields}")
-        is_pos_fields_valid = self.__validate_position_fields(pos_json=payload.get(self.POSITION_KEYS.POSITION))
-        print(f"Position fields valid: {is_pos_fields_valid}")
+        logger.debug("Required position fields present: %s", is_pos_required_fields)
+        is_pos_fields_valid = self.__validate_position_fields(pos_json=pos_json)
+        logger.debug("Position fields valid: %s", is_pos_fields_valid)
 
         is_risk_required_fields = self.__check_required_fields(payload=payload.get(self.RISK_KEYS.RISK),
                                                                required_fields=self.risk_required_fields,
                                                                field_type=self.RISK_KEYS.RISK)
-        print(f"Required risk fields present: {is_risk_required_fields}")
+        logger.debug("Required risk fields present: %s", is_risk_required_fields)
 
-        is_tp_required_fields = self.__check_required_fields(payload=payload.get(self.TP_KEYS.TAKE_PROFIT),
-                                                             required_fields=self.tp_required_fields,
+        is_tp_required_fields = self.__check_required_fields(payload=tp_json, required_fields=self.tp_required_fields,
                                                              field_type=self.TP_KEYS.TAKE_PROFIT)
-        print(f"Required take profit fields present: {is_tp_required_fields}")
+        logger.debug("Required take profit fields present: %s", is_tp_required_fields)
 
-        is_tp_fields_valid = self.__validate_tp_fields(tp_json=payload.get(self.TP_KEYS.TAKE_PROFIT),
-                                                       pos_json=payload.get(self.POSITION_KEYS.POSITION))
-        print(f"Take profit fields valid: {is_tp_fields_valid}")
+        is_tp_fields_valid = self.__validate_tp_fields(tp_json=tp_json, pos_json=pos_json)
+        logger.debug("Take profit fields valid: %s", is_tp_fields_valid)
 
         is_sl_required_fields = self.__check_sl_required_fields(sl_json=payload.get(self.SL_KEYS.STOP_LOSS))
-        print(f"Required stop loss fields present: {is_sl_required_fields}")
+        logger.debug("Required stop loss fields present: %s", is_sl_required_fields)
 
         return is_required_fields and is_risk_required_fields and is_tp_required_fields and is_tp_fields_valid and \
-               is_sl_required_fields
+               is_sl_required_fields and self.__check_ranges(payload=payload)
 
     def __validate_position_fields(self, pos_json: dict):
         # Ensure there is either zero or one DCA trigger fields, but never more than one
@@ -151,6 +157,36 @@ class WebhookJsonValidator:
         return self.__check_exactly_one_field(json=sl_json, fields=self.sl_trigger_fields,
                                               field_id=self.SL_KEYS.STOP_LOSS)
 
+    def __check_ranges(self, payload: dict) -> bool:
+        # Every block is a required field, so each has been checked to be present by now
+        for block, field, allowed, lower, upper in self.range_rules:
+            value = payload[block].get(field)
+            value_type = type(value)
+            if value_type is list:
+                numbers = value
+            elif (value_type is int or value_type is float) and lower < value <= upper or value is None:
+                continue
+            else:
+                numbers = (value,)
+            for number in numbers:
+                number_type = type(number)
+                if (number_type is int or number_type is float) and lower < number <= upper:
+                    continue
+                if not self.__is_numeric_in_range(value=number, allowed=allowed):
+                    raise ValueError(f"Invalid value for '{field}' in '{block}' JSON payload. Value: {number} "
+                                     f"Allowed: above {lower} and up to {upper}")
+        return True
+
+    @staticmethod
+    def __is_numeric_in_range(value, allowed: RangeConstraint) -> bool:
+        # Numeric strings are accepted as the order factories convert every field with int() or float()
+        if type(value) is str:
+            try:
+                value = float(value)
+            except ValueError:
+                return False
+        return value in allowed
+
     @staticmethod
     def __check_required_fields(payload: dict, required_fields: List[str], field_type="") -> bool:
         # Ensure compulsory fields are present in JSON payload
@@ -0,0 +1,150 @@
+import math
+from typing import List, Optional
+
+from chalicelib.exceptions.risktoohighexception import RiskTooHighException
+from chalicelib.factories.orderfactory import OrderFactory
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.risk.risk import Risk
+
+logger = get_logger()
+
+# Portfolio risk is compared after rounding to 2 decimal places, so anything below max risk + half a hundredth passes
+RISK_ROUNDING_ALLOWANCE = 0.005
+BREAKPOINT_NUDGE = 1e-9
+
+
+class PositionSizer:
+    """
+    Finds the largest position quantity whose stop loss keeps portfolio risk within the maximum, without building
+    orders to try it out.
+
+    The loss at the stop loss is linear in the total quantity for a fixed set of entry prices and split percentages,
+    which bounds the largest quantity that could be within risk once split rounding is allowed for. Quantities are
+    then checked down from that bound, one quantity increment at a time, with the same split rounding and Risk
+    calculation the placed orders go through. Typically only a few quantities are evaluated and no orders are built.
+    """
+
+    def __init__(self, portfolio_value: float, max_portfolio_risk: float, sl_trigger_price: float,
+                 entry_prices: List[float], qty_splits: List[int], qty_precision: int):
+        self.portfolio_value = portfolio_value
+        self.max_portfolio_risk = max_portfolio_risk
+        self.sl_trigger_price = sl_trigger_price
+        self.entry_prices = entry_prices
+        self.qty_splits = qty_splits
+        self.qty_precision = qty_precision
+        self.qty_step = 10 ** -qty_precision
+
+    def calculate_token_qty(self, max_token_qty: float) -> float:
+        """
+        Returns max_token_qty if it is already within risk, otherwise the largest smaller quantity which is. Raises
+        RiskTooHighException when even the smallest quantity increment exceeds the maximum risk.
+        """
+        max_steps = int(round(max_token_qty / self.qty_step))
+        if max_steps <= 0 or self.__is_acceptable(max_token_qty):
+            return max_token_qty
+
+        steps = max_steps
+        max_possible_steps = self.__max_possible_steps()
+        if max_possible_steps is not None:
+            steps = min(steps, max_possible_steps)
+        while steps > 0:
+            token_qty = self.__find_qty(steps=steps, max_token_qty=max_token_qty)
+            if token_qty is not None:
+                logger.info("RISK SIZING: Reduced token quantity from %s to %s", max_token_qty, token_qty)
+                return token_qty
+            steps -= 1
+        risk = self.create_risk(token_qty=self.qty_step)
+        raise RiskTooHighException(risk=risk.calculate_portfolio_risk(), max_risk=self.max_portfolio_risk)
+
+    def create_risk(self, token_qty: float) -> Risk:
+        """
+        Risk for a position of token_qty split across the entry prices exactly as the position orders will be.
+        """
+        split_qtys = self.split_quantities(token_qty=token_qty)
+        total_qty = sum(split_qtys)
+        average_entry_price = sum(entry_price * (qty / total_qty) for qty, entry_price in
+                                  zip(split_qtys, self.entry_prices)) if total_qty else 0.0
+        return Risk(token_qty=total_qty, sl_trigger_price=self.sl_trigger_price, portfolio_value=self.portfolio_value,
+                    max_portfolio_risk=self.max_portfolio_risk, token_price=average_entry_price)
+
+    def split_quantities(self, token_qty: float) -> List[float]:
+        if len(self.qty_splits) <= 1:
+            return [token_qty]
+        return OrderFactory._split_quantities(total_qty=token_qty, qty_precision=self.qty_precision,
+                                              qty_splits=self.qty_splits)
+
+    def __max_possible_steps(self) -> Optional[int]:
+        """
+        Upper bound on the quantity increments within risk, or None if the loss does not grow with quantity. Without
+        rounding the loss is quantity * loss per token, rounding each split moves it by less than rounding_loss.
+        """
+        weights = [split / 100 for split in self.qty_splits] if len(self.qty_splits) > 1 else [1.0]
+        price_deltas = [self.sl_trigger_price - entry_price for entry_price in self.entry_prices]
+        loss_per_token = abs(sum(weight * price_delta for weight, price_delta in zip(weights, price_deltas)))
+        if loss_per_token == 0:
+            return None
+        rounding_loss = len(self.qty_splits) * self.qty_step * sum(abs(price_delta) for price_delta in price_deltas)
+        max_loss = self.portfolio_value * (self.max_portfolio_risk + RISK_ROUNDING_ALLOWANCE) / 100
+        return int(math.floor((max_loss + rounding_loss) / loss_per_token / self.qty_step)) + 1
+
+    def __find_qty(self, steps: int, max_token_qty: float) -> Optional[float]:
+        """
+        The quantity around steps quantity increments whose split orders add up to the most tokens within risk, or
+        None if there is none.
+
+        Each DCA split is rounded on its own, so quantities within half an increment of each other can spread tokens
+        differently across the entry prices. Every distinct spread is tried, the exact multiple of the increment first.
+        """
+        best_qty = None
+        best_total_qty = 0.0
+        for token_qty in self.__candidate_qtys(steps=steps):
+            if token_qty > max_token_qty:
+                continue
+            risk = self.create_risk(token_qty=token_qty)
+            if risk.token_qty > best_total_qty and risk.calculate_portfolio_risk() <= self.max_portfolio_risk:
+                best_qty = token_qty
+                best_total_qty = risk.token_qty
+        return best_qty
+
+    def __candidate_qtys(self, steps: int) -> List[float]:
+        candidates = [self.__to_qty(steps)]
+        if len(self.qty_splits) <= 1:
+            return candidates
+        lower = (steps - 0.5) * self.qty_step
+        upper = (steps + 0.5) * self.qty_step
+        # Quantities where one of the leading splits crosses half an increment and so rounds differently
+        segment_starts = [lower]
+        for split in self.qty_splits[:-1]:
+            weight = split / 100
+            if weight > 0:
+                segment_starts += self.__half_step_crossings(offset=0.0, scale=weight, lower=lower, upper=upper)
+        segment_starts.sort()
+        # Between those the leading splits are fixed and the last split, whatever remains, can still cross one
+        for segment_start, segment_end in zip(segment_starts, segment_starts[1:] + [upper]):
+            candidates.append(segment_start)
+            leading_qty = sum(self.split_quantities(token_qty=segment_start)[:-1])
+            candidates += self.__half_step_crossings(offset=-leading_qty, scale=1.0, lower=segment_start,
+                                                     upper=segment_end)
+        return candidates
+
+    def __half_step_crossings(self, offset: float, scale: float, lower: float, upper: float) -> List[float]:
+        """
+        Quantities q in [lower, upper) at which (q + offset) * scale reaches a half increment, nudged past it so the
+        value reliably rounds up.
+        """
+        crossings = []
+        half_step_idx = math.ceil((lower + offset) * scale / self.qty_step - 0.5)
+        while True:
+            crossing = (half_step_idx + 0.5) * self.qty_step / scale - offset
+            if crossing >= upper:
+                return crossings
+            if crossing >= lower:
+                crossings.append(crossing * (1 + BREAKPOINT_NUDGE))
+            half_step_idx += 1
+
+    def __is_acceptable(self, token_qty: float) -> bool:
+        risk = self.create_risk(token_qty=token_qty)
+        return risk.token_qty > 0 and risk.calculate_portfolio_risk() <= self.max_portfolio_risk
+
+    def __to_qty(self, steps: int) -> float:
+        return round(steps * self.qty_step, self.qty_precision)
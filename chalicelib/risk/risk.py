@@ -1,5 +1,8 @@
 from chalicelib import orderutils
 from chalicelib.exceptions.risktoohighexception import RiskTooHighException
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
 
 DEFAULT_MAX_PORTFOLIO_RISK = 1.5
 
@@ -30,11 +33,11 @@ class Risk:
 
     def calculate_acceptable_position_size(self):
         max_acceptable_loss = self.portfolio_value * (self.max_portfolio_risk / 100)
-        print(f"RISK RECALCULATION: Max Acceptable Loss: {max_acceptable_loss}")
+        logger.debug("RISK RECALCULATION: Max Acceptable Loss: %s", max_acceptable_loss)
         current_loss = self.calculate_potential_loss()
-        print(f"RISK RECALCULATION: Potential Current Loss: {current_loss}")
+        logger.debug("RISK RECALCULATION: Potential Current Loss: %s", current_loss)
         reduction_factor = current_loss / max_acceptable_loss
-        print(f"RISK RECALCULATION: Reduction Factor: {reduction_factor}")
+        logger.debug("RISK RECALCULATION: Reduction Factor: %s", reduction_factor)
         acceptable_token_qty = self.token_qty / reduction_factor
-        print(f"RISK RECALCULATION: Recalculated Token Quantity: {acceptable_token_qty}")
+        logger.debug("RISK RECALCULATION: Recalculated Token Quantity: %s", acceptable_token_qty)
         return acceptable_token_qty
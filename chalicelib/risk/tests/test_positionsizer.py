@@ -0,0 +1,117 @@
+import math
+import random
+import unittest
+
+from chalicelib.exceptions.risktoohighexception import RiskTooHighException
+from chalicelib.risk.positionsizer import PositionSizer
+
+
+def size_with_retry_loop(sizer: PositionSizer, max_token_qty: float):
+    """
+    The sizing WebhookHandler did before PositionSizer: up to three attempts, each shrinking the quantity by the ratio
+    of the current loss to the maximum acceptable loss. Returns None where it gave up.
+    """
+    token_qty = max_token_qty
+    for _ in range(3):
+        risk = sizer.create_risk(token_qty=token_qty)
+        if risk.calculate_portfolio_risk() <= sizer.max_portfolio_risk:
+            return risk.token_qty
+        token_qty = risk.calculate_acceptable_position_size()
+    return None
+
+
+class PositionSizerTest(unittest.TestCase):
+
+    def assert_within_risk(self, sizer: PositionSizer, token_qty: float):
+        self.assertLessEqual(sizer.create_risk(token_qty=token_qty).calculate_portfolio_risk(),
+                             sizer.max_portfolio_risk)
+
+    def test_quantity_within_risk_is_unchanged(self):
+        # given
+        class_under_test = PositionSizer(portfolio_value=1000, max_portfolio_risk=2, sl_trigger_price=99,
+                                         entry_prices=[100], qty_splits=[100], qty_precision=3)
+
+        # when
+        token_qty = class_under_test.calculate_token_qty(max_token_qty=10)
+
+        # then
+        self.assertEqual(10, token_qty)
+
+    def test_market_order_reduced_to_max_risk(self):
+        # given
+        # Stop loss 50% below entry with 2% max risk on 1000 allows a loss of 20, i.e. 0.4 tokens
+        class_under_test = PositionSizer(portfolio_value=1000, max_portfolio_risk=2, sl_trigger_price=50,
+                                         entry_prices=[100], qty_splits=[100], qty_precision=3)
+
+        # when
+        token_qty = class_under_test.calculate_token_qty(max_token_qty=10)
+
+        # then
+        self.assertEqual(0.4, token_qty)
+        self.assert_within_risk(sizer=class_under_test, token_qty=token_qty)
+        self.assertGreater(class_under_test.create_risk(token_qty=0.401).calculate_portfolio_risk(), 2)
+
+    def test_dca_entries_use_weighted_average_price(self):
+        # given
+        class_under_test = PositionSizer(portfolio_value=1000, max_portfolio_risk=1, sl_trigger_price=90,
+                                         entry_prices=[100, 98, 95], qty_splits=[20, 30, 50], qty_precision=2)
+
+        # when
+        token_qty = class_under_test.calculate_token_qty(max_token_qty=50)
+
+        # then
+        self.assertEqual(1.45, token_qty)
+        self.assert_within_risk(sizer=class_under_test, token_qty=token_qty)
+
+    def test_no_quantity_within_risk_raises(self):
+        # given
+        class_under_test = PositionSizer(portfolio_value=100, max_portfolio_risk=0.5, sl_trigger_price=20000,
+                                         entry_prices=[30000], qty_splits=[100], qty_precision=3)
+
+        # when / then
+        with self.assertRaises(RiskTooHighException):
+            class_under_test.calculate_token_qty(max_token_qty=1)
+
+    def test_matches_or_beats_retry_loop(self):
+        # given
+        rng = random.Random(7)
+        beaten = 0
+        for _ in range(500):
+            entry_price = rng.uniform(0.5, 50000)
+            rungs = rng.choice([1, 2, 3, 5])
+            entry_prices = [round(entry_price * (1 - 0.01 * rung), 4) for rung in range(rungs)]
+            qty_splits = [100] if rungs == 1 else [100 // rungs] * (rungs - 1) + [100 - (100 // rungs) * (rungs - 1)]
+            qty_precision = rng.randint(0, 4)
+            portfolio_value = rng.uniform(100, 100000)
+            max_token_qty = round(portfolio_value * rng.uniform(0.5, 10) / entry_price, qty_precision)
+            if max_token_qty <= 0:
+                continue
+            sizer = PositionSizer(portfolio_value=portfolio_value, max_portfolio_risk=rng.choice([0.5, 1, 1.5, 3]),
+                                  sl_trigger_price=round(entry_price * rng.uniform(0.7, 0.99), 4),
+                                  entry_prices=entry_prices, qty_splits=qty_splits, qty_precision=qty_precision)
+
+            # when
+            loop_qty = size_with_retry_loop(sizer=sizer, max_token_qty=max_token_qty)
+            try:
+                token_qty = sizer.calculate_token_qty(max_token_qty=max_token_qty)
+            except RiskTooHighException:
+                token_qty = None
+
+            # then
+            # The loop could settle on a quantity finer than the precision allows, which the exchange would reject,
+            # so it is compared at the largest quantity it could actually have placed
+            placeable_loop_qty = None if loop_qty is None else \
+                round(math.floor(round(loop_qty / sizer.qty_step, 6)) * sizer.qty_step, qty_precision)
+            if placeable_loop_qty:
+                self.assertIsNotNone(token_qty)
+                self.assertGreaterEqual(round(sizer.create_risk(token_qty=token_qty).token_qty, qty_precision),
+                                        placeable_loop_qty)
+            if token_qty is not None:
+                self.assert_within_risk(sizer=sizer, token_qty=token_qty)
+                total_qty = round(sizer.create_risk(token_qty=token_qty).token_qty, qty_precision)
+                beaten += not placeable_loop_qty or total_qty > placeable_loop_qty
+        self.assertGreater(beaten, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
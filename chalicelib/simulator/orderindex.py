@@ -0,0 +1,104 @@
+import heapq
+import itertools
+from typing import Dict, List
+
+from chalicelib.simulator.simulatedorder import SimulatedOrder
+
+# Below this many stale entries the heaps are never rebuilt
+COMPACT_MIN_STALE_ENTRIES = 1024
+
+
+class OrderIndex:
+    """
+    Open orders of one symbol keyed by the price which fills or triggers them, so a price update only visits the
+    orders it reaches.
+
+    Orders which act once the price rises to their level are held in a min-heap, those which act once it falls to it
+    in a max-heap. Removing an order only marks its entry stale; stale entries are dropped when they reach the top of
+    a heap, or all at once when they outnumber the live ones. Trailing stops move with the price so are kept apart.
+    """
+
+    def __init__(self):
+        self.rising: List[tuple] = []
+        self.falling: List[tuple] = []
+        self.trailing: Dict[int, SimulatedOrder] = {}
+        self.sequence = itertools.count()
+        self.stale_entries = 0
+
+    def __len__(self):
+        return len(self.rising) + len(self.falling) - self.stale_entries + len(self.trailing)
+
+    def add(self, order: SimulatedOrder, level: float, is_rising: bool):
+        """
+        Indexes an order acting once the price rises to level when is_rising, once it falls to level otherwise.
+        Ties are broken by the order they were added in.
+        """
+        order.index_version += 1
+        if is_rising:
+            heapq.heappush(self.rising, (level, next(self.sequence), order.index_version, order))
+        else:
+            heapq.heappush(self.falling, (-level, next(self.sequence), order.index_version, order))
+
+    def add_trailing(self, order: SimulatedOrder):
+        self.trailing[order.order_id] = order
+
+    def discard(self, order: SimulatedOrder):
+        if self.trailing.pop(order.order_id, None) is not None:
+            return
+        order.index_version += 1
+        self.stale_entries += 1
+        if self.stale_entries > COMPACT_MIN_STALE_ENTRIES and \
+                self.stale_entries * 2 > len(self.rising) + len(self.falling):
+            self.compact()
+
+    def compact(self):
+        self.rising = [entry for entry in self.rising if entry[2] == entry[3].index_version]
+        self.falling = [entry for entry in self.falling if entry[2] == entry[3].index_version]
+        heapq.heapify(self.rising)
+        heapq.heapify(self.falling)
+        self.stale_entries = 0
+
+    def pop_reached(self, price: float) -> List[SimulatedOrder]:
+        """
+        Removes and returns the orders a move to price reaches, nearest level first within each side, then the
+        trailing stops it triggers.
+        """
+        reached = []
+        rising = self.rising
+        while rising and rising[0][0] <= price:
+            _, _, version, order = heapq.heappop(rising)
+            if version == order.index_version:
+                reached.append(order)
+            else:
+                self.stale_entries -= 1
+        falling = self.falling
+        negated_price = -price
+        while falling and falling[0][0] <= negated_price:
+            _, _, version, order = heapq.heappop(falling)
+            if version == order.index_version:
+                reached.append(order)
+            else:
+                self.stale_entries -= 1
+        if self.trailing:
+            reached.extend(self.pop_triggered_trailing_stops(price))
+        return reached
+
+    def pop_triggered_trailing_stops(self, price: float) -> List[SimulatedOrder]:
+        triggered = []
+        for order in self.trailing.values():
+            if order.best_price is None:
+                # Sell trailing stops activate once the price rises to their activation price, buy ones once it falls
+                if (price < order.activation_price) if not order.is_buy else (price > order.activation_price):
+                    continue
+                order.best_price = price
+            if order.is_buy:
+                order.best_price = min(order.best_price, price)
+                if price >= order.best_price * (1 + order.callback_rate / 100):
+                    triggered.append(order)
+            else:
+                order.best_price = max(order.best_price, price)
+                if price <= order.best_price * (1 - order.callback_rate / 100):
+                    triggered.append(order)
+        for order in triggered:
+            del self.trailing[order.order_id]
+        return triggered
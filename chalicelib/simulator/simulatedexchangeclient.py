@@ -0,0 +1,357 @@
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.model import Order as LibOrder
+from binance_f.model import Position
+
+from chalicelib.constants import Constants
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.models.orders.order import Order
+from chalicelib.simulator.orderindex import OrderIndex
+from chalicelib.simulator.simulatedorder import CANCELED, EXPIRED, FILLED, NEW, TRADE, SimulatedOrder
+from chalicelib.simulator.simulatedposition import CROSS, ISOLATED, SimulatedPosition
+from chalicelib.userdata.accountbook import ACCOUNT_UPDATE, ORDER_TRADE_UPDATE
+
+logger = get_logger()
+
+OrderType = Constants.OrderType
+TimeInForce = Constants.TimeInForce
+
+STOP_ORDER_TYPES = {OrderType.STOP, OrderType.STOP_MARKET}
+TAKE_PROFIT_ORDER_TYPES = {OrderType.TAKE_PROFIT, OrderType.TAKE_PROFIT_MARKET}
+# Triggered orders of these types are sent to the book as limit orders, the others as market orders
+LIMIT_ORDER_TYPES = {OrderType.LIMIT, OrderType.STOP, OrderType.TAKE_PROFIT}
+SUPPORTED_ORDER_TYPES = {OrderType.MARKET, OrderType.TRAILING_STOP_MARKET} | LIMIT_ORDER_TYPES | \
+                        STOP_ORDER_TYPES | TAKE_PROFIT_ORDER_TYPES
+
+
+def reject(message: str):
+    raise BinanceApiException(BinanceApiException.EXEC_ERROR, f"[Executing] {message}")
+
+
+class SimulatedExchangeClient(ExchangeClient):
+    """
+    Futures exchange simulated in memory and driven by a price path: set_price moves a symbol's price, which fills
+    the limit orders and triggers the stop, take profit and trailing stop orders it reaches.
+
+    Positions are one-way mode and orders fill whole at the price they execute at. Limit orders which rest on the
+    book pay the maker fee, everything else the taker fee, and realized profit and fees settle into the wallet.
+    Orders which open or add to a position need the initial margin to be available. There is no liquidation,
+    funding or margin held for open orders.
+
+    Listeners get the ORDER_TRADE_UPDATE and ACCOUNT_UPDATE events Binance would send on the user data stream. They
+    are delivered once the call which caused them is done, so a listener can call back into the client, as
+    OrderUpdateHandler does, and see the state its event describes.
+    """
+
+    def __init__(self, wallet_balance: float = 10000.0, price_precision: int = 2, qty_precision: int = 3,
+                 maker_fee_rate: float = 0.0002, taker_fee_rate: float = 0.0004, leverage: int = 20,
+                 margin_type: str = CROSS, start_time: int = 0):
+        self.wallet_balance = wallet_balance
+        self.price_precision = price_precision
+        self.qty_precision = qty_precision
+        self.maker_fee_rate = maker_fee_rate
+        self.taker_fee_rate = taker_fee_rate
+        self.leverage = leverage
+        self.margin_type = margin_type
+        # Milliseconds, set by the price path and used for every update time
+        self.time = start_time
+        self.prices: Dict[str, float] = {}
+        self.positions: Dict[str, SimulatedPosition] = {}
+        self.open_orders: Dict[str, Dict[int, SimulatedOrder]] = {}
+        self.indexes: Dict[str, OrderIndex] = {}
+        self.order_ids = itertools.count(1)
+        self.trade_ids = itertools.count(1)
+        self.listeners: List[Callable[[dict], None]] = []
+        self.events = deque()
+        self.is_dispatching = False
+        # Reentrant so listeners run under it can call back into the client
+        self.lock = threading.RLock()
+
+    # PRICE PATH
+    def add_listener(self, listener: Callable[[dict], None]):
+        self.listeners.append(listener)
+
+    def set_price(self, ticker: str, price: float, timestamp: Optional[int] = None):
+        """
+        Moves the price of ticker and executes the orders the move reaches.
+        """
+        with self.lock:
+            self.prices[ticker] = price
+            if timestamp is not None:
+                self.time = timestamp
+            index = self.indexes.get(ticker)
+            if index is not None:
+                for order in index.pop_reached(price):
+                    self.__on_reached(order=order, price=price, index=index)
+            self.__dispatch()
+
+    def replay(self, ticker: str, prices: Iterable[float], timestamps: Optional[Iterable[int]] = None):
+        if timestamps is None:
+            for price in prices:
+                self.set_price(ticker=ticker, price=price)
+        else:
+            for price, timestamp in zip(prices, timestamps):
+                self.set_price(ticker=ticker, price=price, timestamp=timestamp)
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        return self.prices.get(ticker)
+
+    # ORDERS
+    def place_order(self, order: Order) -> LibOrder:
+        with self.lock:
+            try:
+                return self.__place(order).to_lib_order()
+            finally:
+                self.__dispatch()
+
+    def __place(self, order: Order) -> SimulatedOrder:
+        price = self.prices.get(order.ticker)
+        if price is None:
+            reject(f"No price for {order.ticker} yet")
+        if order.order_type not in SUPPORTED_ORDER_TYPES:
+            reject(f"Order type not supported: {order.order_type}")
+        if not order.close_position and not order.token_qty:
+            reject("-4003: Quantity less than or equal to zero.")
+        simulated_order = SimulatedOrder(order_id=next(self.order_ids), client_order_id=order.order_id,
+                                         symbol=order.ticker, side=order.side, order_type=order.order_type,
+                                         quantity=order.token_qty or 0.0, price=order.limit_price,
+                                         stop_price=order.trigger_price, reduce_only=order.reduce_only,
+                                         close_position=order.close_position, time_in_force=order.time_in_force,
+                                         update_time=self.time)
+        order_type = simulated_order.order_type
+        if order_type == OrderType.MARKET:
+            self.__check_immediate_fill(simulated_order, price)
+            self.__accept(simulated_order)
+            self.__fill(simulated_order, price=price, is_maker=False)
+        elif order_type == OrderType.LIMIT:
+            self.__place_limit(simulated_order, price)
+        elif order_type == OrderType.TRAILING_STOP_MARKET:
+            simulated_order.callback_rate = getattr(order, "callback_rate", None)
+            simulated_order.activation_price = getattr(order, "activation_price", None)
+            if not simulated_order.callback_rate:
+                reject("-1102: Mandatory parameter 'callbackRate' was not sent, was empty/null, or malformed.")
+            if simulated_order.activation_price is None:
+                simulated_order.best_price = price
+            self.__accept(simulated_order)
+            self.__index(order.ticker).add_trailing(simulated_order)
+        else:
+            trigger_price = simulated_order.stop_price
+            if trigger_price is None:
+                reject("-1102: Mandatory parameter 'stopPrice' was not sent, was empty/null, or malformed.")
+            is_rising = simulated_order.is_buy == (order_type in STOP_ORDER_TYPES)
+            if (price >= trigger_price) if is_rising else (price <= trigger_price):
+                reject("-2021: Order would immediately trigger.")
+            self.__accept(simulated_order)
+            self.__index(order.ticker).add(simulated_order, level=trigger_price, is_rising=is_rising)
+        return simulated_order
+
+    def __place_limit(self, order: SimulatedOrder, price: float):
+        if order.price is None:
+            reject("-1102: Mandatory parameter 'price' was not sent, was empty/null, or malformed.")
+        is_marketable = (price <= order.price) if order.is_buy else (price >= order.price)
+        if not is_marketable:
+            self.__accept(order)
+            if order.time_in_force in (TimeInForce.IOC, TimeInForce.FOK):
+                self.__expire(order)
+            else:
+                self.__index(order.symbol).add(order, level=order.price, is_rising=not order.is_buy)
+        elif order.time_in_force == TimeInForce.GTX:
+            # Post only orders are never allowed to take
+            self.__accept(order)
+            self.__expire(order)
+        else:
+            self.__check_immediate_fill(order, price)
+            self.__accept(order)
+            self.__fill(order, price=price, is_maker=False)
+
+    def __on_reached(self, order: SimulatedOrder, price: float, index: OrderIndex):
+        if order.order_type == OrderType.LIMIT:
+            self.__fill(order, price=order.price, is_maker=True)
+        elif order.order_type in LIMIT_ORDER_TYPES:
+            # A triggered stop or take profit limit order works as a limit order from now on
+            order.order_type = OrderType.LIMIT
+            order.update_time = self.time
+            if (price <= order.price) if order.is_buy else (price >= order.price):
+                self.__fill(order, price=price, is_maker=False)
+            else:
+                index.add(order, level=order.price, is_rising=not order.is_buy)
+        else:
+            order.order_type = OrderType.MARKET
+            self.__fill(order, price=price, is_maker=False)
+
+    def cancel_list_orders(self, ticker: str, order_ids: List[int]) -> List[int]:
+        """
+        Cancels open orders of ticker and returns the IDs of those cancelled. Unknown IDs, and orders no longer
+        open, are skipped.
+        """
+        with self.lock:
+            orders = self.open_orders.get(ticker, {})
+            cancelled_ids = []
+            for order_id in order_ids:
+                order = orders.pop(order_id, None)
+                if order is None:
+                    continue
+                self.indexes[ticker].discard(order)
+                order.status = CANCELED
+                order.update_time = self.time
+                cancelled_ids.append(order_id)
+                if self.listeners:
+                    self.__emit_order_update(order, execution_type=CANCELED)
+            self.__dispatch()
+            return cancelled_ids
+
+    def get_open_orders(self, ticker: str) -> List[LibOrder]:
+        with self.lock:
+            return [order.to_lib_order() for order in self.open_orders.get(ticker, {}).values()]
+
+    # MATCHING
+    def __check_immediate_fill(self, order: SimulatedOrder, price: float):
+        """
+        Rejects an order about to fill on placement which Binance would reject rather than accept and expire.
+        """
+        position = self.__position(order.symbol)
+        fill_qty = self.__fill_qty(order, position)
+        if fill_qty == 0:
+            reject("-2022: ReduceOnly Order is rejected.")
+        if not self.__has_margin_for(order, position, fill_qty=fill_qty, price=price):
+            reject("-2019: Margin is insufficient.")
+
+    def __fill_qty(self, order: SimulatedOrder, position: SimulatedPosition) -> float:
+        signed_qty = order.quantity if order.is_buy else -order.quantity
+        if order.close_position:
+            signed_qty = abs(position.amount) if order.is_buy else -abs(position.amount)
+        elif not order.reduce_only:
+            return order.quantity
+        return position.closing_qty(signed_qty)
+
+    def __has_margin_for(self, order: SimulatedOrder, position: SimulatedPosition, fill_qty: float,
+                         price: float) -> bool:
+        opening_qty = fill_qty - position.closing_qty(fill_qty if order.is_buy else -fill_qty)
+        if opening_qty <= 0:
+            return True
+        return opening_qty * price / position.leverage <= self.get_available_balance()
+
+    def __fill(self, order: SimulatedOrder, price: float, is_maker: bool):
+        position = self.__position(order.symbol)
+        fill_qty = self.__fill_qty(order, position)
+        if fill_qty == 0 or not self.__has_margin_for(order, position, fill_qty=fill_qty, price=price):
+            self.__expire(order)
+            return
+        realized_profit = position.fill(fill_qty if order.is_buy else -fill_qty, price)
+        commission = fill_qty * price * (self.maker_fee_rate if is_maker else self.taker_fee_rate)
+        self.wallet_balance += realized_profit - commission
+        order.status = FILLED
+        order.executed_qty = fill_qty
+        order.avg_price = price
+        order.update_time = self.time
+        del self.open_orders[order.symbol][order.order_id]
+        if self.listeners:
+            self.__emit_order_update(order, execution_type=TRADE, last_qty=fill_qty, last_price=price,
+                                     commission=commission, realized_profit=realized_profit,
+                                     trade_id=next(self.trade_ids))
+            self.__emit_account_update(position)
+
+    def __accept(self, order: SimulatedOrder):
+        orders = self.open_orders.get(order.symbol)
+        if orders is None:
+            orders = self.open_orders[order.symbol] = {}
+        orders[order.order_id] = order
+        if self.listeners:
+            self.__emit_order_update(order, execution_type=NEW)
+
+    def __expire(self, order: SimulatedOrder):
+        logger.debug("Expiring order: %s", order)
+        order.status = EXPIRED
+        order.update_time = self.time
+        del self.open_orders[order.symbol][order.order_id]
+        if self.listeners:
+            self.__emit_order_update(order, execution_type=EXPIRED)
+
+    def __index(self, ticker: str) -> OrderIndex:
+        index = self.indexes.get(ticker)
+        if index is None:
+            index = self.indexes[ticker] = OrderIndex()
+        return index
+
+    def __position(self, ticker: str) -> SimulatedPosition:
+        position = self.positions.get(ticker)
+        if position is None:
+            position = self.positions[ticker] = SimulatedPosition(symbol=ticker, leverage=self.leverage,
+                                                                  margin_type=self.margin_type,
+                                                                  qty_precision=self.qty_precision)
+        return position
+
+    # EVENTS
+    def __emit_order_update(self, order: SimulatedOrder, execution_type: str, **trade):
+        self.events.append({"e": ORDER_TRADE_UPDATE, "E": self.time, "T": self.time,
+                            "o": order.to_event(execution_type=execution_type, **trade)})
+
+    def __emit_account_update(self, position: SimulatedPosition):
+        wallet_balance = str(self.wallet_balance)
+        self.events.append({"e": ACCOUNT_UPDATE, "E": self.time, "T": self.time,
+                            "a": {"m": "ORDER", "B": [{"a": "USDT", "wb": wallet_balance, "cw": wallet_balance,
+                                                       "bc": "0"}],
+                                  "P": [position.to_event(self.prices[position.symbol])]}})
+
+    def __dispatch(self):
+        # Events raised while listeners run are queued and delivered by the outermost call, in order
+        if self.is_dispatching or not self.events:
+            return
+        self.is_dispatching = True
+        try:
+            while self.events:
+                event = self.events.popleft()
+                for listener in self.listeners:
+                    listener(event)
+        finally:
+            self.is_dispatching = False
+
+    # PRECISION
+    def get_quantity_precision(self, ticker: str) -> int:
+        return self.qty_precision
+
+    def get_price_precision(self, ticker: str) -> int:
+        return self.price_precision
+
+    # LEVERAGE
+    def update_leverage(self, leverage: int, ticker: str):
+        with self.lock:
+            self.__position(ticker).leverage = int(leverage)
+            return True
+
+    def update_margin_type(self, margin_type: str, ticker: str):
+        if not margin_type:
+            return False
+        with self.lock:
+            position = self.__position(ticker)
+            normalised_margin_type = CROSS if margin_type.upper() == "CROSSED" else ISOLATED
+            # Binance refuses to change the margin type of an open position
+            if position.amount != 0 and position.margin_type != normalised_margin_type:
+                return False
+            position.margin_type = normalised_margin_type
+            return True
+
+    # PORTFOLIO
+    def get_portfolio_value(self) -> float:
+        return self.wallet_balance
+
+    def get_available_balance(self) -> float:
+        """
+        Wallet balance plus unrealized profit, less the initial margin of every position.
+        """
+        available_balance = self.wallet_balance
+        for position in self.positions.values():
+            if position.amount:
+                available_balance += position.unrealized_profit(self.prices[position.symbol]) - \
+                                     position.initial_margin
+        return available_balance
+
+    def get_position(self) -> List[Position]:
+        with self.lock:
+            return [position.to_position(self.prices.get(position.symbol, position.entry_price))
+                    for position in self.positions.values()]
@@ -0,0 +1,106 @@
+from typing import Optional
+
+from binance_f.model import Order as LibOrder
+
+from chalicelib.constants import Constants
+
+NEW = "NEW"
+FILLED = "FILLED"
+CANCELED = "CANCELED"
+EXPIRED = "EXPIRED"
+TRADE = "TRADE"
+
+
+class SimulatedOrder:
+    """
+    An order accepted by the simulated exchange. Orders fill whole, so one is either open or done: FILLED, CANCELED,
+    or EXPIRED when it could not reduce the position or the margin was insufficient once it triggered.
+    """
+    __slots__ = ("order_id", "client_order_id", "symbol", "side", "is_buy", "order_type", "orig_type",
+                 "time_in_force", "quantity", "price", "stop_price", "reduce_only", "close_position", "callback_rate",
+                 "activation_price", "status", "executed_qty", "avg_price", "update_time", "index_version",
+                 "best_price")
+
+    def __init__(self, order_id: int, client_order_id: str, symbol: str, side: Constants.OrderSide, order_type: str,
+                 quantity: float, price: float, stop_price: float, reduce_only: bool, close_position: bool,
+                 time_in_force: Optional[str], update_time: int):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.is_buy = side == Constants.OrderSide.BUY
+        # The type the order currently works as: stop and take profit orders become MARKET or LIMIT once triggered
+        self.order_type = order_type
+        self.orig_type = order_type
+        self.time_in_force = time_in_force
+        self.quantity = quantity
+        self.price = price
+        self.stop_price = stop_price
+        self.reduce_only = reduce_only
+        self.close_position = close_position
+        # Only set for trailing stops
+        self.callback_rate: Optional[float] = None
+        self.activation_price: Optional[float] = None
+        self.status = NEW
+        self.executed_qty = 0.0
+        self.avg_price = 0.0
+        self.update_time = update_time
+        # Bumped whenever the order leaves or moves within the index, so stale index entries can be skipped
+        self.index_version = 0
+        # Best price seen by an activated trailing stop, None until it activates
+        self.best_price: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == NEW
+
+    def to_event(self, execution_type: str, last_qty: float = 0.0, last_price: float = 0.0, commission: float = 0.0,
+                 realized_profit: float = 0.0, trade_id: int = 0) -> dict:
+        """
+        The "o" object of the ORDER_TRADE_UPDATE event Binance sends for this order.
+        """
+        order = {"s": self.symbol, "c": self.client_order_id, "S": self.side, "o": self.order_type,
+                 "f": self.time_in_force or Constants.TimeInForce.GTC, "q": str(self.quantity),
+                 "p": str(self.price or 0), "ap": str(self.avg_price), "sp": str(self.stop_price or 0),
+                 "x": execution_type, "X": self.status, "i": self.order_id, "l": str(last_qty),
+                 "z": str(self.executed_qty), "L": str(last_price), "N": "USDT", "n": str(commission),
+                 "T": self.update_time, "t": trade_id, "R": bool(self.reduce_only),
+                 "wt": "CONTRACT_PRICE", "ot": self.orig_type, "ps": "BOTH", "cp": bool(self.close_position),
+                 "rp": str(realized_profit)}
+        if self.callback_rate is not None:
+            order["cr"] = str(self.callback_rate)
+            order["AP"] = str(self.activation_price if self.activation_price is not None else self.best_price or 0)
+        return order
+
+    def to_lib_order(self) -> LibOrder:
+        """
+        The REST API's model of this order, as returned when placing it or listing open orders.
+        """
+        order = LibOrder()
+        order.symbol = self.symbol
+        order.clientOrderId = self.client_order_id
+        order.side = self.side
+        order.type = self.order_type
+        order.origType = self.orig_type
+        order.timeInForce = self.time_in_force or Constants.TimeInForce.GTC
+        order.origQty = self.quantity
+        order.price = self.price or 0.0
+        order.avgPrice = self.avg_price
+        order.stopPrice = self.stop_price or 0.0
+        order.executedQty = self.executed_qty
+        order.cumQuote = self.executed_qty * self.avg_price
+        order.status = self.status
+        order.orderId = self.order_id
+        order.updateTime = self.update_time
+        order.reduceOnly = bool(self.reduce_only)
+        order.closePosition = bool(self.close_position)
+        order.workingType = "CONTRACT_PRICE"
+        order.positionSide = "BOTH"
+        order.priceRate = self.callback_rate
+        order.activatePrice = self.activation_price
+        return order
+
+    def __repr__(self):
+        return f"--- SIMULATED ORDER --- ID: {self.order_id}, CLIENT ORDER ID: {self.client_order_id}, " \
+               f"SYMBOL: {self.symbol}, SIDE: {self.side}, TYPE: {self.order_type}, STATUS: {self.status}, " \
+               f"QUANTITY: {self.quantity}, PRICE: {self.price}, STOP PRICE: {self.stop_price}"
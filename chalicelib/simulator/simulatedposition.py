@@ -0,0 +1,74 @@
+from binance_f.model import Position
+
+ISOLATED = "isolated"
+CROSS = "cross"
+
+
+class SimulatedPosition:
+    """
+    One-way mode position of a symbol on the simulated exchange, with its leverage and margin type. Positive amounts
+    are long, negative short.
+    """
+    __slots__ = ("symbol", "amount", "entry_price", "leverage", "margin_type", "qty_precision")
+
+    def __init__(self, symbol: str, leverage: int, margin_type: str, qty_precision: int):
+        self.symbol = symbol
+        self.amount = 0.0
+        self.entry_price = 0.0
+        self.leverage = leverage
+        self.margin_type = margin_type
+        self.qty_precision = qty_precision
+
+    @property
+    def initial_margin(self) -> float:
+        return abs(self.amount) * self.entry_price / self.leverage
+
+    def unrealized_profit(self, mark_price: float) -> float:
+        return self.amount * (mark_price - self.entry_price) if self.amount else 0.0
+
+    def closing_qty(self, signed_qty: float) -> float:
+        """
+        How much of a fill of signed_qty reduces the position rather than adding to it or opening the other side.
+        """
+        if self.amount * signed_qty >= 0:
+            return 0.0
+        return min(abs(signed_qty), abs(self.amount))
+
+    def fill(self, signed_qty: float, price: float) -> float:
+        """
+        Applies a fill and returns the profit it realized, before fees.
+        """
+        closing_qty = self.closing_qty(signed_qty)
+        realized_profit = closing_qty * (price - self.entry_price) * (1 if self.amount > 0 else -1)
+        amount = round(self.amount + signed_qty, self.qty_precision)
+        if amount == 0:
+            self.entry_price = 0.0
+        elif closing_qty == 0:
+            self.entry_price = (abs(self.amount) * self.entry_price + abs(signed_qty) * price) / abs(amount)
+        elif closing_qty < abs(signed_qty):
+            # Flipped to the other side: what is left opened at this price
+            self.entry_price = price
+        self.amount = amount
+        return realized_profit
+
+    def to_position(self, mark_price: float) -> Position:
+        position = Position()
+        position.symbol = self.symbol
+        position.positionSide = "BOTH"
+        position.positionAmt = self.amount
+        position.entryPrice = self.entry_price
+        position.markPrice = mark_price
+        position.unrealizedProfit = self.unrealized_profit(mark_price)
+        position.leverage = float(self.leverage)
+        position.marginType = self.margin_type
+        position.isolatedMargin = self.initial_margin if self.margin_type == ISOLATED else 0.0
+        return position
+
+    def to_event(self, mark_price: float) -> dict:
+        """
+        The position object of an ACCOUNT_UPDATE event.
+        """
+        isolated_margin = self.initial_margin if self.margin_type == ISOLATED else 0.0
+        return {"s": self.symbol, "pa": str(self.amount), "ep": str(self.entry_price), "cr": "0",
+                "up": str(self.unrealized_profit(mark_price)), "mt": self.margin_type, "iw": str(isolated_margin),
+                "ps": "BOTH"}
@@ -0,0 +1,165 @@
+import unittest
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+
+from chalicelib.handlers.orderupdatehandler import OrderUpdateHandler
+from chalicelib.models.orders.positionlimitorder import PositionLimitOrder
+from chalicelib.models.orders.positionmarketorder import PositionMarketOrder
+from chalicelib.models.orders.slorder import StopLossOrder
+from chalicelib.models.orders.tpmarketorder import TakeProfitMarketOrder
+from chalicelib.models.orders.trailingstoporder import TrailingStopOrder
+from chalicelib.simulator.simulatedexchangeclient import SimulatedExchangeClient
+from chalicelib.userdata.accountbook import AccountBook
+
+TICKER = "BTCUSDT"
+
+
+class SimulatedExchangeClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = SimulatedExchangeClient(wallet_balance=1000.0, maker_fee_rate=0, taker_fee_rate=0)
+        self.events = []
+        self.client.add_listener(self.events.append)
+        self.client.set_price(TICKER, 100.0, timestamp=1)
+
+    def open_long(self, token_qty: float):
+        self.client.place_order(PositionMarketOrder(side="BUY", ticker=TICKER, token_qty=token_qty,
+                                                    curr_token_price=100.0, entry_price=100.0))
+
+    def fills(self) -> list:
+        return [(event["o"]["ot"], event["o"]["L"]) for event in self.events
+                if event["e"] == "ORDER_TRADE_UPDATE" and event["o"]["x"] == "TRADE"]
+
+    def test_stop_loss_triggers_at_the_price_reaching_it(self):
+        # given
+        self.open_long(token_qty=1)
+        self.client.place_order(StopLossOrder(side="SELL", ticker=TICKER, order_id_str="sl", trigger_price=95.0))
+
+        # when
+        self.client.replay(TICKER, prices=[98.0, 96.0, 94.0], timestamps=[2, 3, 4])
+
+        # then
+        self.assertEqual([("MARKET", "100.0"), ("STOP_MARKET", "94.0")], self.fills())
+        self.assertEqual(0, self.client.get_symbol_position(TICKER).positionAmt)
+        self.assertEqual([], self.client.get_open_orders(TICKER))
+        self.assertEqual(994.0, self.client.get_portfolio_value())
+
+    def test_take_profit_moves_stop_loss_and_stop_loss_cleans_up_orders(self):
+        # given
+        handler = OrderUpdateHandler(exchange_client=self.client)
+        self.client.add_listener(lambda event: handler.handle(event["o"]) if event["e"] == "ORDER_TRADE_UPDATE"
+                                 and event["o"]["X"] == "FILLED" else None)
+        self.open_long(token_qty=2)
+        self.client.place_order(StopLossOrder(side="SELL", ticker=TICKER, order_id_str="sl", trigger_price=95.0))
+        for trigger_price in (105.0, 110.0):
+            self.client.place_order(TakeProfitMarketOrder(side="SELL", ticker=TICKER, token_qty=1,
+                                                          trigger_price=trigger_price, exit_percentage=50))
+
+        # when
+        self.client.set_price(TICKER, 106.0, timestamp=2)
+        open_orders_after_take_profit = self.client.get_open_orders(TICKER)
+        self.client.set_price(TICKER, 99.0, timestamp=3)
+
+        # then
+        self.assertEqual([("STOP_MARKET", 100.0), ("TAKE_PROFIT_MARKET", 110.0)],
+                         sorted((order.type, order.stopPrice) for order in open_orders_after_take_profit))
+        self.assertEqual([("MARKET", "100.0"), ("TAKE_PROFIT_MARKET", "106.0"), ("STOP_MARKET", "99.0")],
+                         self.fills())
+        self.assertEqual([], self.client.get_open_orders(TICKER))
+        self.assertEqual(1005.0, self.client.get_portfolio_value())
+
+    def test_limit_orders_rest_until_reached_and_fill_at_their_price(self):
+        # given
+        client = SimulatedExchangeClient(wallet_balance=1000.0, maker_fee_rate=0.001, taker_fee_rate=0.002)
+        client.set_price(TICKER, 100.0)
+        client.place_order(PositionLimitOrder(side="BUY", ticker=TICKER, token_qty=1, limit_price=98.0,
+                                              curr_token_price=100.0, entry_price=98.0))
+
+        # when
+        client.set_price(TICKER, 99.0)
+        open_orders_above_limit = client.get_open_orders(TICKER)
+        client.set_price(TICKER, 97.0)
+
+        # then
+        self.assertEqual(1, len(open_orders_above_limit))
+        position = client.get_symbol_position(TICKER)
+        self.assertEqual(1, position.positionAmt)
+        self.assertEqual(98.0, position.entryPrice)
+        self.assertEqual(-1.0, position.unrealizedProfit)
+        self.assertAlmostEqual(1000.0 - 0.098, client.get_portfolio_value())
+
+    def test_trailing_stop_triggers_after_callback_from_best_price(self):
+        # given
+        self.open_long(token_qty=1)
+        self.client.place_order(TrailingStopOrder(side="SELL", ticker=TICKER, token_qty=1, callback_rate=1,
+                                                  activation_price=102.0))
+
+        # when
+        self.client.replay(TICKER, prices=[98.0, 105.0, 104.0, 106.0, 105.0])
+        open_orders_before_callback = len(self.client.get_open_orders(TICKER))
+        self.client.set_price(TICKER, 104.9)
+
+        # then
+        self.assertEqual(1, open_orders_before_callback)
+        self.assertEqual([("MARKET", "100.0"), ("TRAILING_STOP_MARKET", "104.9")], self.fills())
+        self.assertEqual(0, self.client.get_symbol_position(TICKER).positionAmt)
+
+    def test_orders_binance_would_reject(self):
+        # when
+        with self.assertRaises(BinanceApiException) as immediate_trigger:
+            self.client.place_order(StopLossOrder(side="SELL", ticker=TICKER, order_id_str="sl", trigger_price=101.0))
+        with self.assertRaises(BinanceApiException) as insufficient_margin:
+            self.client.place_order(PositionMarketOrder(side="BUY", ticker=TICKER, token_qty=201,
+                                                        curr_token_price=100.0, entry_price=100.0))
+
+        # then
+        self.assertIn("-2021", immediate_trigger.exception.error_message)
+        self.assertIn("-2019", insufficient_margin.exception.error_message)
+        self.assertEqual([], self.events)
+
+    def test_cancelled_orders_never_fill(self):
+        # given
+        client = SimulatedExchangeClient(wallet_balance=100000.0)
+        client.set_price(TICKER, 100.0)
+        orders = [client.place_order(PositionLimitOrder(side="BUY", ticker=TICKER, token_qty=1,
+                                                        limit_price=99.0 - i * 0.01, curr_token_price=100.0,
+                                                        entry_price=99.0))
+                  for i in range(3000)]
+
+        # when
+        client.cancel_list_orders(TICKER, [order.orderId for order in orders if order.orderId % 3])
+        client.set_price(TICKER, 50.0)
+
+        # then
+        self.assertEqual(1000, client.get_symbol_position(TICKER).positionAmt)
+        self.assertEqual([], client.get_open_orders(TICKER))
+        self.assertEqual(0, len(client.indexes[TICKER]))
+
+    def test_events_mirror_account_into_account_book(self):
+        # given
+        book = AccountBook()
+        client = SimulatedExchangeClient(wallet_balance=1000.0)
+        client.add_listener(book.apply_event)
+        client.set_price(TICKER, 100.0, timestamp=1)
+        client.place_order(PositionMarketOrder(side="SELL", ticker=TICKER, token_qty=2, curr_token_price=100.0,
+                                               entry_price=100.0))
+        orders = [client.place_order(TakeProfitMarketOrder(side="BUY", ticker=TICKER, token_qty=1,
+                                                           trigger_price=trigger_price, exit_percentage=50))
+                  for trigger_price in (95.0, 90.0, 85.0)]
+
+        # when
+        client.cancel_list_orders(TICKER, [orders[2].orderId])
+        client.set_price(TICKER, 94.0, timestamp=2)
+
+        # then
+        book_position = book.get_position()[0]
+        client_position = client.get_symbol_position(TICKER)
+        self.assertEqual((-1, 100.0), (book_position.positionAmt, book_position.entryPrice))
+        self.assertEqual((client_position.positionAmt, client_position.entryPrice),
+                         (book_position.positionAmt, book_position.entryPrice))
+        self.assertEqual([orders[1].orderId], [order.orderId for order in book.get_open_orders(TICKER)])
+        self.assertEqual([orders[1].orderId], [order.orderId for order in client.get_open_orders(TICKER)])
+
+
+if __name__ == '__main__':
+    unittest.main()
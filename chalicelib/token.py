@@ -1,14 +1,32 @@
 from chalicelib.exchanges.exchangeclient import ExchangeClient
 from chalicelib.markets.markets import Markets
+from chalicelib.prices.priceservice import PriceService, DEFAULT_MAX_AGE_MS
+
+# Entry orders are priced off the last trade, a second old at most
+TOKEN_PRICE_MAX_AGE_MS = DEFAULT_MAX_AGE_MS
+
+
+def get_token_price(markets: Markets, ticker: str, price_service: PriceService = None,
+                    max_price_age_ms: int = TOKEN_PRICE_MAX_AGE_MS) -> float:
+    if price_service is not None:
+        return price_service.get_price(ticker=ticker, max_age_ms=max_price_age_ms)
+    return markets.get_current_token_price(ticker=ticker)
 
 
 class Token:
 
-    def __init__(self, exchange_client: ExchangeClient, markets: Markets, ticker: str):
+    def __init__(self, exchange_client: ExchangeClient, markets: Markets, ticker: str, qty_precision: int = None,
+                 price_precision: int = None, token_price: float = None, price_service: PriceService = None,
+                 max_price_age_ms: int = TOKEN_PRICE_MAX_AGE_MS):
+        # Values already fetched by the caller (e.g. prefetched concurrently) are used as is
         self.ticker = ticker
-        self.qty_precision = exchange_client.get_quantity_precision(ticker=ticker)
-        self.price_precision = exchange_client.get_price_precision(ticker=ticker)
-        self.token_price = markets.get_current_token_price(ticker=ticker)
+        self.qty_precision = qty_precision if qty_precision is not None \
+            else exchange_client.get_quantity_precision(ticker=ticker)
+        self.price_precision = price_precision if price_precision is not None \
+            else exchange_client.get_price_precision(ticker=ticker)
+        self.token_price = token_price if token_price is not None \
+            else get_token_price(markets=markets, ticker=ticker, price_service=price_service,
+                                 max_price_age_ms=max_price_age_ms)
 
     def __repr__(self):
         return f"--- TOKEN ---      TICKER: {self.ticker}, QUANTITY PRECISION: {self.qty_precision}, " \
@@ -0,0 +1,62 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from chalicelib.userconfig.userconfigstore import UserConfigStore, write_binary_user_config
+
+
+class UserConfigStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp_dir.name, "user-config.json")
+        shutil.copyfile("sample-user-config.json", self.json_path)
+        with open(self.json_path) as user_config_json:
+            self.users = json.load(user_config_json)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_user_from_json(self):
+        # given
+        class_under_test = UserConfigStore(path=self.json_path)
+
+        # when
+        user_config = class_under_test.get(user_id="userId2")
+
+        # then
+        self.assertEqual(self.users["userId2"], user_config)
+        self.assertIsNone(class_under_test.get(user_id="unknownUser"))
+
+    def test_file_only_reloaded_when_changed(self):
+        # given
+        class_under_test = UserConfigStore(path=self.json_path)
+        class_under_test.get(user_id="userId1")
+        loaded_configs = class_under_test.configs
+
+        # when
+        class_under_test.get(user_id="userId2")
+        unchanged_configs = class_under_test.configs
+        self.users["userId3"] = {"BOT_API_KEY": "new-user-api-key"}
+        with open(self.json_path, "w") as user_config_json:
+            json.dump(self.users, user_config_json)
+        user_config = class_under_test.get(user_id="userId3")
+
+        # then
+        self.assertIs(loaded_configs, unchanged_configs)
+        self.assertIsNot(loaded_configs, class_under_test.configs)
+        self.assertEqual("new-user-api-key", user_config["BOT_API_KEY"])
+
+    def test_get_users_from_binary_format(self):
+        # given
+        users = {f"user{i}": {"BOT_API_KEY": f"api-key-{i}"} for i in range(1000)}
+        binary_path = os.path.join(self.tmp_dir.name, "user-config.bin")
+        write_binary_user_config(users=users, path=binary_path)
+        class_under_test = UserConfigStore(path=binary_path)
+
+        # then
+        for user_id, expected_config in users.items():
+            self.assertEqual(expected_config, class_under_test.get(user_id=user_id))
+        self.assertIsNone(class_under_test.get(user_id="user1000"))
@@ -0,0 +1,148 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Optional
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+# Compact binary format: a header, an open addressing hash table of user IDs and the JSON encoded configs. Lookups
+# memory map the file and only touch the hash slots and the one record requested.
+BINARY_MAGIC = b"UCFG"
+BINARY_VERSION = 1
+HEADER = struct.Struct("<4sHI")  # magic, version, slot count
+SLOT = struct.Struct("<IHII")  # key offset, key length (0 = empty slot), value offset, value length
+BINARY_EXTENSION = ".bin"
+
+
+def write_binary_user_config(users: Dict[str, dict], path: str):
+    """
+    Writes user configs keyed by user ID in the compact binary format read by UserConfigStore.
+    """
+    slot_count = 1
+    while slot_count < max(2 * len(users), 1):
+        slot_count *= 2
+    slots = [(0, 0, 0, 0)] * slot_count
+    data = bytearray()
+    data_offset = HEADER.size + SLOT.size * slot_count
+    for user_id, user_config in users.items():
+        key = user_id.encode("utf-8")
+        value = json.dumps(user_config, separators=(",", ":")).encode("utf-8")
+        key_offset = data_offset + len(data)
+        data += key
+        value_offset = data_offset + len(data)
+        data += value
+        slot = zlib.crc32(key) & (slot_count - 1)
+        while slots[slot][1]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (key_offset, len(key), value_offset, len(value))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as binary_file:
+        binary_file.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, slot_count))
+        for slot in slots:
+            binary_file.write(SLOT.pack(*slot))
+        binary_file.write(data)
+    os.replace(tmp_path, path)
+
+
+class JsonUserConfigs:
+
+    def __init__(self, path: str):
+        with open(path) as user_config_json:
+            self.users = json.load(user_config_json)
+
+    def get(self, user_id: str) -> Optional[dict]:
+        return self.users.get(user_id)
+
+
+class BinaryUserConfigs:
+
+    def __init__(self, path: str):
+        with open(path, "rb") as binary_file:
+            self.buffer = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.slot_count = HEADER.unpack_from(self.buffer, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"Unsupported user config file format in {path}")
+        # Decoded configs, so repeat lookups for the same user skip JSON decoding
+        self.decoded = {}
+
+    def get(self, user_id: str) -> Optional[dict]:
+        user_config = self.decoded.get(user_id)
+        if user_config is not None:
+            return user_config
+        key = user_id.encode("utf-8")
+        slot = zlib.crc32(key) & (self.slot_count - 1)
+        while True:
+            key_offset, key_len, value_offset, value_len = SLOT.unpack_from(self.buffer, HEADER.size + slot * SLOT.size)
+            if key_len == 0:
+                return None
+            if key_len == len(key) and self.buffer[key_offset:key_offset + key_len] == key:
+                user_config = json.loads(self.buffer[value_offset:value_offset + value_len])
+                self.decoded[user_id] = user_config
+                return user_config
+            slot = (slot + 1) & (self.slot_count - 1)
+
+
+class UserConfigStore:
+    """
+    User configs parsed once per container and indexed by user ID.
+
+    The file is only re-read when its modification time or size changes, so the cost per request is a single stat()
+    and a dict or hash slot lookup regardless of how many users the file holds. Files ending in '.bin' are read in
+    the compact memory mapped binary format written by write_binary_user_config, anything else as JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.configs = None
+        self.file_signature = None
+        self.lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[dict]:
+        self.__reload_if_changed()
+        return self.configs.get(user_id)
+
+    def __reload_if_changed(self):
+        stat = os.stat(self.path)
+        file_signature = (stat.st_mtime_ns, stat.st_size)
+        if file_signature == self.file_signature:
+            return
+        with self.lock:
+            if file_signature == self.file_signature:
+                return
+            logger.info("Loading user config from %s", self.path)
+            # Readers still holding the previous configs keep working, the old mapping is released once unreferenced
+            if self.path.endswith(BINARY_EXTENSION):
+                self.configs = BinaryUserConfigs(self.path)
+            else:
+                self.configs = JsonUserConfigs(self.path)
+            self.file_signature = file_signature
+
+
+_USER_CONFIG_STORES: Dict[str, UserConfigStore] = {}
+_USER_CONFIG_STORES_LOCK = threading.Lock()
+
+
+def get_user_config_store(path: str) -> UserConfigStore:
+    """
+    Returns the process-wide store for the given user config path, creating it on first use.
+    """
+    with _USER_CONFIG_STORES_LOCK:
+        store = _USER_CONFIG_STORES.get(path)
+        if store is None:
+            store = UserConfigStore(path=path)
+            _USER_CONFIG_STORES[path] = store
+        return store
+
+
+if __name__ == "__main__":
+    # Converts a JSON user config file: python -m chalicelib.userconfig.userconfigstore <json path> <binary path>
+    import sys
+
+    with open(sys.argv[1]) as source_json:
+        write_binary_user_config(users=json.load(source_json), path=sys.argv[2])
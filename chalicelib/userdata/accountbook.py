@@ -0,0 +1,119 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from binance_f.model import Order as LibOrder
+from binance_f.model import Position
+
+from chalicelib.logs.botlogger import get_logger
+
+logger = get_logger()
+
+ORDER_TRADE_UPDATE = "ORDER_TRADE_UPDATE"
+ACCOUNT_UPDATE = "ACCOUNT_UPDATE"
+OPEN_ORDER_STATUSES = {"NEW", "PARTIALLY_FILLED"}
+
+
+def order_from_event(order: dict) -> LibOrder:
+    """
+    Builds the REST API's order model from the "o" object of an ORDER_TRADE_UPDATE event.
+    """
+    result = LibOrder()
+    result.symbol = order.get("s", "")
+    result.clientOrderId = order.get("c", "")
+    result.side = order.get("S")
+    result.type = order.get("o")
+    result.timeInForce = order.get("f")
+    result.origQty = float(order.get("q", 0))
+    result.price = float(order.get("p", 0))
+    result.avgPrice = float(order.get("ap", 0))
+    result.stopPrice = float(order.get("sp", 0))
+    result.executedQty = float(order.get("z", 0))
+    result.status = order.get("X")
+    result.orderId = int(order.get("i"))
+    result.updateTime = int(order.get("T", 0))
+    result.reduceOnly = bool(order.get("R", False))
+    result.workingType = order.get("wt", "")
+    result.positionSide = order.get("ps", "")
+    result.closePosition = bool(order.get("cp", False))
+    result.origType = order.get("ot", "")
+    result.activatePrice = float(order["AP"]) if "AP" in order else None
+    result.priceRate = float(order["cr"]) if "cr" in order else None
+    return result
+
+
+class AccountBook:
+    """
+    In-memory mirror of an account's positions and open orders, seeded from a REST snapshot and kept current by
+    applying user data stream events.
+
+    Positions and orders are held as the REST API's models so anything written against ExchangeClient.get_position
+    and ExchangeClient.get_open_orders can read from the book unchanged.
+    """
+
+    def __init__(self):
+        self.positions: Dict[Tuple[str, str], Position] = {}
+        self.open_orders: Dict[str, Dict[int, LibOrder]] = {}
+        self.lock = threading.Lock()
+
+    def load_snapshot(self, positions: Iterable[Position], open_orders: Iterable[LibOrder]):
+        with self.lock:
+            self.positions = {(position.symbol, position.positionSide): position for position in positions}
+            self.open_orders = {}
+            for order in open_orders:
+                self.open_orders.setdefault(order.symbol, {})[order.orderId] = order
+        logger.info("Loaded account snapshot. Positions: %s. Open orders: %s", len(self.positions),
+                    sum(len(orders) for orders in self.open_orders.values()))
+
+    def apply_event(self, event: dict) -> Optional[LibOrder]:
+        """
+        Applies a user data stream event. Returns the updated order for ORDER_TRADE_UPDATE events, None otherwise.
+        """
+        event_type = event.get("e")
+        if event_type == ORDER_TRADE_UPDATE:
+            return self.apply_order_update(event.get("o", {}))
+        if event_type == ACCOUNT_UPDATE:
+            self.apply_account_update(event.get("a", {}))
+        return None
+
+    def apply_order_update(self, order_update: dict) -> LibOrder:
+        order = order_from_event(order_update)
+        with self.lock:
+            orders = self.open_orders.setdefault(order.symbol, {})
+            current = orders.get(order.orderId)
+            # Events can be replayed on top of a newer snapshot after a reconnect
+            if current is not None and current.updateTime > order.updateTime:
+                return current
+            if order.status in OPEN_ORDER_STATUSES:
+                orders[order.orderId] = order
+            else:
+                orders.pop(order.orderId, None)
+        return order
+
+    def apply_account_update(self, account_update: dict):
+        with self.lock:
+            for position_update in account_update.get("P", []):
+                key = (position_update.get("s", ""), position_update.get("ps", ""))
+                position = self.positions.get(key)
+                if position is None:
+                    position = Position()
+                    position.symbol, position.positionSide = key
+                    self.positions[key] = position
+                position.positionAmt = float(position_update.get("pa", 0))
+                position.entryPrice = float(position_update.get("ep", 0))
+                position.unrealizedProfit = float(position_update.get("up", 0))
+                position.marginType = position_update.get("mt", position.marginType)
+                position.isolatedMargin = float(position_update.get("iw", 0))
+
+    def get_position(self) -> List[Position]:
+        with self.lock:
+            return list(self.positions.values())
+
+    def get_open_orders(self, ticker: str) -> List[LibOrder]:
+        with self.lock:
+            return list(self.open_orders.get(ticker, {}).values())
+
+    def remove_orders(self, ticker: str, order_ids: Iterable[int]):
+        with self.lock:
+            orders = self.open_orders.get(ticker, {})
+            for order_id in order_ids:
+                orders.pop(order_id, None)
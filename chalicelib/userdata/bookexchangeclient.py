@@ -0,0 +1,57 @@
+from typing import List
+
+from binance_f.model import Order as LibOrder
+from binance_f.model import Position
+
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.models.orders.order import Order
+from chalicelib.models.orders.orderresult import OrderResult
+from chalicelib.userdata.accountbook import AccountBook
+
+
+class BookExchangeClient(ExchangeClient):
+    """
+    Exchange client which answers position and open order reads from an AccountBook, without a REST call. Orders,
+    cancellations and everything else go to the wrapped client.
+    """
+
+    def __init__(self, exchange_client: ExchangeClient, book: AccountBook):
+        self.exchange_client = exchange_client
+        self.book = book
+
+    # ORDERS
+    def place_order(self, order: Order):
+        return self.exchange_client.place_order(order)
+
+    def place_batch_orders(self, orders: List[Order]) -> List[OrderResult]:
+        return self.exchange_client.place_batch_orders(orders)
+
+    def get_position(self) -> List[Position]:
+        return self.book.get_position()
+
+    def get_open_orders(self, ticker: str) -> List[LibOrder]:
+        return self.book.get_open_orders(ticker=ticker)
+
+    def cancel_list_orders(self, ticker: str, orders: List[int]):
+        result = self.exchange_client.cancel_list_orders(ticker, orders)
+        # The CANCELED events follow on the stream, removing them now keeps later reads in this update consistent
+        self.book.remove_orders(ticker=ticker, order_ids=orders)
+        return result
+
+    # PRECISION
+    def get_quantity_precision(self, ticker: str) -> int:
+        return self.exchange_client.get_quantity_precision(ticker=ticker)
+
+    def get_price_precision(self, ticker: str) -> int:
+        return self.exchange_client.get_price_precision(ticker=ticker)
+
+    # LEVERAGE
+    def update_leverage(self, leverage: int, ticker: str):
+        return self.exchange_client.update_leverage(leverage=leverage, ticker=ticker)
+
+    def update_margin_type(self, margin_type: str, ticker: str):
+        return self.exchange_client.update_margin_type(margin_type=margin_type, ticker=ticker)
+
+    # PORTFOLIO
+    def get_portfolio_value(self) -> float:
+        return self.exchange_client.get_portfolio_value()
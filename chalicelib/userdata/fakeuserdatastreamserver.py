@@ -0,0 +1,55 @@
+import json
+import threading
+from typing import List
+
+from websockets.sync.server import serve
+
+
+class FakeUserDataStreamServer:
+    """
+    Local websocket server standing in for the exchange's user data stream. Events sent are pushed to every connected
+    client, and the path each client connected with is recorded so tests can check which listen key was used.
+    """
+
+    def __init__(self):
+        self.connections = []
+        self.paths: List[str] = []
+        self.condition = threading.Condition()
+        self.server = serve(self.__handle, "127.0.0.1", 0)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-user-data-stream", daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.socket.getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    def __handle(self, connection):
+        with self.condition:
+            self.connections.append(connection)
+            self.paths.append(connection.request.path)
+            self.condition.notify_all()
+        # Keeps the connection open until the client or disconnect_clients closes it
+        for _ in connection:
+            pass
+
+    def wait_for_connections(self, count: int, timeout: float = 5.0) -> bool:
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.paths) >= count, timeout)
+
+    def send_event(self, event: dict):
+        with self.condition:
+            connections = list(self.connections)
+        for connection in connections:
+            connection.send(json.dumps(event))
+
+    def disconnect_clients(self):
+        with self.condition:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            connection.close()
+
+    def stop(self):
+        self.disconnect_clients()
+        self.server.shutdown()
+        self.thread.join(5.0)
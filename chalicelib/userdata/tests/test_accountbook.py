@@ -0,0 +1,87 @@
+import unittest
+
+from binance_f.impl.utils import JsonWrapper
+from binance_f.model import Order as LibOrder
+from binance_f.model import Position
+
+from chalicelib.userdata.accountbook import AccountBook
+
+
+def position_json(symbol: str, position_amt: float, entry_price: float) -> dict:
+    return {
+        "entryPrice": entry_price, "marginType": "isolated", "isAutoAddMargin": False, "isolatedMargin": 0,
+        "leverage": 10, "liquidationPrice": 0, "markPrice": entry_price, "maxNotionalValue": 20000000,
+        "positionAmt": position_amt, "symbol": symbol, "unRealizedProfit": 0, "positionSide": "BOTH"}
+
+
+def open_order_json(symbol: str, order_id: int, client_order_id: str, order_type: str, update_time: int = 1) -> dict:
+    return {
+        "avgPrice": "0", "clientOrderId": client_order_id, "cumQuote": "0", "executedQty": "0", "orderId": order_id,
+        "origQty": "0.01", "origType": order_type, "price": "0", "reduceOnly": True, "side": "SELL",
+        "positionSide": "BOTH", "status": "NEW", "stopPrice": "29000", "closePosition": False, "symbol": symbol,
+        "timeInForce": "GTC", "type": order_type, "updateTime": update_time, "workingType": "CONTRACT_PRICE"}
+
+
+def order_trade_update(symbol: str, order_id: int, client_order_id: str, order_type: str, status: str,
+                       transaction_time: int) -> dict:
+    return {"e": "ORDER_TRADE_UPDATE", "E": transaction_time, "T": transaction_time,
+            "o": {"s": symbol, "c": client_order_id, "S": "SELL", "o": order_type, "f": "GTC", "q": "0.01", "p": "0",
+                  "ap": "0", "sp": "31000", "x": status, "X": status, "i": order_id, "l": "0", "z": "0", "L": "0",
+                  "T": transaction_time, "R": True, "wt": "CONTRACT_PRICE", "ot": order_type, "ps": "BOTH",
+                  "cp": False}}
+
+
+def account_update(symbol: str, position_amt: float, entry_price: float, transaction_time: int) -> dict:
+    return {"e": "ACCOUNT_UPDATE", "E": transaction_time, "T": transaction_time,
+            "a": {"m": "ORDER", "B": [],
+                  "P": [{"s": symbol, "pa": str(position_amt), "ep": str(entry_price), "cr": "0", "up": "0",
+                         "mt": "isolated", "iw": "0", "ps": "BOTH"}]}}
+
+
+class TestAccountBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = AccountBook()
+        positions = [position_json("BTCUSDT", 0.01, 30000)]
+        open_orders = [open_order_json("BTCUSDT", 1, "bot_sl_1", "STOP_MARKET"),
+                       open_order_json("ETHUSDT", 2, "bot_sl_2", "STOP_MARKET")]
+        self.book.load_snapshot(positions=[Position.json_parse(JsonWrapper(position)) for position in positions],
+                                open_orders=[LibOrder.json_parse(JsonWrapper(order)) for order in open_orders])
+
+    def test_order_updates_add_and_remove_open_orders(self):
+        # when
+        new_order = self.book.apply_event(order_trade_update("BTCUSDT", 3, "bot_tp1_3", "TAKE_PROFIT_MARKET", "NEW", 2))
+        self.book.apply_event(order_trade_update("BTCUSDT", 1, "bot_sl_1", "STOP_MARKET", "CANCELED", 2))
+
+        # then
+        self.assertEqual("bot_tp1_3", new_order.clientOrderId)
+        self.assertEqual(31000, new_order.stopPrice)
+        self.assertEqual([3], [order.orderId for order in self.book.get_open_orders("BTCUSDT")])
+        self.assertEqual([2], [order.orderId for order in self.book.get_open_orders("ETHUSDT")])
+
+    def test_order_updates_older_than_the_book_are_ignored(self):
+        # given
+        self.book.apply_event(order_trade_update("BTCUSDT", 1, "bot_sl_1", "STOP_MARKET", "NEW", 5))
+
+        # when
+        self.book.apply_event(order_trade_update("BTCUSDT", 1, "bot_sl_1", "STOP_MARKET", "CANCELED", 4))
+
+        # then
+        self.assertEqual([1], [order.orderId for order in self.book.get_open_orders("BTCUSDT")])
+
+    def test_account_updates_set_positions(self):
+        # when
+        self.book.apply_event(account_update("BTCUSDT", 0.005, 30000, 2))
+        self.book.apply_event(account_update("ETHUSDT", -1, 2000, 3))
+
+        # then
+        positions = {position.symbol: position for position in self.book.get_position()}
+        self.assertEqual(0.005, positions["BTCUSDT"].positionAmt)
+        self.assertEqual(30000, positions["BTCUSDT"].entryPrice)
+        self.assertEqual(10, positions["BTCUSDT"].leverage)
+        self.assertEqual(-1, positions["ETHUSDT"].positionAmt)
+        self.assertEqual(2000, positions["ETHUSDT"].entryPrice)
+
+
+if __name__ == '__main__':
+    unittest.main()
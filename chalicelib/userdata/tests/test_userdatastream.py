@@ -0,0 +1,82 @@
+import time
+import unittest
+
+from chalicelib.constants import Constants
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+from chalicelib.models.orders.slorder import StopLossOrder
+from chalicelib.userdata.fakeuserdatastreamserver import FakeUserDataStreamServer
+from chalicelib.userdata.tests.test_accountbook import account_update, open_order_json, order_trade_update, \
+    position_json
+from chalicelib.userdata.userdatastream import UserDataStreamConsumer
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestUserDataStreamConsumer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeUserDataStreamServer()
+        self.exchange_client = FakeBinanceExchangeClient()
+        self.exchange_client.set_user_data_stream_url(self.server.url)
+        self.exchange_client.set_price_precision(2)
+        self.exchange_client.set_positions([position_json("BTCUSDT", 0.01, 30000)])
+        self.exchange_client.set_open_orders([open_order_json("BTCUSDT", 1, "bot_sl_1", "STOP_MARKET"),
+                                              open_order_json("BTCUSDT", 2, "bot_tp1_2", "TAKE_PROFIT_MARKET"),
+                                              open_order_json("BTCUSDT", 3, "bot_tp2_3", "TAKE_PROFIT_MARKET")])
+        self.consumer = UserDataStreamConsumer(exchange_client=self.exchange_client, min_reconnect_delay=0.01)
+        self.consumer.start()
+        self.assertTrue(self.server.wait_for_connections(1))
+        self.assertTrue(wait_until(lambda: self.consumer.stats["snapshots"] == 1))
+
+    def tearDown(self):
+        self.consumer.stop(timeout=5.0)
+        self.server.stop()
+
+    def test_take_profit_fill_moves_stop_loss_without_rest_reads(self):
+        # when
+        self.server.send_event(account_update("BTCUSDT", 0.005, 30000, 10))
+        self.server.send_event(order_trade_update("BTCUSDT", 2, "bot_tp1_2", "TAKE_PROFIT_MARKET", "FILLED", 10))
+
+        # then
+        self.assertTrue(wait_until(lambda: self.consumer.stats["fillsHandled"] == 1))
+        self.assertEqual(1, self.exchange_client.position_reads)
+        self.assertEqual(1, self.exchange_client.open_order_reads)
+        self.assertEqual([("BTCUSDT", 1)], self.exchange_client.get_cancel_list_orders())
+        stop_order = self.exchange_client.get_placed_orders()[0]
+        self.assertIsInstance(stop_order, StopLossOrder)
+        self.assertEqual(Constants.OrderSide.SELL, stop_order.side)
+        self.assertEqual(30000, stop_order.trigger_price)
+        self.assertEqual([3], [order.orderId for order in self.consumer.book.get_open_orders("BTCUSDT")])
+
+    def test_fill_waits_for_its_account_update(self):
+        # when
+        self.server.send_event(order_trade_update("BTCUSDT", 3, "bot_tp2_3", "TAKE_PROFIT_MARKET", "FILLED", 10))
+        self.server.send_event(order_trade_update("BTCUSDT", 2, "bot_tp1_2", "TAKE_PROFIT_MARKET", "FILLED", 10))
+        self.server.send_event(account_update("BTCUSDT", 0, 0, 10))
+
+        # then
+        self.assertTrue(wait_until(lambda: self.consumer.stats["fillsHandled"] == 2))
+        self.assertEqual([("BTCUSDT", 1)], self.exchange_client.get_cancel_list_orders())
+        self.assertEqual([], self.exchange_client.get_placed_orders())
+
+    def test_reconnects_with_new_listen_key(self):
+        # when
+        self.server.disconnect_clients()
+        self.assertTrue(self.server.wait_for_connections(2))
+        self.server.send_event({"e": "listenKeyExpired", "E": 20})
+        self.assertTrue(self.server.wait_for_connections(3))
+
+        # then
+        self.assertEqual(["/ws/listen-key-1", "/ws/listen-key-2", "/ws/listen-key-3"], self.server.paths)
+        self.assertTrue(wait_until(lambda: self.consumer.stats["snapshots"] == 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
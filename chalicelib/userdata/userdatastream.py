@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from chalicelib.exchanges.exchangeclient import ExchangeClient
+from chalicelib.handlers.orderupdatehandler import OrderUpdateHandler
+from chalicelib.logs.botlogger import get_logger
+from chalicelib.userdata.accountbook import AccountBook, ACCOUNT_UPDATE, ORDER_TRADE_UPDATE
+from chalicelib.userdata.bookexchangeclient import BookExchangeClient
+
+logger = get_logger()
+
+LISTEN_KEY_EXPIRED = "listenKeyExpired"
+FILLED = "FILLED"
+# Binance expires a listen key 60 minutes after it was last kept alive
+KEEPALIVE_INTERVAL_SECONDS = 30 * 60
+MIN_RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 60.0
+# How long a fill waits for the ACCOUNT_UPDATE carrying its position change before it is handled regardless
+FILL_SETTLE_SECONDS = 1.0
+
+
+def connect_websocket(url: str):
+    from websockets.sync.client import connect
+
+    return connect(url)
+
+
+class UserDataStreamConsumer:
+    """
+    Long running consumer of an account's user data stream, for running the bot as a daemon rather than behind the
+    /orderUpdateEvent webhook.
+
+    Each connection takes a fresh listen key, then a REST snapshot of positions and open orders to seed the AccountBook.
+    From then on ORDER_TRADE_UPDATE and ACCOUNT_UPDATE events keep the book current, and each filled order is passed to
+    the OrderUpdateHandler with an exchange client reading from the book, so cleaning up open orders and moving the stop
+    loss need no REST reads. Dropped connections and expired listen keys reconnect with exponential backoff.
+    """
+
+    def __init__(self, exchange_client: ExchangeClient, book: Optional[AccountBook] = None,
+                 on_order_filled: Optional[Callable[[dict], None]] = None,
+                 connect: Callable[[str], object] = connect_websocket,
+                 keepalive_interval: float = KEEPALIVE_INTERVAL_SECONDS,
+                 min_reconnect_delay: float = MIN_RECONNECT_DELAY_SECONDS,
+                 max_reconnect_delay: float = MAX_RECONNECT_DELAY_SECONDS,
+                 fill_settle_seconds: float = FILL_SETTLE_SECONDS):
+        self.exchange_client = exchange_client
+        self.book = book or AccountBook()
+        self.on_order_filled = on_order_filled or OrderUpdateHandler(
+            exchange_client=BookExchangeClient(exchange_client=exchange_client, book=self.book)).handle
+        self.connect = connect
+        self.keepalive_interval = keepalive_interval
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.fill_settle_seconds = fill_settle_seconds
+        self.pending_fills: List[Tuple[float, dict]] = []
+        self.account_update_time = -1
+        self.stats = {"connections": 0, "events": 0, "fillsHandled": 0, "keepalives": 0, "snapshots": 0}
+        self.connection = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self) -> threading.Thread:
+        self.thread = threading.Thread(target=self.run, name="user-data-stream", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self.stopped.set()
+        connection = self.connection
+        if connection is not None:
+            connection.close()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self):
+        reconnect_delay = self.min_reconnect_delay
+        while not self.stopped.is_set():
+            try:
+                self.__consume()
+                reconnect_delay = self.min_reconnect_delay
+            except Exception as err:
+                if self.stopped.is_set():
+                    break
+                logger.warning("User data stream disconnected: %s. Reconnecting in %s seconds", err, reconnect_delay)
+                self.stopped.wait(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, self.max_reconnect_delay)
+        try:
+            self.exchange_client.close_user_data_stream()
+        except Exception as err:
+            logger.warning("Failed to close user data stream: %s", err)
+
+    def __consume(self):
+        listen_key = self.exchange_client.start_user_data_stream()
+        with self.connect(self.exchange_client.get_user_data_stream_url(listen_key)) as connection:
+            self.connection = connection
+            self.stats["connections"] += 1
+            logger.info("Connected to user data stream")
+            # Taken once connected so no event between the snapshot and the first message is missed. Events the
+            # snapshot already reflects are applied again harmlessly.
+            self.book.load_snapshot(positions=self.exchange_client.get_position(),
+                                    open_orders=self.exchange_client.get_open_orders(ticker=None))
+            self.stats["snapshots"] += 1
+            next_keepalive = time.monotonic() + self.keepalive_interval
+            while not self.stopped.is_set():
+                try:
+                    message = connection.recv(timeout=self.__next_timeout(next_keepalive))
+                except TimeoutError:
+                    message = None
+                if message is not None:
+                    event = json.loads(message)
+                    if event.get("e") == LISTEN_KEY_EXPIRED:
+                        logger.info("Listen key expired. Reconnecting")
+                        return
+                    self.__on_event(event)
+                now = time.monotonic()
+                if now >= next_keepalive:
+                    self.exchange_client.keep_user_data_stream()
+                    self.stats["keepalives"] += 1
+                    next_keepalive = now + self.keepalive_interval
+                self.__handle_fills(settled_before=now - self.fill_settle_seconds)
+
+    def __next_timeout(self, next_keepalive: float) -> float:
+        deadline = next_keepalive
+        if self.pending_fills:
+            deadline = min(deadline, self.pending_fills[0][0] + self.fill_settle_seconds)
+        return max(deadline - time.monotonic(), 0)
+
+    def __on_event(self, event: dict):
+        self.stats["events"] += 1
+        order = self.book.apply_event(event)
+        event_type = event.get("e")
+        if event_type == ORDER_TRADE_UPDATE and order is not None and order.status == FILLED:
+            self.pending_fills.append((time.monotonic(), event.get("o", {})))
+        elif event_type == ACCOUNT_UPDATE:
+            self.account_update_time = max(self.account_update_time, int(event.get("T", 0)))
+        # Binance sends a fill's position change in an ACCOUNT_UPDATE with the same transaction time, which may arrive
+        # either side of the ORDER_TRADE_UPDATE. Fills are handled once the book holds their position change.
+        self.__handle_fills(transaction_time=self.account_update_time)
+
+    def __handle_fills(self, settled_before: float = float("-inf"), transaction_time: int = -1):
+        while self.pending_fills:
+            received_at, order = self.pending_fills[0]
+            if received_at > settled_before and int(order.get("T", 0)) > transaction_time:
+                return
+            self.pending_fills.pop(0)
+            logger.info("Order filled: %s %s", order.get("s"), order.get("c"))
+            self.stats["fillsHandled"] += 1
+            try:
+                self.on_order_filled(order)
+            except Exception as err:
+                logger.exception("Error occurred while handling filled order: %s", err)
+
+
+if __name__ == "__main__":
+    # Runs the consumer for one user:
+    #   python -m chalicelib.userdata.userdatastream <user config path> <user ID> [TESTNET]
+    import sys
+
+    from chalicelib.exchanges.exchangeclientpool import create_binance_exchange_client
+    from chalicelib.userconfig.userconfigstore import get_user_config_store
+
+    stream_user_config = get_user_config_store(path=sys.argv[1]).get(user_id=sys.argv[2])
+    if not stream_user_config:
+        sys.exit(f"No user config for user ID {sys.argv[2]}")
+    stream_exchange_client = create_binance_exchange_client(is_test_platform=sys.argv[3:] == ["TESTNET"],
+                                                            is_dry_run=False, user_config=stream_user_config)
+    UserDataStreamConsumer(exchange_client=stream_exchange_client).run()
@@ -0,0 +1,93 @@
+import copy
+import json
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from chalice.test import Client
+
+import app
+from chalicelib.exchanges.fakebinanceexchangeclient import FakeBinanceExchangeClient
+
+SAMPLE_PAYLOAD_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chalicelib",
+                                   "handlers", "tests", "sample-json-payload.json")
+API_KEY = "super-secure-api-key-123"
+
+
+class FakeWebhookHandler:
+    """
+    Records the ticker of every alert it handles. Alerts for the blocking ticker wait until released.
+    """
+    handled = []
+    blocking_ticker = None
+    started = threading.Event()
+    release = threading.Event()
+
+    def __init__(self, payload: dict, **kwargs):
+        self.ticker = payload["position"]["ticker"]
+
+    def handle(self) -> dict:
+        if self.ticker == FakeWebhookHandler.blocking_ticker:
+            FakeWebhookHandler.started.set()
+            FakeWebhookHandler.release.wait(5)
+        FakeWebhookHandler.handled.append(self.ticker)
+        return {"code": 200, "ticker": self.ticker}
+
+
+class WebhookRouteTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(SAMPLE_PAYLOAD_PATH) as sample_json:
+            self.sample_payload = json.load(sample_json)
+        FakeWebhookHandler.handled = []
+        FakeWebhookHandler.started.clear()
+        FakeWebhookHandler.release.clear()
+        exchange_client = FakeBinanceExchangeClient()
+        patches = [mock.patch.object(app, "load_user_config", return_value={app.BOT_API_KEY_CONFIG_KEY: API_KEY}),
+                   mock.patch.object(app, "get_exchange_client", return_value=exchange_client),
+                   mock.patch.object(app, "webhookhandler", SimpleNamespace(WebhookHandler=FakeWebhookHandler)),
+                   mock.patch.object(app, "ccxt", mock.MagicMock()),
+                   mock.patch.object(app, "ccxtmarkets", mock.MagicMock()),
+                   mock.patch.object(app, "priceservice", mock.MagicMock())]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def post_alert(self, ticker: str, responses: dict) -> threading.Thread:
+        payload = copy.deepcopy(self.sample_payload)
+        payload["position"]["ticker"] = ticker
+
+        def post():
+            with Client(app.app) as client:
+                response = client.http.post("/webhook?userId=user", headers={"Content-Type": "application/json"},
+                                            body=json.dumps(payload))
+                responses[ticker] = response.json_body
+        thread = threading.Thread(target=post)
+        thread.start()
+        return thread
+
+    def test_concurrent_alerts_for_different_tickers_all_run(self):
+        # given
+        responses = {}
+        FakeWebhookHandler.blocking_ticker = "BTCUSDT"
+        blocked = self.post_alert("BTCUSDT", responses)
+        FakeWebhookHandler.started.wait(5)
+
+        # when
+        # Alerts are posted one after another as Chalice's test client shares the current request between threads
+        for ticker in ("ETHUSDT", "SOLUSDT"):
+            self.post_alert(ticker, responses).join(5)
+        handled_while_blocked = list(FakeWebhookHandler.handled)
+        FakeWebhookHandler.release.set()
+        blocked.join(5)
+
+        # then
+        self.assertEqual(["ETHUSDT", "SOLUSDT"], handled_while_blocked)
+        self.assertEqual({ticker: {"code": 200, "ticker": ticker} for ticker in ("BTCUSDT", "ETHUSDT", "SOLUSDT")},
+                         responses)
+
+
+if __name__ == '__main__':
+    unittest.main()
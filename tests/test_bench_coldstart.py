@@ -0,0 +1,69 @@
+import unittest
+from types import CodeType
+from typing import Set
+
+import app
+from benchmarks.bench_coldstart import ROUTE_MODULES
+from chalicelib.lazymodule import LazyModule
+
+
+def referenced_names(code: CodeType) -> Set[str]:
+    # Names used by the function and by any lambdas or nested functions defined in it
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= referenced_names(const)
+    return names
+
+
+def route_lazy_modules(view_function) -> Set[str]:
+    """
+    Names of the LazyModules a route uses, directly or through the other functions in app.py it calls.
+    """
+    modules = set()
+    seen = set()
+    pending = [view_function]
+    while pending:
+        function = pending.pop()
+        if function in seen:
+            continue
+        seen.add(function)
+        for name in referenced_names(function.__code__):
+            attr = getattr(app, name, None)
+            if isinstance(attr, LazyModule):
+                modules.add(attr._name)
+            elif callable(attr) and getattr(attr, "__module__", None) == app.__name__ and \
+                    hasattr(attr, "__code__"):
+                pending.append(attr)
+    return modules
+
+
+class ColdStartRouteModulesTest(unittest.TestCase):
+
+    def test_every_route_is_profiled(self):
+        # then
+        self.assertEqual(set(app.app.routes), set(ROUTE_MODULES) - {"app"})
+
+    def test_every_lazy_module_a_route_uses_is_profiled(self):
+        for path, methods in app.app.routes.items():
+            for route in methods.values():
+                # when
+                missing = route_lazy_modules(route.view_function) - set(ROUTE_MODULES[path])
+
+                # then
+                self.assertEqual(set(), missing, f"{path} uses LazyModules bench_coldstart.py does not import")
+
+    def test_lazy_modules_used_through_helpers_are_found(self):
+        # given
+        webhook = app.app.routes["/webhook"]["POST"].view_function
+
+        # when
+        modules = route_lazy_modules(webhook)
+
+        # then
+        self.assertIn("chalicelib.idempotency.idempotencycache", modules)
+        self.assertIn("chalicelib.execution.tickerexecutionqueue", modules)
+
+
+if __name__ == '__main__':
+    unittest.main()